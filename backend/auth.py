@@ -1,15 +1,17 @@
 from datetime import datetime, timedelta
 from typing import Optional, List
 from jose import JWTError, jwt
-import os
-os.environ.setdefault("PASSLIB_BCRYPT_DETECT_WRAPAROUND", "0")
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from database import get_db, DATABASE_URL
+from database import get_async_db, DATABASE_URL
 from models.schemas import TokenData, User
+from principal_cache import principal_cache, encode_principal, decode_principal
+from token_versions import token_versions, STATELESS_AUTH
+from password_hashing import hash_password_sync, verify_password_sync, verify_password_async
 import os
 from uuid import UUID
 
@@ -18,19 +20,19 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Principal fields carried in stateless tokens besides sub/roles/active
+_PROFILE_CLAIMS = ("email", "first_name", "last_name", "phone", "is_verified", "created_at", "updated_at")
 
 # JWT Bearer token
 security = HTTPBearer(auto_error=False)  # Don't auto-error, we'll handle it
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a plain password against its hash (blocking - use verify_password_async in handlers)."""
+    return verify_password_sync(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """Hash a password (blocking - use password_hashing.hash_password in handlers)."""
+    return hash_password_sync(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -44,60 +46,90 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_user_token(user: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """Create the access token for an authenticated user.
+    
+    In stateless mode the token also carries the active flag, the user's
+    current token version and their profile, so requests can be
+    authenticated from the signed claims alone.
+    """
+    claims = {"sub": str(user["user_id"]), "roles": list(user.get("roles") or [])}
+    if STATELESS_AUTH:
+        profile = encode_principal(user)
+        claims.update({
+            "active": bool(user.get("is_active", True)),
+            "tv": token_versions.issue_version(user["user_id"]),
+            "profile": {field: profile.get(field) for field in _PROFILE_CLAIMS}
+        })
+    return create_access_token(claims, expires_delta)
+
+def decode_token(token: str) -> Optional[dict]:
+    """Decode a JWT and return its claims, or None if it is invalid."""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+
 def verify_token(token: str) -> Optional[TokenData]:
     """Verify and decode a JWT token."""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    
+    user_id: str = payload.get("sub")
+    roles: List[str] = payload.get("roles", [])
+    
+    if user_id is None:
+        return None
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        roles: List[str] = payload.get("roles", [])
-        
-        if user_id is None:
-            return None
-            
-        token_data = TokenData(user_id=UUID(user_id), roles=roles)
-        return token_data
-    except JWTError:
+        return TokenData(user_id=UUID(user_id), roles=roles)
+    except ValueError:
         return None
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[dict]:
-    """Authenticate a user with email and password."""
+def principal_from_claims(payload: dict) -> Optional[dict]:
+    """Build the current user from stateless claims; None if revoked or inactive."""
+    if not payload.get("active") or not token_versions.is_current(payload["sub"], payload["tv"]):
+        return None
+    
+    return decode_principal({
+        **payload.get("profile", {}),
+        "user_id": payload["sub"],
+        "is_active": True,
+        "roles": payload.get("roles", [])
+    })
+
+def invalidate_principal(user_id):
+    """Forget cached state for a user after a role, profile or status change.
+    
+    Drops the cached principal and, in stateless mode, revokes outstanding
+    tokens, so the change applies on the user's next request.
+    """
+    principal_cache.invalidate(user_id)
+    if STATELESS_AUTH:
+        token_versions.revoke(user_id)
+
+def _user_with_roles_query(condition: str, extra_columns: str = ""):
+    """Select an active user matching ``condition`` with their role keys aggregated."""
     # Choose aggregation based on database backend
     is_sqlite = DATABASE_URL.lower().startswith("sqlite")
     if is_sqlite:
-        query = text(
-            """
-            SELECT u.user_id, u.email, u.password_hash, u.first_name, u.last_name,
-                   u.phone, u.is_verified, u.is_active, u.created_at, u.updated_at,
-                   GROUP_CONCAT(ur.role_key) as roles
-            FROM "user" u
-            LEFT JOIN user_roles ur ON u.user_id = ur.user_id
-            WHERE u.email = :email AND u.is_active = true
-            GROUP BY u.user_id, u.email, u.password_hash, u.first_name, u.last_name,
-                     u.phone, u.is_verified, u.is_active, u.created_at, u.updated_at
-            """
-        )
+        roles = "GROUP_CONCAT(ur.role_key)"
     else:
-        query = text(
-            """
-            SELECT u.user_id, u.email, u.password_hash, u.first_name, u.last_name,
-                   u.phone, u.is_verified, u.is_active, u.created_at, u.updated_at,
-                   COALESCE(array_agg(ur.role_key) FILTER (WHERE ur.role_key IS NOT NULL), '{}') as roles
-            FROM "user" u
-            LEFT JOIN user_roles ur ON u.user_id = ur.user_id
-            WHERE u.email = :email AND u.is_active = true
-            GROUP BY u.user_id, u.email, u.password_hash, u.first_name, u.last_name,
-                     u.phone, u.is_verified, u.is_active, u.created_at, u.updated_at
-            """
-        )
-
-    result = db.execute(query, {"email": email}).fetchone()
+        roles = "COALESCE(array_agg(ur.role_key) FILTER (WHERE ur.role_key IS NOT NULL), '{}')"
     
-    if not result:
-        return None
-        
-    if not verify_password(password, result.password_hash):
-        return None
-        
+    columns = f"""u.user_id, u.email,{extra_columns} u.first_name, u.last_name,
+               u.phone, u.is_verified, u.is_active, u.created_at, u.updated_at"""
+    return text(f"""
+        SELECT {columns},
+               {roles} as roles
+        FROM "user" u
+        LEFT JOIN user_roles ur ON u.user_id = ur.user_id
+        WHERE {condition} AND u.is_active = true
+        GROUP BY {columns}
+    """)
+
+def _principal_from_row(result) -> dict:
     # Normalize roles to a list for both SQLite and Postgres
     roles = []
     if result.roles:
@@ -105,7 +137,7 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[dict]:
             roles = [role.strip() for role in result.roles.split(',') if role.strip()]
         else:
             roles = list(result.roles)
-        
+    
     return {
         "user_id": result.user_id,
         "email": result.email,
@@ -119,7 +151,27 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[dict]:
         "roles": roles
     }
 
-def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security), db: Session = Depends(get_db)) -> dict:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[dict]:
+    """Authenticate a user with email and password.
+    
+    The password check runs in the KDF process pool, so it may raise 429
+    when too many sign-ins are already in progress.
+    """
+    query = _user_with_roles_query("u.email = :email", extra_columns=" u.password_hash,")
+    result = (await db.execute(query, {"email": email})).fetchone()
+    
+    if not result:
+        return None
+        
+    if not await verify_password_async(password, result.password_hash):
+        return None
+        
+    return _principal_from_row(result)
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> dict:
     """Get the current authenticated user."""
     # Check if credentials were provided
     if credentials is None:
@@ -135,39 +187,38 @@ def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depen
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    payload = decode_token(credentials.credentials)
+    
+    # Stateless tokens are trusted for their lifetime unless the user's version moved on
+    if STATELESS_AUTH and payload and payload.get("sub") and "tv" in payload:
+        principal = principal_from_claims(payload)
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked. Please log in again.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return principal
+    
     token_data = verify_token(credentials.credentials)
     if token_data is None:
         raise credentials_exception
-        
-    # Get user from database
-    query = text("""
-        SELECT u.user_id, u.email, u.first_name, u.last_name, u.phone, u.is_verified, u.is_active,
-               u.created_at, u.updated_at,
-               COALESCE(array_agg(ur.role_key) FILTER (WHERE ur.role_key IS NOT NULL), '{}') as roles
-        FROM "user" u
-        LEFT JOIN user_roles ur ON u.user_id = ur.user_id
-        WHERE u.user_id = :user_id AND u.is_active = true
-        GROUP BY u.user_id, u.email, u.first_name, u.last_name, u.phone, u.is_verified, u.is_active,
-                 u.created_at, u.updated_at
-    """)
     
-    result = db.execute(query, {"user_id": str(token_data.user_id)}).fetchone()
+    # The token proves identity; profile and roles come from the cache when possible
+    principal = await principal_cache.get_async(token_data.user_id)
+    if principal is not None:
+        return principal
+        
+    # Cache miss - get user from database
+    query = _user_with_roles_query("u.user_id = :user_id")
+    result = (await db.execute(query, {"user_id": str(token_data.user_id)})).fetchone()
     
     if result is None:
         raise credentials_exception
         
-    return {
-        "user_id": result.user_id,
-        "email": result.email,
-        "first_name": result.first_name,
-        "last_name": result.last_name,
-        "phone": result.phone,
-        "is_verified": result.is_verified,
-        "is_active": result.is_active,
-        "created_at": result.created_at,
-        "updated_at": result.updated_at,
-        "roles": result.roles
-    }
+    principal = _principal_from_row(result)
+    await run_in_threadpool(principal_cache.set, principal)
+    return principal
 
 def get_current_active_user(current_user: dict = Depends(get_current_user)) -> dict:
     """Get the current active user."""
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Document Blob Backfill for RenewMart
+
+Moves document bytes that predate the content-addressed blob store into it:
+- inline ``documents.file_data`` BYTEA values
+- legacy ``documents.file_path`` files on disk
+
+Each document is streamed in bounded chunks (never loaded whole), hashed,
+stored once per distinct content and linked through ``documents.content_hash``.
+Inline ``file_data`` is cleared once the document points at its blob.
+
+Usage:
+    python backfill_document_blobs.py [--batch-size 50] [--keep-file-data] [--dry-run]
+
+Apply migrations/add_document_blob_store.sql first.
+"""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy import text
+
+from database import SessionLocal
+from blob_store import put_blob
+from document_storage import ingest_chunks, iter_document_data_range, iter_file_range
+
+
+def print_status(message, status="INFO"):
+    """Print colored status message"""
+    colors = {
+        "INFO": "\033[94m",  # Blue
+        "SUCCESS": "\033[92m",  # Green
+        "WARNING": "\033[93m",  # Yellow
+        "ERROR": "\033[91m",  # Red
+        "RESET": "\033[0m"
+    }
+    color = colors.get(status, colors["INFO"])
+    reset = colors["RESET"]
+    print(f"{color}[{status}]{reset} {message}")
+
+
+def fetch_pending_batch(db, batch_size, after_id):
+    """Fetch the next batch of documents without a content hash (metadata only)"""
+    query = text("""
+        SELECT document_id, file_name, file_path, mime_type,
+               length(file_data) AS data_length
+        FROM documents
+        WHERE content_hash IS NULL
+          AND (file_data IS NOT NULL OR file_path IS NOT NULL)
+          AND CAST(document_id AS TEXT) > :after_id
+        ORDER BY CAST(document_id AS TEXT)
+        LIMIT :batch_size
+    """)
+    return db.execute(query, {"after_id": after_id, "batch_size": batch_size}).fetchall()
+
+
+def source_chunks(row):
+    """Return a chunk iterator over a document's legacy bytes, or None"""
+    if row.data_length:
+        return iter_document_data_range(str(row.document_id), 0, row.data_length - 1)
+    if row.file_path and os.path.exists(row.file_path):
+        size = os.path.getsize(row.file_path)
+        return iter_file_range(row.file_path, 0, size - 1) if size else iter(())
+    return None
+
+
+def backfill(batch_size=50, keep_file_data=False, dry_run=False):
+    """Backfill all documents that do not reference a blob yet"""
+    stats = {"migrated": 0, "missing": 0, "failed": 0}
+    after_id = ""
+
+    db = SessionLocal()
+    try:
+        while True:
+            rows = fetch_pending_batch(db, batch_size, after_id)
+            if not rows:
+                break
+
+            for row in rows:
+                after_id = str(row.document_id)
+                chunks = source_chunks(row)
+                if chunks is None:
+                    print_status(f"{row.document_id}: no data or file found, skipping", "WARNING")
+                    stats["missing"] += 1
+                    continue
+
+                try:
+                    with ingest_chunks(chunks, row.file_name, row.mime_type, max_size=None) as ingested:
+                        if dry_run:
+                            print_status(f"{row.document_id}: would store {ingested.size} bytes as {ingested.sha256}")
+                            stats["migrated"] += 1
+                            continue
+
+                        content_hash = put_blob(db, ingested)
+                        db.execute(text(f"""
+                            UPDATE documents
+                            SET content_hash = :content_hash,
+                                file_size = COALESCE(file_size, :file_size)
+                                {'' if keep_file_data else ', file_data = NULL'}
+                            WHERE document_id = :document_id
+                        """), {
+                            "content_hash": content_hash,
+                            "file_size": ingested.size,
+                            "document_id": str(row.document_id)
+                        })
+                        db.commit()
+                        stats["migrated"] += 1
+                except Exception as e:
+                    db.rollback()
+                    print_status(f"{row.document_id}: {str(e)}", "ERROR")
+                    stats["failed"] += 1
+
+            print_status(f"Progress: {stats['migrated']} migrated, {stats['missing']} missing, {stats['failed']} failed")
+    finally:
+        db.close()
+
+    return stats
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Backfill document bytes into the blob store")
+    parser.add_argument("--batch-size", type=int, default=50, help="Documents fetched per batch")
+    parser.add_argument("--keep-file-data", action="store_true", help="Do not clear documents.file_data after migrating")
+    parser.add_argument("--dry-run", action="store_true", help="Hash documents without writing anything")
+    args = parser.parse_args()
+
+    print()
+    print("=" * 80)
+    print(" RenewMart Document Blob Backfill")
+    print("=" * 80)
+    print()
+
+    stats = backfill(args.batch_size, args.keep_file_data, args.dry_run)
+
+    print()
+    print("=" * 80)
+    status = "SUCCESS" if stats["failed"] == 0 else "WARNING"
+    print_status(
+        f"Done: {stats['migrated']} migrated, {stats['missing']} missing, {stats['failed']} failed",
+        status
+    )
+    if not args.dry_run and not args.keep_file_data and stats["migrated"]:
+        print()
+        print("Next steps:")
+        print("  1. Reclaim space from cleared file_data: VACUUM (FULL, ANALYZE) documents;")
+    print("=" * 80)
+    print()
+
+    sys.exit(0 if stats["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
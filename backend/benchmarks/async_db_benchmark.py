@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Async Database Benchmark for RenewMart
+
+Runs a mix of slow and fast queries against a minimal ASGI app and reports
+the latency of the fast queries while the slow ones are in flight.
+
+Two modes are compared:
+    sync    - a ``Session`` from ``get_db`` used inside ``async def`` handlers
+              (how the routers query the database today)
+    async   - an ``AsyncSession`` from ``get_async_db`` with awaited queries
+
+The slow query calls a ``sleep_ms`` SQL function registered on every
+connection, standing in for a heavy report or a lock wait. SQLite (through
+aiosqlite in async mode) keeps the benchmark self-contained; the event loop
+behaviour is the same with PostgreSQL and asyncpg.
+
+Usage:
+    python benchmarks/async_db_benchmark.py [--slow 8] [--slow-ms 200] [--probes 100]
+
+Fast /fast requests are issued every 5ms for the duration of the slow batch.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+PROBE_INTERVAL = 0.005  # seconds between /fast requests
+
+
+def sleep_ms(milliseconds):
+    time.sleep(milliseconds / 1000)
+    return milliseconds
+
+
+def register_sleep(dbapi_connection, connection_record):
+    dbapi_connection.create_function("sleep_ms", 1, sleep_ms)
+
+
+def build_app(mode, url, pool_size):
+    """App with a slow and a fast endpoint backed by the requested session type"""
+    app = FastAPI()
+
+    if mode == "sync":
+        engine = create_engine(url, pool_size=pool_size, connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", register_sleep)
+        Session = sessionmaker(bind=engine)
+
+        async def query(statement, params):
+            with Session() as db:
+                return db.execute(statement, params).scalar()
+    else:
+        engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), pool_size=pool_size)
+        event.listen(engine.sync_engine, "connect", register_sleep)
+        Session = async_sessionmaker(engine)
+
+        async def query(statement, params):
+            async with Session() as db:
+                return (await db.execute(statement, params)).scalar()
+
+    @app.get("/slow")
+    async def slow(ms: int):
+        return {"slept": await query(text("SELECT sleep_ms(:ms)"), {"ms": ms})}
+
+    @app.get("/fast")
+    async def fast():
+        return {"count": await query(text("SELECT COUNT(*) FROM items"), {})}
+
+    return app, engine
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode, url, slow, slow_ms, probes):
+    """Measure /fast latency while a batch of slow queries is in flight"""
+    app, engine = build_app(mode, url, pool_size=slow + probes)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/fast")  # open a pooled connection outside the timing
+
+        async def probe(intended_start):
+            # Open loop: latency counts from when the request was due, so
+            # time spent waiting on a blocked event loop is included
+            await asyncio.sleep(max(intended_start - time.perf_counter(), 0))
+            await client.get("/fast")
+            return (time.perf_counter() - intended_start) * 1000
+
+        batch_started = time.perf_counter()
+        batch = [asyncio.create_task(client.get("/slow", params={"ms": slow_ms})) for _ in range(slow)]
+        latencies = await asyncio.gather(*(
+            probe(batch_started + i * PROBE_INTERVAL) for i in range(probes)
+        ))
+        await asyncio.gather(*batch)
+        batch_seconds = time.perf_counter() - batch_started
+
+    if mode == "sync":
+        engine.dispose()
+    else:
+        await engine.dispose()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies),
+        "batch_seconds": batch_seconds,
+    }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark fast query latency next to slow queries")
+    parser.add_argument("--slow", type=int, default=8, help="Concurrent slow queries")
+    parser.add_argument("--slow-ms", type=int, default=200, help="Duration of each slow query")
+    parser.add_argument("--probes", type=int, default=100, help="Fast queries measured")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed = create_engine(url)
+        with seed.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO items (id) VALUES (:id)"), [{"id": i} for i in range(1000)])
+        seed.dispose()
+
+        print(f"Mix: {args.slow} slow queries x {args.slow_ms}ms, {args.probes} fast probes")
+        print()
+        print(f"{'mode':<6} {'fast p50 ms':>12} {'fast p99 ms':>12} {'fast max ms':>12} {'batch s':>9}")
+        print("-" * 55)
+
+        for mode in ("sync", "async"):
+            result = asyncio.run(run_mode(mode, url, args.slow, args.slow_ms, args.probes))
+            print(
+                f"{mode:<6} {result['p50']:>12.2f} {result['p99']:>12.2f} "
+                f"{result['max']:>12.2f} {result['batch_seconds']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
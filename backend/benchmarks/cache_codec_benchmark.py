@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Benchmark for RenewMart
+
+Compares encode and decode time and stored size of cached values for each
+available serializer, with and without compression, against the plain
+``json.dumps``/``json.loads`` format values were stored in before.
+
+Payloads mirror the responses cached most often: a page of marketplace
+listings and the admin projects list.
+
+Usage:
+    python benchmarks/cache_codec_benchmark.py [--iterations 500] [--rows 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cache_codecs  # noqa: E402
+from cache_codecs import CacheValueCodec  # noqa: E402
+
+ENERGY_TYPES = ["solar", "wind", "hydroelectric", "biomass", "geothermal"]
+STATUSES = ["draft", "submitted", "under_review", "approved", "published"]
+
+
+def marketplace_listing(rows):
+    """Page of published lands as returned by the marketplace endpoint"""
+    started = datetime(2025, 1, 1)
+    return {
+        "items": [
+            {
+                "land_id": str(uuid.UUID(int=index)),
+                "title": f"Parcel {index} near substation",
+                "location_text": f"County road {index % 40}, Rajasthan",
+                "coordinates": {"lat": 26.9 + index / 1000, "lng": 75.8 - index / 1000},
+                "area_acres": 50 + index * 1.5,
+                "energy_key": ENERGY_TYPES[index % len(ENERGY_TYPES)],
+                "capacity_mw": round(5 + index * 0.25, 2),
+                "price_per_mwh": 42.5,
+                "timeline_text": "12-18 months",
+                "interest_count": index % 7,
+                "published_at": (started + timedelta(days=index)).isoformat(),
+            }
+            for index in range(rows)
+        ],
+        "total": rows,
+        "next_cursor": "eyJwdWJsaXNoZWRfYXQiOiAiMjAyNS0wNy0yMCJ9",
+    }
+
+
+def admin_projects(rows):
+    """Admin projects list with owners and review progress"""
+    started = datetime(2025, 1, 1)
+    return [
+        {
+            "land_id": str(uuid.UUID(int=index + 10_000)),
+            "title": f"Project {index}",
+            "status": STATUSES[index % len(STATUSES)],
+            "landowner": {
+                "user_id": str(uuid.UUID(int=index % 25)),
+                "name": f"Owner {index % 25}",
+                "email": f"owner{index % 25}@example.com",
+            },
+            "reviewers": [f"reviewer{slot}@example.com" for slot in range(index % 3 + 1)],
+            "documents_total": 12,
+            "documents_approved": index % 13,
+            "tasks_open": index % 5,
+            "project_priority": "high" if index % 4 == 0 else "normal",
+            "created_at": (started + timedelta(hours=index)).isoformat(),
+            "updated_at": (started + timedelta(hours=index, minutes=30)).isoformat(),
+        }
+        for index in range(rows)
+    ]
+
+
+class LegacyCodec:
+    """Format before cache_codecs: json.dumps for containers, read back with json.loads"""
+
+    @staticmethod
+    def encode(value):
+        return json.dumps(value, default=str)
+
+    @staticmethod
+    def decode(data):
+        return json.loads(data)
+
+
+def measure(codec, payload, iterations):
+    """Mean encode and decode time in microseconds and the stored size in bytes"""
+    encoded = codec.encode(payload)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        codec.encode(payload)
+    encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(encoded)
+    decode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    assert codec.decode(encoded) == json.loads(json.dumps(payload, default=str))
+    size = len(encoded.encode() if isinstance(encoded, str) else encoded)
+    return encode_us, decode_us, size
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark cached value encodings")
+    parser.add_argument("--iterations", type=int, default=500, help="Encodes and decodes per codec and payload")
+    parser.add_argument("--rows", type=int, default=200, help="Rows in each payload")
+    parser.add_argument("--compress-min-bytes", type=int, default=1024, help="Compression threshold")
+    args = parser.parse_args()
+
+    codecs = {"legacy json": LegacyCodec()}
+    compressions = ["none"] + [name for name in ("zlib", "zstd") if name in cache_codecs.available_codecs()]
+    for serializer in cache_codecs._SERIALIZERS:
+        for compression in compressions:
+            codecs[f"{serializer}+{compression}"] = CacheValueCodec(serializer, compression, args.compress_min_bytes)
+
+    payloads = {
+        "marketplace listing": marketplace_listing(args.rows),
+        "admin projects": admin_projects(args.rows),
+    }
+
+    for title, payload in payloads.items():
+        print(f"{title} ({args.rows} rows, {args.iterations} iterations)")
+        print(f"{'codec':<16} {'encode us':>10} {'decode us':>10} {'bytes':>9}")
+        print("-" * 48)
+        for name, codec in codecs.items():
+            encode_us, decode_us, size = measure(codec, payload, args.iterations)
+            print(f"{name:<16} {encode_us:>10.1f} {decode_us:>10.1f} {size:>9,}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
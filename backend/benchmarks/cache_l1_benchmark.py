@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+L1 Cache Benchmark for RenewMart
+
+Measures hot-key read throughput of ``RedisService.get`` with and without
+the in-process L1 tier.
+
+Reads go to the Redis server at ``--redis-url`` when one is reachable.
+Otherwise a stand-in client keeps the values in a dict and sleeps
+``--rtt-us`` per command, standing in for the network round trip to Redis;
+the numbers then show the cost of that round trip rather than of a real
+server.
+
+Usage:
+    python benchmarks/cache_l1_benchmark.py [--reads 20000] [--keys 20] [--rtt-us 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import redis
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from redis_service import RedisService  # noqa: E402
+
+HOT_VALUE = {
+    "energy_types": ["solar", "wind", "hydroelectric", "biomass", "geothermal"],
+    "land_types": ["agricultural", "industrial", "grassland", "desert", "brownfield"],
+    "updated_at": "2025-10-24T09:00:00",
+}
+
+
+class SimulatedRedis:
+    """Dict-backed client that waits one round trip per command"""
+
+    def __init__(self, rtt_seconds):
+        self.rtt = rtt_seconds
+        self.data = {}
+
+    def _wait(self):
+        deadline = time.perf_counter() + self.rtt
+        while time.perf_counter() < deadline:
+            pass
+
+    def get(self, key):
+        self._wait()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._wait()
+        self.data[key] = value
+        return True
+
+    def publish(self, channel, message):
+        self._wait()
+        return 0
+
+
+def connect(url, rtt_seconds):
+    """Real Redis client if the server answers, otherwise the simulated one"""
+    try:
+        client = redis.Redis.from_url(url, decode_responses=True, socket_connect_timeout=1)
+        client.ping()
+        return client, f"redis at {url}"
+    except Exception:
+        return SimulatedRedis(rtt_seconds), f"simulated redis, {rtt_seconds * 1e6:.0f}us round trip"
+
+
+def run_mode(client, l1, reads, keys):
+    """Reads per second and mean latency for hot keys read round-robin"""
+    service = RedisService()
+    service.redis_client, service.is_connected = client, True
+    if l1:
+        service.enable_l1({"bench:lookup:": 30})
+
+    names = [f"bench:lookup:{index}" for index in range(keys)]
+    for name in names:
+        service.set(name, HOT_VALUE, 300)
+
+    started = time.perf_counter()
+    for index in range(reads):
+        service.get(names[index % keys])
+    elapsed = time.perf_counter() - started
+
+    if hasattr(client, "delete"):
+        client.delete(*names)
+    return {"reads_per_second": reads / elapsed, "mean_us": elapsed / reads * 1e6}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark hot-key reads with and without the L1 cache")
+    parser.add_argument("--reads", type=int, default=20000, help="get() calls per mode")
+    parser.add_argument("--keys", type=int, default=20, help="Distinct hot keys read round-robin")
+    parser.add_argument("--rtt-us", type=float, default=200, help="Round trip of the simulated Redis")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0", help="Redis to use when reachable")
+    args = parser.parse_args()
+
+    client, description = connect(args.redis_url, args.rtt_us / 1e6)
+    print(f"Reads: {args.reads} over {args.keys} keys ({len(json.dumps(HOT_VALUE))} byte values), {description}")
+    print()
+    print(f"{'mode':<10} {'reads/s':>12} {'mean us':>10}")
+    print("-" * 34)
+
+    for mode in ("redis", "redis+l1"):
+        result = run_mode(client, mode == "redis+l1", args.reads, args.keys)
+        print(f"{mode:<10} {result['reads_per_second']:>12,.0f} {result['mean_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
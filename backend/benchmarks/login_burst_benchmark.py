@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Login Burst Benchmark for RenewMart
+
+Fires a burst of concurrent password verifications (what a login does) at
+a minimal ASGI app while a steady stream of cheap requests hits an
+unrelated endpoint, and reports that endpoint's latency percentiles.
+
+Two modes are compared:
+    inline  - ``verify_password`` called inside the ``async def`` handler
+              (how login worked before the KDF pool)
+    pool    - ``verify_password_async`` through the bounded KDF pool
+
+The app runs in-process through httpx's ASGI transport, so no database or
+server is needed and event loop stalls show up directly in the numbers.
+
+Usage:
+    python benchmarks/login_burst_benchmark.py [--logins 64] [--probes 200] [--workers 2]
+
+/ping requests are issued every 5ms for the duration of the burst.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from password_hashing import KdfPool, hash_password_sync, verify_password_sync  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+PROBE_INTERVAL = 0.005  # seconds between /ping requests
+
+
+def build_app(mode, pool, hashed):
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        if mode == "inline":
+            ok = verify_password_sync(PASSWORD, hashed)
+        else:
+            ok = await pool.run(verify_password_sync, PASSWORD, hashed)
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping():
+        await asyncio.sleep(0)  # yield once, like any handler doing I/O
+        return {"pong": True}
+
+    return app
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode, logins, probes, workers):
+    """Measure /ping latency while a login burst is in flight"""
+    pool = KdfPool(workers=workers, max_pending=max(logins, 1))
+    hashed = hash_password_sync(PASSWORD)
+    app = build_app(mode, pool, hashed)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        if mode == "pool":
+            await pool.run(verify_password_sync, PASSWORD, hashed)  # start workers outside the timing
+
+        async def probe(intended_start):
+            # Open loop: latency counts from when the request was due, so
+            # time spent waiting on a blocked event loop is included
+            await asyncio.sleep(max(intended_start - time.perf_counter(), 0))
+            await client.get("/ping")
+            return (time.perf_counter() - intended_start) * 1000
+
+        burst_started = time.perf_counter()
+        burst = [asyncio.create_task(client.post("/login")) for _ in range(logins)]
+        latencies = await asyncio.gather(*(
+            probe(burst_started + i * PROBE_INTERVAL) for i in range(probes)
+        ))
+        await asyncio.gather(*burst)
+        burst_seconds = time.perf_counter() - burst_started
+
+    pool.shutdown()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies),
+        "burst_seconds": burst_seconds,
+    }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark event loop latency during a login burst")
+    parser.add_argument("--logins", type=int, default=64, help="Concurrent logins in the burst")
+    parser.add_argument("--probes", type=int, default=200, help="/ping requests measured")
+    parser.add_argument("--workers", type=int, default=2, help="KDF pool processes")
+    args = parser.parse_args()
+
+    print(f"Burst: {args.logins} logins, {args.probes} /ping probes, {args.workers} KDF workers")
+    print()
+    print(f"{'mode':<8} {'ping p50 ms':>12} {'ping p99 ms':>12} {'ping max ms':>12} {'burst s':>9}")
+    print("-" * 57)
+
+    for mode in ("inline", "pool"):
+        result = asyncio.run(run_mode(mode, args.logins, args.probes, args.workers))
+        print(
+            f"{mode:<8} {result['p50']:>12.2f} {result['p99']:>12.2f} "
+            f"{result['max']:>12.2f} {result['burst_seconds']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
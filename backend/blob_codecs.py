@@ -0,0 +1,121 @@
+import zlib
+from typing import Dict, List, Optional
+import logging
+
+from config import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd codec unavailable - blobs fall back to identity
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Codec configuration
+DEFAULT_BLOB_CODEC = settings.get('DOCUMENT_BLOB_CODEC', 'identity')  # identity | zlib | zstd
+BLOB_CODEC_LEVEL = settings.get('DOCUMENT_BLOB_CODEC_LEVEL', 3)  # used by zlib (capped at 9) and zstd
+MIN_COMPRESSION_SAVING = 0.05  # Store raw unless the sample chunk shrinks by at least 5%
+
+# Formats that are already compressed - never worth recompressing
+INCOMPRESSIBLE_MIME_TYPES = {"image/jpeg", "image/png", "image/gif"}
+
+
+class BlobCodec:
+    """Compression applied to each stored chunk of a blob independently.
+
+    Chunks are compressed one by one so any byte range can still be served
+    by decompressing only the chunks that overlap it.
+    """
+
+    name = ""
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class IdentityCodec(BlobCodec):
+    """Stores bytes unchanged (the default)."""
+
+    name = "identity"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCodec(BlobCodec):
+    """DEFLATE from the standard library - portable but slower than zstd."""
+
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCodec(BlobCodec):
+    """Zstandard - requires the optional ``zstandard`` package."""
+
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # Compressor objects are not thread-safe; they are cheap to create per chunk
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+_CODECS: Dict[str, BlobCodec] = {
+    IdentityCodec.name: IdentityCodec(),
+    ZlibCodec.name: ZlibCodec(min(BLOB_CODEC_LEVEL, 9)),
+}
+if zstandard is not None:
+    _CODECS[ZstdCodec.name] = ZstdCodec(BLOB_CODEC_LEVEL)
+
+if DEFAULT_BLOB_CODEC not in _CODECS:
+    logger.warning(f"Blob codec '{DEFAULT_BLOB_CODEC}' is not available, storing blobs uncompressed")
+    DEFAULT_BLOB_CODEC = IdentityCodec.name
+
+
+def available_codecs() -> List[str]:
+    """Names of the codecs usable in this install."""
+    return list(_CODECS)
+
+
+def get_codec(name: Optional[str]) -> BlobCodec:
+    """Get a codec by the name stored with a blob (None means identity)."""
+    name = name or IdentityCodec.name
+    if name not in _CODECS:
+        raise ValueError(f"Unknown or unavailable blob codec: {name}")
+    return _CODECS[name]
+
+
+def choose_codec(mime_type: Optional[str], sample: bytes, preferred: Optional[str] = None) -> BlobCodec:
+    """Pick the codec for a new blob.
+
+    Already-compressed formats are stored raw. For everything else the
+    first chunk is trial-compressed and the codec is only used if it
+    actually saves space, which catches compressed content the MIME type
+    does not reveal (e.g. scanned PDFs made of JPEG images).
+    """
+    codec = _CODECS.get(preferred or DEFAULT_BLOB_CODEC, _CODECS[IdentityCodec.name])
+    if codec.name == IdentityCodec.name or mime_type in INCOMPRESSIBLE_MIME_TYPES or not sample:
+        return _CODECS[IdentityCodec.name]
+
+    if len(codec.compress(sample)) > len(sample) * (1 - MIN_COMPRESSION_SAVING):
+        return _CODECS[IdentityCodec.name]
+    return codec
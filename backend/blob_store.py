@@ -0,0 +1,434 @@
+import os
+import struct
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import engine
+from document_storage import IngestedFile, DOWNLOAD_CHUNK_SIZE
+from blob_codecs import BlobCodec, IdentityCodec, choose_codec, get_codec
+
+logger = logging.getLogger(__name__)
+
+# Blob store configuration
+DEFAULT_BLOB_BACKEND = settings.get('DOCUMENT_BLOB_BACKEND', 'database')
+BLOB_DIR = settings.get('DOCUMENT_BLOB_DIR', str(Path(settings.UPLOAD_DIR) / "blobs"))
+BLOB_CHUNK_SIZE = 256 * 1024  # 256KB per stored chunk row
+BLOB_UNLINK_LOCK_TIMEOUT = settings.get('DOCUMENT_BLOB_UNLINK_LOCK_TIMEOUT', '5s')
+
+_unlink_executor: Optional[ThreadPoolExecutor] = None
+_pending_unlinks: Set[Future] = set()
+
+
+class BlobStore:
+    """Content-addressed storage for document bytes, keyed by SHA-256.
+
+    ``document_blobs`` is the registry of every stored blob regardless of
+    backend; backends only decide where the bytes themselves live. Every
+    ``chunk_size`` slice of the original content is encoded with the blob's
+    codec on its own, and offsets always refer to the original content.
+    """
+
+    backend_name = ""
+
+    def write(self, db: Session, ingested: IngestedFile, chunk_size: int, codec: BlobCodec) -> int:
+        """Persist the bytes of a newly registered blob; returns the stored size."""
+        raise NotImplementedError
+
+    async def write_async(self, db: AsyncSession, ingested: IngestedFile, chunk_size: int, codec: BlobCodec) -> int:
+        """``write`` for an ``AsyncSession``; backends that never touch the session run ``write`` in the thread pool."""
+        return await run_in_threadpool(self.write, None, ingested, chunk_size, codec)
+
+    def iter_range(self, content_hash: str, start: int, end: int, chunk_size: int, codec: BlobCodec) -> Iterator[bytes]:
+        """Yield original bytes ``start..end`` (inclusive) of a stored blob."""
+        raise NotImplementedError
+
+    def remove(self, db: Session, content_hash: str):
+        """Remove the bytes of a blob that is no longer referenced."""
+        raise NotImplementedError
+
+
+class DatabaseBlobStore(BlobStore):
+    """Stores blobs as fixed-size rows in ``document_blob_chunks``.
+
+    Chunk rows keep every read and write bounded to one chunk, and range
+    requests only touch the chunks that overlap the range.
+    """
+
+    backend_name = "database"
+
+    insert_chunk = text("""
+        INSERT INTO document_blob_chunks (content_hash, chunk_index, data)
+        VALUES (:content_hash, :chunk_index, :data)
+    """)
+
+    def write(self, db: Session, ingested: IngestedFile, chunk_size: int, codec: BlobCodec) -> int:
+        stored_size = 0
+        for chunk_index, chunk in enumerate(ingested.iter_chunks(chunk_size)):
+            data = codec.compress(chunk)
+            stored_size += len(data)
+            db.execute(self.insert_chunk, {
+                "content_hash": ingested.sha256,
+                "chunk_index": chunk_index,
+                "data": data
+            })
+        return stored_size
+
+    async def write_async(self, db: AsyncSession, ingested: IngestedFile, chunk_size: int, codec: BlobCodec) -> int:
+        chunks = ingested.iter_chunks(chunk_size)
+
+        def encode_next() -> Optional[bytes]:
+            chunk = next(chunks, None)
+            return None if chunk is None else codec.compress(chunk)
+
+        # Reading and encoding happen in the thread pool, one chunk at a time
+        stored_size = 0
+        chunk_index = 0
+        while True:
+            data = await run_in_threadpool(encode_next)
+            if data is None:
+                break
+            stored_size += len(data)
+            await db.execute(self.insert_chunk, {
+                "content_hash": ingested.sha256,
+                "chunk_index": chunk_index,
+                "data": data
+            })
+            chunk_index += 1
+        return stored_size
+
+    def iter_range(self, content_hash: str, start: int, end: int, chunk_size: int, codec: BlobCodec) -> Iterator[bytes]:
+        query = text("""
+            SELECT data FROM document_blob_chunks
+            WHERE content_hash = :content_hash AND chunk_index = :chunk_index
+        """)
+
+        first_chunk = start // chunk_size
+        last_chunk = end // chunk_size
+
+        # Dedicated connection: the response body outlives the request session
+        with engine.connect() as conn:
+            for chunk_index in range(first_chunk, last_chunk + 1):
+                row = conn.execute(query, {
+                    "content_hash": content_hash,
+                    "chunk_index": chunk_index
+                }).fetchone()
+                if not row:
+                    break
+
+                data = codec.decompress(bytes(row.data))
+                chunk_start = chunk_index * chunk_size
+                lower = max(start - chunk_start, 0)
+                upper = min(end - chunk_start + 1, len(data))
+                yield data[lower:upper]
+
+    def remove(self, db: Session, content_hash: str):
+        # Not left to ON DELETE CASCADE, which SQLite only enforces with PRAGMA foreign_keys=ON
+        db.execute(text("DELETE FROM document_blob_chunks WHERE content_hash = :content_hash"),
+                   {"content_hash": content_hash})
+
+
+class FilesystemBlobStore(BlobStore):
+    """Stores blobs as files in a two-level fan-out directory tree.
+
+    Uncompressed blobs are plain copies of the content. Compressed blobs
+    are a sequence of frames, each a 4-byte big-endian length followed by
+    one encoded chunk, so a range read can skip frames without decoding.
+    The codec is part of the file name, so a file is only ever read with
+    the codec that wrote it.
+    """
+
+    backend_name = "filesystem"
+
+    def __init__(self, root: str = BLOB_DIR):
+        self.root = Path(root)
+
+    def path_for(self, content_hash: str, codec_name: str) -> Path:
+        """Return the on-disk location of a blob, e.g. ``ab/cd/abcd....zstd``."""
+        return self.root / content_hash[:2] / content_hash[2:4] / f"{content_hash}.{codec_name}"
+
+    def write(self, db: Session, ingested: IngestedFile, chunk_size: int, codec: BlobCodec) -> int:
+        target = self.path_for(ingested.sha256, codec.name)
+        if target.exists():
+            # Left by an earlier registration of the same content with the same codec
+            return target.stat().st_size
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        framed = codec.name != IdentityCodec.name
+        # Write to a temp file in the same directory, then atomically move into place
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in ingested.iter_chunks(chunk_size):
+                    if framed:
+                        data = codec.compress(chunk)
+                        fh.write(struct.pack(">I", len(data)))
+                        fh.write(data)
+                    else:
+                        fh.write(chunk)
+                stored_size = fh.tell()
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return stored_size
+
+    def iter_range(self, content_hash: str, start: int, end: int, chunk_size: int, codec: BlobCodec) -> Iterator[bytes]:
+        if codec.name != IdentityCodec.name:
+            yield from self._iter_framed_range(content_hash, start, end, chunk_size, codec)
+            return
+
+        remaining = end - start + 1
+        with open(self.path_for(content_hash, codec.name), "rb") as fh:
+            fh.seek(start)
+            while remaining > 0:
+                chunk = fh.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def _iter_framed_range(self, content_hash: str, start: int, end: int, chunk_size: int, codec: BlobCodec) -> Iterator[bytes]:
+        first_chunk = start // chunk_size
+        last_chunk = end // chunk_size
+        with open(self.path_for(content_hash, codec.name), "rb") as fh:
+            for chunk_index in range(last_chunk + 1):
+                header = fh.read(4)
+                if len(header) < 4:
+                    break
+                (length,) = struct.unpack(">I", header)
+                if chunk_index < first_chunk:
+                    # Skip frames before the range without reading them
+                    fh.seek(length, os.SEEK_CUR)
+                    continue
+
+                data = codec.decompress(fh.read(length))
+                chunk_start = chunk_index * chunk_size
+                lower = max(start - chunk_start, 0)
+                upper = min(end - chunk_start + 1, len(data))
+                yield data[lower:upper]
+
+    def remove(self, db: Session, content_hash: str):
+        def unlink_after_commit(session):
+            # The claim in _unlink_unregistered can wait on a row lock, and on an
+            # AsyncSession this hook runs on the event loop, so hand it off
+            future = _get_unlink_executor().submit(self._unlink_released, content_hash)
+            _pending_unlinks.add(future)
+            future.add_done_callback(_pending_unlinks.discard)
+
+        # Only delete the file once the registry row deletion is durable
+        event.listen(db, "after_commit", unlink_after_commit, once=True)
+
+    def _unlink_released(self, content_hash: str):
+        try:
+            self._unlink_unregistered(content_hash)
+        except Exception as e:
+            # An orphaned file only costs disk space; the commit already succeeded
+            logger.warning(f"Files of released blob {content_hash} not removed: {e}")
+
+    def _unlink_unregistered(self, content_hash: str):
+        """Delete a blob's files unless its hash has been registered again.
+
+        A concurrent ``put_blob`` of the same content may have registered the
+        hash after our delete and reused the file instead of writing it. To
+        rule that out, a placeholder registry row is inserted in a transaction
+        that is always rolled back: the insert conflicts if the hash is
+        registered, waits for a registration still in flight, and makes later
+        registrations wait until the files are gone. The wait is bounded by
+        ``BLOB_UNLINK_LOCK_TIMEOUT``; on timeout the files are left in place.
+        """
+        claim = text("""
+            INSERT INTO document_blobs (content_hash, size, storage_backend, chunk_size)
+            VALUES (:content_hash, 0, :storage_backend, 0)
+            ON CONFLICT (content_hash) DO NOTHING
+            RETURNING content_hash
+        """)
+
+        directory = self.root / content_hash[:2] / content_hash[2:4]
+        with engine.connect() as conn:
+            trans = conn.begin()
+            try:
+                if conn.dialect.name == "postgresql":
+                    conn.execute(
+                        text("SELECT set_config('lock_timeout', :timeout, true)"),
+                        {"timeout": BLOB_UNLINK_LOCK_TIMEOUT}
+                    )
+                claimed = conn.execute(claim, {
+                    "content_hash": content_hash,
+                    "storage_backend": self.backend_name
+                }).fetchone()
+                if not claimed:
+                    logger.debug(f"Blob {content_hash} registered again, keeping its files")
+                    return
+                for path in directory.glob(f"{content_hash}.*"):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+            finally:
+                trans.rollback()
+
+
+def _get_unlink_executor() -> ThreadPoolExecutor:
+    global _unlink_executor
+    if _unlink_executor is None:
+        _unlink_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blob-unlink")
+    return _unlink_executor
+
+
+def wait_for_blob_unlinks(timeout: Optional[float] = None):
+    """Block until the file removals queued by committed releases have run."""
+    wait(list(_pending_unlinks), timeout=timeout)
+
+
+def shutdown_blob_unlinks():
+    """Finish queued file removals and stop their thread (called on application shutdown)."""
+    global _unlink_executor
+    if _unlink_executor is not None:
+        _unlink_executor.shutdown(wait=True)
+        _unlink_executor = None
+
+
+_BLOB_STORES: Dict[str, BlobStore] = {
+    DatabaseBlobStore.backend_name: DatabaseBlobStore(),
+    FilesystemBlobStore.backend_name: FilesystemBlobStore(),
+}
+
+
+def get_blob_store(backend: Optional[str] = None) -> BlobStore:
+    """Get the blob store for a backend name (defaults to the configured one)."""
+    backend = backend or DEFAULT_BLOB_BACKEND
+    if backend not in _BLOB_STORES:
+        raise ValueError(f"Unknown document blob backend: {backend}")
+    return _BLOB_STORES[backend]
+
+
+_REGISTER_BLOB = text("""
+    INSERT INTO document_blobs (content_hash, size, mime_type, storage_backend, chunk_size, codec)
+    VALUES (:content_hash, :size, :mime_type, :storage_backend, :chunk_size, :codec)
+    ON CONFLICT (content_hash) DO NOTHING
+    RETURNING content_hash
+""")
+
+_SET_STORED_SIZE = text("""
+    UPDATE document_blobs SET stored_size = :stored_size WHERE content_hash = :content_hash
+""")
+
+
+def _choose_blob_codec(ingested: IngestedFile) -> BlobCodec:
+    sample = next(ingested.iter_chunks(BLOB_CHUNK_SIZE), b"")
+    return choose_codec(ingested.mime_type, sample)
+
+
+def _register_params(ingested: IngestedFile, store: BlobStore, codec: BlobCodec) -> dict:
+    return {
+        "content_hash": ingested.sha256,
+        "size": ingested.size,
+        "mime_type": ingested.mime_type,
+        "storage_backend": store.backend_name,
+        "chunk_size": BLOB_CHUNK_SIZE,
+        "codec": codec.name
+    }
+
+
+def put_blob(db: Session, ingested: IngestedFile) -> str:
+    """Store an ingested file and return its content hash.
+
+    Identical content is stored once: if the hash is already registered the
+    bytes are not written again. The codec is chosen per blob (see
+    ``choose_codec``); ``size`` keeps the original size and ``stored_size``
+    what the backend holds. Runs inside the caller's transaction, so the
+    blob row commits or rolls back with the document row.
+    """
+    store = get_blob_store()
+    codec = _choose_blob_codec(ingested)
+
+    created = db.execute(_REGISTER_BLOB, _register_params(ingested, store, codec)).fetchone()
+
+    if created:
+        stored_size = store.write(db, ingested, BLOB_CHUNK_SIZE, codec)
+        db.execute(_SET_STORED_SIZE, {"stored_size": stored_size, "content_hash": ingested.sha256})
+    else:
+        logger.debug(f"Blob {ingested.sha256} already stored, skipping write")
+
+    return ingested.sha256
+
+
+async def put_blob_async(db: AsyncSession, ingested: IngestedFile) -> str:
+    """``put_blob`` for an ``AsyncSession``.
+
+    The registry statements are awaited on the caller's session, so the blob
+    still commits or rolls back with the document row; reading, encoding and
+    writing the bytes run in the thread pool.
+    """
+    store = get_blob_store()
+    codec = await run_in_threadpool(_choose_blob_codec, ingested)
+
+    created = (await db.execute(_REGISTER_BLOB, _register_params(ingested, store, codec))).fetchone()
+
+    if created:
+        stored_size = await store.write_async(db, ingested, BLOB_CHUNK_SIZE, codec)
+        await db.execute(_SET_STORED_SIZE, {"stored_size": stored_size, "content_hash": ingested.sha256})
+    else:
+        logger.debug(f"Blob {ingested.sha256} already stored, skipping write")
+
+    return ingested.sha256
+
+
+def iter_blob_range(blob, start: int, end: int) -> Iterator[bytes]:
+    """Yield a byte range of a blob row (content_hash, storage_backend, chunk_size, codec).
+
+    Offsets refer to the original content; compressed chunks are decoded
+    one at a time while streaming.
+    """
+    store = get_blob_store(blob.storage_backend)
+    return store.iter_range(blob.content_hash, start, end, blob.chunk_size, get_codec(blob.codec))
+
+
+def materialize_blob(blob) -> str:
+    """Copy a blob row's bytes to a temp file and return its path.
+
+    Used to hand blobs to worker processes, which open files by path.
+    The caller removes the file.
+    """
+    fd, path = tempfile.mkstemp(prefix="blob-", dir=settings.get('UPLOAD_TEMP_DIR'))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            if blob.size:
+                for chunk in iter_blob_range(blob, 0, blob.size - 1):
+                    fh.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def release_blob(db: Session, content_hash: Optional[str]) -> bool:
+    """Delete a blob once no document references it any more.
+
+    Returns True if the blob was removed.
+    """
+    if not content_hash:
+        return False
+
+    removed = db.execute(text("""
+        DELETE FROM document_blobs
+        WHERE content_hash = :content_hash
+          AND NOT EXISTS (SELECT 1 FROM documents WHERE content_hash = :content_hash)
+        RETURNING storage_backend
+    """), {"content_hash": content_hash}).fetchone()
+
+    if not removed:
+        return False
+
+    get_blob_store(removed.storage_backend).remove(db, content_hash)
+    return True
@@ -0,0 +1,206 @@
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Union
+import logging
+
+from config import settings
+from blob_codecs import BlobCodec, available_codecs, get_codec
+
+try:
+    import orjson
+except ImportError:  # orjson serializer unavailable - structured values use json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack serializer unavailable - structured values use json
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Cached value encoding configuration
+CACHE_VALUE_SERIALIZER = settings.get('CACHE_VALUE_SERIALIZER', 'orjson')  # json | orjson | msgpack
+CACHE_COMPRESSION = settings.get('CACHE_COMPRESSION', 'zlib')  # none | zlib | zstd
+CACHE_COMPRESS_MIN_BYTES = settings.get('CACHE_COMPRESS_MIN_BYTES', 1024)  # smaller values are stored raw
+
+# Encoded values start with a byte that never occurs in UTF-8 text, so values
+# written before the header existed (plain JSON or str) are still recognised
+MAGIC = 0xC1
+
+# Value types, stored in the high nibble of the second header byte
+TAG_STR, TAG_BOOL, TAG_FLOAT, TAG_BYTES, TAG_DATETIME, TAG_DATE, TAG_UUID, TAG_DECIMAL = range(1, 9)
+TAG_JSON, TAG_ORJSON, TAG_MSGPACK = 10, 11, 12
+
+# Compression, stored in the low nibble
+_COMPRESSION_IDS = {"zlib": 1, "zstd": 2}
+_COMPRESSION_NAMES = {ident: name for name, ident in _COMPRESSION_IDS.items()}
+
+
+class Serializer:
+    """Encoding of structured values (dicts, lists, tuples)."""
+
+    name = ""
+    tag = 0
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonSerializer(Serializer):
+    """Standard library JSON, the format values were stored in before the codec layer."""
+
+    name = "json"
+    tag = TAG_JSON
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson - requires the optional ``orjson`` package."""
+
+    name = "orjson"
+    tag = TAG_ORJSON
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """MessagePack - requires the optional ``msgpack`` package."""
+
+    name = "msgpack"
+    tag = TAG_MSGPACK
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=str, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+_SERIALIZERS: Dict[str, Serializer] = {JsonSerializer.name: JsonSerializer()}
+if orjson is not None:
+    _SERIALIZERS[OrjsonSerializer.name] = OrjsonSerializer()
+if msgpack is not None:
+    _SERIALIZERS[MsgpackSerializer.name] = MsgpackSerializer()
+_SERIALIZERS_BY_TAG = {serializer.tag: serializer for serializer in _SERIALIZERS.values()}
+
+
+def _decode_legacy(text: str) -> Any:
+    """Values stored as ``json.dumps`` or ``str`` before the header was introduced."""
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return text
+
+
+class CacheValueCodec:
+    """Encodes cached values as a two-byte header followed by the payload.
+
+    The header records the value's type, so scalars come back as the type
+    they were stored as (bool, float, str, bytes, datetime, date, UUID,
+    Decimal) and structured values are decoded by the serializer that wrote
+    them, whatever this process is configured to write. Payloads of at least
+    ``compress_min_bytes`` are compressed when that makes them smaller.
+
+    Integers are stored as plain digits without a header so Redis INCRBY
+    keeps working on them. Values nested inside dicts and lists follow the
+    serializer: datetimes, UUIDs and Decimals there become strings.
+    """
+
+    def __init__(self, serializer: str = CACHE_VALUE_SERIALIZER, compression: str = CACHE_COMPRESSION,
+                 compress_min_bytes: int = CACHE_COMPRESS_MIN_BYTES):
+        if serializer not in _SERIALIZERS:
+            logger.warning(f"Cache serializer '{serializer}' is not available, using json")
+            serializer = JsonSerializer.name
+        self.serializer = _SERIALIZERS[serializer]
+
+        self.compressor: Optional[BlobCodec] = None
+        if compression in _COMPRESSION_IDS:
+            if compression in available_codecs():
+                self.compressor = get_codec(compression)
+            else:
+                logger.warning(f"Cache compression '{compression}' is not available, storing values uncompressed")
+        self.compress_min_bytes = compress_min_bytes
+
+    def encode(self, value: Any) -> Union[str, bytes]:
+        """Bytes to store in Redis for a value."""
+        if isinstance(value, int) and not isinstance(value, bool):
+            return str(value)
+
+        if isinstance(value, str):
+            tag, payload = TAG_STR, value.encode()
+        elif isinstance(value, bool):
+            tag, payload = TAG_BOOL, b"1" if value else b"0"
+        elif isinstance(value, float):
+            tag, payload = TAG_FLOAT, repr(value).encode()
+        elif isinstance(value, (bytes, bytearray)):
+            tag, payload = TAG_BYTES, bytes(value)
+        elif isinstance(value, datetime):
+            tag, payload = TAG_DATETIME, value.isoformat().encode()
+        elif isinstance(value, date):
+            tag, payload = TAG_DATE, value.isoformat().encode()
+        elif isinstance(value, uuid.UUID):
+            tag, payload = TAG_UUID, value.bytes
+        elif isinstance(value, Decimal):
+            tag, payload = TAG_DECIMAL, str(value).encode()
+        else:
+            tag, payload = self.serializer.tag, self.serializer.dumps(value)
+
+        compression = 0
+        if self.compressor is not None and len(payload) >= self.compress_min_bytes:
+            packed = self.compressor.compress(payload)
+            if len(packed) < len(payload):
+                payload, compression = packed, _COMPRESSION_IDS[self.compressor.name]
+        return bytes((MAGIC, tag << 4 | compression)) + payload
+
+    def decode(self, data: Union[str, bytes, None]) -> Any:
+        """Value stored by ``encode`` (or by the JSON/str format it replaced)."""
+        if data is None:
+            return None
+        if isinstance(data, str):
+            return _decode_legacy(data)
+        if len(data) < 2 or data[0] != MAGIC:
+            return _decode_legacy(data.decode())
+
+        tag, compression = data[1] >> 4, data[1] & 0x0F
+        payload = data[2:]
+        if compression:
+            payload = get_codec(_COMPRESSION_NAMES[compression]).decompress(payload)
+
+        if tag == TAG_STR:
+            return payload.decode()
+        if tag == TAG_BOOL:
+            return payload == b"1"
+        if tag == TAG_FLOAT:
+            return float(payload)
+        if tag == TAG_BYTES:
+            return payload
+        if tag == TAG_DATETIME:
+            return datetime.fromisoformat(payload.decode())
+        if tag == TAG_DATE:
+            return date.fromisoformat(payload.decode())
+        if tag == TAG_UUID:
+            return uuid.UUID(bytes=payload)
+        if tag == TAG_DECIMAL:
+            return Decimal(payload.decode())
+        serializer = _SERIALIZERS_BY_TAG.get(tag)
+        if serializer is None:
+            raise ValueError(f"Cached value written with unavailable serializer (tag {tag})")
+        return serializer.loads(payload)
+
+
+# Codec used by redis_service for every value it stores
+value_codec = CacheValueCodec()
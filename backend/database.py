@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from config import settings
 from typing import Optional
 from uuid import UUID
@@ -26,6 +27,58 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the configured backends (asyncpg / aiosqlite)
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """Map a synchronous database URL onto its asyncio driver."""
+    scheme, separator, rest = url.partition("://")
+    backend = scheme.split("+")[0].lower()
+    return f"{_ASYNC_DRIVERS.get(backend, scheme)}{separator}{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+_async_engine = None
+_async_sessionmaker = None
+
+def get_async_engine():
+    """Create the asyncio engine on first use.
+    
+    Created lazily so the async driver is only required by code that
+    actually uses ``get_async_db``.
+    """
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=settings.get('DATABASE_ECHO', False),
+            pool_size=settings.get('DATABASE_POOL_SIZE', 10),
+            max_overflow=settings.get('DATABASE_MAX_OVERFLOW', 20),
+            pool_pre_ping=True
+        )
+    return _async_engine
+
+def get_async_sessionmaker():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        # Objects stay usable after commit - lazy refreshes are not possible under asyncio
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+async def dispose_async_engine():
+    """Close pooled async connections (called on application shutdown)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+
 # Create Base class
 Base = declarative_base()
 
@@ -37,8 +90,13 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an asyncio database session - queries are awaited instead of blocking the event loop
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
 # Helper function to get user by email (for auth compatibility)
-def get_user_by_email(db: Session, email: str) -> Optional[dict]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[dict]:
     """Get user by email address."""
     # Use SQLite-compatible aggregation when running against SQLite
     is_sqlite = DATABASE_URL.lower().startswith("sqlite")
@@ -69,7 +127,7 @@ def get_user_by_email(db: Session, email: str) -> Optional[dict]:
             """
         )
     
-    result = db.execute(query, {"email": email}).fetchone()
+    result = (await db.execute(query, {"email": email})).fetchone()
     
     if not result:
         return None
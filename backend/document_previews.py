@@ -0,0 +1,127 @@
+import os
+from typing import Optional, Set
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from config import settings
+from database import engine
+from blob_store import materialize_blob
+from redis_service import redis_service
+from preview_renderer import PREVIEW_MIME_TYPE, can_render, render_preview
+from worker_pool import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+# Preview configuration
+PREVIEW_MAX_PENDING = settings.get('PREVIEW_MAX_PENDING', 32)  # Renders queued or running at once
+PREVIEW_MAX_DIMENSION = settings.get('PREVIEW_MAX_DIMENSION', 320)  # Longest edge in pixels
+PREVIEW_MAX_SOURCE_SIZE = settings.get('PREVIEW_MAX_SOURCE_SIZE', 100 * 1024 * 1024)  # Skip larger files
+PREVIEW_RETRY_AFTER = 2  # seconds a client should wait for a pending preview
+PREVIEW_FAILURE_TTL = settings.get('PREVIEW_FAILURE_TTL', 900)  # Seconds before a failed render is retried
+
+FAILURE_PREFIX = "preview_failed"
+
+_pending: Set[str] = set()
+
+
+def preview_etag(content_hash: str) -> str:
+    """Strong ETag of a preview - previews are derived from immutable blobs."""
+    return f'"{content_hash}-preview"'
+
+
+def _failure_key(content_hash: str) -> str:
+    return f"{FAILURE_PREFIX}:{content_hash}"
+
+
+def preview_failed(content_hash: str) -> bool:
+    """Whether rendering this blob failed recently (blocking - one redis round trip)."""
+    return redis_service.exists(_failure_key(content_hash))
+
+
+def _load_blob(content_hash: str):
+    """Blob metadata plus whether a preview already exists."""
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT b.content_hash, b.size, b.mime_type, b.storage_backend, b.chunk_size, b.codec,
+                   p.content_hash AS preview_hash
+            FROM document_blobs b
+            LEFT JOIN document_previews p ON p.content_hash = b.content_hash
+            WHERE b.content_hash = :content_hash
+        """), {"content_hash": content_hash}).fetchone()
+
+
+def _store_preview(content_hash: str, data: bytes, width: int, height: int):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO document_previews (content_hash, mime_type, width, height, data)
+            VALUES (:content_hash, :mime_type, :width, :height, :data)
+            ON CONFLICT (content_hash) DO NOTHING
+        """), {
+            "content_hash": content_hash,
+            "mime_type": PREVIEW_MIME_TYPE,
+            "width": width,
+            "height": height,
+            "data": data
+        })
+
+
+def _mark_failed(content_hash: str):
+    redis_service.set(_failure_key(content_hash), True, PREVIEW_FAILURE_TTL)
+
+
+def can_preview(mime_type: Optional[str], size: Optional[int] = None) -> bool:
+    """Whether a blob of this type and size gets a preview."""
+    if size is not None and size > PREVIEW_MAX_SOURCE_SIZE:
+        return False
+    return can_render(mime_type)
+
+
+async def generate_preview(content_hash: Optional[str]) -> bool:
+    """Render and store the preview of a blob if it does not have one yet.
+
+    Meant to run as a background task after an upload commits. Renders of
+    the same blob are deduplicated and at most ``PREVIEW_MAX_PENDING`` are
+    in flight; extra requests are dropped and retried on the next preview
+    request. A failed render is remembered for ``PREVIEW_FAILURE_TTL`` so
+    polling clients do not queue it again. Returns True if a preview was stored.
+    """
+    if not content_hash or content_hash in _pending or len(_pending) >= PREVIEW_MAX_PENDING:
+        return False
+
+    _pending.add(content_hash)
+    source_path = None
+    try:
+        if await run_in_threadpool(preview_failed, content_hash):
+            return False
+
+        blob = await run_in_threadpool(_load_blob, content_hash)
+        if not blob or blob.preview_hash or not can_preview(blob.mime_type, blob.size):
+            return False
+
+        source_path = await run_in_threadpool(materialize_blob, blob)
+        rendered = await run_in_worker(
+            render_preview,
+            source_path,
+            blob.mime_type,
+            (PREVIEW_MAX_DIMENSION, PREVIEW_MAX_DIMENSION)
+        )
+        if rendered is None:
+            await run_in_threadpool(_mark_failed, content_hash)
+            return False
+
+        data, width, height = rendered
+        await run_in_threadpool(_store_preview, content_hash, data, width, height)
+        return True
+    except Exception as e:
+        logger.warning(f"Preview generation failed for blob {content_hash}: {str(e)}")
+        await run_in_threadpool(_mark_failed, content_hash)
+        return False
+    finally:
+        _pending.discard(content_hash)
+        if source_path:
+            try:
+                os.remove(source_path)
+            except FileNotFoundError:
+                pass
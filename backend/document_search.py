@@ -0,0 +1,216 @@
+import html
+import os
+from typing import Any, Dict, List, Optional, Set
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import engine, DATABASE_URL
+from blob_store import materialize_blob
+from text_extraction import can_extract, extract_text
+from worker_pool import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+# Search configuration
+SEARCH_MAX_INDEXED_CHARS = settings.get('SEARCH_MAX_INDEXED_CHARS', 500_000)  # Text kept per document
+SEARCH_MAX_SOURCE_SIZE = settings.get('SEARCH_MAX_SOURCE_SIZE', 100 * 1024 * 1024)  # Skip larger files
+SEARCH_MAX_PENDING = settings.get('SEARCH_MAX_PENDING', 32)  # Extractions queued or running at once
+SNIPPET_SOURCE_CHARS = 200_000  # Text scanned when building a snippet
+
+# Private-use characters delimiting hits, swapped for <mark> tags once the snippet is escaped
+_HIT_START = "\ue000"
+_HIT_END = "\ue001"
+
+IS_SQLITE = DATABASE_URL.lower().startswith("sqlite")
+
+_pending: Set[str] = set()
+
+# Postgres: generated tsvector column with a GIN index.
+# 'simple' keeps parcel numbers and references verbatim (no stemming or stop words).
+_POSTGRES_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS document_text (
+        content_hash VARCHAR(64) PRIMARY KEY REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+        content TEXT NOT NULL,
+        indexed_at TIMESTAMPTZ DEFAULT now()
+    )""",
+    """ALTER TABLE document_text ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED""",
+    "CREATE INDEX IF NOT EXISTS idx_document_text_search ON document_text USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_land_assigned_to ON tasks(land_id, assigned_to)",
+]
+
+# SQLite: external-content FTS5 table kept in sync with triggers
+_SQLITE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS document_text (
+        content_hash VARCHAR(64) PRIMARY KEY REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+        content TEXT NOT NULL,
+        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS document_text_fts USING fts5(
+        content, content='document_text', tokenize='unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS document_text_ai AFTER INSERT ON document_text BEGIN
+        INSERT INTO document_text_fts(rowid, content) VALUES (new.rowid, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS document_text_ad AFTER DELETE ON document_text BEGIN
+        INSERT INTO document_text_fts(document_text_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    END""",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_land_assigned_to ON tasks(land_id, assigned_to)",
+]
+
+
+def ensure_search_schema(bind=None):
+    """Create the full-text index for the configured database if missing."""
+    statements = _SQLITE_SCHEMA if IS_SQLITE else _POSTGRES_SCHEMA
+    with (bind or engine).begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def can_index(mime_type: Optional[str], size: Optional[int] = None) -> bool:
+    """Whether a blob of this type and size gets indexed."""
+    if size is not None and size > SEARCH_MAX_SOURCE_SIZE:
+        return False
+    return can_extract(mime_type)
+
+
+def _load_blob(content_hash: str):
+    """Blob metadata plus whether its text is already indexed."""
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT b.content_hash, b.size, b.mime_type, b.storage_backend, b.chunk_size, b.codec,
+                   t.content_hash AS indexed_hash
+            FROM document_blobs b
+            LEFT JOIN document_text t ON t.content_hash = b.content_hash
+            WHERE b.content_hash = :content_hash
+        """), {"content_hash": content_hash}).fetchone()
+
+
+def _store_text(content_hash: str, content: str):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO document_text (content_hash, content)
+            VALUES (:content_hash, :content)
+            ON CONFLICT (content_hash) DO NOTHING
+        """), {"content_hash": content_hash, "content": content})
+
+
+async def index_document_text(content_hash: Optional[str]) -> bool:
+    """Extract and index the text of a blob if it is not indexed yet.
+
+    Meant to run as a background task after an upload commits. Extraction
+    runs in the shared worker pool; the index is keyed by content hash, so
+    identical files are extracted once. Returns True if text was indexed.
+    """
+    if not content_hash or content_hash in _pending or len(_pending) >= SEARCH_MAX_PENDING:
+        return False
+
+    _pending.add(content_hash)
+    source_path = None
+    try:
+        blob = await run_in_threadpool(_load_blob, content_hash)
+        if not blob or blob.indexed_hash or not can_index(blob.mime_type, blob.size):
+            return False
+
+        source_path = await run_in_threadpool(materialize_blob, blob)
+        content = await run_in_worker(extract_text, source_path, blob.mime_type, SEARCH_MAX_INDEXED_CHARS)
+        if content is None:
+            return False
+
+        await run_in_threadpool(_store_text, content_hash, content)
+        return True
+    except Exception as e:
+        logger.warning(f"Text extraction failed for blob {content_hash}: {str(e)}")
+        return False
+    finally:
+        _pending.discard(content_hash)
+        if source_path:
+            try:
+                os.remove(source_path)
+            except FileNotFoundError:
+                pass
+
+
+def _fts5_query(query: str) -> str:
+    """Quote every term so user input can never be FTS5 syntax (AND of terms)."""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search_documents(
+    db: Session,
+    query: str,
+    access_condition: str = "",
+    params: Optional[Dict[str, Any]] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Any]:
+    """Ranked full-text search over indexed document text.
+
+    ``access_condition`` is an SQL fragment over ``d`` (documents) and ``l``
+    (lands) that limits results to what the caller may see; it is applied
+    inside the indexed match, before ranking and pagination. Snippets are
+    only built for the returned page; they hold raw document text with
+    private-use delimiters around hits, see ``highlight_snippet``.
+    """
+    params = dict(params or {})
+    params.update({"limit": limit, "offset": offset, "hit_start": _HIT_START, "hit_end": _HIT_END})
+    condition = f" AND {access_condition}" if access_condition else ""
+
+    if IS_SQLITE:
+        params["query"] = _fts5_query(query)
+        sql = f"""
+            SELECT d.document_id, d.land_id, d.document_type, d.file_name, d.mime_type, d.created_at,
+                   -bm25(document_text_fts) AS rank,
+                   snippet(document_text_fts, 0, :hit_start, :hit_end, '...', 16) AS snippet
+            FROM document_text_fts
+            JOIN document_text t ON t.rowid = document_text_fts.rowid
+            JOIN documents d ON d.content_hash = t.content_hash
+            LEFT JOIN lands l ON d.land_id = l.land_id
+            WHERE document_text_fts MATCH :query{condition}
+            ORDER BY bm25(document_text_fts), d.created_at DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        params["query"] = query
+        params["snippet_chars"] = SNIPPET_SOURCE_CHARS
+        params["headline_options"] = (
+            f'StartSel="{_HIT_START}", StopSel="{_HIT_END}", MaxFragments=2, MaxWords=18, MinWords=6'
+        )
+        sql = f"""
+            WITH q AS (SELECT websearch_to_tsquery('simple', :query) AS query)
+            SELECT hits.*,
+                   ts_headline('simple', left(t.content, :snippet_chars), q.query,
+                               :headline_options) AS snippet
+            FROM (
+                SELECT d.document_id, d.land_id, d.document_type, d.file_name, d.mime_type, d.created_at,
+                       d.content_hash, ts_rank_cd(t.search_vector, q.query) AS rank
+                FROM document_text t
+                CROSS JOIN q
+                JOIN documents d ON d.content_hash = t.content_hash
+                LEFT JOIN lands l ON d.land_id = l.land_id
+                WHERE t.search_vector @@ q.query{condition}
+                ORDER BY rank DESC, d.created_at DESC
+                LIMIT :limit OFFSET :offset
+            ) hits
+            JOIN document_text t ON t.content_hash = hits.content_hash
+            CROSS JOIN q
+            ORDER BY hits.rank DESC, hits.created_at DESC
+        """
+
+    return db.execute(text(sql), params).fetchall()
+
+
+def highlight_snippet(snippet: Optional[str]) -> str:
+    """HTML-escape a search snippet and wrap its hits in ``<mark>`` tags.
+
+    Snippets are cut from uploaded text, so they are escaped before any
+    markup is added.
+    """
+    if not snippet:
+        return ""
+    return html.escape(snippet).replace(_HIT_START, "<mark>").replace(_HIT_END, "</mark>")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Document Text Indexer for RenewMart
+
+Extracts and indexes the text of blobs uploaded before full-text search
+existed (new uploads are indexed in the background automatically).
+Extraction runs in the shared worker pool, a batch at a time.
+
+Usage:
+    python index_document_text.py [--batch-size 20]
+
+Apply migrations/add_document_text_search.sql first (Postgres).
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import text
+
+from database import engine
+from document_search import ensure_search_schema, index_document_text
+from text_extraction import DOCX_MIME_TYPE, PDF_MIME_TYPE, TEXT_MIME_TYPE
+from worker_pool import shutdown_worker_pool
+
+
+def print_status(message, status="INFO"):
+    """Print colored status message"""
+    colors = {
+        "INFO": "\033[94m",  # Blue
+        "SUCCESS": "\033[92m",  # Green
+        "WARNING": "\033[93m",  # Yellow
+        "ERROR": "\033[91m",  # Red
+        "RESET": "\033[0m"
+    }
+    color = colors.get(status, colors["INFO"])
+    reset = colors["RESET"]
+    print(f"{color}[{status}]{reset} {message}")
+
+
+def fetch_pending_batch(batch_size, after_hash):
+    """Fetch the next batch of indexable blobs without extracted text"""
+    with engine.connect() as conn:
+        return [row.content_hash for row in conn.execute(text("""
+            SELECT b.content_hash
+            FROM document_blobs b
+            LEFT JOIN document_text t ON t.content_hash = b.content_hash
+            WHERE t.content_hash IS NULL
+              AND b.mime_type IN (:txt, :pdf, :docx)
+              AND b.content_hash > :after_hash
+            ORDER BY b.content_hash
+            LIMIT :batch_size
+        """), {
+            "txt": TEXT_MIME_TYPE,
+            "pdf": PDF_MIME_TYPE,
+            "docx": DOCX_MIME_TYPE,
+            "after_hash": after_hash,
+            "batch_size": batch_size
+        })]
+
+
+async def index_all(batch_size=20):
+    """Index every pending blob, one concurrent batch at a time"""
+    stats = {"indexed": 0, "skipped": 0}
+    after_hash = ""
+
+    while True:
+        batch = fetch_pending_batch(batch_size, after_hash)
+        if not batch:
+            break
+        after_hash = batch[-1]
+
+        results = await asyncio.gather(*(index_document_text(content_hash) for content_hash in batch))
+        indexed = sum(1 for result in results if result)
+        stats["indexed"] += indexed
+        stats["skipped"] += len(batch) - indexed
+        print_status(f"Progress: {stats['indexed']} indexed, {stats['skipped']} skipped")
+
+    return stats
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Index the text of existing documents for search")
+    parser.add_argument("--batch-size", type=int, default=20, help="Blobs extracted concurrently per batch")
+    args = parser.parse_args()
+
+    print()
+    print("=" * 80)
+    print(" RenewMart Document Text Indexer")
+    print("=" * 80)
+    print()
+
+    ensure_search_schema()
+    try:
+        stats = asyncio.run(index_all(args.batch_size))
+    finally:
+        shutdown_worker_pool()
+
+    print()
+    print("=" * 80)
+    status = "SUCCESS" if stats["skipped"] == 0 else "WARNING"
+    print_status(f"Done: {stats['indexed']} indexed, {stats['skipped']} skipped (see log for failures)", status)
+    print("=" * 80)
+    print()
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
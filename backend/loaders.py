@@ -0,0 +1,133 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from fastapi import Depends
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+
+
+class DataLoader:
+    """Batching, memoizing loader for one entity type within one request.
+
+    ``load`` calls made before the event loop gets back to the loader are
+    collected and resolved by a single call to ``batch_fn``; a key that was
+    already requested is answered from the cache without touching the
+    database again. ``batch_fn`` is a coroutine function that receives the
+    list of keys and returns a dict of the values it found; missing keys
+    resolve to ``default``.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], Awaitable[Dict[str, Any]]], default: Any = None):
+        self.batch_fn = batch_fn
+        self.default = default
+        self._cache: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._batches_in_flight: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """Return the value for one key, batched with other loads in flight."""
+        key = str(key)
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        return await future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[str, Any]:
+        """Return the values for many keys (``None`` keys are skipped) using at most one query."""
+        wanted = list(dict.fromkeys(str(key) for key in keys if key is not None))
+        values = await asyncio.gather(*(self.load(key) for key in wanted))
+        return dict(zip(wanted, values))
+
+    def prime(self, key: Hashable, value: Any):
+        """Seed the cache with a value the caller already has."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[str(key)] = future
+
+    def _dispatch(self):
+        keys, self._queue = self._queue, []
+        self.batches += 1
+        task = asyncio.ensure_future(self._resolve(keys))
+        self._batches_in_flight.add(task)
+        task.add_done_callback(self._batches_in_flight.discard)
+
+    async def _resolve(self, keys: List[str]):
+        try:
+            found = await self.batch_fn(keys)
+        except Exception as exc:
+            for key in keys:
+                self._cache.pop(key).set_exception(exc)
+            return
+        for key in keys:
+            self._cache[key].set_result(found.get(key, self.default))
+
+
+async def _select_by_ids(db: AsyncSession, lock: asyncio.Lock, query: str, ids: List[str]):
+    statement = text(query).bindparams(bindparam("ids", expanding=True))
+    # Batches of different loaders can be due together; a session runs one statement at a time
+    async with lock:
+        return (await db.execute(statement, {"ids": ids})).fetchall()
+
+
+class RequestLoaders:
+    """Per-request loaders for users, lands and user roles, keyed by primary key.
+
+    Obtained through the ``get_loaders`` dependency, which FastAPI resolves
+    once per request, so every dependency and handler in a request shares
+    the same cache and the same database session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._lock = asyncio.Lock()
+        self.users = DataLoader(self._load_users)
+        self.lands = DataLoader(self._load_lands)
+        self.roles = DataLoader(self._load_roles)
+
+    async def _load_users(self, ids: List[str]) -> Dict[str, Any]:
+        rows = await _select_by_ids(self.db, self._lock, """
+            SELECT user_id, email, first_name, last_name, phone, is_active, created_at, updated_at
+            FROM "user"
+            WHERE user_id IN :ids
+        """, ids)
+        return {str(row.user_id): row for row in rows}
+
+    async def _load_lands(self, ids: List[str]) -> Dict[str, Any]:
+        rows = await _select_by_ids(self.db, self._lock, """
+            SELECT land_id, landowner_id, title, location_text, status, energy_key,
+                   capacity_mw, published_at, created_at, updated_at
+            FROM lands
+            WHERE land_id IN :ids
+        """, ids)
+        return {str(row.land_id): row for row in rows}
+
+    async def _load_roles(self, ids: List[str]) -> Dict[str, List[str]]:
+        rows = await _select_by_ids(self.db, self._lock, """
+            SELECT user_id, role_key
+            FROM user_roles
+            WHERE user_id IN :ids
+        """, ids)
+        # A fresh list per user, so callers editing one user's roles can't affect another's
+        roles: Dict[str, List[str]] = {key: [] for key in ids}
+        for row in rows:
+            roles.setdefault(str(row.user_id), []).append(row.role_key)
+        return roles
+
+
+def display_name(user: Optional[Any]) -> Optional[str]:
+    """Full name of a loaded user row, matching ``first_name || ' ' || last_name`` in SQL."""
+    if user is None or user.first_name is None or user.last_name is None:
+        return None
+    return f"{user.first_name} {user.last_name}"
+
+
+def get_loaders(db: AsyncSession = Depends(get_async_db)) -> RequestLoaders:
+    """Dependency providing the request's loaders."""
+    return RequestLoaders(db)
@@ -7,12 +7,22 @@ import uvicorn
 import time
 import logging
 from pydantic import ValidationError
-from database import engine, Base
+from database import engine, Base, dispose_async_engine
+from pagination import CURSOR_HEADER
+from sql_metrics import SQLMetricsMiddleware
 from routers import auth, users, lands, sections, tasks, investors, documents, reviews, logs as logs_router, cache, health
 import logs
 from logs import log_request_middleware, setup_request_logging
 from config import settings
 from rate_limiter import limiter, rate_limit_handler, check_rate_limiter_health
+from worker_pool import shutdown_worker_pool
+from blob_store import shutdown_blob_unlinks
+from resumable_uploads import start_partial_purger, stop_partial_purger
+from fastapi.concurrency import run_in_threadpool
+from password_hashing import kdf_pool
+from document_search import ensure_search_schema
+from token_versions import token_versions, STATELESS_AUTH
+from redis_service import redis_service
 from slowapi.errors import RateLimitExceeded
 
 # Configure logging based on settings
@@ -27,10 +37,26 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     Base.metadata.create_all(bind=engine)
+    try:
+        ensure_search_schema()
+    except Exception as e:
+        logger.warning(f"Full-text search index unavailable: {str(e)}")
     setup_request_logging()  # Initialize request logging
+    redis_service.start_memory_reaper()  # Free expired keys of the fallback store during Redis outages
+    redis_service.start_l1_invalidation()  # Evict L1 keys and principals changed by other workers
+    start_partial_purger()  # Reclaim disk held by abandoned resumable uploads
+    if STATELESS_AUTH:
+        token_versions.start()  # Replicate token revocations from other workers
     yield
     # Shutdown
-    pass
+    token_versions.stop()
+    redis_service.stop_memory_reaper()
+    redis_service.stop_l1_invalidation()
+    stop_partial_purger()
+    shutdown_worker_pool()
+    kdf_pool.shutdown()
+    await run_in_threadpool(shutdown_blob_unlinks)  # Let released blob files be removed
+    await dispose_async_engine()
 
 app = FastAPI(
     title="RenewMart API",
@@ -105,8 +131,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.ALLOWED_METHODS,
     allow_headers=settings.ALLOWED_HEADERS,
+    expose_headers=[CURSOR_HEADER],
 )
 
+# Per-route SQL statement stats, collected until the response body is fully sent
+app.add_middleware(SQLMetricsMiddleware)
+
 # Request timing and logging middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -159,7 +189,8 @@ async def global_exception_handler(request: Request, exc: Exception):
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail, "type": "http_error"}
+        content={"detail": exc.detail, "type": "http_error"},
+        headers=getattr(exc, "headers", None)
     )
 
 # Include routers with proper prefixes
@@ -0,0 +1,251 @@
+import fnmatch
+import heapq
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Rough number of bytes a value holds, counting container contents."""
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "expire_at", "size")
+
+    def __init__(self, value: Any, expire_at: Optional[float], size: int):
+        self.value = value
+        self.expire_at = expire_at
+        self.size = size
+
+
+class MemoryStore:
+    """Bounded in-process key/value store used while Redis is unreachable.
+
+    Keys are kept in LRU order and evicted once either ``max_entries`` or
+    ``max_bytes`` is exceeded. Expiry times sit in a min-heap so expired
+    keys are freed without being read again: every write reaps what is due,
+    and ``start_reaper`` runs a background sweep for idle periods. Heap
+    records of keys that were overwritten or deleted are skipped when they
+    surface and the heap is rebuilt if they pile up.
+
+    Methods follow the Redis commands they stand in for: ``ttl`` returns -2
+    for missing and -1 for persistent keys, ``expire`` with a non-positive
+    time deletes the key and ``increment`` keeps the key's TTL.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of a live key, refreshing its LRU position."""
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """Store a value, replacing any TTL; False if it is larger than the whole store."""
+        size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            with self._lock:
+                self._stats["rejected"] += 1
+            logger.warning(f"Not caching '{key}' in memory: {size} bytes exceeds the store limit")
+            return False
+
+        expire_at = None
+        if isinstance(expire, int) and expire > 0:
+            expire_at = time.monotonic() + expire
+        with self._lock:
+            self._remove(key)
+            self._data[key] = _Entry(value, expire_at, size)
+            self._bytes += size
+            if expire_at is not None:
+                self._schedule(expire_at, key)
+            self._reap()
+            self._evict()
+        return True
+
+    def delete(self, *keys: str) -> int:
+        """Remove keys; returns how many were live."""
+        deleted = 0
+        with self._lock:
+            for key in keys:
+                if self._live(key) is not None:
+                    self._remove(key)
+                    deleted += 1
+        return deleted
+
+    def exists(self, key: str) -> bool:
+        """Whether a key is present and not expired."""
+        with self._lock:
+            return self._live(key) is not None
+
+    def expire(self, key: str, seconds: int) -> bool:
+        """Set a key's TTL; a non-positive TTL deletes it. False if the key is missing."""
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return False
+            if seconds <= 0:
+                self._remove(key)
+                return True
+            entry.expire_at = time.monotonic() + seconds
+            self._schedule(entry.expire_at, key)
+        return True
+
+    def ttl(self, key: str) -> int:
+        """Seconds until a key expires, -1 if it never does, -2 if it does not exist."""
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return -2
+            if entry.expire_at is None:
+                return -1
+            return max(math.ceil(entry.expire_at - time.monotonic()), 1)
+
+    def increment(self, key: str, amount: int = 1) -> Optional[int]:
+        """Add to an integer value, creating it at ``amount``; None if the value is not an integer."""
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                expire_at = None
+            else:
+                try:
+                    amount = int(entry.value) + amount
+                except (TypeError, ValueError):
+                    return None
+                expire_at = entry.expire_at
+                self._remove(key)
+            size = estimate_size(key) + estimate_size(amount)
+            self._data[key] = _Entry(amount, expire_at, size)
+            self._bytes += size
+            if expire_at is not None:
+                self._schedule(expire_at, key)
+            self._evict()
+        return amount
+
+    def keys(self, pattern: str = "*") -> List[str]:
+        """Live keys matching a Redis-style glob pattern."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                key for key, entry in self._data.items()
+                if (entry.expire_at is None or entry.expire_at > now) and fnmatch.fnmatchcase(key, pattern)
+            ]
+
+    def purge_expired(self) -> int:
+        """Remove every expired key now; returns how many were removed."""
+        with self._lock:
+            return self._reap(limit=None)
+
+    def clear(self):
+        """Remove everything."""
+        with self._lock:
+            self._data.clear()
+            self._expiry.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups * 100, 2) if lookups else 0.0
+            }
+
+    def start_reaper(self, interval: float = 30.0):
+        """Purge expired keys every ``interval`` seconds on a daemon thread."""
+        if self._reaper:
+            return
+        self._reaper_stop.clear()
+
+        def run():
+            while not self._reaper_stop.wait(interval):
+                try:
+                    self.purge_expired()
+                except Exception as e:
+                    logger.error(f"Memory store reaper error: {e}")
+
+        self._reaper = threading.Thread(target=run, name="memory-store-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self):
+        """Stop the background sweep."""
+        if self._reaper:
+            self._reaper_stop.set()
+            self._reaper.join(timeout=5)
+            self._reaper = None
+
+    # The helpers below expect the lock to be held
+
+    def _live(self, key: str) -> Optional[_Entry]:
+        entry = self._data.get(key)
+        if entry is not None and entry.expire_at is not None and entry.expire_at <= time.monotonic():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return None
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _schedule(self, expire_at: float, key: str):
+        heapq.heappush(self._expiry, (expire_at, key))
+        if len(self._expiry) > 2 * len(self._data) + 64:
+            self._expiry = [(entry.expire_at, k) for k, entry in self._data.items() if entry.expire_at is not None]
+            heapq.heapify(self._expiry)
+
+    def _reap(self, limit: Optional[int] = 16) -> int:
+        now = time.monotonic()
+        reaped = 0
+        while self._expiry and self._expiry[0][0] <= now and (limit is None or reaped < limit):
+            expire_at, key = heapq.heappop(self._expiry)
+            entry = self._data.get(key)
+            # Skip records left behind by a later set or expire on the same key
+            if entry is not None and entry.expire_at == expire_at:
+                self._remove(key)
+                self._stats["expirations"] += 1
+                reaped += 1
+        return reaped
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats["evictions"] += 1
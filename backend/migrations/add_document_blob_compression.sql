@@ -0,0 +1,16 @@
+-- Migration: Compression at rest for document blobs
+-- Description: Each blob records the codec its chunks are encoded with and the bytes actually stored.
+--              document_blobs.size stays the original size used for Content-Length and ranges.
+-- Date: 2025-10-23
+
+ALTER TABLE document_blobs ADD COLUMN IF NOT EXISTS codec VARCHAR(20) NOT NULL DEFAULT 'identity';
+ALTER TABLE document_blobs ADD COLUMN IF NOT EXISTS stored_size BIGINT;
+
+-- Blobs written before this migration are stored raw
+UPDATE document_blobs SET stored_size = size WHERE stored_size IS NULL AND codec = 'identity';
+
+COMMENT ON COLUMN document_blobs.size IS 'Original (uncompressed) size in bytes';
+COMMENT ON COLUMN document_blobs.codec IS 'Per-chunk codec: identity, zlib or zstd';
+COMMENT ON COLUMN document_blobs.stored_size IS 'Bytes held by the storage backend after compression';
+
+-- Compressed chunks gain nothing from pglz; EXTERNAL storage (set in add_document_blob_store.sql) stays.
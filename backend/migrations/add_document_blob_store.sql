@@ -0,0 +1,37 @@
+-- Migration: Content-addressed document blob store
+-- Description: Move document bytes out of the documents table into a blob store keyed by SHA-256.
+--              documents rows reference blobs by content_hash; identical files are stored once.
+-- Date: 2025-10-20
+
+-- Registry of every stored blob, whichever backend holds the bytes
+CREATE TABLE IF NOT EXISTS document_blobs (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    size BIGINT NOT NULL,
+    mime_type TEXT,
+    storage_backend VARCHAR(20) NOT NULL DEFAULT 'database',
+    chunk_size INTEGER NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Bytes for the 'database' backend, stored as fixed-size chunks
+CREATE TABLE IF NOT EXISTS document_blob_chunks (
+    content_hash VARCHAR(64) NOT NULL REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    PRIMARY KEY (content_hash, chunk_index)
+);
+
+-- Chunks are already bounded in size; skip pglz so each chunk is read without decompression
+ALTER TABLE document_blob_chunks ALTER COLUMN data SET STORAGE EXTERNAL;
+
+-- Documents reference their content by hash
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64) REFERENCES document_blobs(content_hash);
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
+
+COMMENT ON COLUMN documents.content_hash IS 'SHA-256 of the document content in document_blobs';
+COMMENT ON COLUMN documents.file_data IS 'Legacy inline binary data - cleared by backfill_document_blobs.py';
+
+-- After applying, move existing data with:
+--   python backfill_document_blobs.py
+-- then reclaim the space held by the old inline bytes (takes an exclusive lock):
+--   VACUUM (FULL, ANALYZE) documents;
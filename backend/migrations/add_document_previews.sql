@@ -0,0 +1,18 @@
+-- Migration: Document previews
+-- Description: Cache of JPEG thumbnails (images/TIFF) and first-page rasters (PDF),
+--              keyed by blob content hash so identical files share one preview.
+-- Date: 2025-10-21
+
+CREATE TABLE IF NOT EXISTS document_previews (
+    content_hash VARCHAR(64) PRIMARY KEY REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+    mime_type TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+COMMENT ON TABLE document_previews IS 'Rendered previews of document_blobs, generated in the background after upload';
+
+-- Previews of existing documents are generated lazily on the first
+-- GET /documents/{document_id}/preview request.
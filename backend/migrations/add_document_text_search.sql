@@ -0,0 +1,24 @@
+-- Migration: Full-text search over document contents
+-- Description: Extracted text of .txt/.pdf/.docx blobs with a generated tsvector column and GIN index.
+--              Keyed by content_hash so identical files are extracted and indexed once.
+-- Date: 2025-10-22
+
+CREATE TABLE IF NOT EXISTS document_text (
+    content_hash VARCHAR(64) PRIMARY KEY REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    indexed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- 'simple' configuration: parcel numbers, NOC references and survey IDs are kept verbatim
+ALTER TABLE document_text ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_document_text_search ON document_text USING GIN (search_vector);
+
+-- Reviewer permission check in /documents/search (EXISTS over tasks per matching document)
+CREATE INDEX IF NOT EXISTS idx_tasks_land_assigned_to ON tasks(land_id, assigned_to);
+
+COMMENT ON TABLE document_text IS 'Extracted document text for full-text search, filled in the background after upload';
+
+-- After applying, index documents uploaded before this migration with:
+--   python index_document_text.py
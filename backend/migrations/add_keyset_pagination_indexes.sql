@@ -0,0 +1,34 @@
+-- Migration: Composite indexes for keyset (cursor) pagination
+-- Description: List endpoints page with WHERE (sort_key, id) < (:cursor_sort, :cursor_id)
+--              ORDER BY sort_key DESC, id DESC. Each index matches one of those orderings so a
+--              page is an index range scan instead of scanning and discarding every earlier row.
+-- Date: 2025-10-24
+
+-- GET /lands/
+CREATE INDEX IF NOT EXISTS idx_lands_created_keyset ON lands (created_at DESC, land_id DESC);
+
+-- GET /lands/dashboard/projects
+CREATE INDEX IF NOT EXISTS idx_lands_owner_updated_keyset ON lands (landowner_id, updated_at DESC, land_id DESC);
+
+-- GET /lands/marketplace/published
+CREATE INDEX IF NOT EXISTS idx_lands_published_keyset
+    ON lands ((COALESCE(published_at, created_at)) DESC, land_id DESC)
+    WHERE status = 'published';
+
+-- GET /tasks/
+CREATE INDEX IF NOT EXISTS idx_tasks_created_keyset ON tasks (created_at DESC, task_id DESC);
+
+-- GET /documents/admin/all
+CREATE INDEX IF NOT EXISTS idx_documents_created_keyset ON documents (created_at DESC, document_id DESC);
+
+-- GET /users/
+CREATE INDEX IF NOT EXISTS idx_user_created_keyset ON "user" (created_at DESC, user_id DESC);
+
+-- GET /investors/admin/interests
+CREATE INDEX IF NOT EXISTS idx_interests_created_keyset ON investor_interests (created_at DESC, interest_id DESC);
+
+ANALYZE lands;
+ANALYZE tasks;
+ANALYZE documents;
+ANALYZE "user";
+ANALYZE investor_interests;
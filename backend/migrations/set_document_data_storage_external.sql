@@ -0,0 +1,12 @@
+-- Migration: Store document blobs uncompressed out-of-line
+-- Description: Switch documents.file_data to EXTERNAL storage so substr() windows used by
+--              the streaming/Range download path only read the TOAST chunks they need
+-- Date: 2025-10-20
+
+-- EXTERNAL = out-of-line, no pglz compression. Sliced reads of compressed values have to
+-- decompress from the start of the value; uncompressed values can be fetched chunk by chunk.
+-- Only affects newly written values; existing rows keep their current representation
+-- until they are rewritten.
+ALTER TABLE documents ALTER COLUMN file_data SET STORAGE EXTERNAL;
+
+COMMENT ON COLUMN documents.file_data IS 'Binary data of the document file (EXTERNAL storage for sliced reads)';
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, LargeBinary
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, BigInteger, Boolean, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, BYTEA
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -19,7 +19,8 @@ class Document(Base):
     document_type = Column(Text)
     file_name = Column(Text, nullable=False)
     file_path = Column(Text, nullable=True)  # Legacy field, now nullable
-    file_data = Column(BYTEA, nullable=True)  # Binary data stored in database
+    file_data = Column(BYTEA, nullable=True)  # Legacy inline binary data, superseded by content_hash
+    content_hash = Column(String(64), ForeignKey("document_blobs.content_hash"), nullable=True, index=True)  # SHA-256 of the stored blob
     file_size = Column(Integer)
     mime_type = Column(Text)
     is_draft = Column(Boolean, default=True)
@@ -34,4 +35,52 @@ class Document(Base):
     land = relationship("Land", back_populates="documents")
     land_section = relationship("LandSection", back_populates="documents")
     uploader = relationship("User", foreign_keys=[uploaded_by], back_populates="uploaded_documents")
-    approver = relationship("User", foreign_keys=[approved_by])
\ No newline at end of file
+    approver = relationship("User", foreign_keys=[approved_by])
+
+
+class DocumentBlob(Base):
+    """Content-addressed blob registry - one row per distinct file content (SHA-256)"""
+    __tablename__ = "document_blobs"
+    
+    content_hash = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)  # Original (uncompressed) size
+    mime_type = Column(Text)
+    storage_backend = Column(String(20), nullable=False, default='database')  # database, filesystem
+    chunk_size = Column(Integer, nullable=False)
+    codec = Column(String(20), nullable=False, default='identity')  # identity, zlib, zstd - applied per chunk
+    stored_size = Column(BigInteger, nullable=True)  # Bytes held by the backend after compression
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DocumentBlobChunk(Base):
+    """Fixed-size chunks of blobs held by the database blob backend"""
+    __tablename__ = "document_blob_chunks"
+    
+    content_hash = Column(String(64), ForeignKey("document_blobs.content_hash", ondelete="CASCADE"), primary_key=True)
+    chunk_index = Column(Integer, primary_key=True)
+    data = Column(BYTEA, nullable=False)
+
+
+class DocumentPreview(Base):
+    """Rendered JPEG thumbnail of a blob, shared by every document with that content"""
+    __tablename__ = "document_previews"
+    
+    content_hash = Column(String(64), ForeignKey("document_blobs.content_hash", ondelete="CASCADE"), primary_key=True)
+    mime_type = Column(Text, nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    data = Column(BYTEA, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DocumentText(Base):
+    """Extracted text of a blob for full-text search.
+    
+    The search index itself (Postgres tsvector column + GIN index, or the
+    SQLite FTS5 table) is managed by document_search.ensure_search_schema.
+    """
+    __tablename__ = "document_text"
+    
+    content_hash = Column(String(64), ForeignKey("document_blobs.content_hash", ondelete="CASCADE"), primary_key=True)
+    content = Column(Text, nullable=False)
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -54,6 +54,10 @@ class DocumentTypeEnum(str, Enum):
     PERMIT = "permit"
     OTHER = "other"
 
+class DocumentReviewDecisionEnum(str, Enum):
+    APPROVE = "approve"
+    REJECT = "reject"
+
 # Base configuration for all models
 class BaseSchema(BaseModel):
     model_config = ConfigDict(
@@ -489,7 +493,7 @@ class DocumentBase(BaseSchema):
     document_type: Optional[str] = Field(None, max_length=100, description="Type of document")
     file_name: str = Field(..., max_length=255, description="Original file name")
     file_path: Optional[str] = Field(None, max_length=500, description="Legacy storage file path (deprecated)")
-    file_size: Optional[int] = Field(None, ge=0, le=104857600, description="File size in bytes (max 100MB)")
+    file_size: Optional[int] = Field(None, ge=0, le=1073741824, description="File size in bytes (max 1GB)")
     mime_type: Optional[str] = Field(None, max_length=100, description="MIME type")
     is_draft: bool = Field(True, description="Whether document is in draft mode")
     status: Optional[str] = Field("pending", max_length=50, description="Document approval status")
@@ -541,6 +545,63 @@ class Document(DocumentBase):
     uploaded_by: Optional[UUID] = None
     created_at: datetime
 
+class DocumentSearchResult(BaseSchema):
+    document_id: UUID
+    land_id: Optional[UUID] = None
+    document_type: Optional[str] = None
+    file_name: str
+    mime_type: Optional[str] = None
+    created_at: datetime
+    rank: float = Field(..., description="Relevance score, higher is better")
+    snippet: str = Field(..., description="HTML-escaped matching text with hits wrapped in <mark> tags")
+
+class DocumentReviewItem(BaseSchema):
+    document_id: UUID
+    decision: DocumentReviewDecisionEnum
+    reason: Optional[str] = Field(None, max_length=1000, description="Rejection reason (required to reject)")
+    admin_comments: Optional[str] = Field(None, max_length=2000, description="Admin comments")
+
+class DocumentReviewBatch(BaseSchema):
+    items: List[DocumentReviewItem] = Field(..., min_length=1, max_length=200, description="Review decisions to apply")
+
+class DocumentReviewResult(BaseSchema):
+    document_id: UUID
+    decision: DocumentReviewDecisionEnum
+    success: bool
+    document: Optional[Document] = None
+    error: Optional[str] = None
+
+class DocumentReviewBatchResponse(BaseSchema):
+    results: List[DocumentReviewResult]
+    approved: int = Field(..., ge=0)
+    rejected: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+
+class DocumentUploadResult(BaseSchema):
+    file_name: str
+    success: bool
+    document: Optional[Document] = None
+    error: Optional[str] = None
+
+class DocumentBatchUploadResponse(BaseSchema):
+    results: List[DocumentUploadResult]
+    uploaded: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+
+class UploadSessionCreate(BaseSchema):
+    document_type: str = Field(..., max_length=100, description="Type of document")
+    file_name: str = Field(..., max_length=255, description="Original file name")
+    file_size: int = Field(..., gt=0, description="Total file size in bytes")
+
+class UploadSession(BaseSchema):
+    upload_id: UUID
+    land_id: UUID
+    document_type: str
+    file_name: str
+    file_size: int
+    offset: int = Field(..., ge=0, description="Bytes received so far")
+    expires_at: datetime
+
 # ============================================================================
 # TASK SCHEMAS
 # ============================================================================
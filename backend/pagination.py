@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+# Response header carrying the cursor for the page after the one returned
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Build an opaque cursor from the last row's sort key and primary key."""
+    payload = {"id": str(row_id)}
+    if isinstance(sort_value, datetime):
+        payload["ts"] = sort_value.isoformat()
+    else:
+        payload["v"] = sort_value if sort_value is None else str(sort_value)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Return ``(sort_value, row_id)`` from a cursor, or raise 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if "ts" in payload:
+            return datetime.fromisoformat(payload["ts"]), payload["id"]
+        return payload["v"], payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_page(
+    sort_expression: str,
+    id_expression: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    params: Dict[str, Any]
+) -> Tuple[str, str]:
+    """Build the seek condition and ORDER BY/LIMIT clause for a newest-first page.
+
+    With a cursor the page starts right after the row it encodes
+    (``WHERE (sort, id) < (:cursor_sort, :cursor_id)``), which the matching
+    composite index serves without reading earlier pages. Without one the
+    legacy ``OFFSET :skip`` is used. Both orderings include the primary key
+    so a cursor taken from an offset page continues it exactly.
+
+    Rows whose sort key is NULL come first, as in PostgreSQL's default
+    descending order and its ``DESC`` indexes. A cursor taken from one of
+    them continues through the remaining NULL rows by id and then on to
+    every dated row, since a row comparison against NULL matches nothing.
+
+    Returns ``(where_sql, order_sql)``; ``where_sql`` is appended to the
+    query's filters and ``order_sql`` ends it.
+    """
+    params["limit"] = limit
+    order_sql = f" ORDER BY {sort_expression} DESC NULLS FIRST, {id_expression} DESC"
+
+    if cursor:
+        cursor_sort, params["cursor_id"] = decode_cursor(cursor)
+        if cursor_sort is None:
+            where_sql = (f" AND (({sort_expression} IS NULL AND {id_expression} < :cursor_id)"
+                         f" OR {sort_expression} IS NOT NULL)")
+        else:
+            params["cursor_sort"] = cursor_sort
+            where_sql = f" AND ({sort_expression}, {id_expression}) < (:cursor_sort, :cursor_id)"
+        return where_sql, order_sql + " LIMIT :limit"
+
+    params["skip"] = skip
+    return "", order_sql + " LIMIT :limit OFFSET :skip"
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int, sort_attr: str, id_attr: str):
+    """Expose the cursor for the next page when this page came back full."""
+    if rows and len(rows) >= limit:
+        last = rows[-1]
+        response.headers[CURSOR_HEADER] = encode_cursor(getattr(last, sort_attr), getattr(last, id_attr))
@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import logging
+
+os.environ.setdefault("PASSLIB_BCRYPT_DETECT_WRAPAROUND", "0")
+from passlib.context import CryptContext
+from fastapi import HTTPException, status
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Password hashing configuration
+PASSWORD_HASH_WORKERS = settings.get('PASSWORD_HASH_WORKERS', 2)  # Processes doing KDF work
+PASSWORD_HASH_MAX_PENDING = settings.get('PASSWORD_HASH_MAX_PENDING', 32)  # Hash/verify calls queued or running
+PASSWORD_HASH_RETRY_AFTER = 1  # seconds suggested to clients turned away with 429
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+def hash_password_sync(password: str) -> str:
+    """Hash a password in the calling thread (scripts and worker processes)."""
+    return pwd_context.hash(password)
+
+
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the calling thread (scripts and worker processes)."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class KdfPool:
+    """Bounded process pool for password hashing and verification.
+
+    PBKDF2 is deliberately slow; running it inside ``async def`` handlers
+    stalls the event loop for every other request. Calls are sent to a
+    small set of spawned processes instead. At most ``max_pending`` calls
+    may be queued or running; beyond that callers get ``429`` rather than
+    an ever-growing queue during a login burst. Counters are only touched
+    from the event loop thread.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._stats = {"completed": 0, "rejected": 0, "failed": 0, "peak_pending": 0, "total_seconds": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run a KDF function in the pool, or raise 429 if the pool is saturated."""
+        if self._pending >= self.max_pending:
+            self._stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many sign-in requests in progress. Please retry shortly.",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)}
+            )
+
+        self._pending += 1
+        self._stats["peak_pending"] = max(self._stats["peak_pending"], self._pending)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+            self._stats["completed"] += 1
+            return result
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+        finally:
+            self._pending -= 1
+            self._stats["total_seconds"] += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters for monitoring."""
+        stats = dict(self._stats)
+        finished = stats["completed"] + stats["failed"]
+        stats["avg_seconds"] = round(stats.pop("total_seconds") / max(finished, 1), 4)
+        stats.update({
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "queue_depth": max(self._pending - self.workers, 0)
+        })
+        return stats
+
+    def shutdown(self):
+        """Stop the worker processes (called on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global KDF pool instance
+kdf_pool = KdfPool()
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await kdf_pool.run(hash_password_sync, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await kdf_pool.run(verify_password_sync, plain_password, hashed_password)
@@ -0,0 +1,80 @@
+"""Preview rendering executed inside the preview worker processes.
+
+Kept free of application imports (settings, database, redis) so spawned
+workers start quickly. Pillow and PyMuPDF are optional: without them the
+matching document types simply get no preview.
+"""
+import io
+from typing import Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow not installed - no previews at all
+    Image = None
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24
+    except ImportError:  # PyMuPDF not installed - no PDF previews
+        pymupdf = None
+
+PREVIEW_MIME_TYPE = "image/jpeg"
+
+IMAGE_MIME_TYPES = {"image/jpeg", "image/png", "image/gif", "image/tiff"}
+PDF_MIME_TYPE = "application/pdf"
+
+
+def can_render(mime_type: Optional[str]) -> bool:
+    """Whether a preview can be produced for this MIME type in this install"""
+    if Image is None:
+        return False
+    if mime_type in IMAGE_MIME_TYPES:
+        return True
+    return mime_type == PDF_MIME_TYPE and pymupdf is not None
+
+
+def _to_jpeg(image, max_size: Tuple[int, int]) -> Tuple[bytes, int, int]:
+    """Downscale an image and encode it as a JPEG thumbnail"""
+    image.thumbnail(max_size)
+    if image.mode not in ("RGB", "L"):
+        # Flatten transparency onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.split()[-1])
+        image = background
+
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=80, optimize=True)
+    return output.getvalue(), image.width, image.height
+
+
+def _render_image(path: str, max_size: Tuple[int, int]) -> Tuple[bytes, int, int]:
+    with Image.open(path) as image:
+        # Let the JPEG decoder downscale while decoding; multi-page TIFFs use the first frame
+        image.draft("RGB", max_size)
+        image.seek(0)
+        return _to_jpeg(image.copy(), max_size)
+
+
+def _render_pdf(path: str, max_size: Tuple[int, int]) -> Tuple[bytes, int, int]:
+    with pymupdf.open(path) as pdf:
+        page = pdf[0]
+        # Rasterize the first page directly at thumbnail resolution
+        zoom = min(max_size[0] / page.rect.width, max_size[1] / page.rect.height)
+        pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+        image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        return _to_jpeg(image, max_size)
+
+
+def render_preview(path: str, mime_type: str, max_size: Tuple[int, int]) -> Optional[Tuple[bytes, int, int]]:
+    """Render a JPEG preview of the file at ``path``.
+
+    Returns (jpeg_bytes, width, height), or None if the type is not supported.
+    """
+    if not can_render(mime_type):
+        return None
+    if mime_type == PDF_MIME_TYPE:
+        return _render_pdf(path, max_size)
+    return _render_image(path, max_size)
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from redis_service import redis_service, user_tag
+
+logger = logging.getLogger(__name__)
+
+# Principal cache configuration
+PRINCIPAL_CACHE_TTL = settings.get('PRINCIPAL_CACHE_TTL', 300)  # seconds a principal is kept in Redis
+PRINCIPAL_CACHE_LOCAL_TTL = settings.get('PRINCIPAL_CACHE_LOCAL_TTL', 15)  # seconds kept in process memory
+PRINCIPAL_CACHE_MAX_ENTRIES = settings.get('PRINCIPAL_CACHE_MAX_ENTRIES', 10_000)
+
+_DATETIME_FIELDS = ("created_at", "updated_at")
+PRINCIPAL_PREFIX = "principal:"
+
+
+def _principal_key(user_id) -> str:
+    return f"{PRINCIPAL_PREFIX}{user_id}"
+
+
+def encode_principal(principal: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe copy of a principal for Redis."""
+    encoded = dict(principal)
+    encoded["user_id"] = str(principal["user_id"])
+    encoded["roles"] = list(principal.get("roles") or [])
+    for field in _DATETIME_FIELDS:
+        if isinstance(encoded.get(field), datetime):
+            encoded[field] = encoded[field].isoformat()
+    return encoded
+
+
+def decode_principal(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the types ``get_current_user`` returns from the database."""
+    principal = dict(data)
+    principal["user_id"] = UUID(str(data["user_id"]))
+    principal["roles"] = list(data.get("roles") or [])
+    for field in _DATETIME_FIELDS:
+        if isinstance(principal.get(field), str):
+            principal[field] = datetime.fromisoformat(principal[field])
+    return principal
+
+
+class PrincipalCache:
+    """Authenticated principals keyed by user id.
+
+    A small in-process LRU with a short TTL sits in front of Redis, which
+    holds the shared copy. Invalidations are broadcast to the other worker
+    processes over the L1 eviction channel; the local TTL only bounds how
+    long a principal can be served if that broadcast is lost.
+    Callers always get their own copy.
+    """
+
+    def __init__(
+        self,
+        ttl: int = PRINCIPAL_CACHE_TTL,
+        local_ttl: int = PRINCIPAL_CACHE_LOCAL_TTL,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES
+    ):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, user_id) -> Optional[Dict[str, Any]]:
+        """Cached principal for a user, or None on a miss."""
+        key = str(user_id)
+        now = time.monotonic()
+        principal = self._get_local(key, now)
+        if principal is not None:
+            return principal
+        return self._load_shared(key, redis_service.get(_principal_key(key)), now)
+
+    async def get_async(self, user_id) -> Optional[Dict[str, Any]]:
+        """``get`` for coroutines; a local miss reads Redis in the thread pool."""
+        key = str(user_id)
+        now = time.monotonic()
+        principal = self._get_local(key, now)
+        if principal is not None:
+            return principal
+        data = await run_in_threadpool(redis_service.get, _principal_key(key))
+        return self._load_shared(key, data, now)
+
+    def set(self, principal: Dict[str, Any]):
+        """Cache a principal loaded from the database."""
+        data = encode_principal(principal)
+        redis_service.set(_principal_key(data["user_id"]), data, self.ttl, tags=[user_tag(data["user_id"])])
+        with self._lock:
+            self._store_local(data["user_id"], data, time.monotonic())
+
+    def invalidate(self, user_id):
+        """Drop a user's principal after a role, profile or status change."""
+        key = str(user_id)
+        with self._lock:
+            self._local.pop(key, None)
+            self._stats["invalidations"] += 1
+        redis_service.delete(_principal_key(key))
+        redis_service.broadcast_eviction(_principal_key(key))
+
+    def evict_local(self, principal_key: str):
+        """Drop a principal another worker invalidated from this process only."""
+        with self._lock:
+            self._local.pop(principal_key[len(PRINCIPAL_PREFIX):], None)
+
+    def clear(self):
+        """Drop every locally cached principal (Redis entries expire on their own)."""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_entries"] = len(self._local)
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["local_hits"] + stats["redis_hits"]) / max(lookups, 1) * 100, 2)
+        return stats
+
+    def _get_local(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] > now:
+                self._local.move_to_end(key)
+                self._stats["local_hits"] += 1
+                return decode_principal(entry[1])
+            if entry:
+                del self._local[key]
+        return None
+
+    def _load_shared(self, key: str, data: Any, now: float) -> Optional[Dict[str, Any]]:
+        # data is what Redis returned for the principal
+        if not isinstance(data, dict):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._stats["redis_hits"] += 1
+            self._store_local(key, data, now)
+        return decode_principal(data)
+
+    def _store_local(self, key: str, data: Dict[str, Any], now: float):
+        # Caller holds the lock
+        self._local[key] = (now + self.local_ttl, data)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
+redis_service.on_eviction(PRINCIPAL_PREFIX, principal_cache.evict_local)
@@ -1,50 +1,119 @@
 import redis
+import redis.asyncio
+import hashlib
 import json
+import os
 import pickle
-from typing import Any, Optional, Union, Dict, List
-from functools import wraps
-from datetime import datetime, timedelta
+import threading
+import time
+import uuid
+from typing import Any, Callable, Iterable, Optional, Union, Dict, List
+from functools import partial, wraps
+from datetime import date, datetime
+from decimal import Decimal
 import logging
 from config import settings
+from memory_store import MemoryStore
+from cache_codecs import value_codec
 import asyncio
 from contextlib import asynccontextmanager
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# In-memory fallback store limits
+MEMORY_CACHE_MAX_ENTRIES = settings.get('MEMORY_CACHE_MAX_ENTRIES', 10_000)
+MEMORY_CACHE_MAX_BYTES = settings.get('MEMORY_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+MEMORY_CACHE_REAP_INTERVAL = settings.get('MEMORY_CACHE_REAP_INTERVAL', 30)  # seconds between expiry sweeps
+
+# In-process L1 tier in front of Redis
+CACHE_L1_ENABLED = settings.get('CACHE_L1_ENABLED', False)
+CACHE_L1_TTLS = settings.get('CACHE_L1_TTLS', {})  # key prefix -> seconds a value is kept in each worker
+CACHE_L1_MAX_ENTRIES = settings.get('CACHE_L1_MAX_ENTRIES', 5_000)
+CACHE_L1_MAX_BYTES = settings.get('CACHE_L1_MAX_BYTES', 16 * 1024 * 1024)
+CACHE_L1_CHANNEL = settings.get('CACHE_L1_CHANNEL', 'cache_l1_invalidate')  # pub/sub channel evicting L1 keys
+
+# Cached function results
+CACHE_LOCK_TIMEOUT = settings.get('CACHE_LOCK_TIMEOUT', 10)  # seconds one worker may hold a key's recompute lock
+CACHE_LOCK_POLL_INTERVAL = 0.05  # seconds between checks while another worker computes a key
+
+# Cache tags
+CACHE_TAG_TTL = settings.get('CACHE_TAG_TTL', 86400)  # minimum seconds a tag remembers its keys
+CACHE_INVALIDATE_BATCH = settings.get('CACHE_INVALIDATE_BATCH', 500)  # keys deleted per round trip
+
+MARKETPLACE_TAG = "marketplace"
+
+TagSpec = Optional[Union[Iterable[str], Callable[..., Iterable[str]]]]
+
+_MISSING = object()
+
+
+def user_tag(user_id) -> str:
+    """Tag of cache entries holding data of one user"""
+    return f"user:{user_id}"
+
+
+def land_tag(land_id) -> str:
+    """Tag of cache entries holding data of one land"""
+    return f"land:{land_id}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
 class RedisService:
     """Redis service for caching and session management"""
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
+        # Same server without response decoding, for reading encoded values
+        self.value_client: Optional[redis.Redis] = None
         self.is_connected = False
-        # In-memory fallback store when Redis is unavailable
-        # Structure: { key: {"value": Any, "expire_at": Optional[datetime]} }
-        self._memory_store: Dict[str, Dict[str, Any]] = {}
+        # Bounded in-memory fallback store when Redis is unavailable
+        self._memory_store = MemoryStore(MEMORY_CACHE_MAX_ENTRIES, MEMORY_CACHE_MAX_BYTES)
+        self._memory_tags: Dict[str, set] = {}
+        self._memory_tags_lock = threading.Lock()
+        # Optional in-process tier holding raw Redis values for keys with an L1 TTL
+        self._l1 = MemoryStore(CACHE_L1_MAX_ENTRIES, CACHE_L1_MAX_BYTES)
+        self._l1_ttls: List[tuple] = []
+        self._l1_origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._l1_pubsub = None
+        self._l1_thread = None
+        self._l1_stats = {"published": 0, "received": 0}
+        self._l1_lock = threading.Lock()
+        # (prefix, callback) for process-local caches outside L1 that follow the same evictions
+        self._eviction_listeners: List[tuple] = []
+        if CACHE_L1_ENABLED:
+            self.enable_l1(CACHE_L1_TTLS)
         self._initialize_connection()
     
     def _initialize_connection(self):
         """Initialize Redis connection with fallback handling"""
         try:
-            self.redis_client = redis.Redis(
+            options = dict(
                 host=getattr(settings, 'REDIS_HOST', 'localhost'),
                 port=getattr(settings, 'REDIS_PORT', 6379),
                 db=getattr(settings, 'REDIS_DB', 0),
                 password=getattr(settings, 'REDIS_PASSWORD', '') or None,
-                decode_responses=True,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
                 health_check_interval=30
             )
+            self.redis_client = redis.Redis(decode_responses=True, **options)
             
             # Test connection
             self.redis_client.ping()
+            self.value_client = redis.Redis(decode_responses=False, **options)
             self.is_connected = True
             logger.info(f"Redis connected successfully to {settings.REDIS_HOST}:{settings.REDIS_PORT}")
             
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}. Caching will be disabled.")
             self.redis_client = None
+            self.value_client = None
             self.is_connected = False
     
     def reconnect(self) -> bool:
@@ -53,33 +122,41 @@ class RedisService:
             self._initialize_connection()
         return self.is_connected
     
-    def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+    def set(self, key: str, value: Any, expire: Optional[int] = None,
+            tags: Optional[Iterable[str]] = None) -> bool:
         """Set a key-value pair in Redis with optional expiration
         
         Args:
             key: Redis key
-            value: Value to store (will be JSON serialized)
+            value: Value to store (encoded by ``cache_codecs.value_codec``)
             expire: Expiration time in seconds
+            tags: Tags to register the key under, for ``CacheManager.invalidate_tags``
             
         Returns:
             True if successful, False otherwise
         """
         if not self.is_connected or not self.redis_client:
             # Fallback: store in memory
-            expire_at = None
-            if isinstance(expire, int) and expire > 0:
-                expire_at = datetime.utcnow() + timedelta(seconds=expire)
-            self._memory_store[key] = {"value": value, "expire_at": expire_at}
-            return True
+            stored = self._memory_store.set(key, value, expire)
+            if stored and tags:
+                self._tag_in_memory(key, tags)
+            return stored
             
         try:
-            # Serialize complex objects to JSON
-            if isinstance(value, (dict, list, tuple)):
-                serialized_value = json.dumps(value, default=str)
-            else:
-                serialized_value = str(value)
+            serialized_value = value_codec.encode(value)
             
-            result = self.redis_client.set(key, serialized_value, ex=expire)
+            if tags:
+                # Tag sets outlive their keys; members that expired are skipped on invalidation
+                tag_ttl = max(CACHE_TAG_TTL, expire or 0)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.set(key, serialized_value, ex=expire)
+                for tag in tags:
+                    pipe.sadd(_tag_key(tag), key)
+                    pipe.expire(_tag_key(tag), tag_ttl)
+                result = pipe.execute()[0]
+            else:
+                result = self.redis_client.set(key, serialized_value, ex=expire)
+            self._l1_invalidate(key, serialized_value)
             return bool(result)
             
         except Exception as e:
@@ -98,26 +175,21 @@ class RedisService:
         """
         if not self.is_connected or not self.redis_client:
             # Fallback: read from memory
-            entry = self._memory_store.get(key)
-            if not entry:
-                return default
-            expire_at = entry.get("expire_at")
-            if expire_at and datetime.utcnow() > expire_at:
-                # Expired - remove and return default
-                self._memory_store.pop(key, None)
-                return default
-            return entry.get("value", default)
+            return self._memory_store.get(key, default)
+            
+        l1_ttl = self._l1_ttl(key)
+        if l1_ttl:
+            value = self._l1.get(key, _MISSING)
+            if value is not _MISSING:
+                return value_codec.decode(value)
             
         try:
-            value = self.redis_client.get(key)
+            value = (self.value_client or self.redis_client).get(key)
             if value is None:
                 return default
-            
-            # Try to deserialize JSON
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            if l1_ttl:
+                self._l1.set(key, value, l1_ttl)
+            return value_codec.decode(value)
                 
         except Exception as e:
             logger.error(f"Redis GET error for key '{key}': {e}")
@@ -133,21 +205,56 @@ class RedisService:
             Number of keys deleted
         """
         if not self.is_connected or not self.redis_client:
-            if not keys:
-                return 0
-            deleted = 0
-            for k in keys:
-                if k in self._memory_store:
-                    self._memory_store.pop(k, None)
-                    deleted += 1
-            return deleted
+            return self._memory_store.delete(*keys)
             
         try:
-            return self.redis_client.delete(*keys)
+            deleted = self.redis_client.delete(*keys)
+            for key in keys:
+                self._l1_invalidate(key)
+            return deleted
         except Exception as e:
             logger.error(f"Redis DELETE error for keys {keys}: {e}")
             return 0
     
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete keys in one pipelined round trip, evicting them from every L1
+        
+        Args:
+            keys: Redis keys to delete
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        if not self.is_connected or not self.redis_client:
+            return self._memory_store.delete(*keys)
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.unlink(*keys)
+            for key in keys:
+                if self._l1_ttl(key):
+                    self._l1.delete(key)
+                    pipe.publish(CACHE_L1_CHANNEL, f"{self._l1_origin} {key}")
+            return pipe.execute()[0]
+        except Exception as e:
+            logger.error(f"Redis UNLINK error for {len(keys)} keys: {e}")
+            return 0
+    
+    def _tag_in_memory(self, key: str, tags: Iterable[str]):
+        with self._memory_tags_lock:
+            for tag in tags:
+                members = self._memory_tags.setdefault(tag, set())
+                members.add(key)
+                if len(members) > self._memory_store.max_entries:
+                    # Forget keys the fallback store has already evicted or expired
+                    members.intersection_update(self._memory_store.keys())
+    
+    def _pop_memory_tag(self, tag: str) -> List[str]:
+        with self._memory_tags_lock:
+            return list(self._memory_tags.pop(tag, ()))
+    
     def exists(self, key: str) -> bool:
         """Check if a key exists in Redis
         
@@ -158,15 +265,7 @@ class RedisService:
             True if key exists, False otherwise
         """
         if not self.is_connected or not self.redis_client:
-            entry = self._memory_store.get(key)
-            if not entry:
-                return False
-            expire_at = entry.get("expire_at")
-            if expire_at and datetime.utcnow() > expire_at:
-                # Expired - remove and report not exists
-                self._memory_store.pop(key, None)
-                return False
-            return True
+            return self._memory_store.exists(key)
             
         try:
             return bool(self.redis_client.exists(key))
@@ -185,17 +284,10 @@ class RedisService:
             True if successful, False otherwise
         """
         if not self.is_connected or not self.redis_client:
-            entry = self._memory_store.get(key)
-            if not entry:
-                return False
-            expire_at = None
-            if isinstance(seconds, int) and seconds > 0:
-                expire_at = datetime.utcnow() + timedelta(seconds=seconds)
-            entry["expire_at"] = expire_at
-            self._memory_store[key] = entry
-            return True
+            return self._memory_store.expire(key, seconds)
             
         try:
+            self._l1_invalidate(key)
             return bool(self.redis_client.expire(key, seconds))
         except Exception as e:
             logger.error(f"Redis EXPIRE error for key '{key}': {e}")
@@ -211,18 +303,7 @@ class RedisService:
             TTL in seconds, -1 if no expiration, -2 if key doesn't exist
         """
         if not self.is_connected or not self.redis_client:
-            entry = self._memory_store.get(key)
-            if not entry:
-                return -2
-            expire_at = entry.get("expire_at")
-            if not expire_at:
-                return -1
-            remaining = int((expire_at - datetime.utcnow()).total_seconds())
-            if remaining <= 0:
-                # Expired - cleanup and report not exist
-                self._memory_store.pop(key, None)
-                return -2
-            return remaining
+            return self._memory_store.ttl(key)
             
         try:
             return self.redis_client.ttl(key)
@@ -241,22 +322,12 @@ class RedisService:
             New value after increment, None if failed
         """
         if not self.is_connected or not self.redis_client:
-            entry = self._memory_store.get(key)
-            if entry:
-                value = entry.get("value")
-                try:
-                    new_val = int(value) + amount
-                except Exception:
-                    return None
-                entry["value"] = new_val
-                self._memory_store[key] = entry
-                return new_val
-            else:
-                self._memory_store[key] = {"value": amount, "expire_at": None}
-                return amount
+            return self._memory_store.increment(key, amount)
             
         try:
-            return self.redis_client.incrby(key, amount)
+            value = self.redis_client.incrby(key, amount)
+            self._l1_invalidate(key)
+            return value
         except Exception as e:
             logger.error(f"Redis INCRBY error for key '{key}': {e}")
             return None
@@ -286,19 +357,382 @@ class RedisService:
                 })
             except Exception as e:
                 status["error"] = str(e)
+        else:
+            status["memory_store"] = self._memory_store.stats()
+        
+        if self._l1_ttls:
+            status["l1"] = self.l1_stats()
         
         return status
+    
+    def enable_l1(self, ttls: Dict[str, int]):
+        """Keep values of keys starting with the given prefixes in process for the prefix's TTL
+        
+        Args:
+            ttls: Key prefix to seconds; the longest matching prefix wins
+        """
+        self._l1_ttls = sorted(
+            ((prefix, int(ttl)) for prefix, ttl in ttls.items() if int(ttl) > 0),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self._l1.clear()
+    
+    def _l1_ttl(self, key: str) -> Optional[int]:
+        for prefix, ttl in self._l1_ttls:
+            if key.startswith(prefix):
+                return ttl
+        return None
+    
+    def _l1_invalidate(self, key: str, value: Union[str, bytes, None] = None):
+        """Refresh or drop a key in this worker's L1 and evict it from every other worker's"""
+        ttl = self._l1_ttl(key)
+        if not ttl:
+            return
+        if value is None:
+            self._l1.delete(key)
+        else:
+            self._l1.set(key, value, ttl)
+        self.broadcast_eviction(key)
+    
+    def broadcast_eviction(self, key: str):
+        """Evict a key from the L1 and eviction listeners of every other worker"""
+        if not self.is_connected or not self.redis_client:
+            return
+        try:
+            self.redis_client.publish(CACHE_L1_CHANNEL, f"{self._l1_origin} {key}")
+            with self._l1_lock:
+                self._l1_stats["published"] += 1
+        except Exception as e:
+            # Other workers fall back to their L1 TTL
+            logger.warning(f"L1 invalidation of '{key}' not broadcast: {e}")
+    
+    def on_eviction(self, prefix: str, callback: Callable[[str], None]):
+        """Call ``callback(key)`` when another worker evicts a key starting with ``prefix``
+        
+        Lets process-local caches kept outside L1 follow ``broadcast_eviction``.
+        Register before ``start_l1_invalidation``.
+        """
+        self._eviction_listeners.append((prefix, callback))
+    
+    def _on_l1_message(self, message):
+        origin, _, key = str(message.get("data", "")).partition(" ")
+        if origin != self._l1_origin and key:
+            self._l1.delete(key)
+            for prefix, callback in self._eviction_listeners:
+                if key.startswith(prefix):
+                    callback(key)
+            with self._l1_lock:
+                self._l1_stats["received"] += 1
+    
+    def start_l1_invalidation(self):
+        """Subscribe to L1 evictions broadcast by other workers"""
+        if not (self._l1_ttls or self._eviction_listeners):
+            return
+        if self._l1_thread or not self.is_connected or not self.redis_client:
+            return
+        self._l1_pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        self._l1_pubsub.subscribe(**{CACHE_L1_CHANNEL: self._on_l1_message})
+        self._l1_thread = self._l1_pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    
+    def stop_l1_invalidation(self):
+        """Stop the L1 eviction subscriber"""
+        if self._l1_thread:
+            self._l1_thread.stop()
+            self._l1_thread = None
+        if self._l1_pubsub:
+            self._l1_pubsub.close()
+            self._l1_pubsub = None
+    
+    def l1_stats(self) -> Dict[str, Any]:
+        """L1 hit rates and invalidation counts"""
+        with self._l1_lock:
+            broadcast = dict(self._l1_stats)
+        return {
+            "prefixes": dict(self._l1_ttls),
+            "subscribed": self._l1_thread is not None,
+            **self._l1.stats(),
+            "invalidations_published": broadcast["published"],
+            "invalidations_received": broadcast["received"]
+        }
+    
+    def start_memory_reaper(self):
+        """Start the periodic sweep of expired keys in the in-memory fallback store."""
+        self._memory_store.start_reaper(MEMORY_CACHE_REAP_INTERVAL)
+    
+    def stop_memory_reaper(self):
+        """Stop the in-memory fallback store's sweep."""
+        self._memory_store.stop_reaper()
 
 # Global Redis service instance
 redis_service = RedisService()
 
 # Caching decorators
-def cache_result(expire: int = 300, key_prefix: str = ""):
+
+# Arguments that do not change a cached function's result, left out of its key
+_KEY_EXEMPT_TYPES = (Session, AsyncSession, redis.Redis, redis.asyncio.Redis)
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-compatible stand-in for values json cannot encode, stable across processes"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, _KEY_EXEMPT_TYPES):
+        return f"<{type(value).__module__}.{type(value).__qualname__}>"
+    # Keying on the type alone would let calls with different values share an entry
+    raise TypeError(f"Cannot derive a cache key from a {type(value).__qualname__} argument")
+
+
+def make_cache_key(key_prefix: str, func, args: tuple, kwargs: dict) -> str:
+    """Cache key for a call, identical in every process for equal arguments
+    
+    Args:
+        key_prefix: Prefix for cache keys
+        func: Cached function
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+    
+    Returns:
+        ``{key_prefix}:{module.function}:{digest of the arguments}``
+    
+    Raises:
+        TypeError: An argument is neither JSON-compatible, a known value type,
+            nor a session or Redis client
+    """
+    payload = json.dumps([args, kwargs], sort_keys=True, default=_canonical, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return f"{key_prefix}:{func.__module__}.{func.__qualname__}:{digest}"
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_async_flights: Dict[str, "asyncio.Future"] = {}
+_flights_lock = threading.Lock()
+_refresh_tasks: set = set()
+_LEADER_CANCELLED = object()
+
+
+def _single_flight(key: str, compute):
+    """Run ``compute`` once for concurrent callers with the same key in this process"""
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    try:
+        flight.result = compute()
+        return flight.result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+async def _async_single_flight(key: str, compute):
+    """Await ``compute`` once for concurrent callers with the same key on this event loop
+
+    If the leading caller is cancelled (e.g. its client disconnected), its
+    waiters are not: the first one to resume becomes the new leader.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        future = _async_flights.get(key)
+        if future is None or future.get_loop() is not loop:
+            break
+        result = await asyncio.shield(future)
+        if result is not _LEADER_CANCELLED:
+            return result
+    future = _async_flights[key] = loop.create_future()
+    try:
+        result = await compute()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.set_result(_LEADER_CANCELLED)
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Waiters re-raise it; nobody else needs to retrieve it
+        raise
+    finally:
+        if _async_flights.get(key) is future:
+            del _async_flights[key]
+
+
+def _read_entry(cache_key: str):
+    """Cached value and whether it is past its fresh period, or (_MISSING, False)"""
+    entry = redis_service.get(cache_key)
+    if not isinstance(entry, dict) or "value" not in entry or "fresh_until" not in entry:
+        return _MISSING, False
+    return entry["value"], time.time() >= entry["fresh_until"]
+
+
+def _write_entry(cache_key: str, value: Any, expire: int, stale_ttl: int, tags: Optional[List[str]] = None):
+    entry = {"value": value, "fresh_until": time.time() + expire}
+    redis_service.set(cache_key, entry, expire + stale_ttl, tags=tags)
+
+
+def _resolve_tags(tags: "TagSpec", args: tuple, kwargs: dict) -> Optional[List[str]]:
+    if tags is None:
+        return None
+    return list(tags(*args, **kwargs) if callable(tags) else tags)
+
+
+def _worker_lock(cache_key: str, timeout: int):
+    """Redis lock making one worker compute a key; None when Redis is not used"""
+    if not redis_service.is_connected or not redis_service.redis_client:
+        return None
+    return redis_service.redis_client.lock(f"lock:{cache_key}", timeout=timeout)
+
+
+def _release(lock):
+    try:
+        lock.release()
+    except Exception as e:
+        # Expired while computing; another worker may already hold it
+        logger.debug(f"Cache lock release failed: {e}")
+
+
+def _load(cache_key: str, compute, store, lock_timeout: int):
+    """Compute and store a value, letting only one worker compute it at a time"""
+    lock = _worker_lock(cache_key, lock_timeout)
+    if lock is not None and not lock.acquire(blocking=False):
+        # Another worker is computing it; wait for its result up to the lock timeout
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(CACHE_LOCK_POLL_INTERVAL)
+            value, _ = _read_entry(cache_key)
+            if value is not _MISSING:
+                return value
+            if lock.acquire(blocking=False):
+                break
+        else:
+            lock = None
+    try:
+        result = compute()
+        if result is not None:
+            store(cache_key, result)
+            logger.debug(f"Cached result for key: {cache_key}")
+        return result
+    finally:
+        if lock is not None and lock.owned():
+            _release(lock)
+
+
+def _poll(cache_key: str, lock):
+    """One wait step: the value another worker stored, else whether the lock is now ours"""
+    value, _ = _read_entry(cache_key)
+    if value is not _MISSING:
+        return value, False
+    return _MISSING, lock.acquire(blocking=False)
+
+
+def _release_owned(lock):
+    if lock.owned():
+        _release(lock)
+
+
+async def _async_load(cache_key: str, compute, store, lock_timeout: int):
+    """Async counterpart of ``_load``
+
+    The lock and cache round trips are blocking Redis calls, so they run in
+    the threadpool rather than on the event loop.
+    """
+    lock = _worker_lock(cache_key, lock_timeout)
+    if lock is not None and not await run_in_threadpool(lock.acquire, blocking=False):
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(CACHE_LOCK_POLL_INTERVAL)
+            value, acquired = await run_in_threadpool(_poll, cache_key, lock)
+            if value is not _MISSING:
+                return value
+            if acquired:
+                break
+        else:
+            lock = None
+    try:
+        result = await compute()
+        if result is not None:
+            await run_in_threadpool(store, cache_key, result)
+            logger.debug(f"Cached result for key: {cache_key}")
+        return result
+    finally:
+        if lock is not None:
+            await run_in_threadpool(_release_owned, lock)
+
+
+def _try_refresh(cache_key: str, compute, store, lock_timeout: int):
+    """Recompute a stale value unless another worker already is"""
+    lock = _worker_lock(cache_key, lock_timeout)
+    if lock is not None and not lock.acquire(blocking=False):
+        return
+    try:
+        result = compute()
+        if result is not None:
+            store(cache_key, result)
+    except Exception as e:
+        logger.warning(f"Background refresh of '{cache_key}' failed: {e}")
+    finally:
+        if lock is not None and lock.owned():
+            _release(lock)
+
+
+async def _async_refresh(cache_key: str, compute, store, lock_timeout: int):
+    """Async counterpart of ``_try_refresh``"""
+    lock = _worker_lock(cache_key, lock_timeout)
+    if lock is not None and not await run_in_threadpool(lock.acquire, blocking=False):
+        return
+    try:
+        result = await compute()
+        if result is not None:
+            await run_in_threadpool(store, cache_key, result)
+    except Exception as e:
+        logger.warning(f"Background refresh of '{cache_key}' failed: {e}")
+    finally:
+        if lock is not None:
+            await run_in_threadpool(_release_owned, lock)
+
+
+def cache_result(expire: int = 300, key_prefix: str = "", stale_ttl: int = 0,
+                 lock_timeout: int = CACHE_LOCK_TIMEOUT, tags: TagSpec = None):
     """Decorator to cache function results
     
+    Concurrent misses for the same arguments are computed once: callers in
+    this process wait for the first one, and other workers wait on a Redis
+    lock for its result. ``None`` results are not cached.
+    
     Args:
         expire: Cache expiration time in seconds (default: 5 minutes)
         key_prefix: Prefix for cache keys
+        stale_ttl: Seconds past ``expire`` during which the old value is
+            still returned while a background thread recomputes it
+        lock_timeout: Seconds a worker may hold the recompute lock
+        tags: Tags registered for every entry (see ``CacheManager.invalidate_tags``),
+            or a function of the call's arguments returning them
     
     Returns:
         Decorated function
@@ -306,31 +740,46 @@ def cache_result(expire: int = 300, key_prefix: str = ""):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{key_prefix}:{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
+            cache_key = make_cache_key(key_prefix, func, args, kwargs)
+            compute = lambda: func(*args, **kwargs)
+            store = partial(_write_entry, expire=expire, stale_ttl=stale_ttl,
+                            tags=_resolve_tags(tags, args, kwargs))
             
             # Try to get from cache
-            cached_result = redis_service.get(cache_key)
-            if cached_result is not None:
+            value, stale = _read_entry(cache_key)
+            if value is not _MISSING:
                 logger.debug(f"Cache hit for key: {cache_key}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            if result is not None:
-                redis_service.set(cache_key, result, expire)
-                logger.debug(f"Cached result for key: {cache_key}")
+                if stale and f"refresh:{cache_key}" not in _flights:
+                    threading.Thread(
+                        target=_single_flight,
+                        args=(f"refresh:{cache_key}",
+                              lambda: _try_refresh(cache_key, compute, store, lock_timeout)),
+                        daemon=True
+                    ).start()
+                return value
             
-            return result
+            # Execute function once for every concurrent caller and cache result
+            return _single_flight(
+                cache_key, lambda: _load(cache_key, compute, store, lock_timeout)
+            )
         return wrapper
     return decorator
 
-def cache_async_result(expire: int = 300, key_prefix: str = ""):
+def cache_async_result(expire: int = 300, key_prefix: str = "", stale_ttl: int = 0,
+                       lock_timeout: int = CACHE_LOCK_TIMEOUT, tags: TagSpec = None):
     """Decorator to cache async function results
     
+    Behaves like ``cache_result``; stale values are refreshed by a task on
+    the running event loop.
+    
     Args:
         expire: Cache expiration time in seconds (default: 5 minutes)
         key_prefix: Prefix for cache keys
+        stale_ttl: Seconds past ``expire`` during which the old value is
+            still returned while a background task recomputes it
+        lock_timeout: Seconds a worker may hold the recompute lock
+        tags: Tags registered for every entry, or a function of the call's
+            arguments returning them
     
     Returns:
         Decorated async function
@@ -338,25 +787,32 @@ def cache_async_result(expire: int = 300, key_prefix: str = ""):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{key_prefix}:{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
+            cache_key = make_cache_key(key_prefix, func, args, kwargs)
+            compute = lambda: func(*args, **kwargs)
+            store = partial(_write_entry, expire=expire, stale_ttl=stale_ttl,
+                            tags=_resolve_tags(tags, args, kwargs))
             
-            # Try to get from cache
-            cached_result = redis_service.get(cache_key)
-            if cached_result is not None:
+            # Try to get from cache, without blocking the loop on the round trip
+            value, stale = await run_in_threadpool(_read_entry, cache_key)
+            if value is not _MISSING:
                 logger.debug(f"Cache hit for key: {cache_key}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            if result is not None:
-                redis_service.set(cache_key, result, expire)
-                logger.debug(f"Cached result for key: {cache_key}")
+                if stale and f"refresh:{cache_key}" not in _async_flights:
+                    task = asyncio.get_running_loop().create_task(_async_single_flight(
+                        f"refresh:{cache_key}",
+                        lambda: _async_refresh(cache_key, compute, store, lock_timeout)
+                    ))
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+                return value
             
-            return result
+            # Execute function once for every concurrent caller and cache result
+            return await _async_single_flight(
+                cache_key, lambda: _async_load(cache_key, compute, store, lock_timeout)
+            )
         return wrapper
     return decorator
 
+
 # Session management
 class SessionManager:
     """Redis-based session management"""
@@ -389,7 +845,8 @@ class SessionManager:
             "last_accessed": datetime.utcnow().isoformat()
         }
         
-        return redis_service.set(key, session_data, expire_time)
+        tags = [user_tag(data["user_id"])] if data.get("user_id") else None
+        return redis_service.set(key, session_data, expire_time, tags=tags)
     
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session data
@@ -462,10 +919,56 @@ session_manager = SessionManager()
 class CacheManager:
     """Utilities for cache management and invalidation"""
     
+    @staticmethod
+    def invalidate_tags(*tags: str) -> int:
+        """Delete every cache entry registered under any of the tags
+        
+        The tag set is renamed before its members are read, so keys tagged
+        while the invalidation runs start a fresh set instead of being lost.
+        
+        Args:
+            tags: Tags such as ``user_tag(user_id)``, ``land_tag(land_id)`` or ``MARKETPLACE_TAG``
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not redis_service.is_connected or not redis_service.redis_client:
+            keys = {key for tag in tags for key in redis_service._pop_memory_tag(tag)}
+            return redis_service.delete_many(list(keys))
+        
+        client = redis_service.redis_client
+        deleted = 0
+        for tag in tags:
+            purging = f"{_tag_key(tag)}:purging:{uuid.uuid4().hex}"
+            try:
+                client.rename(_tag_key(tag), purging)
+            except redis.ResponseError:
+                continue  # Nothing tagged
+            try:
+                deleted += CacheManager._delete_in_batches(client.sscan_iter(purging, count=CACHE_INVALIDATE_BATCH))
+            finally:
+                client.unlink(purging)
+        return deleted
+    
+    @staticmethod
+    def _delete_in_batches(keys) -> int:
+        deleted = 0
+        batch: List[str] = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= CACHE_INVALIDATE_BATCH:
+                deleted += redis_service.delete_many(batch)
+                batch = []
+        return deleted + redis_service.delete_many(batch)
+    
     @staticmethod
     def invalidate_pattern(pattern: str) -> int:
         """Invalidate cache keys matching a pattern
         
+        Walks the keyspace with SCAN, so Redis keeps serving other clients,
+        but the cost still grows with the number of keys. Meant for ad-hoc
+        admin use; application code should invalidate by tag.
+        
         Args:
             pattern: Redis key pattern (e.g., "user:*", "cache:api:*")
             
@@ -473,13 +976,12 @@ class CacheManager:
             Number of keys deleted
         """
         if not redis_service.is_connected or not redis_service.redis_client:
-            return 0
+            return redis_service.delete_many(redis_service._memory_store.keys(pattern))
         
         try:
-            keys = redis_service.redis_client.keys(pattern)
-            if keys:
-                return redis_service.delete(*keys)
-            return 0
+            return CacheManager._delete_in_batches(
+                redis_service.redis_client.scan_iter(match=pattern, count=CACHE_INVALIDATE_BATCH)
+            )
         except Exception as e:
             logger.error(f"Cache invalidation error for pattern '{pattern}': {e}")
             return 0
@@ -494,17 +996,29 @@ class CacheManager:
         Returns:
             Number of keys deleted
         """
-        patterns = [
-            f"user:{user_id}:*",
-            f"*:user:{user_id}:*",
-            f"session:{user_id}*"
-        ]
-        
-        total_deleted = 0
-        for pattern in patterns:
-            total_deleted += CacheManager.invalidate_pattern(pattern)
+        return CacheManager.invalidate_tags(user_tag(user_id))
+    
+    @staticmethod
+    def clear_land_cache(land_id, marketplace: bool = False) -> int:
+        """Clear cache entries holding data of a land
         
-        return total_deleted
+        Args:
+            land_id: Land identifier
+            marketplace: Also clear every marketplace page, for changes that can
+                move the land onto pages it is not on yet (publishing, edits)
+            
+        Returns:
+            Number of keys deleted
+        """
+        tags = [land_tag(land_id)]
+        if marketplace:
+            tags.append(MARKETPLACE_TAG)
+        try:
+            return CacheManager.invalidate_tags(*tags)
+        except Exception as e:
+            # The write already committed; cached copies expire with their TTL
+            logger.error(f"Cache invalidation for land {land_id} failed: {e}")
+            return 0
     
     @staticmethod
     def get_cache_stats() -> Dict[str, Any]:
@@ -0,0 +1,297 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Set
+import logging
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+# Resumable upload configuration
+RESUMABLE_UPLOAD_DIR = Path(settings.get('RESUMABLE_UPLOAD_DIR', str(Path(settings.UPLOAD_DIR) / "partial")))
+RESUMABLE_UPLOAD_TTL = settings.get('RESUMABLE_UPLOAD_TTL', 86400)  # 24 hours
+RESUMABLE_MAX_FILE_SIZE = settings.get('RESUMABLE_MAX_FILE_SIZE', 1024 * 1024 * 1024)  # 1GB
+RESUMABLE_LOCK_TTL = settings.get('RESUMABLE_LOCK_TTL', 60)  # Seconds; renewed while bytes keep arriving
+RESUMABLE_PURGE_INTERVAL = settings.get('RESUMABLE_PURGE_INTERVAL', 3600)  # Seconds between stale partial sweeps
+
+SESSION_PREFIX = "upload_session"
+LOCK_PREFIX = "lock:upload_session"
+
+# Uploads locked by this process when Redis is unavailable (sessions then live in memory too)
+_local_locks: Set[str] = set()
+
+_purger: Optional[threading.Thread] = None
+_purger_stop = threading.Event()
+
+
+def _session_key(upload_id: str) -> str:
+    """Generate the redis key of an upload session"""
+    return f"{SESSION_PREFIX}:{upload_id}"
+
+
+def partial_path(upload_id: str) -> Path:
+    """Location of the partially uploaded bytes of a session"""
+    return RESUMABLE_UPLOAD_DIR / f"{upload_id}.part"
+
+
+def current_offset(upload_id: str) -> int:
+    """Number of bytes persisted so far - the partial file is the source of truth"""
+    try:
+        return partial_path(upload_id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def purge_stale_partials(max_age: int = RESUMABLE_UPLOAD_TTL) -> int:
+    """Delete partial files whose session has outlived the TTL.
+
+    Redis expires the session metadata on its own; this reclaims the disk
+    space held by the matching partial files.
+    """
+    if not RESUMABLE_UPLOAD_DIR.exists():
+        return 0
+
+    cutoff = time.time() - max_age
+    removed = 0
+    for part in RESUMABLE_UPLOAD_DIR.glob("*.part"):
+        try:
+            if part.stat().st_mtime < cutoff and not redis_service.exists(_session_key(part.stem)):
+                part.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def start_partial_purger(interval: float = RESUMABLE_PURGE_INTERVAL):
+    """Run ``purge_stale_partials`` every ``interval`` seconds on a daemon thread."""
+    global _purger
+    if _purger:
+        return
+    _purger_stop.clear()
+
+    def run():
+        while not _purger_stop.wait(interval):
+            try:
+                removed = purge_stale_partials()
+                if removed:
+                    logger.info(f"Removed {removed} abandoned partial upload(s)")
+            except Exception as e:
+                logger.error(f"Partial upload purge error: {e}")
+
+    _purger = threading.Thread(target=run, name="partial-upload-purger", daemon=True)
+    _purger.start()
+
+
+def stop_partial_purger():
+    """Stop the background sweep of stale partial files."""
+    global _purger
+    if _purger:
+        _purger_stop.set()
+        _purger.join(timeout=5)
+        _purger = None
+
+
+def create_upload_session(
+    land_id: str,
+    user_id: str,
+    document_type: str,
+    file_name: str,
+    file_size: int
+) -> Dict[str, Any]:
+    """Create a resumable upload session and its empty partial file"""
+    if file_size > RESUMABLE_MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size: {RESUMABLE_MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+
+    upload_id = str(uuid.uuid4())
+    session = {
+        "upload_id": upload_id,
+        "land_id": land_id,
+        "user_id": user_id,
+        "document_type": document_type,
+        "file_name": file_name,
+        "file_size": file_size,
+        "expires_at": (datetime.utcnow() + timedelta(seconds=RESUMABLE_UPLOAD_TTL)).isoformat()
+    }
+
+    RESUMABLE_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    partial_path(upload_id).touch()
+
+    if not redis_service.set(_session_key(upload_id), session, RESUMABLE_UPLOAD_TTL):
+        partial_path(upload_id).unlink()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Upload session could not be created"
+        )
+
+    return session
+
+
+def get_upload_session(upload_id: str, current_user: dict) -> Dict[str, Any]:
+    """Load an upload session owned by the current user (or any, for admins)"""
+    session = redis_service.get(_session_key(upload_id))
+    if not session or not isinstance(session, dict):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
+        )
+
+    is_admin = "administrator" in current_user.get("roles", [])
+    if not is_admin and session["user_id"] != str(current_user["user_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions for this upload session"
+        )
+
+    return session
+
+
+class UploadLock:
+    """Exclusive hold on an upload session while a request writes or finalizes it.
+
+    A client retrying a PATCH that timed out can race its original request,
+    and a repeated complete call could create the document twice. The lock
+    is a Redis key set with NX and a TTL, so a crashed worker cannot hold it
+    forever; the second request gets 409 instead of waiting.
+    """
+
+    def __init__(self, upload_id: str):
+        self.upload_id = upload_id
+        self._lock = None
+        self._renew_at = 0.0
+
+    def __enter__(self) -> "UploadLock":
+        if redis_service.is_connected and redis_service.redis_client:
+            self._lock = redis_service.redis_client.lock(
+                f"{LOCK_PREFIX}:{self.upload_id}", timeout=RESUMABLE_LOCK_TTL
+            )
+            acquired = self._lock.acquire(blocking=False)
+        else:
+            acquired = self.upload_id not in _local_locks
+            if acquired:
+                _local_locks.add(self.upload_id)
+
+        if not acquired:
+            self._lock = None
+            offset = current_offset(self.upload_id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Another request is writing to this upload. Retry once it has finished",
+                headers={"Upload-Offset": str(offset)}
+            )
+        self._renew_at = time.monotonic() + RESUMABLE_LOCK_TTL / 2
+
+        # The holder before us may have completed or cancelled the upload
+        if not redis_service.exists(_session_key(self.upload_id)):
+            self.__exit__(None, None, None)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found or expired"
+            )
+        return self
+
+    def keep_alive(self):
+        """Extend the TTL of the lock during long writes."""
+        if self._lock is not None and time.monotonic() >= self._renew_at:
+            self._lock.reacquire()
+            self._renew_at = time.monotonic() + RESUMABLE_LOCK_TTL / 2
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._lock is None:
+            _local_locks.discard(self.upload_id)
+            return
+        try:
+            self._lock.release()
+        except Exception as e:
+            # Expired while held; another request may own it now
+            logger.debug(f"Upload lock release failed: {e}")
+        self._lock = None
+
+
+def _open_at(path: Path, offset: int) -> BinaryIO:
+    """Open a partial file for writing at ``offset``"""
+    fh = open(path, "r+b")
+    fh.seek(offset)
+    return fh
+
+
+async def append_chunk(session: Dict[str, Any], offset: int, body: AsyncIterator[bytes]) -> int:
+    """Write a request body into the partial file at ``offset``.
+
+    The client must send the offset it believes the server has; a mismatch
+    is answered with 409 so it can re-query and resume, as is a request
+    arriving while another one holds the upload. Bytes are written as they
+    arrive, in the thread pool, so a dropped connection keeps everything
+    received without a slow disk stalling the event loop.
+    Returns the new offset.
+    """
+    upload_id = session["upload_id"]
+    with UploadLock(upload_id) as lock:
+        expected = current_offset(upload_id)
+        if offset != expected:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload offset mismatch. Current offset: {expected}",
+                headers={"Upload-Offset": str(expected)}
+            )
+
+        limit = session["file_size"]
+        position = offset
+        fh = await run_in_threadpool(_open_at, partial_path(upload_id), offset)
+        try:
+            async for chunk in body:
+                if position + len(chunk) > limit:
+                    # Discard this request's bytes so the offset stays consistent
+                    await run_in_threadpool(fh.truncate, offset)
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Chunk exceeds the declared file size of {limit} bytes"
+                    )
+                await run_in_threadpool(fh.write, chunk)
+                position += len(chunk)
+                lock.keep_alive()
+        finally:
+            await run_in_threadpool(fh.close)
+
+    # Keep the session alive while the client is making progress
+    redis_service.expire(_session_key(upload_id), RESUMABLE_UPLOAD_TTL)
+    return position
+
+
+def claim_upload_session(session: Dict[str, Any]):
+    """Take a session out of Redis before finalizing it.
+
+    Deleting the key is atomic, so exactly one request gets to create the
+    document however long hashing and storing the file take - the upload
+    lock alone expires after ``RESUMABLE_LOCK_TTL``. Later requests for the
+    session get 404. Call ``restore_upload_session`` if finalizing fails.
+    """
+    if not redis_service.delete(_session_key(session["upload_id"])):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
+        )
+
+
+def restore_upload_session(session: Dict[str, Any]):
+    """Put a claimed session back so the client can retry completing it"""
+    redis_service.set(_session_key(session["upload_id"]), session, RESUMABLE_UPLOAD_TTL)
+
+
+def discard_upload_session(upload_id: str):
+    """Remove an upload session and its partial file"""
+    redis_service.delete(_session_key(upload_id))
+    try:
+        partial_path(upload_id).unlink()
+    except FileNotFoundError:
+        pass
@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from datetime import timedelta
 from typing import Optional
-from database import get_db, get_user_by_email
+from database import get_async_db, get_user_by_email
 from models.schemas import (
     UserCreate, UserResponse, UserLogin, Token, ErrorResponse, SuccessResponse,
     VerificationRequest, VerificationConfirm
 )
 from models.users import User, UserRole
 from models.lookup_tables import LuRole
-from auth import authenticate_user, create_access_token, get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES, get_password_hash
+from auth import authenticate_user, create_user_token, invalidate_principal, get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
+from password_hashing import hash_password
 from pydantic import ValidationError
 from rate_limiter import enhanced_limiter, RateLimits
 from redis_service import redis_service
@@ -109,18 +111,18 @@ async def register_user(
     background_tasks: BackgroundTasks,
     user_data: UserCreate, 
     send_verification: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         # Check if user already exists
-        if get_user_by_email(db, user_data.email):
+        if await get_user_by_email(db, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         db_user = User(
             email=user_data.email,
             password_hash=hashed_password,
@@ -131,21 +133,23 @@ async def register_user(
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         # Add roles if provided (make robust in environments where lookup tables may be missing)
         try:
             for role_key in user_data.roles:
-                role = db.query(LuRole).filter(LuRole.role_key == role_key).first()
+                role = (await db.execute(select(LuRole).where(LuRole.role_key == role_key))).scalars().first()
                 if role:
                     user_role = UserRole(user_id=db_user.user_id, role_key=role_key)
                     db.add(user_role)
-            db.commit()
+            await db.commit()
         except Exception:
             # If role assignment fails (e.g., lookup table missing), continue without roles
             try:
-                db.rollback()
+                await db.rollback()
+                # The rollback expired db_user, and it cannot lazy-load on an AsyncSession
+                await db.refresh(db_user)
             except Exception:
                 pass
         
@@ -172,7 +176,7 @@ async def register_user(
                     pass
         
         # Get user roles for response
-        user_roles = db.query(UserRole).filter(UserRole.user_id == db_user.user_id).all()
+        user_roles = (await db.execute(select(UserRole).where(UserRole.user_id == db_user.user_id))).scalars().all()
         roles = [ur.role_key for ur in user_roles]
         
         try:
@@ -275,8 +279,8 @@ async def register_user(
     }
 )
 @enhanced_limiter.limit(RateLimits.AUTH_LOGIN)
-async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -285,9 +289,7 @@ async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequ
         )
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user["user_id"])}, expires_delta=access_token_expires
-    )
+    access_token = create_user_token(user, expires_delta=access_token_expires)
 
     return Token(access_token=access_token, token_type="bearer", user=user)
 
@@ -381,19 +383,19 @@ async def register_with_verification(
     request: Request,
     background_tasks: BackgroundTasks,
     user_data: UserCreate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register user and automatically send verification code"""
     try:
         # Check if user already exists
-        if get_user_by_email(db, user_data.email):
+        if await get_user_by_email(db, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         db_user = User(
             email=user_data.email,
             password_hash=hashed_password,
@@ -404,20 +406,21 @@ async def register_with_verification(
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         # Add roles
         try:
             for role_key in user_data.roles:
-                role = db.query(LuRole).filter(LuRole.role_key == role_key).first()
+                role = (await db.execute(select(LuRole).where(LuRole.role_key == role_key))).scalars().first()
                 if role:
                     user_role = UserRole(user_id=db_user.user_id, role_key=role_key)
                     db.add(user_role)
-            db.commit()
+            await db.commit()
         except Exception:
             try:
-                db.rollback()
+                await db.rollback()
+                await db.refresh(db_user)
             except Exception:
                 pass
         
@@ -472,9 +475,9 @@ async def request_verification_code(
     request: Request,
     background_tasks: BackgroundTasks,
     payload: VerificationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = get_user_by_email(db, payload.email)
+    user = await get_user_by_email(db, payload.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     if user.get("is_verified"):
@@ -516,8 +519,8 @@ async def request_verification_code(
     description="Validate the verification code and mark the user as verified.",
 )
 @enhanced_limiter.limit(RateLimits.API_WRITE)
-async def confirm_verification_code(request: Request, payload: VerificationConfirm, db: Session = Depends(get_db)):
-    user = get_user_by_email(db, payload.email)
+async def confirm_verification_code(request: Request, payload: VerificationConfirm, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email(db, payload.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -530,17 +533,18 @@ async def confirm_verification_code(request: Request, payload: VerificationConfi
             pass
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired verification code")
 
-    db_user = db.query(User).filter(User.user_id == user["user_id"]).first()
+    db_user = (await db.execute(select(User).where(User.user_id == user["user_id"]))).scalars().first()
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     db_user.is_verified = True
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_principal(db_user.user_id)
 
     redis_service.delete(key)
 
-    user_roles = db.query(UserRole).filter(UserRole.user_id == db_user.user_id).all()
+    user_roles = (await db.execute(select(UserRole).where(UserRole.user_id == db_user.user_id))).scalars().all()
     roles = [ur.role_key for ur in user_roles]
 
     try:
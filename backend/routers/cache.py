@@ -3,6 +3,7 @@ from typing import Dict, Any, Optional
 import logging
 
 from redis_service import redis_service, cache_manager, session_manager
+from principal_cache import principal_cache
 from auth import get_current_user
 from models.schemas import SuccessResponse, ErrorResponse
 from rate_limiter import enhanced_limiter, RateLimits
@@ -83,6 +84,7 @@ def get_cache_status(
         return {
             "redis_health": redis_health,
             "cache_stats": cache_stats,
+            "principal_cache": principal_cache.stats(),
             "timestamp": request.state.__dict__.get('start_time', 0)
         }
         
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import Response, StreamingResponse, FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Header, Request, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse, FileResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
 from uuid import UUID
@@ -8,64 +9,78 @@ from pathlib import Path
 import io
 import os
 import uuid
+from collections import Counter
 from datetime import datetime
 
-from database import get_db
+from database import get_async_db
 from auth import get_current_user, require_admin
+from pagination import keyset_page, set_next_cursor
+from document_storage import (
+    ingest_upload, ingest_uploads, ingest_path, build_range_response, iter_document_data_range, iter_file_range,
+    etag_matches, metadata_etag, content_etag, validator_headers, is_not_modified, not_modified_response,
+    ArchiveEntry, build_archive_response, unique_archive_name, UPLOAD_BATCH_MAX_FILES
+)
+from blob_store import put_blob_async, iter_blob_range, release_blob
+from document_previews import generate_preview, can_preview, preview_etag, preview_failed, PREVIEW_RETRY_AFTER
+from document_search import index_document_text, search_documents, highlight_snippet
+from resumable_uploads import (
+    create_upload_session, get_upload_session, append_chunk, current_offset,
+    partial_path, discard_upload_session, claim_upload_session, restore_upload_session,
+    UploadLock, RESUMABLE_MAX_FILE_SIZE
+)
 from models.schemas import (
-    DocumentCreate, DocumentUpdate, Document,
+    DocumentCreate, DocumentUpdate, Document, DocumentSearchResult,
+    DocumentReviewBatch, DocumentReviewResult, DocumentReviewBatchResponse,
+    DocumentUploadResult, DocumentBatchUploadResponse,
+    UploadSessionCreate, UploadSession,
     MessageResponse
 )
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
 # Configuration
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx", ".jpg", ".jpeg", ".png", ".tiff", ".txt"}
 
+# Document types each reviewer role may see (per Workflow.txt roles_assignment)
+# Using the actual document_type values as stored in database (section IDs)
+ROLE_DOCUMENT_MAPPING = {
+    "re_sales_advisor": [
+        "land-valuation",
+        "ownership-documents",
+        "sale-contracts"
+    ],
+    "re_analyst": [
+        "topographical-surveys",
+        "grid-connectivity",
+        "financial-models"
+    ],
+    "re_governance_lead": [
+        "zoning-approvals",
+        "environmental-impact",
+        "government-nocs"
+    ]
+}
+
 # Helper functions
-def validate_file(file: UploadFile) -> tuple[bool, str]:
-    """Validate uploaded file"""
-    # Check file extension
-    file_ext = Path(file.filename).suffix.lower()
+def validate_file_name(file_name: str) -> tuple[bool, str]:
+    """Validate the extension of an uploaded file name"""
+    file_ext = Path(file_name).suffix.lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         return False, f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
     
     return True, "Valid"
 
-def read_file_bytes(file: UploadFile) -> tuple[bytes, int]:
-    """Read file content as bytes and return data with size"""
-    file_data = b""
-    file_size = 0
-    
-    # Read file in chunks
-    while chunk := file.file.read(8192):
-        file_size += len(chunk)
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
-            )
-        file_data += chunk
-    
-    return file_data, file_size
+def validate_file(file: UploadFile) -> tuple[bool, str]:
+    """Validate uploaded file"""
+    return validate_file_name(file.filename)
 
-# Document endpoints
-@router.post("/upload/{land_id}", response_model=Document)
-async def upload_document(
-    land_id: UUID,
-    document_type: str = Form(...),
-    file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Upload a document for a land (owner or admin only)."""
-    # Check if land exists and user has permission
+async def check_land_upload_permission(land_id: UUID, current_user: dict, db: AsyncSession):
+    """Ensure the land exists and the user may upload documents for it (owner or admin)."""
     land_check = text("""
         SELECT landowner_id, status FROM lands WHERE land_id = :land_id
     """)
     
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -86,6 +101,169 @@ async def upload_document(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to upload documents for this land"
         )
+
+async def resolve_land_document_access(land_id: UUID, current_user: dict, db: AsyncSession) -> Optional[List[str]]:
+    """Check that the user may view documents of a land.
+    
+    Returns the document types the user is limited to (reviewers with a
+    mapped role), or None when every document of the land is visible.
+    """
+    land_check = text("""
+        SELECT landowner_id, status FROM lands WHERE land_id = :land_id
+    """)
+    
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
+    
+    if not land_result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Land not found"
+        )
+    
+    # Check permissions - convert to strings for comparison
+    user_roles = current_user.get("roles", [])
+    user_id_str = str(current_user["user_id"])
+    landowner_id_str = str(land_result.landowner_id)
+    
+    is_admin = "administrator" in user_roles
+    is_owner = landowner_id_str == user_id_str
+    is_published = land_result.status == "published"
+    
+    if is_admin or is_owner or is_published:
+        return None
+    
+    # Check if user has a task assigned for this land
+    reviewer_check = text("""
+        SELECT assigned_role FROM tasks 
+        WHERE land_id = :land_id AND assigned_to = :user_id
+        LIMIT 1
+    """)
+    reviewer_result = (await db.execute(
+        reviewer_check, 
+        {"land_id": str(land_id), "user_id": user_id_str}
+    )).fetchone()
+    
+    if not reviewer_result:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view documents for this land"
+        )
+    
+    # Filter documents based on reviewer role (per Workflow.txt)
+    return ROLE_DOCUMENT_MAPPING.get(reviewer_result.assigned_role) or None
+
+def document_type_filter(allowed_types: Optional[List[str]], params: dict) -> str:
+    """SQL condition limiting ``d.document_type`` to ``allowed_types`` ("" if unrestricted)."""
+    if not allowed_types:
+        return ""
+    
+    # Create placeholders for IN clause
+    placeholders = ", ".join([f":doc_type_{i}" for i in range(len(allowed_types))])
+    for i, doc_type in enumerate(allowed_types):
+        params[f"doc_type_{i}"] = doc_type
+    return f"d.document_type IN ({placeholders})"
+
+def document_access_condition(current_user: dict, params: dict) -> str:
+    """SQL condition over ``d``/``l`` matching the rules of ``get_land_documents``.
+    
+    Admins see everything; others see documents of lands they own, published
+    lands, and lands where they are assigned a task - limited to the document
+    types of that task's reviewer role when the role is mapped.
+    """
+    if "administrator" in current_user.get("roles", []):
+        return ""
+    
+    params["access_user_id"] = str(current_user["user_id"])
+    
+    role_conditions = []
+    mapped_roles = []
+    for i, (role, doc_types) in enumerate(ROLE_DOCUMENT_MAPPING.items()):
+        params[f"access_role_{i}"] = role
+        mapped_roles.append(f":access_role_{i}")
+        placeholders = []
+        for j, doc_type in enumerate(doc_types):
+            params[f"access_role_{i}_type_{j}"] = doc_type
+            placeholders.append(f":access_role_{i}_type_{j}")
+        role_conditions.append(
+            f"(tk.assigned_role = :access_role_{i} AND d.document_type IN ({', '.join(placeholders)}))"
+        )
+    
+    return f"""(
+        l.landowner_id = :access_user_id
+        OR l.status = 'published'
+        OR EXISTS (
+            SELECT 1 FROM tasks tk
+            WHERE tk.land_id = d.land_id AND tk.assigned_to = :access_user_id
+              AND (tk.assigned_role IS NULL
+                   OR tk.assigned_role NOT IN ({', '.join(mapped_roles)})
+                   OR {' OR '.join(role_conditions)})
+        )
+    )"""
+
+def schedule_document_processing(background_tasks: BackgroundTasks, content_hash: str):
+    """Queue preview rendering and text indexing to run after the response."""
+    background_tasks.add_task(generate_preview, content_hash)
+    background_tasks.add_task(index_document_text, content_hash)
+
+def document_byte_source(document_id, row):
+    """Locate the bytes of a document.
+    
+    ``row`` must carry content_hash, blob_size, storage_backend, chunk_size,
+    codec, data_length and file_path. Returns ``(range_iter, size)`` or None when
+    no stored copy exists.
+    """
+    # Content-addressed blob store
+    if row.content_hash and row.blob_size is not None:
+        return (lambda start, end: iter_blob_range(row, start, end)), row.blob_size
+    
+    # Inline database blob storage (documents not yet backfilled)
+    if row.data_length:
+        return (lambda start, end: iter_document_data_range(str(document_id), start, end)), row.data_length
+    
+    # Fallback to file system (legacy method for old documents)
+    if row.file_path and os.path.exists(row.file_path):
+        return (lambda start, end: iter_file_range(row.file_path, start, end)), os.path.getsize(row.file_path)
+    
+    return None
+
+# Columns needed by document_byte_source, selected without loading any bytes
+DOCUMENT_SOURCE_COLUMNS = """
+    d.file_path, d.content_hash, b.size AS blob_size, b.storage_backend, b.chunk_size, b.codec,
+    CASE WHEN d.content_hash IS NULL THEN length(d.file_data) END AS data_length
+"""
+
+def build_document_archive(rows, archive_name: str) -> StreamingResponse:
+    """Stream the given document rows as a ZIP, one folder per document type."""
+    used_names = set()
+    entries = []
+    for row in rows:
+        source = document_byte_source(row.document_id, row)
+        if source is None:
+            continue
+        range_iter, size = source
+        entries.append(ArchiveEntry(
+            name=unique_archive_name(f"{row.document_type or 'other'}/{row.file_name}", used_names),
+            size=size,
+            mime_type=row.mime_type,
+            modified=row.created_at,
+            open_range=range_iter
+        ))
+    
+    return build_archive_response(entries, archive_name)
+
+# Document endpoints
+@router.post("/upload/{land_id}", response_model=Document)
+async def upload_document(
+    land_id: UUID,
+    background_tasks: BackgroundTasks,
+    document_type: str = Form(...),
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Upload a document for a land (owner or admin only)."""
+    # Check if land exists and user has permission
+    await check_land_upload_permission(land_id, current_user, db)
     
     # Validate file
     is_valid, error_msg = validate_file(file)
@@ -95,109 +273,378 @@ async def upload_document(
             detail=error_msg
         )
     
+    # Stream the upload once: size, hash and MIME sniffing happen in the same pass
+    ingested = await run_in_threadpool(ingest_upload, file)
+    
     try:
-        # Read file bytes
-        file_data, file_size = read_file_bytes(file)
-        
-        # Determine MIME type
-        mime_type = file.content_type or 'application/octet-stream'
+        # Store the bytes once in the blob store, then reference them by hash
+        content_hash = await put_blob_async(db, ingested)
         
-        # Create document record with binary data
         document_id = str(uuid.uuid4())
         insert_query = text("""
             INSERT INTO documents (
                 document_id, land_id, document_type, file_name, 
-                file_data, file_size, uploaded_by, mime_type, is_draft
+                content_hash, file_size, uploaded_by, mime_type, is_draft
             ) VALUES (
                 :document_id, :land_id, :document_type, :file_name,
-                :file_data, :file_size, :uploaded_by, :mime_type, :is_draft
+                :content_hash, :file_size, :uploaded_by, :mime_type, :is_draft
             )
         """)
         
-        db.execute(insert_query, {
+        await db.execute(insert_query, {
             "document_id": document_id,
             "land_id": str(land_id),
             "document_type": document_type,
             "file_name": file.filename,
-            "file_data": file_data,
-            "file_size": file_size,
+            "content_hash": content_hash,
+            "file_size": ingested.size,
             "uploaded_by": current_user["user_id"],
-            "mime_type": mime_type,
+            "mime_type": ingested.mime_type,
             "is_draft": True
         })
         
-        db.commit()
+        await db.commit()
+        
+        # Render the preview and index the text once the response has been sent
+        schedule_document_processing(background_tasks, content_hash)
         
         # Fetch the created document
-        return await get_document(UUID(document_id), current_user, db)
+        return document_from_row(await load_document(UUID(document_id), current_user, db))
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload document: {str(e)}"
         )
+    finally:
+        ingested.close()
 
-@router.get("/land/{land_id}", response_model=List[Document])
-async def get_land_documents(
+async def put_blob_in_savepoint(db: AsyncSession, ingested) -> str:
+    """Register a blob inside a savepoint so one failed write doesn't abort the batch"""
+    async with db.begin_nested():
+        return await put_blob_async(db, ingested)
+
+
+@router.post("/upload/{land_id}/batch", response_model=DocumentBatchUploadResponse)
+async def upload_documents_batch(
     land_id: UUID,
-    document_type: Optional[str] = None,
+    background_tasks: BackgroundTasks,
+    document_type: str = Form(...),
+    files: List[UploadFile] = File(...),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all documents for a land."""
-    # Check if land exists and user has permission
-    land_check = text("""
-        SELECT landowner_id, status FROM lands WHERE land_id = :land_id
-    """)
+    """Upload several documents of one type for a land (owner or admin only).
+    
+    Permissions are checked once, the files are ingested concurrently, all
+    document rows are inserted with one executemany and committed together.
+    Each file gets its own result, so a bad file does not fail the batch.
+    """
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per request: {UPLOAD_BATCH_MAX_FILES}"
+        )
     
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    await check_land_upload_permission(land_id, current_user, db)
     
-    if not land_result:
+    errors = {}
+    accepted = []
+    for index, file in enumerate(files):
+        is_valid, error_msg = validate_file(file)
+        if is_valid:
+            accepted.append(index)
+        else:
+            errors[index] = error_msg
+    
+    ingested = dict(zip(accepted, await ingest_uploads([files[index] for index in accepted])))
+    
+    document_ids = {}
+    rows = []
+    try:
+        for index, item in list(ingested.items()):
+            if isinstance(item, Exception):
+                errors[index] = item.detail if isinstance(item, HTTPException) else str(item)
+                del ingested[index]
+                continue
+            
+            try:
+                content_hash = await put_blob_in_savepoint(db, item)
+            except Exception as e:
+                errors[index] = f"Failed to store file: {str(e)}"
+                continue
+            
+            document_ids[index] = str(uuid.uuid4())
+            rows.append({
+                "document_id": document_ids[index],
+                "land_id": str(land_id),
+                "document_type": document_type,
+                "file_name": files[index].filename,
+                "content_hash": content_hash,
+                "file_size": item.size,
+                "uploaded_by": current_user["user_id"],
+                "mime_type": item.mime_type,
+                "is_draft": True
+            })
+        
+        if rows:
+            await db.execute(text("""
+                INSERT INTO documents (
+                    document_id, land_id, document_type, file_name, 
+                    content_hash, file_size, uploaded_by, mime_type, is_draft
+                ) VALUES (
+                    :document_id, :land_id, :document_type, :file_name,
+                    :content_hash, :file_size, :uploaded_by, :mime_type, :is_draft
+                )
+            """), rows)
+        
+        await db.commit()
+        
+    except Exception as e:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Land not found"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload documents: {str(e)}"
         )
+    finally:
+        for item in ingested.values():
+            if not isinstance(item, Exception):
+                item.close()
+    
+    for content_hash in dict.fromkeys(row["content_hash"] for row in rows):
+        schedule_document_processing(background_tasks, content_hash)
+    
+    # Read the created rows back in one query for the response
+    created = {}
+    if document_ids:
+        params = {f"id_{i}": document_id for i, document_id in enumerate(document_ids.values())}
+        created_rows = (await db.execute(text(f"""
+            SELECT document_id, land_id, document_type, file_name, file_path, file_size,
+                   uploaded_by, created_at, mime_type, is_draft
+            FROM documents
+            WHERE document_id IN ({', '.join(':' + key for key in params)})
+        """), params)).fetchall()
+        for row in created_rows:
+            created[str(row.document_id)] = Document(
+                document_id=row.document_id,
+                land_id=row.land_id,
+                document_type=row.document_type,
+                file_name=row.file_name,
+                file_path=row.file_path,
+                file_size=row.file_size,
+                uploaded_by=row.uploaded_by,
+                created_at=row.created_at,
+                mime_type=row.mime_type,
+                is_draft=row.is_draft
+            )
     
-    # Check permissions - convert to strings for comparison
-    user_roles = current_user.get("roles", [])
-    user_id_str = str(current_user["user_id"])
-    landowner_id_str = str(land_result.landowner_id)
+    results = []
+    for index, file in enumerate(files):
+        document = created.get(document_ids.get(index))
+        results.append(DocumentUploadResult(
+            file_name=file.filename,
+            success=document is not None,
+            document=document,
+            error=None if document else errors.get(index, "Failed to upload document")
+        ))
+    
+    return DocumentBatchUploadResponse(
+        results=results,
+        uploaded=sum(1 for r in results if r.success),
+        failed=sum(1 for r in results if not r.success)
+    )
+
+# ========== RESUMABLE UPLOAD ENDPOINTS ==========
+
+def _upload_session_response(session: dict) -> UploadSession:
+    return UploadSession(
+        upload_id=session["upload_id"],
+        land_id=session["land_id"],
+        document_type=session["document_type"],
+        file_name=session["file_name"],
+        file_size=session["file_size"],
+        offset=current_offset(session["upload_id"]),
+        expires_at=session["expires_at"]
+    )
+
+@router.post("/upload/{land_id}/sessions", response_model=UploadSession, status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    land_id: UUID,
+    session_data: UploadSessionCreate,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Start a resumable upload for a land document (owner or admin only).
     
-    is_admin = "administrator" in user_roles
-    is_owner = landowner_id_str == user_id_str
-    is_published = land_result.status == "published"
+    Send the bytes with ``PATCH /documents/uploads/{upload_id}`` and finish
+    with ``POST /documents/uploads/{upload_id}/complete``.
+    """
+    await check_land_upload_permission(land_id, current_user, db)
     
-    # Check if user is a reviewer assigned to this land
-    is_reviewer = False
-    reviewer_role = None
-    if not (is_admin or is_owner or is_published):
-        # Check if user has a task assigned for this land
-        reviewer_check = text("""
-            SELECT assigned_role FROM tasks 
-            WHERE land_id = :land_id AND assigned_to = :user_id
-            LIMIT 1
+    is_valid, error_msg = validate_file_name(session_data.file_name)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+    
+    session = create_upload_session(
+        land_id=str(land_id),
+        user_id=str(current_user["user_id"]),
+        document_type=session_data.document_type,
+        file_name=session_data.file_name,
+        file_size=session_data.file_size
+    )
+    
+    response.headers["Location"] = f"{router.prefix}/uploads/{session['upload_id']}"
+    return _upload_session_response(session)
+
+@router.get("/uploads/{upload_id}", response_model=UploadSession)
+async def get_resumable_upload(
+    upload_id: UUID,
+    response: Response,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the current offset of a resumable upload."""
+    session = get_upload_session(str(upload_id), current_user)
+    result = _upload_session_response(session)
+    response.headers["Upload-Offset"] = str(result.offset)
+    return result
+
+@router.patch("/uploads/{upload_id}", response_model=UploadSession)
+async def upload_resumable_chunk(
+    upload_id: UUID,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    current_user: dict = Depends(get_current_user)
+):
+    """Append the request body to a resumable upload at ``Upload-Offset``."""
+    session = get_upload_session(str(upload_id), current_user)
+    
+    new_offset = await append_chunk(session, upload_offset, request.stream())
+    
+    response.headers["Upload-Offset"] = str(new_offset)
+    return _upload_session_response(session)
+
+@router.post("/uploads/{upload_id}/complete", response_model=Document)
+async def complete_resumable_upload(
+    upload_id: UUID,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Finalize a resumable upload and create the document."""
+    session = get_upload_session(str(upload_id), current_user)
+    land_id = UUID(session["land_id"])
+    
+    # Permissions may have changed since the session was created
+    await check_land_upload_permission(land_id, current_user, db)
+    
+    # A repeated complete call must not create the document twice. The lock
+    # covers the size check; claiming the session keeps every later request
+    # out while the file is hashed and stored, however long that takes.
+    with UploadLock(session["upload_id"]):
+        received = current_offset(session["upload_id"])
+        if received != session["file_size"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload incomplete: received {received} of {session['file_size']} bytes",
+                headers={"Upload-Offset": str(received)}
+            )
+        claim_upload_session(session)
+    
+    try:
+        # Hash and sniff the assembled file in place - no extra copy
+        ingested = await run_in_threadpool(
+            ingest_path,
+            str(partial_path(session["upload_id"])),
+            session["file_name"],
+            None,
+            RESUMABLE_MAX_FILE_SIZE
+        )
+    except Exception:
+        restore_upload_session(session)
+        raise
+    
+    try:
+        content_hash = await put_blob_async(db, ingested)
+        
+        document_id = str(uuid.uuid4())
+        insert_query = text("""
+            INSERT INTO documents (
+                document_id, land_id, document_type, file_name,
+                content_hash, file_size, uploaded_by, mime_type, is_draft
+            ) VALUES (
+                :document_id, :land_id, :document_type, :file_name,
+                :content_hash, :file_size, :uploaded_by, :mime_type, :is_draft
+            )
         """)
-        reviewer_result = db.execute(
-            reviewer_check, 
-            {"land_id": str(land_id), "user_id": user_id_str}
-        ).fetchone()
         
-        if reviewer_result:
-            is_reviewer = True
-            reviewer_role = reviewer_result.assigned_role
+        await db.execute(insert_query, {
+            "document_id": document_id,
+            "land_id": str(land_id),
+            "document_type": session["document_type"],
+            "file_name": session["file_name"],
+            "content_hash": content_hash,
+            "file_size": ingested.size,
+            "uploaded_by": current_user["user_id"],
+            "mime_type": ingested.mime_type,
+            "is_draft": True
+        })
+        
+        await db.commit()
     
-    if not (is_admin or is_owner or is_published or is_reviewer):
+    except Exception as e:
+        await db.rollback()
+        restore_upload_session(session)
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to view documents for this land"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload document: {str(e)}"
         )
+    finally:
+        ingested.close()
+    
+    discard_upload_session(session["upload_id"])
+    
+    schedule_document_processing(background_tasks, content_hash)
+    
+    return document_from_row(await load_document(UUID(document_id), current_user, db))
+
+@router.delete("/uploads/{upload_id}", response_model=MessageResponse)
+async def cancel_resumable_upload(
+    upload_id: UUID,
+    current_user: dict = Depends(get_current_user)
+):
+    """Abort a resumable upload and discard the bytes received so far."""
+    session = get_upload_session(str(upload_id), current_user)
+    discard_upload_session(session["upload_id"])
+    return MessageResponse(message="Upload cancelled")
+
+@router.get("/land/{land_id}", response_model=List[Document])
+async def get_land_documents(
+    land_id: UUID,
+    response: Response,
+    document_type: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all documents for a land.
+    
+    The ETag covers every listed row (content hash and metadata), so an
+    unchanged listing is answered with ``304 Not Modified``.
+    """
+    # Check if land exists and user has permission
+    allowed_types = await resolve_land_document_access(land_id, current_user, db)
     
     # Build query with optional document type filter
     base_query = """
         SELECT d.document_id, d.land_id, d.document_type, d.file_name,
                d.file_path, d.file_size, d.uploaded_by, d.created_at,
-               d.mime_type, d.is_draft,
+               d.mime_type, d.is_draft, d.content_hash,
                u.first_name || ' ' || u.last_name as uploader_name,
                l.title as land_title
         FROM documents d
@@ -207,37 +654,9 @@ async def get_land_documents(
     """
     
     params = {"land_id": str(land_id)}
-    
-    # Filter documents based on reviewer role (per Workflow.txt)
-    if is_reviewer and reviewer_role and not (is_admin or is_owner):
-        # Document type mapping based on Workflow.txt roles_assignment
-        # Using the actual document_type values as stored in database (section IDs)
-        role_document_mapping = {
-            "re_sales_advisor": [
-                "land-valuation",
-                "ownership-documents",
-                "sale-contracts"
-            ],
-            "re_analyst": [
-                "topographical-surveys",
-                "grid-connectivity",
-                "financial-models"
-            ],
-            "re_governance_lead": [
-                "zoning-approvals",
-                "environmental-impact",
-                "government-nocs"
-            ]
-        }
-        
-        allowed_docs = role_document_mapping.get(reviewer_role, [])
-        if allowed_docs:
-            # Create placeholders for IN clause
-            placeholders = ", ".join([f":doc_type_{i}" for i in range(len(allowed_docs))])
-            base_query += f" AND d.document_type IN ({placeholders})"
-            # Add document types to params
-            for i, doc_type in enumerate(allowed_docs):
-                params[f"doc_type_{i}"] = doc_type
+    type_filter = document_type_filter(allowed_types, params)
+    if type_filter:
+        base_query += f" AND {type_filter}"
     
     if document_type:
         base_query += " AND d.document_type = :document_type"
@@ -245,42 +664,217 @@ async def get_land_documents(
     
     base_query += " ORDER BY d.created_at DESC"
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
+    
+    headers = validator_headers(
+        metadata_etag(results),
+        max((row.created_at for row in results), default=None)
+    )
+    if is_not_modified(headers["ETag"], if_none_match):
+        return not_modified_response(headers)
+    
+    response.headers.update(headers)
+    return [document_from_row(row) for row in results]
+
+@router.get("/land/{land_id}/archive")
+async def download_land_archive(
+    land_id: UUID,
+    document_type: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download every document of a land the user may see as one ZIP.
+    
+    The archive is built while it is sent: each file is read in chunks
+    straight from storage, so nothing is buffered in memory or on disk.
+    """
+    allowed_types = await resolve_land_document_access(land_id, current_user, db)
+    
+    # Metadata only - bytes are read while the archive streams
+    base_query = f"""
+        SELECT d.document_id, d.document_type, d.file_name, d.mime_type, d.created_at,
+               {DOCUMENT_SOURCE_COLUMNS}
+        FROM documents d
+        LEFT JOIN document_blobs b ON d.content_hash = b.content_hash
+        WHERE d.land_id = :land_id
+    """
+    
+    params = {"land_id": str(land_id)}
+    type_filter = document_type_filter(allowed_types, params)
+    if type_filter:
+        base_query += f" AND {type_filter}"
+    
+    if document_type:
+        base_query += " AND d.document_type = :document_type"
+        params["document_type"] = document_type
+    
+    base_query += " ORDER BY d.document_type, d.created_at"
+    
+    results = (await db.execute(text(base_query), params)).fetchall()
+    
+    return build_document_archive(results, f"land-{land_id}-documents.zip")
+
+@router.get("/search", response_model=List[DocumentSearchResult])
+async def search_document_contents(
+    q: str = Query(..., min_length=2, max_length=200, description="Words, parcel numbers or references to find"),
+    land_id: Optional[UUID] = None,
+    document_type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search the text of uploaded documents (.txt, .pdf, .docx).
+    
+    Results follow the same permission rules as ``get_land_documents`` and
+    are ranked by relevance, each with a highlighted snippet.
+    """
+    params = {}
+    conditions = []
+    
+    if land_id:
+        # Scoped search - exactly the documents get_land_documents would list
+        allowed_types = await resolve_land_document_access(land_id, current_user, db)
+        conditions.append("d.land_id = :land_id")
+        params["land_id"] = str(land_id)
+        type_filter = document_type_filter(allowed_types, params)
+        if type_filter:
+            conditions.append(type_filter)
+    else:
+        access_condition = document_access_condition(current_user, params)
+        if access_condition:
+            conditions.append(access_condition)
+    
+    if document_type:
+        conditions.append("d.document_type = :document_type")
+        params["document_type"] = document_type
+    
+    try:
+        results = await db.run_sync(search_documents, q, " AND ".join(conditions), params, limit, offset)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search documents: {str(e)}"
+        )
     
     return [
-        Document(
+        DocumentSearchResult(
             document_id=row.document_id,
             land_id=row.land_id,
             document_type=row.document_type,
             file_name=row.file_name,
-            file_path=row.file_path,
-            file_size=row.file_size,
-            uploaded_by=row.uploaded_by,
-            created_at=row.created_at,
             mime_type=row.mime_type,
-            is_draft=row.is_draft
+            created_at=row.created_at,
+            rank=row.rank,
+            snippet=highlight_snippet(row.snippet)
         )
         for row in results
     ]
 
+async def load_document(document_id: UUID, current_user: dict, db: AsyncSession):
+    """Fetch a document's metadata row, enforcing view permissions."""
+    query = text("""
+        SELECT d.document_id, d.land_id, d.document_type, d.file_name,
+               d.file_path, d.file_size, d.uploaded_by, d.created_at,
+               d.mime_type, d.is_draft, d.content_hash,
+               l.landowner_id, l.status
+        FROM documents d
+        LEFT JOIN lands l ON d.land_id = l.land_id
+        WHERE d.document_id = :document_id
+    """)
+    
+    result = (await db.execute(query, {"document_id": str(document_id)})).fetchone()
+    
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    # Check permissions - convert to strings for comparison
+    user_roles = current_user.get("roles", [])
+    user_id_str = str(current_user["user_id"])
+    
+    is_admin = "administrator" in user_roles
+    is_owner = result.landowner_id and str(result.landowner_id) == user_id_str
+    is_published = result.status == "published"
+    
+    if result.landowner_id and not (is_admin or is_owner or is_published):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view this document"
+        )
+    
+    return result
+
+def document_from_row(row) -> Document:
+    return Document(
+        document_id=row.document_id,
+        land_id=row.land_id,
+        document_type=row.document_type,
+        file_name=row.file_name,
+        file_path=row.file_path,
+        file_size=row.file_size,
+        uploaded_by=row.uploaded_by,
+        created_at=row.created_at,
+        mime_type=row.mime_type,
+        is_draft=row.is_draft
+    )
+
 @router.get("/{document_id}", response_model=Document)
 async def get_document(
     document_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get document by ID."""
+    """Get document by ID.
+    
+    Carries an ETag over the content hash and returned metadata, so a
+    matching ``If-None-Match`` is answered with ``304 Not Modified``.
+    """
+    result = await load_document(document_id, current_user, db)
+    
+    headers = validator_headers(
+        metadata_etag([(result.content_hash, result.document_type, result.file_name,
+                        result.file_path, result.file_size, result.mime_type, result.is_draft)]),
+        result.created_at
+    )
+    if is_not_modified(headers["ETag"], if_none_match):
+        return not_modified_response(headers)
+    
+    response.headers.update(headers)
+    return document_from_row(result)
+
+@router.get("/{document_id}/preview")
+async def get_document_preview(
+    document_id: UUID,
+    background_tasks: BackgroundTasks,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a small JPEG preview of a document (images, TIFF and PDF first page).
+    
+    Previews are keyed by content hash and carry a strong ETag, so repeat
+    requests with ``If-None-Match`` are answered with ``304 Not Modified``.
+    Returns ``202 Accepted`` with ``Retry-After`` while the preview is rendered,
+    and ``404`` once rendering has failed.
+    """
+    # Metadata-only lookup - the preview bytes are loaded only when sent
     query = text("""
-        SELECT d.document_id, d.land_id, d.document_type, d.file_name,
-               d.file_path, d.file_size, d.uploaded_by, d.created_at,
-               d.mime_type, d.is_draft,
+        SELECT d.content_hash, b.mime_type AS blob_mime_type, b.size AS blob_size,
+               p.content_hash AS preview_hash,
                l.landowner_id, l.status
         FROM documents d
+        LEFT JOIN document_blobs b ON d.content_hash = b.content_hash
+        LEFT JOIN document_previews p ON d.content_hash = p.content_hash
         LEFT JOIN lands l ON d.land_id = l.land_id
         WHERE d.document_id = :document_id
     """)
     
-    result = db.execute(query, {"document_id": str(document_id)}).fetchone()
+    result = (await db.execute(query, {"document_id": str(document_id)})).fetchone()
     
     if not result:
         raise HTTPException(
@@ -288,7 +882,7 @@ async def get_document(
             detail="Document not found"
         )
     
-    # Check permissions - convert to strings for comparison
+    # Check permissions - same rules as viewing the document
     user_roles = current_user.get("roles", [])
     user_id_str = str(current_user["user_id"])
     
@@ -302,17 +896,37 @@ async def get_document(
             detail="Not enough permissions to view this document"
         )
     
-    return Document(
-        document_id=result.document_id,
-        land_id=result.land_id,
-        document_type=result.document_type,
-        file_name=result.file_name,
-        file_path=result.file_path,
-        file_size=result.file_size,
-        uploaded_by=result.uploaded_by,
-        created_at=result.created_at,
-        mime_type=result.mime_type,
-        is_draft=result.is_draft
+    if result.preview_hash:
+        etag = preview_etag(result.content_hash)
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        preview = (await db.execute(text("""
+            SELECT data, mime_type FROM document_previews WHERE content_hash = :content_hash
+        """), {"content_hash": result.content_hash})).fetchone()
+        return Response(content=bytes(preview.data), media_type=preview.mime_type, headers=headers)
+    
+    # Legacy documents outside the blob store and unsupported types have no preview
+    if not result.content_hash or not can_preview(result.blob_mime_type, result.blob_size):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No preview available for this document"
+        )
+    
+    # Unreadable or corrupt files would otherwise be re-rendered on every poll
+    if await run_in_threadpool(preview_failed, result.content_hash):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Preview could not be generated for this document"
+        )
+    
+    # Not rendered yet (or the upload-time render was dropped) - queue it
+    background_tasks.add_task(generate_preview, result.content_hash)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"message": "Preview is being generated"},
+        headers={"Retry-After": str(PREVIEW_RETRY_AFTER)}
     )
 
 @router.put("/{document_id}", response_model=Document)
@@ -320,7 +934,7 @@ async def update_document(
     document_id: UUID,
     document_update: DocumentUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update document metadata (uploader or admin only)."""
     # Check if document exists and user has permission
@@ -331,7 +945,7 @@ async def update_document(
         WHERE d.document_id = :document_id
     """)
     
-    doc_result = db.execute(doc_check, {"document_id": str(document_id)}).fetchone()
+    doc_result = (await db.execute(doc_check, {"document_id": str(document_id)})).fetchone()
     
     if not doc_result:
         raise HTTPException(
@@ -370,27 +984,27 @@ async def update_document(
             WHERE document_id = :document_id
         """)
         
-        db.execute(update_query, params)
-        db.commit()
+        await db.execute(update_query, params)
+        await db.commit()
     
-    return await get_document(document_id, current_user, db)
+    return document_from_row(await load_document(document_id, current_user, db))
 
 @router.delete("/{document_id}", response_model=MessageResponse)
 async def delete_document(
     document_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete document (uploader or admin only)."""
     # Check if document exists and user has permission
     doc_check = text("""
-        SELECT d.uploaded_by, l.landowner_id
+        SELECT d.uploaded_by, d.content_hash, l.landowner_id
         FROM documents d
         LEFT JOIN lands l ON d.land_id = l.land_id
         WHERE d.document_id = :document_id
     """)
     
-    doc_result = db.execute(doc_check, {"document_id": str(document_id)}).fetchone()
+    doc_result = (await db.execute(doc_check, {"document_id": str(document_id)})).fetchone()
     
     if not doc_result:
         raise HTTPException(
@@ -413,15 +1027,18 @@ async def delete_document(
         )
     
     try:
-        # Delete database record (includes binary data)
+        # Delete database record
         delete_query = text("DELETE FROM documents WHERE document_id = :document_id")
-        db.execute(delete_query, {"document_id": str(document_id)})
-        db.commit()
+        await db.execute(delete_query, {"document_id": str(document_id)})
+        
+        # Drop the blob too if no other document shares the same content
+        await db.run_sync(release_blob, doc_result.content_hash)
+        await db.commit()
         
         return MessageResponse(message="Document deleted successfully")
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete document: {str(e)}"
@@ -430,19 +1047,31 @@ async def delete_document(
 @router.get("/download/{document_id}")
 async def download_document(
     document_id: UUID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    if_modified_since: Optional[str] = Header(None, alias="If-Modified-Since"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Download document file from database or file system (legacy)."""
-    # Check if document exists and user has permission
-    doc_check = text("""
-        SELECT d.file_data, d.file_path, d.file_name, d.mime_type, l.landowner_id, l.status
+    """Download document file from database or file system (legacy).
+    
+    The file is streamed in chunks and single byte ranges are honoured
+    with ``206 Partial Content``. Blob-backed documents carry the content
+    hash as a strong ETag; conditional requests are answered with
+    ``304 Not Modified`` before any bytes are read.
+    """
+    # Metadata-only permission check - never loads the blob itself
+    doc_check = text(f"""
+        SELECT d.file_name, d.mime_type, d.created_at, {DOCUMENT_SOURCE_COLUMNS},
+               l.landowner_id, l.status
         FROM documents d
+        LEFT JOIN document_blobs b ON d.content_hash = b.content_hash
         LEFT JOIN lands l ON d.land_id = l.land_id
         WHERE d.document_id = :document_id
     """)
     
-    doc_result = db.execute(doc_check, {"document_id": str(document_id)}).fetchone()
+    doc_result = (await db.execute(doc_check, {"document_id": str(document_id)})).fetchone()
     
     if not doc_result:
         raise HTTPException(
@@ -464,36 +1093,36 @@ async def download_document(
             detail="Not enough permissions to download this document"
         )
     
-    # Try database blob storage first (new method)
-    if doc_result.file_data:
-        return Response(
-            content=bytes(doc_result.file_data),
-            media_type=doc_result.mime_type or 'application/octet-stream',
-            headers={
-                'Content-Disposition': f'attachment; filename="{doc_result.file_name}"'
-            }
-        )
-    
-    # Fallback to file system (legacy method for old documents)
-    elif doc_result.file_path and os.path.exists(doc_result.file_path):
-        from fastapi.responses import FileResponse
-        return FileResponse(
-            path=doc_result.file_path,
-            filename=doc_result.file_name,
-            media_type=doc_result.mime_type or 'application/octet-stream'
-        )
+    # Legacy copies outside the blob store have no content hash to tag
+    headers = validator_headers(
+        content_etag(doc_result.content_hash) if doc_result.content_hash else None,
+        doc_result.created_at
+    )
+    if is_not_modified(headers.get("ETag"), if_none_match, doc_result.created_at, if_modified_since):
+        return not_modified_response(headers)
     
-    # Neither method has the file
-    else:
+    source = document_byte_source(document_id, doc_result)
+    if source is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document file data not found. Please re-upload this document."
         )
+    
+    range_iter, size = source
+    return build_range_response(
+        range_iter,
+        size=size,
+        file_name=doc_result.file_name,
+        mime_type=doc_result.mime_type,
+        range_header=range_header,
+        extra_headers=headers,
+        if_range=if_range
+    )
 
 @router.get("/types/list", response_model=List[str])
 async def get_document_types(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all document types in use."""
     query = text("""
@@ -502,14 +1131,14 @@ async def get_document_types(
         ORDER BY document_type
     """)
     
-    results = db.execute(query).fetchall()
+    results = (await db.execute(query)).fetchall()
     
     return [row.document_type for row in results]
 
 @router.get("/my/uploads", response_model=List[Document])
 async def get_my_uploads(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all documents uploaded by the current user."""
     query = text("""
@@ -521,7 +1150,7 @@ async def get_my_uploads(
         ORDER BY d.created_at DESC
     """)
     
-    results = db.execute(query, {"user_id": current_user["user_id"]}).fetchall()
+    results = (await db.execute(query, {"user_id": current_user["user_id"]})).fetchall()
     
     return [
         Document(
@@ -542,11 +1171,13 @@ async def get_my_uploads(
 # Admin endpoints
 @router.get("/admin/all", response_model=List[Document])
 async def get_all_documents(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     document_type: Optional[str] = None,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all documents (admin only)."""
     base_query = """
@@ -557,15 +1188,17 @@ async def get_all_documents(
         WHERE 1=1
     """
     
-    params = {"skip": skip, "limit": limit}
+    params = {}
     
     if document_type:
         base_query += " AND d.document_type = :document_type"
         params["document_type"] = document_type
     
-    base_query += " ORDER BY d.created_at DESC OFFSET :skip LIMIT :limit"
+    where_sql, order_sql = keyset_page("d.created_at", "d.document_id", cursor, skip, limit, params)
+    base_query += where_sql + order_sql
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
+    set_next_cursor(response, results, limit, "created_at", "document_id")
     
     return [
         Document(
@@ -589,10 +1222,11 @@ async def get_all_documents(
 @router.post("/task/{task_id}/upload", response_model=Document)
 async def upload_task_document(
     task_id: UUID,
+    background_tasks: BackgroundTasks,
     document_type: str = Form(...),
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a document for a specific task (reviewer only)."""
     # Check if task exists and user is assigned to it
@@ -602,7 +1236,7 @@ async def upload_task_document(
         WHERE t.task_id = :task_id
     """)
     
-    task_result = db.execute(task_check, {"task_id": str(task_id)}).fetchone()
+    task_result = (await db.execute(task_check, {"task_id": str(task_id)})).fetchone()
     
     if not task_result:
         raise HTTPException(
@@ -632,19 +1266,22 @@ async def upload_task_document(
             detail=error_msg
         )
     
+    # Stream the upload once: size, hash and MIME sniffing happen in the same pass
+    ingested = await run_in_threadpool(ingest_upload, file)
+    
     try:
-        # Read file bytes
-        file_data, file_size = read_file_bytes(file)
+        # Store the bytes once in the blob store, then reference them by hash
+        content_hash = await put_blob_async(db, ingested)
         
         # Insert document with task_id
         insert_query = text("""
             INSERT INTO documents (
                 document_id, land_id, task_id, uploaded_by, document_type, 
-                file_name, file_data, file_size, mime_type, is_draft, status, created_at
+                file_name, content_hash, file_size, mime_type, is_draft, status, created_at
             )
             VALUES (
                 :document_id, :land_id, :task_id, :uploaded_by, :document_type, 
-                :file_name, :file_data, :file_size, :mime_type, :is_draft, :status, :created_at
+                :file_name, :content_hash, :file_size, :mime_type, :is_draft, :status, :created_at
             )
             RETURNING document_id, land_id, task_id, uploaded_by, document_type, 
                       file_name, file_path, file_size, mime_type, is_draft, status, created_at
@@ -652,22 +1289,23 @@ async def upload_task_document(
         
         document_id = uuid.uuid4()
         
-        result = db.execute(insert_query, {
+        result = await db.execute(insert_query, {
             "document_id": str(document_id),
             "land_id": str(task_result.land_id),
             "task_id": str(task_id),
             "uploaded_by": str(current_user["user_id"]),
             "document_type": document_type,
             "file_name": file.filename,
-            "file_data": file_data,
-            "file_size": file_size,
-            "mime_type": file.content_type or "application/octet-stream",
+            "content_hash": content_hash,
+            "file_size": ingested.size,
+            "mime_type": ingested.mime_type,
             "is_draft": False,  # Task documents are not drafts
             "status": "pending",  # Pending admin approval
             "created_at": datetime.utcnow()
         })
         
-        db.commit()
+        await db.commit()
+        schedule_document_processing(background_tasks, content_hash)
         
         row = result.fetchone()
         return Document(
@@ -686,19 +1324,21 @@ async def upload_task_document(
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Upload error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload document: {str(e)}"
         )
+    finally:
+        ingested.close()
 
 
 @router.get("/task/{task_id}", response_model=List[Document])
 async def get_task_documents(
     task_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all documents for a specific task."""
     # Check if task exists
@@ -706,7 +1346,7 @@ async def get_task_documents(
         SELECT t.task_id, t.assigned_to FROM tasks t WHERE t.task_id = :task_id
     """)
     
-    task_result = db.execute(task_check, {"task_id": str(task_id)}).fetchone()
+    task_result = (await db.execute(task_check, {"task_id": str(task_id)})).fetchone()
     
     if not task_result:
         raise HTTPException(
@@ -725,7 +1365,7 @@ async def get_task_documents(
         ORDER BY d.created_at DESC
     """)
     
-    results = db.execute(query, {"task_id": str(task_id)}).fetchall()
+    results = (await db.execute(query, {"task_id": str(task_id)})).fetchall()
     
     return [
         Document(
@@ -750,12 +1390,72 @@ async def get_task_documents(
     ]
 
 
+@router.get("/task/{task_id}/archive")
+async def download_task_archive(
+    task_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download the documents of a task as one streamed ZIP (admin, landowner or assigned reviewer)."""
+    task_check = text("""
+        SELECT t.task_id, t.assigned_to, t.assigned_role, l.landowner_id
+        FROM tasks t
+        LEFT JOIN lands l ON t.land_id = l.land_id
+        WHERE t.task_id = :task_id
+    """)
+    
+    task_result = (await db.execute(task_check, {"task_id": str(task_id)})).fetchone()
+    
+    if not task_result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    # Check permissions - convert to strings for comparison
+    user_roles = current_user.get("roles", [])
+    user_id_str = str(current_user["user_id"])
+    
+    is_admin = "administrator" in user_roles
+    is_owner = str(task_result.landowner_id) == user_id_str
+    is_assigned = str(task_result.assigned_to) == user_id_str
+    
+    if not (is_admin or is_owner or is_assigned):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to download documents for this task"
+        )
+    
+    # Metadata only - bytes are read while the archive streams
+    base_query = f"""
+        SELECT d.document_id, d.document_type, d.file_name, d.mime_type, d.created_at,
+               {DOCUMENT_SOURCE_COLUMNS}
+        FROM documents d
+        LEFT JOIN document_blobs b ON d.content_hash = b.content_hash
+        WHERE d.task_id = :task_id
+    """
+    params = {"task_id": str(task_id)}
+    
+    # Reviewers get the document types of their role, plus anything they uploaded themselves
+    allowed_types = None if (is_admin or is_owner) else ROLE_DOCUMENT_MAPPING.get(task_result.assigned_role)
+    type_filter = document_type_filter(allowed_types, params)
+    if type_filter:
+        base_query += f" AND (d.uploaded_by = :user_id OR {type_filter})"
+        params["user_id"] = user_id_str
+    
+    base_query += " ORDER BY d.document_type, d.created_at"
+    
+    results = (await db.execute(text(base_query), params)).fetchall()
+    
+    return build_document_archive(results, f"task-{task_id}-documents.zip")
+
+
 @router.post("/approve/{document_id}", response_model=Document)
 async def approve_document(
     document_id: UUID,
     admin_comments: Optional[str] = Form(None),
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Approve a document (admin only)."""
     # Update document status
@@ -771,14 +1471,14 @@ async def approve_document(
                   is_draft, status, approved_by, approved_at, admin_comments
     """)
     
-    result = db.execute(update_query, {
+    result = await db.execute(update_query, {
         "document_id": str(document_id),
         "approved_by": str(current_user["user_id"]),
         "approved_at": datetime.utcnow(),
         "admin_comments": admin_comments
     })
     
-    db.commit()
+    await db.commit()
     
     row = result.fetchone()
     
@@ -813,7 +1513,7 @@ async def reject_document(
     rejection_reason: str = Form(...),
     admin_comments: Optional[str] = Form(None),
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reject a document (admin only)."""
     # Update document status
@@ -830,7 +1530,7 @@ async def reject_document(
                   is_draft, status, approved_by, approved_at, rejection_reason, admin_comments
     """)
     
-    result = db.execute(update_query, {
+    result = await db.execute(update_query, {
         "document_id": str(document_id),
         "approved_by": str(current_user["user_id"]),
         "approved_at": datetime.utcnow(),
@@ -838,7 +1538,7 @@ async def reject_document(
         "admin_comments": admin_comments
     })
     
-    db.commit()
+    await db.commit()
     
     row = result.fetchone()
     
@@ -868,15 +1568,130 @@ async def reject_document(
     )
 
 
+@router.post("/review/batch", response_model=DocumentReviewBatchResponse)
+async def review_documents_batch(
+    batch: DocumentReviewBatch,
+    current_user: dict = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Approve and reject many documents in one transaction (admin only).
+    
+    Each decision is applied with a single set-based UPDATE and the
+    updated rows come back through RETURNING. Invalid items (unknown
+    document, missing rejection reason, duplicates) are reported per item
+    without affecting the rest of the batch.
+    """
+    occurrences = Counter(str(item.document_id) for item in batch.items)
+    errors = {}
+    pending = {"approve": [], "reject": []}
+    
+    for index, item in enumerate(batch.items):
+        if occurrences[str(item.document_id)] > 1:
+            errors[index] = "Document appears more than once in the batch"
+        elif item.decision == "reject" and not item.reason:
+            errors[index] = "A rejection reason is required"
+        else:
+            pending[item.decision].append(item)
+    
+    updated = {}
+    reviewed_at = datetime.utcnow()
+    
+    try:
+        for decision, items in pending.items():
+            if not items:
+                continue
+            
+            params = {
+                "approved_by": str(current_user["user_id"]),
+                "approved_at": reviewed_at
+            }
+            id_placeholders = []
+            comment_cases = []
+            reason_cases = []
+            for i, item in enumerate(items):
+                params[f"id_{i}"] = str(item.document_id)
+                params[f"comments_{i}"] = item.admin_comments
+                params[f"reason_{i}"] = item.reason
+                id_placeholders.append(f":id_{i}")
+                comment_cases.append(f"WHEN :id_{i} THEN :comments_{i}")
+                reason_cases.append(f"WHEN :id_{i} THEN :reason_{i}")
+            
+            if decision == "approve":
+                set_clause = "status = 'approved'"
+            else:
+                set_clause = f"status = 'rejected', rejection_reason = CASE document_id {' '.join(reason_cases)} END"
+            
+            update_query = text(f"""
+                UPDATE documents
+                SET {set_clause},
+                    approved_by = :approved_by,
+                    approved_at = :approved_at,
+                    admin_comments = CASE document_id {' '.join(comment_cases)} END
+                WHERE document_id IN ({', '.join(id_placeholders)})
+                RETURNING document_id, land_id, task_id, document_type, file_name, 
+                          file_path, file_size, uploaded_by, created_at, mime_type, 
+                          is_draft, status, approved_by, approved_at, rejection_reason, admin_comments
+            """)
+            
+            for row in (await db.execute(update_query, params)).fetchall():
+                updated[str(row.document_id)] = Document(
+                    document_id=row.document_id,
+                    land_id=row.land_id,
+                    task_id=row.task_id,
+                    document_type=row.document_type,
+                    file_name=row.file_name,
+                    file_path=row.file_path,
+                    file_size=row.file_size,
+                    uploaded_by=row.uploaded_by,
+                    created_at=row.created_at,
+                    mime_type=row.mime_type,
+                    is_draft=row.is_draft,
+                    status=row.status,
+                    approved_by=row.approved_by,
+                    approved_at=row.approved_at,
+                    rejection_reason=row.rejection_reason,
+                    admin_comments=row.admin_comments
+                )
+        
+        await db.commit()
+        
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to review documents: {str(e)}"
+        )
+    
+    # Report in request order; anything the UPDATEs did not return does not exist
+    results = []
+    for index, item in enumerate(batch.items):
+        document = None if index in errors else updated.get(str(item.document_id))
+        results.append(DocumentReviewResult(
+            document_id=item.document_id,
+            decision=item.decision,
+            success=document is not None,
+            document=document,
+            error=None if document else errors.get(index, "Document not found")
+        ))
+    
+    return DocumentReviewBatchResponse(
+        results=results,
+        approved=sum(1 for r in results if r.success and r.decision == "approve"),
+        rejected=sum(1 for r in results if r.success and r.decision == "reject"),
+        failed=sum(1 for r in results if not r.success)
+    )
+
+
 # ========== SUBTASK-BASED DOCUMENT ENDPOINTS ==========
 
 @router.post("/subtask/{subtask_id}/upload", response_model=Document)
 async def upload_subtask_document(
     subtask_id: UUID,
+    background_tasks: BackgroundTasks,
     document_type: str = Form(...),
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a document for a specific subtask (reviewer only)."""
     # Check if subtask exists and get task info
@@ -887,7 +1702,7 @@ async def upload_subtask_document(
         WHERE s.subtask_id = :subtask_id
     """)
     
-    subtask_result = db.execute(subtask_check, {"subtask_id": str(subtask_id)}).fetchone()
+    subtask_result = (await db.execute(subtask_check, {"subtask_id": str(subtask_id)})).fetchone()
     
     if not subtask_result:
         raise HTTPException(
@@ -917,19 +1732,22 @@ async def upload_subtask_document(
             detail=error_msg
         )
     
+    # Stream the upload once: size, hash and MIME sniffing happen in the same pass
+    ingested = await run_in_threadpool(ingest_upload, file)
+    
     try:
-        # Read file bytes
-        file_data, file_size = read_file_bytes(file)
+        # Store the bytes once in the blob store, then reference them by hash
+        content_hash = await put_blob_async(db, ingested)
         
         # Insert document with subtask_id
         insert_query = text("""
             INSERT INTO documents (
                 document_id, land_id, task_id, subtask_id, uploaded_by, document_type, 
-                file_name, file_data, file_size, mime_type, is_draft, status, created_at
+                file_name, content_hash, file_size, mime_type, is_draft, status, created_at
             )
             VALUES (
                 :document_id, :land_id, :task_id, :subtask_id, :uploaded_by, :document_type, 
-                :file_name, :file_data, :file_size, :mime_type, :is_draft, :status, :created_at
+                :file_name, :content_hash, :file_size, :mime_type, :is_draft, :status, :created_at
             )
             RETURNING document_id, land_id, task_id, subtask_id, uploaded_by, document_type, 
                       file_name, file_path, file_size, mime_type, is_draft, status, created_at
@@ -937,7 +1755,7 @@ async def upload_subtask_document(
         
         document_id = uuid.uuid4()
         
-        result = db.execute(insert_query, {
+        result = await db.execute(insert_query, {
             "document_id": str(document_id),
             "land_id": str(subtask_result.land_id),
             "task_id": str(subtask_result.task_id),
@@ -945,15 +1763,16 @@ async def upload_subtask_document(
             "uploaded_by": str(current_user["user_id"]),
             "document_type": document_type,
             "file_name": file.filename,
-            "file_data": file_data,
-            "file_size": file_size,
-            "mime_type": file.content_type or "application/octet-stream",
+            "content_hash": content_hash,
+            "file_size": ingested.size,
+            "mime_type": ingested.mime_type,
             "is_draft": False,
             "status": "pending",
             "created_at": datetime.utcnow()
         })
         
-        db.commit()
+        await db.commit()
+        schedule_document_processing(background_tasks, content_hash)
         
         row = result.fetchone()
         return Document(
@@ -973,19 +1792,21 @@ async def upload_subtask_document(
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Upload error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload document: {str(e)}"
         )
+    finally:
+        ingested.close()
 
 
 @router.get("/subtask/{subtask_id}", response_model=List[Document])
 async def get_subtask_documents(
     subtask_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all documents for a specific subtask."""
     # Check if subtask exists
@@ -993,7 +1814,7 @@ async def get_subtask_documents(
         SELECT s.subtask_id FROM subtasks s WHERE s.subtask_id = :subtask_id
     """)
     
-    subtask_result = db.execute(subtask_check, {"subtask_id": str(subtask_id)}).fetchone()
+    subtask_result = (await db.execute(subtask_check, {"subtask_id": str(subtask_id)})).fetchone()
     
     if not subtask_result:
         raise HTTPException(
@@ -1012,7 +1833,7 @@ async def get_subtask_documents(
         ORDER BY d.created_at DESC
     """)
     
-    results = db.execute(query, {"subtask_id": str(subtask_id)}).fetchall()
+    results = (await db.execute(query, {"subtask_id": str(subtask_id)})).fetchall()
     
     return [
         Document(
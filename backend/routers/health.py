@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, Any, List, Optional
 import logging
 import time
@@ -6,12 +7,14 @@ import psutil
 import os
 from datetime import datetime, timezone
 
-from database import get_db, engine
+from database import get_async_engine
 from redis_service import redis_service
+from principal_cache import principal_cache
+from password_hashing import kdf_pool
+from sql_metrics import sql_metrics
 from rate_limiter import enhanced_limiter, RateLimits, check_rate_limiter_health
 from auth import get_current_user
 from models.schemas import SuccessResponse
-from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
@@ -76,7 +79,7 @@ router = APIRouter(
     }
 )
 @enhanced_limiter.limit(RateLimits.PUBLIC)
-def health_check(request: Request):
+async def health_check(request: Request):
     """
     Basic health check endpoint.
     
@@ -93,8 +96,8 @@ def health_check(request: Request):
     
     # Check database connectivity
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
         health_status["services"]["database"] = "connected"
     except Exception as e:
         health_status["services"]["database"] = "disconnected"
@@ -103,7 +106,7 @@ def health_check(request: Request):
     
     # Check Redis connectivity
     try:
-        redis_health = check_rate_limiter_health()
+        redis_health = await run_in_threadpool(check_rate_limiter_health)
         health_status["services"]["redis"] = redis_health.get("status", "unknown")
         if not redis_health.get("connected", False):
             health_status["errors"].append("Redis: Connection failed")
@@ -180,7 +183,7 @@ def health_check(request: Request):
     }
 )
 @enhanced_limiter.limit(RateLimits.ADMIN)
-def detailed_health_check(
+async def detailed_health_check(
     request: Request,
     current_user: dict = Depends(get_current_user)
 ):
@@ -208,7 +211,7 @@ def detailed_health_check(
     # System metrics
     try:
         health_data["system"] = {
-            "cpu_percent": psutil.cpu_percent(interval=1),
+            "cpu_percent": await run_in_threadpool(psutil.cpu_percent, interval=1),
             "memory_percent": psutil.virtual_memory().percent,
             "disk_usage_percent": psutil.disk_usage('/').percent if os.name != 'nt' else psutil.disk_usage('C:\\').percent,
             "boot_time": datetime.fromtimestamp(psutil.boot_time(), timezone.utc).isoformat(),
@@ -224,19 +227,20 @@ def detailed_health_check(
     
     # Database detailed check
     try:
-        with engine.connect() as conn:
+        async_engine = get_async_engine()
+        async with async_engine.connect() as conn:
             # Test query performance
             query_start = time.time()
-            conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 1"))
             query_time = (time.time() - query_start) * 1000
             
             health_data["database"] = {
                 "status": "connected",
                 "query_time_ms": round(query_time, 2),
-                "pool_size": engine.pool.size(),
-                "checked_out_connections": engine.pool.checkedout(),
-                "overflow_connections": engine.pool.overflow(),
-                "invalid_connections": engine.pool.invalidated()
+                "pool_size": async_engine.pool.size(),
+                "checked_out_connections": async_engine.pool.checkedout(),
+                "overflow_connections": async_engine.pool.overflow(),
+                "invalid_connections": async_engine.pool.invalidated()
             }
     except Exception as e:
         health_data["database"] = {
@@ -249,7 +253,7 @@ def detailed_health_check(
     # Redis detailed check
     try:
         if redis_service.is_connected:
-            redis_info = redis_service.get_health_status()
+            redis_info = await run_in_threadpool(redis_service.get_health_status)
             health_data["redis"] = redis_info
         else:
             health_data["redis"] = {
@@ -265,7 +269,7 @@ def detailed_health_check(
     
     # Rate limiter check
     try:
-        rate_limiter_health = check_rate_limiter_health()
+        rate_limiter_health = await run_in_threadpool(check_rate_limiter_health)
         health_data["rate_limiter"] = rate_limiter_health
     except Exception as e:
         health_data["rate_limiter"] = {
@@ -360,6 +364,7 @@ def get_metrics(
     try:
         # Basic system metrics
         process = psutil.Process()
+        pool = get_async_engine().pool
         metrics = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "system": {
@@ -370,9 +375,9 @@ def get_metrics(
                 "threads": process.num_threads()
             },
             "database": {
-                "pool_size": engine.pool.size(),
-                "active_connections": engine.pool.checkedout(),
-                "overflow_connections": engine.pool.overflow()
+                "pool_size": pool.size(),
+                "active_connections": pool.checkedout(),
+                "overflow_connections": pool.overflow()
             }
         }
         
@@ -390,6 +395,15 @@ def get_metrics(
         else:
             metrics["redis"] = {"connected": False}
         
+        # Authenticated principal cache hit rates
+        metrics["principal_cache"] = principal_cache.stats()
+        
+        # Password hashing pool queue depth and backpressure
+        metrics["password_hashing"] = kdf_pool.stats()
+        
+        # Statements per route and suspected N+1 queries
+        metrics["sql"] = sql_metrics.stats()
+        
         # Application-specific metrics
         metrics["application"] = {
             "version": "1.0.0",
@@ -431,7 +445,7 @@ def get_metrics(
     }
 )
 @enhanced_limiter.limit("100/minute")
-def readiness_probe(request: Request):
+async def readiness_probe(request: Request):
     """
     Readiness probe for container orchestration.
     
@@ -439,8 +453,8 @@ def readiness_probe(request: Request):
     """
     try:
         # Check database readiness
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
         
         return {
             "status": "ready",
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 import uuid
 
-from database import get_db
+from database import get_async_db
 from auth import get_current_user, require_admin
+from pagination import keyset_page, set_next_cursor
+from redis_service import cache_manager
 from models.schemas import (
     InterestCreate, InterestUpdate, InterestResponse,
     LandVisibilityUpdate, MessageResponse
@@ -53,7 +55,7 @@ def can_manage_interest(user_roles: List[str], user_id: str, interest_data: dict
 async def express_interest(
     interest_data: InterestCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Express interest in a land (investor only)."""
     user_roles = current_user.get("roles", [])
@@ -72,7 +74,7 @@ async def express_interest(
         WHERE land_id = :land_id
     """)
     
-    land_result = db.execute(land_check, {"land_id": str(interest_data.land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(interest_data.land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -93,10 +95,10 @@ async def express_interest(
         WHERE investor_id = :investor_id AND land_id = :land_id
     """)
     
-    existing_result = db.execute(existing_check, {
+    existing_result = (await db.execute(existing_check, {
         "investor_id": current_user["user_id"],
         "land_id": str(interest_data.land_id)
-    }).fetchone()
+    })).fetchone()
     
     if existing_result:
         raise HTTPException(
@@ -116,20 +118,21 @@ async def express_interest(
             )
         """)
         
-        db.execute(create_query, {
+        await db.execute(create_query, {
             "interest_id": interest_id,
             "investor_id": current_user["user_id"],
             "land_id": str(interest_data.land_id),
             "comments": interest_data.comments
         })
         
-        db.commit()
+        await db.commit()
+        cache_manager.clear_land_cache(interest_data.land_id)
         
         # Fetch the created interest
         return await get_interest(UUID(interest_id), current_user, db)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to express interest: {str(e)}"
@@ -143,7 +146,7 @@ async def get_interests(
     skip: int = 0,
     limit: int = 100,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get interests with optional filters."""
     user_roles = current_user.get("roles", [])
@@ -185,7 +188,7 @@ async def get_interests(
     
     base_query += " ORDER BY ii.created_at DESC OFFSET :skip LIMIT :limit"
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
     
     return [
         InterestResponse(
@@ -208,7 +211,7 @@ async def get_interests(
 async def get_interest(
     interest_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get interest by ID."""
     query = text("""
@@ -223,7 +226,7 @@ async def get_interest(
         WHERE ii.interest_id = :interest_id
     """)
     
-    result = db.execute(query, {"interest_id": str(interest_id)}).fetchone()
+    result = (await db.execute(query, {"interest_id": str(interest_id)})).fetchone()
     
     if not result:
         raise HTTPException(
@@ -263,7 +266,7 @@ async def update_interest(
     interest_id: UUID,
     interest_update: InterestUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update interest (investor or land owner only)."""
     # Check if interest exists and user has permission
@@ -274,7 +277,7 @@ async def update_interest(
         WHERE ii.interest_id = :interest_id
     """)
     
-    interest_result = db.execute(interest_check, {"interest_id": str(interest_id)}).fetchone()
+    interest_result = (await db.execute(interest_check, {"interest_id": str(interest_id)})).fetchone()
     
     if not interest_result:
         raise HTTPException(
@@ -318,13 +321,13 @@ async def update_interest(
                 WHERE interest_id = :interest_id
             """)
             
-            db.execute(update_query, params)
-            db.commit()
+            await db.execute(update_query, params)
+            await db.commit()
         
         return await get_interest(interest_id, current_user, db)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update interest: {str(e)}"
@@ -334,16 +337,16 @@ async def update_interest(
 async def withdraw_interest(
     interest_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Withdraw interest (investor only)."""
     # Check if interest exists and user has permission
     interest_check = text("""
-        SELECT investor_id FROM investor_interests 
+        SELECT investor_id, land_id FROM investor_interests 
         WHERE interest_id = :interest_id
     """)
     
-    interest_result = db.execute(interest_check, {"interest_id": str(interest_id)}).fetchone()
+    interest_result = (await db.execute(interest_check, {"interest_id": str(interest_id)})).fetchone()
     
     if not interest_result:
         raise HTTPException(
@@ -364,14 +367,15 @@ async def withdraw_interest(
     try:
         # Delete interest
         delete_query = text("DELETE FROM investor_interests WHERE interest_id = :interest_id")
-        db.execute(delete_query, {"interest_id": str(interest_id)})
+        await db.execute(delete_query, {"interest_id": str(interest_id)})
         
-        db.commit()
+        await db.commit()
+        cache_manager.clear_land_cache(interest_result.land_id)
         
         return MessageResponse(message="Interest withdrawn successfully")
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to withdraw interest: {str(e)}"
@@ -381,7 +385,7 @@ async def withdraw_interest(
 async def get_my_interests(
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get interests expressed by the current user."""
     user_roles = current_user.get("roles", [])
@@ -413,7 +417,7 @@ async def get_my_interests(
     
     base_query += " ORDER BY ii.created_at DESC"
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
     
     return [
         InterestResponse(
@@ -437,12 +441,12 @@ async def get_land_interests(
     land_id: UUID,
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get interests for a specific land (land owner or admin only)."""
     # Check if land exists and user has permission
     land_check = text("SELECT owner_id FROM lands WHERE land_id = :land_id")
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -480,7 +484,7 @@ async def get_land_interests(
     
     base_query += " ORDER BY ii.created_at DESC"
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
     
     return [
         InterestResponse(
@@ -505,12 +509,12 @@ async def update_land_visibility(
     land_id: UUID,
     visibility_update: LandVisibilityUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update land visibility settings (land owner or admin only)."""
     # Check if land exists and user has permission
     land_check = text("SELECT owner_id FROM lands WHERE land_id = :land_id")
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -536,17 +540,17 @@ async def update_land_visibility(
             WHERE land_id = :land_id
         """)
         
-        db.execute(update_query, {
+        await db.execute(update_query, {
             "land_id": str(land_id),
             "visibility": visibility_update.visibility
         })
         
-        db.commit()
+        await db.commit()
         
         return MessageResponse(message="Land visibility updated successfully")
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update land visibility: {str(e)}"
@@ -559,7 +563,7 @@ async def get_visible_lands(
     skip: int = 0,
     limit: int = 100,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get lands visible to investors."""
     user_roles = current_user.get("roles", [])
@@ -604,7 +608,7 @@ async def get_visible_lands(
         OFFSET :skip LIMIT :limit
     """
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
     
     return [
         {
@@ -630,7 +634,7 @@ async def get_visible_lands(
 async def get_interest_stats(
     land_id: Optional[UUID] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get interest statistics."""
     user_roles = current_user.get("roles", [])
@@ -662,7 +666,7 @@ async def get_interest_stats(
             base_query += " AND l.owner_id = :user_id"
         params["user_id"] = current_user["user_id"]
     
-    result = db.execute(text(base_query), params).fetchone()
+    result = (await db.execute(text(base_query), params)).fetchone()
     
     return {
         "total_interests": result.total_interests,
@@ -676,7 +680,7 @@ async def get_interest_stats(
 @router.get("/stats/visibility")
 async def get_visibility_stats(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get land visibility statistics."""
     user_roles = current_user.get("roles", [])
@@ -699,7 +703,7 @@ async def get_visibility_stats(
         base_query += " AND owner_id = :user_id"
         params["user_id"] = current_user["user_id"]
     
-    result = db.execute(text(base_query), params).fetchone()
+    result = (await db.execute(text(base_query), params)).fetchone()
     
     return {
         "total_lands": result.total_lands,
@@ -712,11 +716,13 @@ async def get_visibility_stats(
 # Admin endpoints
 @router.get("/admin/interests", response_model=List[InterestResponse])
 async def get_all_interests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     status: Optional[str] = None,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all interests (admin only)."""
     base_query = """
@@ -731,15 +737,17 @@ async def get_all_interests(
         WHERE 1=1
     """
     
-    params = {"skip": skip, "limit": limit}
+    params = {}
     
     if status:
         base_query += " AND ii.status = :status"
         params["status"] = status
     
-    base_query += " ORDER BY ii.created_at DESC OFFSET :skip LIMIT :limit"
+    where_sql, order_sql = keyset_page("ii.created_at", "ii.interest_id", cursor, skip, limit, params)
+    base_query += where_sql + order_sql
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
+    set_next_cursor(response, results, limit, "created_at", "interest_id")
     
     return [
         InterestResponse(
@@ -761,7 +769,7 @@ async def get_all_interests(
 @router.get("/status/list", response_model=List[str])
 async def get_interest_statuses(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all interest statuses."""
     # Return standard interest statuses
@@ -770,7 +778,7 @@ async def get_interest_statuses(
 @router.get("/visibility/list", response_model=List[str])
 async def get_visibility_options(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all visibility options."""
     # Return standard visibility options
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime
 
-from database import get_db
+from config import settings
+from database import get_async_db
 from auth import get_current_user, require_admin
+from redis_service import redis_service, cache_manager, make_cache_key, land_tag, MARKETPLACE_TAG
+from pagination import CURSOR_HEADER, keyset_page, set_next_cursor
+from loaders import RequestLoaders, get_loaders
 from models.schemas import (
     LandCreate, LandUpdate, LandResponse, Land,
     LandSectionCreate, LandSection,
@@ -16,13 +20,16 @@ from models.schemas import (
 
 router = APIRouter(prefix="/lands", tags=["lands"])
 
+LAND_CACHE_TTL = settings.get('LAND_CACHE_TTL', 300)  # seconds a land's row stays cached for get_land
+MARKETPLACE_CACHE_TTL = settings.get('MARKETPLACE_CACHE_TTL', 60)  # seconds a marketplace page stays cached
+
 
 # Admin Dashboard
 @router.get("/admin/projects", response_model=List[Dict[str, Any]])
 async def get_admin_projects(
     status_filter: Optional[str] = Query(None, description="Filter by status: submitted, under_review, approved, published, etc."),
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all projects for admin review (admin only)."""
     
@@ -81,7 +88,7 @@ async def get_admin_projects(
     if status_filter:
         params["status_filter"] = status_filter
     
-    results = db.execute(query, params).fetchall()
+    results = (await db.execute(query, params)).fetchall()
     
     projects = []
     for row in results:
@@ -119,7 +126,7 @@ async def get_admin_projects(
 @router.get("/admin/summary", response_model=Dict[str, Any])
 async def get_admin_summary(
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get admin dashboard summary statistics (admin only)."""
     
@@ -138,7 +145,7 @@ async def get_admin_summary(
         WHERE status != 'draft'
     """)
     
-    result = db.execute(summary_query).fetchone()
+    result = (await db.execute(summary_query)).fetchone()
     
     # Get landowner count
     landowner_query = text("""
@@ -146,7 +153,7 @@ async def get_admin_summary(
         FROM lands l
         WHERE l.status != 'draft'
     """)
-    landowner_result = db.execute(landowner_query).fetchone()
+    landowner_result = (await db.execute(landowner_query)).fetchone()
     
     # Get investor interest count
     interest_query = text("""
@@ -157,7 +164,7 @@ async def get_admin_summary(
         INNER JOIN lands l ON ii.land_id = l.land_id
         WHERE l.status != 'draft'
     """)
-    interest_result = db.execute(interest_query).fetchone()
+    interest_result = (await db.execute(interest_query)).fetchone()
     
     return {
         "totalProjects": result.total_projects,
@@ -178,7 +185,7 @@ async def get_admin_summary(
 @router.get("/admin/investor-interests", response_model=List[Dict[str, Any]])
 async def get_admin_investor_interests(
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all investor interests with detailed information (admin only)."""
     
@@ -211,7 +218,7 @@ async def get_admin_investor_interests(
         ORDER BY ii.created_at DESC
     """)
     
-    results = db.execute(query).fetchall()
+    results = (await db.execute(query)).fetchall()
     
     interests = []
     for row in results:
@@ -244,7 +251,7 @@ async def get_admin_investor_interests(
 @router.get("/dashboard/summary", response_model=Dict[str, Any])
 async def get_landowner_dashboard_summary(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get landowner dashboard summary with statistics."""
     user_id = current_user["user_id"]
@@ -260,7 +267,7 @@ async def get_landowner_dashboard_summary(
         WHERE landowner_id = :user_id
     """)
     
-    summary_result = db.execute(summary_query, {"user_id": user_id}).fetchone()
+    summary_result = (await db.execute(summary_query, {"user_id": user_id})).fetchone()
     
     # Calculate estimated revenue (simplified calculation based on capacity)
     revenue_query = text("""
@@ -272,7 +279,7 @@ async def get_landowner_dashboard_summary(
         AND price_per_mwh IS NOT NULL
     """)
     
-    revenue_result = db.execute(revenue_query, {"user_id": user_id}).fetchone()
+    revenue_result = (await db.execute(revenue_query, {"user_id": user_id})).fetchone()
     
     return {
         "totalLandArea": float(summary_result.total_land_area) if summary_result.total_land_area else 0,
@@ -285,12 +292,14 @@ async def get_landowner_dashboard_summary(
 
 @router.get("/dashboard/projects", response_model=List[Dict[str, Any]])
 async def get_landowner_dashboard_projects(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, description="Search by name or location"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get landowner's projects for dashboard display."""
     user_id = current_user["user_id"]
@@ -324,7 +333,7 @@ async def get_landowner_dashboard_projects(
         WHERE l.landowner_id = :user_id
     """
     
-    params = {"user_id": user_id, "skip": skip, "limit": limit}
+    params = {"user_id": user_id}
     
     # Apply filters
     if status_filter:
@@ -335,9 +344,11 @@ async def get_landowner_dashboard_projects(
         query += " AND (LOWER(l.title) LIKE :search OR LOWER(l.location_text) LIKE :search)"
         params["search"] = f"%{search.lower()}%"
     
-    query += " ORDER BY l.updated_at DESC OFFSET :skip LIMIT :limit"
+    where_sql, order_sql = keyset_page("l.updated_at", "l.land_id", cursor, skip, limit, params)
+    query += where_sql + order_sql
     
-    results = db.execute(text(query), params).fetchall()
+    results = (await db.execute(text(query), params)).fetchall()
+    set_next_cursor(response, results, limit, "last_updated", "land_id")
     
     # Format projects for frontend
     projects = []
@@ -371,7 +382,7 @@ async def get_landowner_dashboard_projects(
 async def create_land(
     land_data: LandCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new land entry (authenticated users)."""
     try:
@@ -398,7 +409,7 @@ async def create_land(
             )
         """)
         
-        db.execute(insert_query, {
+        await db.execute(insert_query, {
             "land_id": str(land_id),
             "landowner_id": current_user["user_id"],
             "title": land_data.title,
@@ -415,13 +426,13 @@ async def create_land(
             "admin_notes": land_data.admin_notes
         })
         
-        db.commit()
+        await db.commit()
         
         # Fetch the created land
         return await get_land(land_id, current_user, db)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create land: {str(e)}"
@@ -429,12 +440,14 @@ async def create_land(
 
 @router.get("/", response_model=List[Land])
 async def list_lands(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     owner_id: Optional[UUID] = Query(None, description="Filter by owner"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List lands with optional filters."""
     # Build dynamic query based on user role and filters
@@ -448,7 +461,7 @@ async def list_lands(
         WHERE 1=1
     """
     
-    params = {"skip": skip, "limit": limit}
+    params = {}
     
     # Apply filters based on user role
     user_roles = current_user.get("roles", [])
@@ -465,9 +478,11 @@ async def list_lands(
         base_query += " AND l.landowner_id = :owner_id"
         params["owner_id"] = str(owner_id)
     
-    base_query += " ORDER BY l.created_at DESC OFFSET :skip LIMIT :limit"
+    where_sql, order_sql = keyset_page("l.created_at", "l.land_id", cursor, skip, limit, params)
+    base_query += where_sql + order_sql
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
+    set_next_cursor(response, results, limit, "created_at", "land_id")
     
     return [
         Land(
@@ -498,23 +513,19 @@ async def list_lands(
 async def get_land(
     land_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get land by ID."""
-    query = text("""
-        SELECT l.land_id, l.landowner_id, l.title, l.location_text,
-               l.coordinates, l.area_acres, l.land_type, l.status,
-               l.admin_notes, l.energy_key, l.capacity_mw, l.price_per_mwh,
-               l.timeline_text, l.contract_term_years, l.developer_name,
-               l.project_priority, l.project_due_date,
-               l.published_at, l.interest_locked_at, l.created_at, l.updated_at
-        FROM lands l
-        WHERE l.land_id = :land_id
-    """)
-    
-    result = db.execute(query, {"land_id": str(land_id)}).fetchone()
-    
-    if not result:
+    cache_key = f"api:land:{land_id}"
+    cached = redis_service.get(cache_key)
+    if cached is not None:
+        land = Land(**cached)
+    else:
+        land = await load_land(land_id, db)
+        if land is not None:
+            redis_service.set(cache_key, land.model_dump(mode="json"), LAND_CACHE_TTL, tags=[land_tag(land_id)])
+    
+    if land is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Land not found"
@@ -523,11 +534,11 @@ async def get_land(
     # Check permissions - compare both as strings to avoid UUID/string mismatch
     user_roles = current_user.get("roles", [])
     user_id_str = str(current_user["user_id"])
-    landowner_id_str = str(result.landowner_id)
+    landowner_id_str = str(land.landowner_id)
     
     is_admin = "administrator" in user_roles
     is_owner = user_id_str == landowner_id_str
-    is_published = result.status == "published"
+    is_published = land.status == "published"
     
     if not (is_admin or is_owner or is_published):
         raise HTTPException(
@@ -535,6 +546,26 @@ async def get_land(
             detail="Not enough permissions to view this land"
         )
     
+    return land
+
+async def load_land(land_id: UUID, db: AsyncSession) -> Optional[Land]:
+    """Read a land row from the database, or None if it doesn't exist."""
+    query = text("""
+        SELECT l.land_id, l.landowner_id, l.title, l.location_text,
+               l.coordinates, l.area_acres, l.land_type, l.status,
+               l.admin_notes, l.energy_key, l.capacity_mw, l.price_per_mwh,
+               l.timeline_text, l.contract_term_years, l.developer_name,
+               l.project_priority, l.project_due_date,
+               l.published_at, l.interest_locked_at, l.created_at, l.updated_at
+        FROM lands l
+        WHERE l.land_id = :land_id
+    """)
+    
+    result = (await db.execute(query, {"land_id": str(land_id)})).fetchone()
+    
+    if not result:
+        return None
+    
     return Land(
         land_id=result.land_id,
         landowner_id=result.landowner_id,
@@ -564,7 +595,7 @@ async def update_land(
     land_id: UUID,
     land_update: LandUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update land information (owner or admin only)."""
     # Check if land exists and user has permission
@@ -572,7 +603,7 @@ async def update_land(
         SELECT landowner_id, status FROM lands WHERE land_id = :land_id
     """)
     
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -630,8 +661,9 @@ async def update_land(
             WHERE land_id = :land_id
         """)
         
-        db.execute(update_query, params)
-        db.commit()
+        await db.execute(update_query, params)
+        await db.commit()
+        cache_manager.clear_land_cache(land_id, marketplace=True)
     
     return await get_land(land_id, current_user, db)
 
@@ -639,7 +671,7 @@ async def update_land(
 async def delete_land(
     land_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete land (owner or admin only)."""
     # Check if land exists and user has permission
@@ -647,7 +679,7 @@ async def delete_land(
         SELECT owner_id, status_key FROM lands WHERE land_id = :land_id
     """)
     
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -677,8 +709,9 @@ async def delete_land(
         )
     
     delete_query = text("DELETE FROM lands WHERE land_id = :land_id")
-    db.execute(delete_query, {"land_id": str(land_id)})
-    db.commit()
+    await db.execute(delete_query, {"land_id": str(land_id)})
+    await db.commit()
+    cache_manager.clear_land_cache(land_id)
     
     return MessageResponse(message="Land deleted successfully")
 
@@ -687,7 +720,7 @@ async def delete_land(
 async def submit_land_for_review(
     land_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit land for review (owner only)."""
     # First check if land exists and belongs to user
@@ -695,7 +728,7 @@ async def submit_land_for_review(
         SELECT landowner_id, status FROM lands WHERE land_id = :land_id
     """)
     
-    land_result = db.execute(check_query, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(check_query, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -722,17 +755,18 @@ async def submit_land_for_review(
     # Try to use stored procedure first, fallback to direct update
     try:
         sp_query = text("SELECT sp_land_submit_for_review(:land_id, :owner_id) as success")
-        result = db.execute(sp_query, {
+        result = (await db.execute(sp_query, {
             "land_id": str(land_id),
             "owner_id": current_user["user_id"]
-        }).fetchone()
+        })).fetchone()
         
         if result and result.success:
-            db.commit()
+            await db.commit()
+            cache_manager.clear_land_cache(land_id)
             return MessageResponse(message="Land submitted for review successfully")
     except Exception as sp_error:
         # Stored procedure doesn't exist, use direct update
-        db.rollback()
+        await db.rollback()
         print(f"Stored procedure not found, using direct update: {sp_error}")
         
         try:
@@ -742,15 +776,16 @@ async def submit_land_for_review(
                 WHERE land_id = :land_id AND landowner_id = :owner_id
             """)
             
-            db.execute(update_query, {
+            await db.execute(update_query, {
                 "land_id": str(land_id),
                 "owner_id": current_user["user_id"]
             })
             
-            db.commit()
+            await db.commit()
+            cache_manager.clear_land_cache(land_id)
             return MessageResponse(message="Land submitted for review successfully")
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error submitting land: {str(e)}"
@@ -760,16 +795,17 @@ async def submit_land_for_review(
 async def publish_land(
     land_id: UUID,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Publish land (admin only)."""
     query = text("SELECT sp_publish_land(:land_id) as success")
     
     try:
-        result = db.execute(query, {"land_id": str(land_id)}).fetchone()
-        db.commit()
+        result = (await db.execute(query, {"land_id": str(land_id)})).fetchone()
+        await db.commit()
         
         if result and result.success:
+            cache_manager.clear_land_cache(land_id, marketplace=True)
             return MessageResponse(message="Land published successfully")
         else:
             raise HTTPException(
@@ -777,7 +813,7 @@ async def publish_land(
                 detail="Failed to publish land"
             )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error publishing land: {str(e)}"
@@ -787,16 +823,17 @@ async def publish_land(
 async def mark_land_ready_to_buy(
     land_id: UUID,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark land as ready to buy (admin only)."""
     query = text("SELECT sp_land_mark_rtb(:land_id) as success")
     
     try:
-        result = db.execute(query, {"land_id": str(land_id)}).fetchone()
-        db.commit()
+        result = (await db.execute(query, {"land_id": str(land_id)})).fetchone()
+        await db.commit()
         
         if result and result.success:
+            cache_manager.clear_land_cache(land_id, marketplace=True)
             return MessageResponse(message="Land marked as ready to buy successfully")
         else:
             raise HTTPException(
@@ -804,7 +841,7 @@ async def mark_land_ready_to_buy(
                 detail="Failed to mark land as ready to buy"
             )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error marking land as RTB: {str(e)}"
@@ -812,17 +849,29 @@ async def mark_land_ready_to_buy(
 
 @router.get("/marketplace/published", response_model=List[Dict[str, Any]])
 async def get_published_lands(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     energy_type: Optional[str] = None,
     min_capacity: Optional[float] = None,
     max_capacity: Optional[float] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all published lands for marketplace (public endpoint)."""
+    cache_key = make_cache_key("api", get_published_lands, (), {
+        "skip": skip, "limit": limit, "cursor": cursor, "energy_type": energy_type,
+        "min_capacity": min_capacity, "max_capacity": max_capacity,
+        "min_price": min_price, "max_price": max_price, "location": location
+    })
+    cached = redis_service.get(cache_key)
+    if cached is not None:
+        if cached["next_cursor"]:
+            response.headers[CURSOR_HEADER] = cached["next_cursor"]
+        return cached["projects"]
     
     # Build dynamic query for published lands
     base_query = """
@@ -841,6 +890,7 @@ async def get_published_lands(
             l.developer_name,
             l.published_at,
             l.created_at,
+            COALESCE(l.published_at, l.created_at) as listed_at,
             u.first_name || ' ' || u.last_name as landowner_name,
             u.email as landowner_email,
             COUNT(DISTINCT ii.interest_id) as interest_count
@@ -850,7 +900,7 @@ async def get_published_lands(
         WHERE l.status = 'published'
     """
     
-    params = {"skip": skip, "limit": limit}
+    params = {}
     
     # Apply filters
     if energy_type:
@@ -877,16 +927,17 @@ async def get_published_lands(
         base_query += " AND l.location_text ILIKE :location"
         params["location"] = f"%{location}%"
     
-    base_query += """
+    # Newest listings first; lands published before published_at was recorded sort by creation
+    where_sql, order_sql = keyset_page("COALESCE(l.published_at, l.created_at)", "l.land_id", cursor, skip, limit, params)
+    base_query += where_sql + """
         GROUP BY l.land_id, l.title, l.location_text, l.coordinates, l.land_type,
                  l.energy_key, l.capacity_mw, l.price_per_mwh, l.area_acres,
                  l.timeline_text, l.contract_term_years, l.developer_name,
                  l.published_at, l.created_at, u.first_name, u.last_name, u.email
-        ORDER BY l.published_at DESC NULLS LAST, l.created_at DESC
-        OFFSET :skip LIMIT :limit
-    """
+    """ + order_sql
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
+    set_next_cursor(response, results, limit, "listed_at", "land_id")
     
     projects = []
     for row in results:
@@ -917,18 +968,45 @@ async def get_published_lands(
         }
         projects.append(project)
     
+    # Tagged per land too, so a land's edits and interests evict the pages showing it
+    redis_service.set(
+        cache_key,
+        {"projects": projects, "next_cursor": response.headers.get(CURSOR_HEADER)},
+        MARKETPLACE_CACHE_TTL,
+        tags=[MARKETPLACE_TAG, *(land_tag(project["land_id"]) for project in projects)]
+    )
     return projects
 
 # Land sections management
+async def check_land_visible(land_id: UUID, current_user: dict, loaders: RequestLoaders):
+    """Raise 404/403 unless the user may view the land (same rules as ``get_land``)."""
+    land = await loaders.lands.load(land_id)
+    if not land:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Land not found"
+        )
+    
+    user_roles = current_user.get("roles", [])
+    is_admin = "administrator" in user_roles
+    is_owner = str(current_user["user_id"]) == str(land.landowner_id)
+    if not (is_admin or is_owner or land.status == "published"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view this land"
+        )
+    return land
+
 @router.get("/{land_id}/sections", response_model=List[LandSection])
 async def get_land_sections(
     land_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """Get all sections for a land."""
     # First check if user can access this land
-    await get_land(land_id, current_user, db)
+    await check_land_visible(land_id, current_user, loaders)
     
     query = text("""
         SELECT ls.land_section_id, ls.land_id, ls.section_definition_id,
@@ -940,7 +1018,7 @@ async def get_land_sections(
         ORDER BY sd.section_name
     """)
     
-    results = db.execute(query, {"land_id": str(land_id)}).fetchall()
+    results = (await db.execute(query, {"land_id": str(land_id)})).fetchall()
     
     return [
         LandSection(
@@ -959,12 +1037,12 @@ async def create_land_section(
     land_id: UUID,
     section_data: LandSectionCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new section for a land."""
     # Check if user owns the land or is admin
     land_check = text("SELECT owner_id FROM lands WHERE land_id = :land_id")
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -991,13 +1069,13 @@ async def create_land_section(
         SELECT sp_assign_section(:land_id, :section_definition_id, :section_data) as section_id
     """)
     
-    result = db.execute(query, {
+    result = (await db.execute(query, {
         "land_id": str(land_id),
         "section_definition_id": str(section_data.section_definition_id),
         "section_data": section_data.section_data
-    }).fetchone()
+    })).fetchone()
     
-    db.commit()
+    await db.commit()
     
     if not result or not result.section_id:
         raise HTTPException(
@@ -1012,7 +1090,7 @@ async def create_land_section(
         WHERE land_section_id = :section_id
     """)
     
-    section_result = db.execute(section_query, {"section_id": result.section_id}).fetchone()
+    section_result = (await db.execute(section_query, {"section_id": result.section_id})).fetchone()
     
     return LandSection(
         land_section_id=section_result.land_section_id,
@@ -1026,7 +1104,7 @@ async def create_land_section(
 @router.get("/sections/definitions", response_model=List[SectionDefinition])
 async def get_section_definitions(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all available section definitions."""
     query = text("""
@@ -1035,7 +1113,7 @@ async def get_section_definitions(
         ORDER BY section_name
     """)
     
-    results = db.execute(query).fetchall()
+    results = (await db.execute(query)).fetchall()
     
     return [
         SectionDefinition(
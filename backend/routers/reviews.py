@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 import json
 
-from database import get_db
+from database import get_async_db
 from auth import get_current_user, require_admin
+from redis_service import cache_manager
 from models.schemas import MessageResponse
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
@@ -19,7 +20,7 @@ async def save_review_status(
     reviewer_role: str,
     review_data: Dict[str, Any],
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Save or update review status for a specific role on a land."""
     
@@ -33,7 +34,7 @@ async def save_review_status(
     
     # Check if land exists
     land_check = text("SELECT land_id FROM lands WHERE land_id = :land_id")
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -47,10 +48,10 @@ async def save_review_status(
             SELECT review_id FROM land_reviews 
             WHERE land_id = :land_id AND reviewer_role = :reviewer_role
         """)
-        existing = db.execute(check_query, {
+        existing = (await db.execute(check_query, {
             "land_id": str(land_id),
             "reviewer_role": reviewer_role
-        }).fetchone()
+        })).fetchone()
         
         if existing:
             # Update existing review
@@ -113,15 +114,15 @@ async def save_review_status(
             "published_at": review_data.get("publishedAt")
         }
         
-        result = db.execute(update_query, params)
-        db.commit()
+        result = await db.execute(update_query, params)
+        await db.commit()
         
         # Auto-publish land to marketplace if this review is published
         if params.get("published") == True:
             try:
                 # Check if land is already published
                 land_status_query = text("SELECT status FROM lands WHERE land_id = :land_id")
-                land_status = db.execute(land_status_query, {"land_id": str(land_id)}).fetchone()
+                land_status = (await db.execute(land_status_query, {"land_id": str(land_id)})).fetchone()
                 
                 if land_status and land_status.status != 'published':
                     # Check if land has required fields for publishing
@@ -138,7 +139,7 @@ async def save_review_status(
                         FROM lands 
                         WHERE land_id = :land_id
                     """)
-                    fields_check = db.execute(check_fields_query, {"land_id": str(land_id)}).fetchone()
+                    fields_check = (await db.execute(check_fields_query, {"land_id": str(land_id)})).fetchone()
                     
                     if fields_check and fields_check.has_required_fields:
                         # Publish the land to marketplace
@@ -148,8 +149,9 @@ async def save_review_status(
                             WHERE land_id = :land_id 
                             AND status IN ('draft', 'submitted', 'under_review', 'approved', 'investor_ready')
                         """)
-                        db.execute(publish_query, {"land_id": str(land_id)})
-                        db.commit()
+                        await db.execute(publish_query, {"land_id": str(land_id)})
+                        await db.commit()
+                        cache_manager.clear_land_cache(land_id, marketplace=True)
             except Exception as publish_error:
                 # Log but don't fail the review save if publish fails
                 print(f"Warning: Failed to auto-publish land {land_id}: {str(publish_error)}")
@@ -158,7 +160,7 @@ async def save_review_status(
         return await get_review_status(land_id, reviewer_role, current_user, db)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save review status: {str(e)}"
@@ -170,7 +172,7 @@ async def get_review_status(
     land_id: UUID,
     reviewer_role: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get review status for a specific role on a land."""
     
@@ -186,10 +188,10 @@ async def get_review_status(
         WHERE land_id = :land_id AND reviewer_role = :reviewer_role
     """)
     
-    result = db.execute(query, {
+    result = (await db.execute(query, {
         "land_id": str(land_id),
         "reviewer_role": reviewer_role
-    }).fetchone()
+    })).fetchone()
     
     if not result:
         # Return default pending status
@@ -228,13 +230,13 @@ async def get_review_status(
 async def get_all_review_statuses(
     land_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all review statuses for a land (all roles)."""
     
     # Check if land exists
     land_check = text("SELECT land_id FROM lands WHERE land_id = :land_id")
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -255,7 +257,7 @@ async def get_all_review_statuses(
         ORDER BY created_at ASC
     """)
     
-    results = db.execute(query, {"land_id": str(land_id)}).fetchall()
+    results = (await db.execute(query, {"land_id": str(land_id)})).fetchall()
     
     # Build response with all three roles
     all_roles = ['re_sales_advisor', 're_analyst', 're_governance_lead']
@@ -305,7 +307,7 @@ async def delete_review_status(
     land_id: UUID,
     reviewer_role: str,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete review status for a specific role (admin only)."""
     
@@ -316,10 +318,10 @@ async def delete_review_status(
             RETURNING review_id
         """)
         
-        result = db.execute(query, {
+        result = (await db.execute(query, {
             "land_id": str(land_id),
             "reviewer_role": reviewer_role
-        }).fetchone()
+        })).fetchone()
         
         if not result:
             raise HTTPException(
@@ -327,13 +329,13 @@ async def delete_review_status(
                 detail="Review not found"
             )
         
-        db.commit()
+        await db.commit()
         return MessageResponse(message="Review status deleted successfully")
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete review status: {str(e)}"
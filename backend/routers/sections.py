@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from database import get_db
-from models.schemas import LandSection, Land, User, UserRole
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from typing import List, Optional, Set
+from uuid import UUID
+from database import get_async_db
+from models import LandSection, Land, User
 from auth import get_current_user
 from pydantic import BaseModel
 
@@ -12,7 +14,7 @@ router = APIRouter()
 class SectionUpdate(BaseModel):
     data: Optional[dict] = None
     assigned_role: Optional[str] = None
-    assigned_user: Optional[str] = None
+    assigned_user: Optional[UUID] = None
 
 class SectionResponse(BaseModel):
     land_section_id: str
@@ -36,48 +38,77 @@ class SectionDecision(BaseModel):
     decision: str  # 'approved' or 'rejected'
     comments: Optional[str] = None
 
-# Helper functions
-def check_user_role(db: Session, user_id: str, required_roles: List[str]) -> bool:
-    user_roles = db.query(UserRole).filter(UserRole.user_id == user_id).all()
-    roles = [ur.role_key for ur in user_roles]
-    return any(role in roles for role in required_roles)
-
-def is_admin(db: Session, user_id: str) -> bool:
-    return check_user_role(db, user_id, ["administrator"])
-
-def is_landowner(db: Session, user_id: str, land_id: str) -> bool:
-    land = db.query(Land).filter(Land.land_id == land_id).first()
-    return land and str(land.landowner_id) == str(user_id)
-
-def can_edit_section(db: Session, user_id: str, section: LandSection) -> bool:
-    # Admin can edit all
-    if is_admin(db, user_id):
-        return True
-    
-    # Landowner can edit draft sections of their own land
-    if section.status == 'draft' and is_landowner(db, user_id, str(section.land_id)):
-        return True
-    
-    # Assigned user can edit their assigned sections
-    if section.assigned_user and str(section.assigned_user) == str(user_id):
-        return True
+# Permission context
+class SectionPermissions:
+    """The caller's permissions, built once per request.
+    
+    Roles come from the authenticated principal, so role checks never query
+    the database. The IDs of the lands the caller owns are loaded with one
+    query the first time ownership matters and reused for every later check.
+    """
+    
+    def __init__(self, current_user: dict, db: AsyncSession):
+        self.user_id = UUID(str(current_user["user_id"]))
+        self.roles: Set[str] = set(current_user.get("roles") or [])
+        self.is_admin = "administrator" in self.roles
+        self._db = db
+        self._owned_land_ids: Optional[Set[str]] = None
+    
+    def has_role(self, *roles: str) -> bool:
+        return any(role in self.roles for role in roles)
+    
+    async def owns_land(self, land_id) -> bool:
+        if self._owned_land_ids is None:
+            rows = (await self._db.execute(select(Land.land_id).where(Land.landowner_id == self.user_id))).all()
+            self._owned_land_ids = {str(row.land_id) for row in rows}
+        return str(land_id) in self._owned_land_ids
+    
+    def is_assigned(self, section: LandSection) -> bool:
+        """Whether the section is assigned to the caller directly or through one of their roles."""
+        if section.assigned_user and str(section.assigned_user) == str(self.user_id):
+            return True
+        return bool(section.assigned_role) and self.has_role(section.assigned_role)
+    
+    async def can_view_section(self, section: LandSection, land: Optional[Land]) -> bool:
+        return (
+            self.is_admin or
+            await self.owns_land(section.land_id) or
+            self.is_assigned(section) or
+            (land is not None and land.status in ['published'])
+        )
     
-    # User with assigned role can edit
-    if section.assigned_role:
-        return check_user_role(db, user_id, [section.assigned_role])
+    async def can_edit_section(self, section: LandSection) -> bool:
+        # Admin can edit all
+        if self.is_admin:
+            return True
+        
+        # Landowner can edit draft sections of their own land
+        if section.status == 'draft' and await self.owns_land(section.land_id):
+            return True
+        
+        # Assigned user or role can edit
+        return self.is_assigned(section)
     
-    return False
+    def can_review_section(self, section: LandSection) -> bool:
+        return self.is_admin or self.is_assigned(section)
+
+def get_section_permissions(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> SectionPermissions:
+    """Dependency providing the caller's permission context for this request."""
+    return SectionPermissions(current_user, db)
 
 # API endpoints
 @router.get("/land/{land_id}", response_model=List[SectionResponse])
 async def get_land_sections(
-    land_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    land_id: UUID,
+    perms: SectionPermissions = Depends(get_section_permissions),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all sections for a land"""
     # Check if land exists
-    land = db.query(Land).filter(Land.land_id == land_id).first()
+    land = (await db.execute(select(Land).where(Land.land_id == land_id))).scalars().first()
     if not land:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -85,15 +116,15 @@ async def get_land_sections(
         )
     
     # Check permissions
-    if not (is_admin(db, str(current_user.user_id)) or 
-            is_landowner(db, str(current_user.user_id), land_id) or
-            land.status in ['published', 'submitted', 'under_review', 'approved']):
+    if not (perms.is_admin or 
+            land.status in ['published', 'submitted', 'under_review', 'approved'] or
+            await perms.owns_land(land_id)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
     
-    sections = db.query(LandSection).filter(LandSection.land_id == land_id).all()
+    sections = (await db.execute(select(LandSection).where(LandSection.land_id == land_id))).scalars().all()
     
     result = []
     for section in sections:
@@ -117,12 +148,12 @@ async def get_land_sections(
 
 @router.get("/{section_id}", response_model=SectionResponse)
 async def get_section(
-    section_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    section_id: UUID,
+    perms: SectionPermissions = Depends(get_section_permissions),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get section by ID"""
-    section = db.query(LandSection).filter(LandSection.land_section_id == section_id).first()
+    section = (await db.execute(select(LandSection).where(LandSection.land_section_id == section_id))).scalars().first()
     if not section:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -130,12 +161,8 @@ async def get_section(
         )
     
     # Check permissions
-    land = db.query(Land).filter(Land.land_id == section.land_id).first()
-    if not (is_admin(db, str(current_user.user_id)) or 
-            is_landowner(db, str(current_user.user_id), str(section.land_id)) or
-            (section.assigned_user and str(section.assigned_user) == str(current_user.user_id)) or
-            (section.assigned_role and check_user_role(db, str(current_user.user_id), [section.assigned_role])) or
-            land.status in ['published']):
+    land = (await db.execute(select(Land).where(Land.land_id == section.land_id))).scalars().first()
+    if not await perms.can_view_section(section, land):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -159,13 +186,13 @@ async def get_section(
 
 @router.put("/{section_id}", response_model=SectionResponse)
 async def update_section(
-    section_id: str,
+    section_id: UUID,
     section_update: SectionUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    perms: SectionPermissions = Depends(get_section_permissions),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update section data"""
-    section = db.query(LandSection).filter(LandSection.land_section_id == section_id).first()
+    section = (await db.execute(select(LandSection).where(LandSection.land_section_id == section_id))).scalars().first()
     if not section:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -173,7 +200,7 @@ async def update_section(
         )
     
     # Check permissions
-    if not can_edit_section(db, str(current_user.user_id), section):
+    if not await perms.can_edit_section(section):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to edit this section"
@@ -184,7 +211,7 @@ async def update_section(
     for field, value in update_data.items():
         if field == 'assigned_user' and value:
             # Validate user exists
-            user = db.query(User).filter(User.user_id == value).first()
+            user = (await db.execute(select(User).where(User.user_id == value))).scalars().first()
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -192,8 +219,8 @@ async def update_section(
                 )
         setattr(section, field, value)
     
-    db.commit()
-    db.refresh(section)
+    await db.commit()
+    await db.refresh(section)
     
     return SectionResponse(
         land_section_id=str(section.land_section_id),
@@ -213,19 +240,19 @@ async def update_section(
 
 @router.post("/{section_id}/assign", response_model=dict)
 async def assign_section(
-    section_id: str,
+    section_id: UUID,
     assignment: SectionUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    perms: SectionPermissions = Depends(get_section_permissions),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assign section to role/user (admin only)"""
-    if not is_admin(db, str(current_user.user_id)):
+    if not perms.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only administrators can assign sections"
         )
     
-    section = db.query(LandSection).filter(LandSection.land_section_id == section_id).first()
+    section = (await db.execute(select(LandSection).where(LandSection.land_section_id == section_id))).scalars().first()
     if not section:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -238,7 +265,7 @@ async def assign_section(
     
     if assignment.assigned_user:
         # Validate user exists
-        user = db.query(User).filter(User.user_id == assignment.assigned_user).first()
+        user = (await db.execute(select(User).where(User.user_id == assignment.assigned_user))).scalars().first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -246,19 +273,19 @@ async def assign_section(
             )
         section.assigned_user = assignment.assigned_user
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Section assigned successfully"}
 
 @router.post("/{section_id}/decide", response_model=dict)
 async def decide_section(
-    section_id: str,
+    section_id: UUID,
     decision: SectionDecision,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    perms: SectionPermissions = Depends(get_section_permissions),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Approve or reject section (reviewer only)"""
-    section = db.query(LandSection).filter(LandSection.land_section_id == section_id).first()
+    section = (await db.execute(select(LandSection).where(LandSection.land_section_id == section_id))).scalars().first()
     if not section:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -266,13 +293,7 @@ async def decide_section(
         )
     
     # Check if user can review this section
-    can_review = (
-        is_admin(db, str(current_user.user_id)) or
-        (section.assigned_user and str(section.assigned_user) == str(current_user.user_id)) or
-        (section.assigned_role and check_user_role(db, str(current_user.user_id), [section.assigned_role]))
-    )
-    
-    if not can_review:
+    if not perms.can_review_section(section):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to review this section"
@@ -289,21 +310,23 @@ async def decide_section(
     section.reviewer_comments = decision.comments
     
     if decision.decision == 'approved':
-        section.approved_at = db.execute('SELECT NOW()').scalar()
+        section.approved_at = func.now()
         section.rejected_at = None
     else:
-        section.rejected_at = db.execute('SELECT NOW()').scalar()
+        section.rejected_at = func.now()
         section.approved_at = None
     
-    db.commit()
+    await db.commit()
     
     # Check if all sections are approved to update land status
-    land = db.query(Land).filter(Land.land_id == section.land_id).first()
+    land = (await db.execute(select(Land).where(Land.land_id == section.land_id))).scalars().first()
     if land:
-        pending_sections = db.query(LandSection).filter(
-            LandSection.land_id == section.land_id,
-            LandSection.status != 'approved'
-        ).count()
+        pending_sections = (await db.execute(
+            select(func.count()).select_from(LandSection).where(
+                LandSection.land_id == section.land_id,
+                LandSection.status != 'approved'
+            )
+        )).scalar()
         
         if pending_sections == 0:
             # All sections approved
@@ -313,27 +336,23 @@ async def decide_section(
             if land.status in ['submitted', 'under_review', 'approved']:
                 land.status = 'under_review'
         
-        db.commit()
+        await db.commit()
     
     return {"message": f"Section {decision.decision} successfully"}
 
 @router.get("/assigned/me", response_model=List[SectionResponse])
 async def get_my_assigned_sections(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    perms: SectionPermissions = Depends(get_section_permissions),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get sections assigned to current user"""
-    # Get user roles
-    user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.user_id).all()
-    roles = [ur.role_key for ur in user_roles]
-    
     # Query sections assigned to user or their roles
-    query = db.query(LandSection).filter(
-        (LandSection.assigned_user == current_user.user_id) |
-        (LandSection.assigned_role.in_(roles))
+    query = select(LandSection).where(
+        (LandSection.assigned_user == perms.user_id) |
+        (LandSection.assigned_role.in_(perms.roles))
     )
     
-    sections = query.all()
+    sections = (await db.execute(query)).scalars().all()
     
     result = []
     for section in sections:
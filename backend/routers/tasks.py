@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi import status as http_status
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, bindparam
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 import uuid
 import logging
 
-from database import get_db
+from database import get_async_db
 from auth import get_current_user, require_admin
+from loaders import RequestLoaders, get_loaders, display_name
+from pagination import keyset_page, set_next_cursor
 from models.schemas import (
     TaskCreate, TaskUpdate, TaskResponse, TaskHistoryResponse,
     SubtaskCreate, SubtaskUpdate, SubtaskResponse,
@@ -22,7 +24,7 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 logger = logging.getLogger(__name__)
 
 # Helper functions
-async def create_default_subtasks_for_task(task_id: str, assigned_role: str, created_by: str, db: Session):
+async def create_default_subtasks_for_task(task_id: str, assigned_role: str, created_by: str, db: AsyncSession):
     """Helper function to create default subtasks for a task based on the assigned role."""
     # Get default subtask templates
     default_subtasks = {
@@ -84,7 +86,7 @@ async def create_default_subtasks_for_task(task_id: str, assigned_role: str, cre
                 )
             """)
             
-            db.execute(insert_query, {
+            await db.execute(insert_query, {
                 "subtask_id": str(subtask_id),
                 "task_id": task_id,
                 "title": template["title"],
@@ -98,7 +100,7 @@ async def create_default_subtasks_for_task(task_id: str, assigned_role: str, cre
             # Continue with other subtasks even if one fails
             continue
     
-    db.commit()
+    await db.commit()
     print(f"Created {len(templates)} default subtasks for task {task_id}")
 
 def can_access_task(user_roles: List[str], user_id: str, task_data: dict) -> bool:
@@ -137,12 +139,47 @@ def can_manage_task(user_roles: List[str], user_id: str, task_data: dict) -> boo
     
     return False
 
+async def load_subtasks_by_task(task_ids: List[Any], db: AsyncSession) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch the subtasks of many tasks in one query, grouped by task ID.
+    
+    Every requested task gets an entry, so tasks without subtasks map to an
+    empty list. Subtasks keep their creation order within each task.
+    """
+    subtasks_by_task = {str(task_id): [] for task_id in task_ids}
+    if not subtasks_by_task:
+        return subtasks_by_task
+    
+    subtasks_query = text("""
+        SELECT subtask_id, task_id, title, description, status, 
+               assigned_to, created_by, order_index, created_at, updated_at
+        FROM subtasks 
+        WHERE task_id IN :task_ids
+        ORDER BY task_id, created_at ASC
+    """).bindparams(bindparam("task_ids", expanding=True))
+    subtasks_result = (await db.execute(subtasks_query, {"task_ids": list(subtasks_by_task)})).fetchall()
+    
+    for subtask in subtasks_result:
+        subtasks_by_task[str(subtask.task_id)].append({
+            "subtask_id": str(subtask.subtask_id),
+            "task_id": str(subtask.task_id),
+            "title": subtask.title,
+            "description": subtask.description,
+            "status": subtask.status,
+            "assigned_to": str(subtask.assigned_to) if subtask.assigned_to else None,
+            "created_by": str(subtask.created_by) if subtask.created_by else None,
+            "order_index": subtask.order_index,
+            "created_at": subtask.created_at,
+            "updated_at": subtask.updated_at
+        })
+    
+    return subtasks_by_task
+
 # Task endpoints
 @router.post("/", response_model=TaskResponse)
 async def create_task(
     task_data: TaskCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new task (admin or land owner only)."""
     # Check if land exists and user has permission
@@ -150,7 +187,7 @@ async def create_task(
         SELECT landowner_id, status FROM lands WHERE land_id = :land_id
     """)
     
-    land_result = db.execute(land_check, {"land_id": str(task_data.land_id)}).fetchone()
+    land_result = (await db.execute(land_check, {"land_id": str(task_data.land_id)})).fetchone()
     
     if not land_result:
         raise HTTPException(
@@ -169,7 +206,7 @@ async def create_task(
     # Validate assigned_to user if provided
     if task_data.assigned_to:
         user_check = text("SELECT user_id FROM \"user\" WHERE user_id = :user_id")
-        user_result = db.execute(user_check, {"user_id": str(task_data.assigned_to)}).fetchone()
+        user_result = (await db.execute(user_check, {"user_id": str(task_data.assigned_to)})).fetchone()
         
         if not user_result:
             raise HTTPException(
@@ -194,7 +231,7 @@ async def create_task(
             )
         """)
         
-        db.execute(insert_query, {
+        await db.execute(insert_query, {
             "task_id": task_id,
             "land_id": str(task_data.land_id),
             "title": task_data.task_type.replace('_', ' ').title(),  # Convert task_type to title
@@ -206,7 +243,7 @@ async def create_task(
             "due_date": task_data.due_date
         })
         
-        db.commit()
+        await db.commit()
         
         # Auto-create default subtasks if task has assigned_role
         if task_data.assigned_role:
@@ -216,7 +253,7 @@ async def create_task(
         return await get_task(UUID(task_id), current_user, db)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create task: {str(e)}"
@@ -224,6 +261,7 @@ async def create_task(
 
 @router.get("/", response_model=List[TaskResponse])
 async def get_tasks(
+    response: Response,
     land_id: Optional[UUID] = None,
     assigned_to: Optional[UUID] = None,
     status: Optional[str] = None,
@@ -233,8 +271,10 @@ async def get_tasks(
     summary_only: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """Get tasks with optional filters."""
     user_roles = current_user.get("roles", [])
@@ -245,17 +285,13 @@ async def get_tasks(
                t.assigned_to, t.created_by as assigned_by, t.status, t.priority,
                t.assigned_role, t.start_date, t.end_date, t.due_date,
                t.completion_notes, t.created_at, t.updated_at,
-               l.title as land_title, l.landowner_id,
-               u1.first_name || ' ' || u1.last_name as assigned_to_name,
-               u2.first_name || ' ' || u2.last_name as assigned_by_name
+               l.title as land_title, l.landowner_id
         FROM tasks t
         JOIN lands l ON t.land_id = l.land_id
-        LEFT JOIN "user" u1 ON t.assigned_to = u1.user_id
-        LEFT JOIN "user" u2 ON t.created_by = u2.user_id
         WHERE 1=1
     """
     
-    params = {"skip": skip, "limit": limit}
+    params = {}
     
     # Add filters
     if land_id:
@@ -283,39 +319,22 @@ async def get_tasks(
         """
         params["user_id"] = current_user["user_id"]
     
-    base_query += " ORDER BY t.created_at DESC OFFSET :skip LIMIT :limit"
+    where_sql, order_sql = keyset_page("t.created_at", "t.task_id", cursor, skip, limit, params)
+    base_query += where_sql + order_sql
+    
+    results = (await db.execute(text(base_query), params)).fetchall()
+    set_next_cursor(response, results, limit, "created_at", "task_id")
     
-    results = db.execute(text(base_query), params).fetchall()
+    # Assignee and creator names for the whole page in one lookup
+    users = await loaders.users.load_many(
+        [row.assigned_to for row in results] + [row.assigned_by for row in results]
+    )
     
-    # If include_subtasks is requested, fetch subtasks for each task
+    # If include_subtasks is requested, fetch the subtasks of the whole page at once
     if include_subtasks:
+        subtasks_by_task = await load_subtasks_by_task([row.task_id for row in results], db)
         task_responses = []
         for row in results:
-            # Get subtasks for this task
-            subtasks_query = text("""
-                SELECT subtask_id, task_id, title, description, status, 
-                       assigned_to, created_at, updated_at
-                FROM subtasks 
-                WHERE task_id = :task_id
-                ORDER BY created_at ASC
-            """)
-            subtasks_result = db.execute(subtasks_query, {"task_id": str(row.task_id)}).fetchall()
-            
-            # Convert subtasks to dict format
-            subtasks = [
-                {
-                    "subtask_id": str(subtask.subtask_id),
-                    "task_id": str(subtask.task_id),
-                    "title": subtask.title,
-                    "description": subtask.description,
-                    "status": subtask.status,
-                    "assigned_to": str(subtask.assigned_to) if subtask.assigned_to else None,
-                    "created_at": subtask.created_at,
-                    "updated_at": subtask.updated_at
-                }
-                for subtask in subtasks_result
-            ]
-            
             # Create task response with subtasks
             task_response = {
                 "task_id": str(row.task_id),
@@ -334,9 +353,9 @@ async def get_tasks(
                 "created_at": row.created_at,
                 "updated_at": row.updated_at,
                 "land_title": row.land_title,
-                "assigned_to_name": row.assigned_to_name,
-                "assigned_by_name": row.assigned_by_name,
-                "subtasks": subtasks
+                "assigned_to_name": display_name(users.get(str(row.assigned_to))),
+                "assigned_by_name": display_name(users.get(str(row.assigned_by))),
+                "subtasks": subtasks_by_task[str(row.task_id)]
             }
             task_responses.append(task_response)
         
@@ -357,8 +376,8 @@ async def get_tasks(
                 created_at=row.created_at,
                 updated_at=row.updated_at,
                 land_title=row.land_title,
-                assigned_to_name=row.assigned_to_name,
-                assigned_by_name=row.assigned_by_name
+                assigned_to_name=display_name(users.get(str(row.assigned_to))),
+                assigned_by_name=display_name(users.get(str(row.assigned_by)))
             )
             for row in results
         ]
@@ -367,15 +386,13 @@ async def get_tasks(
 async def get_project_review_tasks(
     land_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """Get all tasks for a specific land/project with subtasks for landowner review."""
     
     # Check if user is landowner of this land or admin
-    land_check = text("""
-        SELECT landowner_id, status FROM lands WHERE land_id = :land_id
-    """)
-    land_result = db.execute(land_check, {"land_id": str(land_id)}).fetchone()
+    land_result = await loaders.lands.load(land_id)
     
     if not land_result:
         raise HTTPException(
@@ -398,47 +415,22 @@ async def get_project_review_tasks(
                    t.assigned_to, t.created_by as assigned_by, t.status, t.priority,
                    t.assigned_role, t.start_date, t.end_date, t.due_date,
                    t.completion_notes, t.created_at, t.updated_at,
-                   l.title as land_title, l.landowner_id,
-                   u1.first_name || ' ' || u1.last_name as assigned_to_name,
-                   u2.first_name || ' ' || u2.last_name as assigned_by_name
+                   l.title as land_title, l.landowner_id
             FROM tasks t
             JOIN lands l ON t.land_id = l.land_id
-            LEFT JOIN "user" u1 ON t.assigned_to = u1.user_id
-            LEFT JOIN "user" u2 ON t.created_by = u2.user_id
             WHERE t.land_id = :land_id
             ORDER BY t.created_at DESC
         """)
         
-        tasks_result = db.execute(tasks_query, {"land_id": str(land_id)}).fetchall()
+        tasks_result = (await db.execute(tasks_query, {"land_id": str(land_id)})).fetchall()
         
-        # Get subtasks for each task
+        # Get subtasks for all tasks in one query
+        subtasks_by_task = await load_subtasks_by_task([task.task_id for task in tasks_result], db)
+        users = await loaders.users.load_many(
+            [task.assigned_to for task in tasks_result] + [task.assigned_by for task in tasks_result]
+        )
         tasks_with_subtasks = []
         for task in tasks_result:
-            # Get subtasks for this task
-            subtasks_query = text("""
-                SELECT subtask_id, task_id, title, description, status, 
-                       assigned_to, created_at, updated_at
-                FROM subtasks 
-                WHERE task_id = :task_id
-                ORDER BY created_at ASC
-            """)
-            subtasks_result = db.execute(subtasks_query, {"task_id": str(task.task_id)}).fetchall()
-            
-            # Convert subtasks to dict format
-            subtasks = [
-                {
-                    "subtask_id": str(subtask.subtask_id),
-                    "task_id": str(subtask.task_id),
-                    "title": subtask.title,
-                    "description": subtask.description,
-                    "status": subtask.status,
-                    "assigned_to": str(subtask.assigned_to) if subtask.assigned_to else None,
-                    "created_at": subtask.created_at,
-                    "updated_at": subtask.updated_at
-                }
-                for subtask in subtasks_result
-            ]
-            
             # Create task response with subtasks
             task_response = {
                 "task_id": str(task.task_id),
@@ -458,9 +450,9 @@ async def get_project_review_tasks(
                 "created_at": task.created_at,
                 "updated_at": task.updated_at,
                 "land_title": task.land_title,
-                "assigned_to_name": task.assigned_to_name,
-                "assigned_by_name": task.assigned_by_name,
-                "subtasks": subtasks
+                "assigned_to_name": display_name(users.get(str(task.assigned_to))),
+                "assigned_by_name": display_name(users.get(str(task.assigned_by))),
+                "subtasks": subtasks_by_task[str(task.task_id)]
             }
             tasks_with_subtasks.append(task_response)
         
@@ -477,7 +469,7 @@ async def get_project_review_tasks(
 async def get_task(
     task_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get task by ID."""
     query = text("""
@@ -494,7 +486,7 @@ async def get_task(
         WHERE t.task_id = :task_id
     """)
     
-    result = db.execute(query, {"task_id": str(task_id)}).fetchone()
+    result = (await db.execute(query, {"task_id": str(task_id)})).fetchone()
     
     if not result:
         raise HTTPException(
@@ -539,7 +531,7 @@ async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update task (assigned user, creator, or admin only)."""
     # Check if task exists and user has permission
@@ -550,7 +542,7 @@ async def update_task(
         WHERE t.task_id = :task_id
     """)
     
-    task_result = db.execute(task_check, {"task_id": str(task_id)}).fetchone()
+    task_result = (await db.execute(task_check, {"task_id": str(task_id)})).fetchone()
     
     if not task_result:
         raise HTTPException(
@@ -578,7 +570,7 @@ async def update_task(
     # Validate assigned_to user if provided
     if task_update.assigned_to:
         user_check = text("SELECT user_id FROM \"user\" WHERE user_id = :user_id")
-        user_result = db.execute(user_check, {"user_id": str(task_update.assigned_to)}).fetchone()
+        user_result = (await db.execute(user_check, {"user_id": str(task_update.assigned_to)})).fetchone()
         
         if not user_result:
             raise HTTPException(
@@ -597,7 +589,7 @@ async def update_task(
                 WHERE task_id = :task_id
             """)
             
-            db.execute(status_update, {
+            await db.execute(status_update, {
                 "task_id": str(task_id),
                 "new_status": task_update.status
             })
@@ -613,7 +605,7 @@ async def update_task(
                 )
             """)
             
-            db.execute(history_insert, {
+            await db.execute(history_insert, {
                 "history_id": str(uuid.uuid4()),
                 "task_id": str(task_id),
                 "from_status": task_result.current_status,
@@ -651,14 +643,14 @@ async def update_task(
                 WHERE task_id = :task_id
             """)
             
-            db.execute(update_query, params)
+            await db.execute(update_query, params)
         
-        db.commit()
+        await db.commit()
         
         return await get_task(task_id, current_user, db)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update task: {str(e)}"
@@ -668,7 +660,7 @@ async def update_task(
 async def delete_task(
     task_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete task (creator or admin only)."""
     # Check if task exists and user has permission
@@ -679,7 +671,7 @@ async def delete_task(
         WHERE t.task_id = :task_id
     """)
     
-    task_result = db.execute(task_check, {"task_id": str(task_id)}).fetchone()
+    task_result = (await db.execute(task_check, {"task_id": str(task_id)})).fetchone()
     
     if not task_result:
         raise HTTPException(
@@ -702,18 +694,18 @@ async def delete_task(
     try:
         # Delete task history first (foreign key constraint)
         delete_history = text("DELETE FROM task_history WHERE task_id = :task_id")
-        db.execute(delete_history, {"task_id": str(task_id)})
+        await db.execute(delete_history, {"task_id": str(task_id)})
         
         # Delete task
         delete_task_query = text("DELETE FROM tasks WHERE task_id = :task_id")
-        db.execute(delete_task_query, {"task_id": str(task_id)})
+        await db.execute(delete_task_query, {"task_id": str(task_id)})
         
-        db.commit()
+        await db.commit()
         
         return MessageResponse(message="Task deleted successfully")
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete task: {str(e)}"
@@ -723,7 +715,7 @@ async def delete_task(
 async def get_task_history(
     task_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get task history."""
     # Check if task exists and user has permission
@@ -734,7 +726,7 @@ async def get_task_history(
         WHERE t.task_id = :task_id
     """)
     
-    task_result = db.execute(task_check, {"task_id": str(task_id)}).fetchone()
+    task_result = (await db.execute(task_check, {"task_id": str(task_id)})).fetchone()
     
     if not task_result:
         raise HTTPException(
@@ -766,7 +758,7 @@ async def get_task_history(
         ORDER BY th.changed_at DESC
     """)
     
-    results = db.execute(history_query, {"task_id": str(task_id)}).fetchall()
+    results = (await db.execute(history_query, {"task_id": str(task_id)})).fetchall()
     
     return [
         TaskHistoryResponse(
@@ -786,7 +778,7 @@ async def get_task_history(
 async def get_my_tasks(
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get tasks assigned to the current user."""
     base_query = """
@@ -812,7 +804,7 @@ async def get_my_tasks(
     base_query += " ORDER BY t.due_date ASC NULLS LAST, t.created_at DESC"
     
     try:
-        results = db.execute(text(base_query), params).fetchall()
+        results = (await db.execute(text(base_query), params)).fetchall()
         
         return [
             TaskResponse(
@@ -844,7 +836,7 @@ async def get_my_tasks(
 async def get_tasks_created_by_me(
     status: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get tasks created by the current user."""
     base_query = """
@@ -870,7 +862,7 @@ async def get_tasks_created_by_me(
     base_query += " ORDER BY t.created_at DESC"
     
     try:
-        results = db.execute(text(base_query), params).fetchall()
+        results = (await db.execute(text(base_query), params)).fetchall()
         
         return [
             TaskResponse(
@@ -906,7 +898,7 @@ async def get_all_tasks(
     status: Optional[str] = None,
     task_type: Optional[str] = None,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all tasks (admin only)."""
     base_query = """
@@ -935,7 +927,7 @@ async def get_all_tasks(
     
     base_query += " ORDER BY t.created_at DESC OFFSET :skip LIMIT :limit"
     
-    results = db.execute(text(base_query), params).fetchall()
+    results = (await db.execute(text(base_query), params)).fetchall()
     
     return [
         TaskResponse(
@@ -961,7 +953,7 @@ async def get_all_tasks(
 @router.get("/types/list", response_model=List[str])
 async def get_task_types(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all task types in use."""
     query = text("""
@@ -970,14 +962,14 @@ async def get_task_types(
         ORDER BY task_type
     """)
     
-    results = db.execute(query).fetchall()
+    results = (await db.execute(query)).fetchall()
     
     return [row.task_type for row in results]
 
 @router.get("/status/list", response_model=List[str])
 async def get_task_statuses(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all task statuses."""
     # Return standard task statuses
@@ -986,7 +978,7 @@ async def get_task_statuses(
 @router.get("/priority/list", response_model=List[str])
 async def get_task_priorities(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all task priorities."""
     # Return standard task priorities
@@ -996,7 +988,7 @@ async def get_task_priorities(
 async def get_task_stats(
     land_id: Optional[UUID] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get task statistics summary."""
     user_roles = current_user.get("roles", [])
@@ -1028,7 +1020,7 @@ async def get_task_stats(
         """
         params["user_id"] = current_user["user_id"]
     
-    result = db.execute(text(base_query), params).fetchone()
+    result = (await db.execute(text(base_query), params)).fetchone()
     
     return {
         "total_tasks": result.total_tasks,
@@ -1048,7 +1040,7 @@ async def create_subtask(
     task_id: UUID,
     subtask_data: SubtaskCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new subtask for a task."""
     try:
@@ -1059,7 +1051,7 @@ async def create_subtask(
             JOIN lands l ON t.land_id = l.land_id
             WHERE t.task_id = CAST(:task_id AS uuid)
         """
-        task = db.execute(text(task_query), {"task_id": str(task_id)}).fetchone()
+        task = (await db.execute(text(task_query), {"task_id": str(task_id)})).fetchone()
         
         if not task:
             raise HTTPException(
@@ -1097,7 +1089,7 @@ async def create_subtask(
                       completed_at, order_index
         """
         
-        result = db.execute(text(insert_query), {
+        result = (await db.execute(text(insert_query), {
             "subtask_id": str(subtask_id),
             "task_id": str(task_id),
             "title": subtask_data.title,
@@ -1106,9 +1098,9 @@ async def create_subtask(
             "assigned_to": str(subtask_data.assigned_to) if subtask_data.assigned_to else None,
             "created_by": str(current_user["user_id"]),
             "order_index": subtask_data.order_index
-        }).fetchone()
+        })).fetchone()
         
-        db.commit()
+        await db.commit()
         
         return SubtaskResponse(
             subtask_id=result.subtask_id,
@@ -1128,7 +1120,7 @@ async def create_subtask(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error creating subtask: {str(e)}")
         import traceback
         traceback.print_exc()
@@ -1142,7 +1134,7 @@ async def create_subtask(
 async def get_subtasks(
     task_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all subtasks for a task."""
     try:
@@ -1153,7 +1145,7 @@ async def get_subtasks(
             JOIN lands l ON t.land_id = l.land_id
             WHERE t.task_id = CAST(:task_id AS uuid)
         """
-        task = db.execute(text(task_query), {"task_id": str(task_id)}).fetchone()
+        task = (await db.execute(text(task_query), {"task_id": str(task_id)})).fetchone()
         
         if not task:
             raise HTTPException(
@@ -1187,7 +1179,7 @@ async def get_subtasks(
             ORDER BY s.order_index, s.created_at
         """
         
-        results = db.execute(text(query), {"task_id": str(task_id)}).fetchall()
+        results = (await db.execute(text(query), {"task_id": str(task_id)})).fetchall()
         
         return [
             SubtaskResponse(
@@ -1225,7 +1217,7 @@ async def update_subtask(
     subtask_id: UUID,
     subtask_data: SubtaskUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a subtask."""
     try:
@@ -1238,10 +1230,10 @@ async def update_subtask(
             JOIN lands l ON t.land_id = l.land_id
             WHERE s.subtask_id = CAST(:subtask_id AS uuid) AND s.task_id = CAST(:task_id AS uuid)
         """
-        subtask = db.execute(text(subtask_query), {
+        subtask = (await db.execute(text(subtask_query), {
             "subtask_id": str(subtask_id),
             "task_id": str(task_id)
-        }).fetchone()
+        })).fetchone()
         
         if not subtask:
             raise HTTPException(
@@ -1318,8 +1310,8 @@ async def update_subtask(
                       completed_at, order_index
         """
         
-        result = db.execute(text(update_query), params).fetchone()
-        db.commit()
+        result = (await db.execute(text(update_query), params)).fetchone()
+        await db.commit()
         
         return SubtaskResponse(
             subtask_id=result.subtask_id,
@@ -1339,7 +1331,7 @@ async def update_subtask(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error updating subtask: {str(e)}")
         import traceback
         traceback.print_exc()
@@ -1354,7 +1346,7 @@ async def delete_subtask(
     task_id: UUID,
     subtask_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a subtask."""
     # Verify subtask exists
@@ -1366,10 +1358,10 @@ async def delete_subtask(
         JOIN lands l ON t.land_id = l.land_id
         WHERE s.subtask_id = :subtask_id AND s.task_id = :task_id
     """
-    subtask = db.execute(text(subtask_query), {
+    subtask = (await db.execute(text(subtask_query), {
         "subtask_id": str(subtask_id),
         "task_id": str(task_id)
-    }).fetchone()
+    })).fetchone()
     
     if not subtask:
         raise HTTPException(
@@ -1393,10 +1385,10 @@ async def delete_subtask(
         )
     
     # Delete subtask
-    db.execute(text("DELETE FROM subtasks WHERE subtask_id = :subtask_id"), {
+    await db.execute(text("DELETE FROM subtasks WHERE subtask_id = :subtask_id"), {
         "subtask_id": str(subtask_id)
     })
-    db.commit()
+    await db.commit()
     
     return {"message": "Subtask deleted successfully"}
 
@@ -1405,13 +1397,13 @@ async def delete_subtask(
 async def submit_subtasks_status(
     task_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit all subtasks for a task. This marks the review as complete and updates task status."""
     try:
         # Check task exists and user has access
         task_query = text("SELECT * FROM tasks WHERE task_id = CAST(:task_id AS uuid)")
-        task_result = db.execute(task_query, {"task_id": str(task_id)}).fetchone()
+        task_result = (await db.execute(task_query, {"task_id": str(task_id)})).fetchone()
         
         if not task_result:
             raise HTTPException(status_code=404, detail="Task not found")
@@ -1433,7 +1425,7 @@ async def submit_subtasks_status(
             FROM subtasks 
             WHERE task_id = CAST(:task_id AS uuid)
         """)
-        subtasks_result = db.execute(subtasks_query, {"task_id": str(task_id)}).fetchall()
+        subtasks_result = (await db.execute(subtasks_query, {"task_id": str(task_id)})).fetchall()
         
         # Calculate completion stats
         total_subtasks = len(subtasks_result)
@@ -1451,7 +1443,7 @@ async def submit_subtasks_status(
                         updated_at = now()
                     WHERE task_id = CAST(:task_id AS uuid)
                 """)
-                db.execute(update_task_query, {"task_id": str(task_id)})
+                await db.execute(update_task_query, {"task_id": str(task_id)})
             elif completion_percentage > 0:
                 # If some subtasks are completed, mark task as in_progress
                 update_task_query = text("""
@@ -1460,9 +1452,9 @@ async def submit_subtasks_status(
                         updated_at = now()
                     WHERE task_id = CAST(:task_id AS uuid)
                 """)
-                db.execute(update_task_query, {"task_id": str(task_id)})
+                await db.execute(update_task_query, {"task_id": str(task_id)})
         
-        db.commit()
+        await db.commit()
         
         return {
             "message": "Subtasks submitted successfully",
@@ -1474,7 +1466,7 @@ async def submit_subtasks_status(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error submitting subtasks: {str(e)}")
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1486,7 +1478,7 @@ async def submit_subtasks_status(
 async def get_default_subtask_templates(
     role: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get default subtask templates for a reviewer role."""
     
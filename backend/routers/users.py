@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
 from datetime import timedelta
@@ -7,25 +7,27 @@ from uuid import UUID
 from pydantic import validator
 import logging
 
-from database import get_db
+from database import get_async_db
 from models.schemas import (
     User, UserCreate, UserUpdate, UserLogin, Token, MessageResponse,
     UserRole, UserRoleCreate, LuRole
 )
 from auth import (
-    get_password_hash, authenticate_user, create_access_token,
+    authenticate_user, create_user_token, invalidate_principal,
     get_current_active_user, get_current_user, require_admin, ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from password_hashing import hash_password
+from pagination import keyset_page, set_next_cursor
 
 router = APIRouter(prefix="/users", tags=["users"])
 logger = logging.getLogger(__name__)
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
     check_query = text("SELECT user_id FROM \"user\" WHERE email = :email")
-    existing_user = db.execute(check_query, {"email": user_data.email}).fetchone()
+    existing_user = (await db.execute(check_query, {"email": user_data.email})).fetchone()
     
     if existing_user:
         raise HTTPException(
@@ -34,7 +36,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     
     # Create user
     insert_query = text("""
@@ -43,16 +45,16 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         RETURNING user_id, email, first_name, last_name, phone, is_active, created_at, updated_at
     """)
     
-    result = db.execute(insert_query, {
+    result = (await db.execute(insert_query, {
         "email": user_data.email,
         "password_hash": hashed_password,
         "first_name": user_data.first_name,
         "last_name": user_data.last_name,
         "phone": user_data.phone,
         "is_active": user_data.is_active
-    }).fetchone()
+    })).fetchone()
     
-    db.commit()
+    await db.commit()
     
     return User(
         user_id=result.user_id,
@@ -66,9 +68,9 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token with user data."""
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     
     if not user:
         raise HTTPException(
@@ -78,10 +80,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
         )
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user["user_id"]), "roles": user["roles"]},
-        expires_delta=access_token_expires
-    )
+    access_token = create_user_token(user, expires_delta=access_token_expires)
     
     # Convert UUID to string for JSON serialization
     user_data = {
@@ -112,19 +111,21 @@ async def get_current_user_profile(current_user: dict = Depends(get_current_acti
 
 @router.get("/", response_model=List[User])
 async def list_users(
+    response: Response,
     role: str = None,
     is_active: bool = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces skip"),
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all users with optional filtering by role (admin only)."""
     try:
         # Build query parts
         joins = ""
         where_clauses = []
-        params = {"skip": skip, "limit": limit}
+        params = {}
         
         # Add JOIN if filtering by role
         if role:
@@ -140,9 +141,8 @@ async def list_users(
             params["is_active"] = is_active
         
         # Build WHERE clause
-        where_sql = ""
-        if where_clauses:
-            where_sql = " WHERE " + " AND ".join(where_clauses)
+        keyset_sql, order_sql = keyset_page("u.created_at", "u.user_id", cursor, skip, limit, params)
+        where_sql = " WHERE 1=1" + "".join(f" AND {clause}" for clause in where_clauses) + keyset_sql
         
         # Complete query
         query = f"""
@@ -151,11 +151,11 @@ async def list_users(
             FROM "user" u
             {joins}
             {where_sql}
-            ORDER BY u.created_at DESC 
-            OFFSET :skip LIMIT :limit
+            {order_sql}
         """
         
-        results = db.execute(text(query), params).fetchall()
+        results = (await db.execute(text(query), params)).fetchall()
+        set_next_cursor(response, results, limit, "created_at", "user_id")
         
         return [
             User(
@@ -170,6 +170,8 @@ async def list_users(
             )
             for row in results
         ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching users: {str(e)}")
         raise HTTPException(
@@ -181,7 +183,7 @@ async def list_users(
 async def update_current_user_profile(
     user_update: UserUpdate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile."""
     # Build update query dynamically
@@ -191,7 +193,7 @@ async def update_current_user_profile(
     if user_update.email is not None:
         # Check if email is already taken by another user
         check_query = text("SELECT user_id FROM \"user\" WHERE email = :email AND user_id != :user_id")
-        existing = db.execute(check_query, {"email": user_update.email, "user_id": str(current_user["user_id"])}).fetchone()
+        existing = (await db.execute(check_query, {"email": user_update.email, "user_id": str(current_user["user_id"])})).fetchone()
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -229,8 +231,9 @@ async def update_current_user_profile(
         RETURNING user_id, email, first_name, last_name, phone, is_active, created_at, updated_at
     """)
     
-    result = db.execute(update_query, params).fetchone()
-    db.commit()
+    result = (await db.execute(update_query, params)).fetchone()
+    await db.commit()
+    invalidate_principal(current_user["user_id"])
     
     return User(
         user_id=result.user_id,
@@ -248,7 +251,7 @@ async def update_current_user_profile(
 async def get_user(
     user_id: UUID,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user by ID. Admins can view anyone, users can view themselves, and reviewers can view users on same projects."""
     user_roles = current_user.get("roles", [])
@@ -266,10 +269,10 @@ async def get_user(
               AND t2.assigned_to = CAST(:target_user_id AS uuid)
         """)
         
-        shared_result = db.execute(shared_project_query, {
+        shared_result = (await db.execute(shared_project_query, {
             "current_user_id": str(current_user["user_id"]),
             "target_user_id": str(user_id)
-        }).fetchone()
+        })).fetchone()
         
         if not shared_result or shared_result.count == 0:
             raise HTTPException(
@@ -283,7 +286,7 @@ async def get_user(
         WHERE user_id = CAST(:user_id AS uuid)
     """)
     
-    result = db.execute(query, {"user_id": str(user_id)}).fetchone()
+    result = (await db.execute(query, {"user_id": str(user_id)})).fetchone()
     
     if not result:
         raise HTTPException(
@@ -307,12 +310,12 @@ async def assign_user_role(
     user_id: UUID,
     role_data: UserRoleCreate,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assign a role to a user (admin only)."""
     # Check if user exists
     user_check = text("SELECT user_id FROM \"user\" WHERE user_id = :user_id")
-    if not db.execute(user_check, {"user_id": str(user_id)}).fetchone():
+    if not (await db.execute(user_check, {"user_id": str(user_id)})).fetchone():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
@@ -320,7 +323,7 @@ async def assign_user_role(
     
     # Check if role exists
     role_check = text("SELECT role_key FROM lu_roles WHERE role_key = :role_key")
-    if not db.execute(role_check, {"role_key": role_data.role_key}).fetchone():
+    if not (await db.execute(role_check, {"role_key": role_data.role_key})).fetchone():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Role not found"
@@ -333,11 +336,12 @@ async def assign_user_role(
         ON CONFLICT (user_id, role_key) DO NOTHING
     """)
     
-    db.execute(insert_query, {
+    await db.execute(insert_query, {
         "user_id": str(user_id),
         "role_key": role_data.role_key
     })
-    db.commit()
+    await db.commit()
+    invalidate_principal(user_id)
     
     return MessageResponse(message="Role assigned successfully")
 
@@ -346,7 +350,7 @@ async def remove_user_role(
     user_id: UUID,
     role_key: str,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove a role from a user (admin only)."""
     delete_query = text("""
@@ -354,11 +358,12 @@ async def remove_user_role(
         WHERE user_id = :user_id AND role_key = :role_key
     """)
     
-    result = db.execute(delete_query, {
+    result = await db.execute(delete_query, {
         "user_id": str(user_id),
         "role_key": role_key
     })
-    db.commit()
+    await db.commit()
+    invalidate_principal(user_id)
     
     if result.rowcount == 0:
         raise HTTPException(
@@ -372,7 +377,7 @@ async def remove_user_role(
 async def get_user_roles(
     user_id: UUID,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all roles for a user (admin only)."""
     query = text("""
@@ -382,7 +387,7 @@ async def get_user_roles(
         ORDER BY assigned_at
     """)
     
-    results = db.execute(query, {"user_id": str(user_id)}).fetchall()
+    results = (await db.execute(query, {"user_id": str(user_id)})).fetchall()
     
     return [
         UserRole(
@@ -396,11 +401,11 @@ async def get_user_roles(
 @router.get("/roles/available", response_model=List[LuRole])
 async def get_available_roles(
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all available roles (admin only)."""
     query = text("SELECT role_key, label FROM lu_roles ORDER BY label")
-    results = db.execute(query).fetchall()
+    results = (await db.execute(query)).fetchall()
     
     return [
         LuRole(role_key=row.role_key, label=row.label)
@@ -422,13 +427,13 @@ class UserCreateWithRoles(UserCreate):
 async def create_user_by_admin(
     user_data: UserCreateWithRoles,
     current_user: dict = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new user with roles (admin only)."""
     try:
         # Check if user already exists
         check_query = text("SELECT user_id FROM \"user\" WHERE email = :email")
-        existing_user = db.execute(check_query, {"email": user_data.email}).fetchone()
+        existing_user = (await db.execute(check_query, {"email": user_data.email})).fetchone()
         
         if existing_user:
             raise HTTPException(
@@ -437,7 +442,7 @@ async def create_user_by_admin(
             )
         
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         
         # Create user
         insert_query = text("""
@@ -446,14 +451,14 @@ async def create_user_by_admin(
             RETURNING user_id, email, first_name, last_name, phone, is_active, created_at, updated_at
         """)
         
-        result = db.execute(insert_query, {
+        result = (await db.execute(insert_query, {
             "email": user_data.email,
             "password_hash": hashed_password,
             "first_name": user_data.first_name,
             "last_name": user_data.last_name,
             "phone": user_data.phone,
             "is_active": user_data.is_active if user_data.is_active is not None else True
-        }).fetchone()
+        })).fetchone()
         
         user_id = result.user_id
         
@@ -462,7 +467,7 @@ async def create_user_by_admin(
             for role_key in user_data.roles:
                 # Verify role exists
                 role_check = text("SELECT role_key FROM lu_roles WHERE role_key = :role_key")
-                if not db.execute(role_check, {"role_key": role_key}).fetchone():
+                if not (await db.execute(role_check, {"role_key": role_key})).fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail=f"Invalid role: {role_key}"
@@ -474,12 +479,12 @@ async def create_user_by_admin(
                     VALUES (:user_id, :role_key)
                     ON CONFLICT (user_id, role_key) DO NOTHING
                 """)
-                db.execute(role_insert, {
+                await db.execute(role_insert, {
                     "user_id": str(user_id),
                     "role_key": role_key
                 })
         
-        db.commit()
+        await db.commit()
         
         return User(
             user_id=result.user_id,
@@ -492,10 +497,10 @@ async def create_user_by_admin(
             updated_at=result.updated_at
         )
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating user: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,232 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# SQL instrumentation configuration
+SQL_N_PLUS_ONE_THRESHOLD = settings.get('SQL_N_PLUS_ONE_THRESHOLD', 5)  # same statement shape this often in one request
+SQL_SERVER_TIMING = settings.get('SQL_SERVER_TIMING', False)  # add a Server-Timing header to every response
+SQL_METRICS_MAX_SHAPES = 20  # suspected N+1 shapes kept per route
+
+UNROUTED = "(unrouted)"
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists differ only in their number of placeholders
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with literals, IN-list lengths and whitespace normalised away."""
+    shape = _PLACEHOLDER_LIST.sub("(?)", statement)
+    shape = _LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueries:
+    """SQL executed while handling one request."""
+
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.shapes: Counter = Counter()
+
+    def add(self, statement: str, elapsed_ms: float, rows: int):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int = None) -> Dict[str, int]:
+        """Statement shapes run at least ``threshold`` times, i.e. suspected N+1 queries."""
+        threshold = threshold or SQL_N_PLUS_ONE_THRESHOLD
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("sql_request_queries", default=None)
+
+
+class SQLMetrics:
+    """Per-route statement counts and timings.
+
+    Statements are attributed to the request being handled through a context
+    variable, which follows the request into the threadpool that runs sync
+    endpoints. When the request finishes its totals are folded into the stats
+    of its route template (``GET /api/lands/{land_id}``), so the number of
+    routes tracked is bounded by the application rather than by traffic.
+    Statements issued outside a request are counted under ``(unrouted)``.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = SQL_N_PLUS_ONE_THRESHOLD):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def start_request(self):
+        """Begin collecting statements for the current request; returns a token for ``finish_request``."""
+        return _current.set(RequestQueries())
+
+    def finish_request(self, token, route: Optional[str]) -> RequestQueries:
+        """Stop collecting and record the request under its route template."""
+        queries = _current.get()
+        _current.reset(token)
+        self.record_request(queries, route)
+        return queries
+
+    def record_request(self, queries: RequestQueries, route: Optional[str]):
+        """Record the statements of a finished request under its route template."""
+        suspects = queries.repeated_shapes(self.n_plus_one_threshold)
+        if suspects:
+            for shape, count in suspects.items():
+                logger.warning(f"Suspected N+1 on {route}: {count}x {shape[:200]}")
+        self._record(route or UNROUTED, queries, suspects, requests=1)
+
+    def _record(self, route: str, queries: RequestQueries, suspects: Dict[str, int], requests: int):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    "requests": 0, "statements": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "rows": 0, "max_statements": 0, "n_plus_one_requests": 0, "n_plus_one": {}
+                }
+            stats["requests"] += requests
+            stats["statements"] += queries.count
+            stats["total_ms"] += queries.total_ms
+            stats["max_ms"] = max(stats["max_ms"], queries.max_ms)
+            stats["rows"] += queries.rows
+            stats["max_statements"] = max(stats["max_statements"], queries.count)
+            if suspects:
+                stats["n_plus_one_requests"] += 1
+                shapes = stats["n_plus_one"]
+                for shape, count in suspects.items():
+                    if shape in shapes or len(shapes) < SQL_METRICS_MAX_SHAPES:
+                        shapes[shape] = max(shapes.get(shape, 0), count)
+
+    def _on_statement(self, statement: str, elapsed_ms: float, rows: int):
+        queries = _current.get()
+        if queries is not None:
+            queries.add(statement, elapsed_ms, rows)
+            return
+        single = RequestQueries()
+        single.add(statement, elapsed_ms, rows)
+        self._record(UNROUTED, single, {}, requests=0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-route totals, routes with the most database time first."""
+        with self._lock:
+            routes = {route: dict(stats, n_plus_one=dict(stats["n_plus_one"]))
+                      for route, stats in self._routes.items()}
+        for stats in routes.values():
+            stats["avg_statements"] = round(stats["statements"] / stats["requests"], 2) if stats["requests"] else None
+            stats["total_ms"] = round(stats["total_ms"], 3)
+            stats["max_ms"] = round(stats["max_ms"], 3)
+        ordered = sorted(routes.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "statements": sum(stats["statements"] for stats in routes.values()),
+            "routes": dict(ordered)
+        }
+
+    def reset(self):
+        """Forget all recorded stats."""
+        with self._lock:
+            self._routes.clear()
+
+
+sql_metrics = SQLMetrics()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context so a failed statement leaves nothing behind
+    context._sql_metrics_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_metrics_start", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    # rowcount is the number of rows a SELECT returned on PostgreSQL; drivers report -1 when unknown
+    rows = max(getattr(cursor, "rowcount", -1) or 0, 0)
+    sql_metrics._on_statement(statement, elapsed_ms, rows)
+
+
+def route_template(request) -> Optional[str]:
+    """``METHOD /api/path/{param}`` for the route that handled a request, or None if none matched.
+
+    Built from the request path with path parameter values put back as
+    placeholders, since the matched route object does not carry the prefixes
+    its router was included with.
+    """
+    if request.scope.get("route") is None:
+        return None
+    names = {str(value): f"{{{name}}}" for name, value in request.scope.get("path_params", {}).items()}
+    segments = [names.get(segment, segment) for segment in request.url.path.split("/")]
+    return f"{request.method} {'/'.join(segments)}"
+
+
+def server_timing(queries: RequestQueries) -> str:
+    """``Server-Timing`` header value describing a request's database time."""
+    return f'db;dur={queries.total_ms:.2f};desc="{queries.count} queries"'
+
+
+class SQLMetricsMiddleware:
+    """Attributes the statements of each HTTP request to its route.
+
+    A pure ASGI middleware, so collection ends when the last body message is
+    sent rather than when the endpoint returns: statements issued while a
+    ``StreamingResponse`` is iterated (chunked downloads, archives) count
+    towards the request. ``Server-Timing`` has to be sent with the headers,
+    so for streamed bodies it only covers the statements run before them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = sql_metrics.start_request()
+        queries = _current.get()
+        finished = False
+
+        def finish():
+            nonlocal finished
+            if not finished:
+                finished = True
+                sql_metrics.record_request(queries, route_template(Request(scope)))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and SQL_SERVER_TIMING:
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(queries))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Errors and disconnects never send the last body message
+            finish()
+            _current.reset(token)
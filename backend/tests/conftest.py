@@ -0,0 +1,164 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import blob_store
+from main import app
+from auth import get_current_user
+from database import async_database_url, get_async_db
+
+# The tables the routers under test query, with every column any suite needs.
+# SQLite only uses declared types for affinity, plus TIMESTAMP conversion when
+# a suite asks for parsed timestamps.
+SCHEMA = [
+    """CREATE TABLE "user" (
+        user_id TEXT PRIMARY KEY, email TEXT, password_hash TEXT, first_name TEXT, last_name TEXT,
+        phone TEXT, is_verified BOOLEAN, is_active BOOLEAN, created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    """CREATE TABLE user_roles (
+        user_id TEXT, role_key TEXT, assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, role_key)
+    )""",
+    """CREATE TABLE lu_roles (role_key TEXT PRIMARY KEY, label TEXT)""",
+    """CREATE TABLE lands (
+        land_id TEXT PRIMARY KEY, landowner_id TEXT, title TEXT, location_text TEXT,
+        coordinates TEXT, area_acres NUMERIC, land_type TEXT, status TEXT, admin_notes TEXT,
+        energy_key TEXT, capacity_mw NUMERIC, price_per_mwh NUMERIC, timeline_text TEXT,
+        contract_term_years INTEGER, developer_name TEXT, project_priority TEXT,
+        project_due_date TIMESTAMP, published_at TIMESTAMP, interest_locked_at TIMESTAMP,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    """CREATE TABLE land_sections (
+        land_section_id TEXT PRIMARY KEY, land_id TEXT, section_definition_id TEXT, section_data TEXT,
+        section_key TEXT, status TEXT, assigned_role TEXT, assigned_user TEXT, data TEXT,
+        reviewer_comments TEXT, submitted_at TIMESTAMP, approved_at TIMESTAMP, rejected_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE section_definitions (
+        section_definition_id TEXT PRIMARY KEY, section_name TEXT, section_type TEXT, is_required BOOLEAN
+    )""",
+    """CREATE TABLE land_reviews (
+        review_id TEXT PRIMARY KEY, land_id TEXT, reviewer_role TEXT, reviewer_id TEXT,
+        reviewer_name TEXT, status TEXT, rating INTEGER, comments TEXT, justification TEXT,
+        subtasks_completed INTEGER, total_subtasks INTEGER, documents_approved INTEGER,
+        total_documents INTEGER, review_data TEXT, approved_at TIMESTAMP, published BOOLEAN,
+        published_at TIMESTAMP, created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    """CREATE TABLE investor_interests (
+        interest_id TEXT PRIMARY KEY, investor_id TEXT, land_id TEXT, status TEXT, comments TEXT,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    """CREATE TABLE tasks (
+        task_id TEXT PRIMARY KEY, land_id TEXT, title TEXT, description TEXT, task_type TEXT,
+        assigned_to TEXT, created_by TEXT, status TEXT, priority TEXT, assigned_role TEXT,
+        start_date TIMESTAMP, end_date TIMESTAMP, due_date TIMESTAMP, completion_notes TEXT,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    """CREATE TABLE subtasks (
+        subtask_id TEXT PRIMARY KEY, task_id TEXT, title TEXT, description TEXT, status TEXT,
+        assigned_to TEXT, created_by TEXT, order_index INTEGER, created_at TIMESTAMP, updated_at TIMESTAMP
+    )""",
+    """CREATE TABLE document_blobs (
+        content_hash VARCHAR(64) PRIMARY KEY, size BIGINT NOT NULL, mime_type TEXT,
+        storage_backend VARCHAR(20) NOT NULL, chunk_size INTEGER NOT NULL,
+        codec VARCHAR(20) NOT NULL DEFAULT 'identity', stored_size BIGINT
+    )""",
+    """CREATE TABLE document_blob_chunks (
+        content_hash VARCHAR(64) NOT NULL, chunk_index INTEGER NOT NULL, data BLOB NOT NULL,
+        PRIMARY KEY (content_hash, chunk_index)
+    )""",
+    """CREATE TABLE documents (
+        document_id TEXT PRIMARY KEY, land_id TEXT, task_id TEXT, document_type TEXT,
+        file_name TEXT, file_path TEXT, file_data BLOB, file_size INTEGER, uploaded_by TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, mime_type TEXT, is_draft BOOLEAN,
+        status TEXT DEFAULT 'pending', approved_by TEXT, approved_at TIMESTAMP,
+        rejection_reason TEXT, admin_comments TEXT, content_hash VARCHAR(64)
+    )""",
+]
+
+
+class SQLiteDatabase:
+    """Throwaway SQLite file with ``SCHEMA``, opened through both engines the app uses.
+
+    ``engine`` is the sync engine tests seed and inspect the data with;
+    ``Session`` makes the ``AsyncSession`` requests run on. Every statement
+    either engine executes is appended to ``statements``, and those run as an
+    executemany also to ``batched``.
+    """
+
+    def __init__(self, path, parse_timestamps: bool = False):
+        url = f"sqlite:///{path}"
+        # TIMESTAMP columns come back as datetimes, as they do from PostgreSQL
+        connect_args = {"detect_types": sqlite3.PARSE_DECLTYPES} if parse_timestamps else {}
+        self.engine = create_engine(url, connect_args=connect_args)
+        self.async_engine = create_async_engine(async_database_url(url), connect_args=connect_args)
+        self.Session = async_sessionmaker(self.async_engine, expire_on_commit=False)
+        with self.engine.begin() as conn:
+            for statement in SCHEMA:
+                conn.execute(text(statement))
+
+        self.statements = []
+        self.batched = []
+        for target in (self.engine, self.async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        if executemany:
+            self.batched.append(statement)
+
+    def insert(self, table: str, *rows: dict):
+        """Insert rows given as column -> value dicts, one transaction per call."""
+        with self.engine.begin() as conn:
+            for row in rows:
+                columns = ", ".join(row)
+                values = ", ".join(f":{column}" for column in row)
+                conn.execute(text(f'INSERT INTO "{table}" ({columns}) VALUES ({values})'), row)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "parse_timestamps: open the test database with TIMESTAMP columns parsed into datetimes"
+    )
+
+
+@pytest.fixture
+def database(request, tmp_path):
+    """Empty ``SQLiteDatabase``; mark the test ``parse_timestamps`` to get datetimes back."""
+    parse_timestamps = request.node.get_closest_marker("parse_timestamps") is not None
+    db = SQLiteDatabase(tmp_path / "app.db", parse_timestamps=parse_timestamps)
+    yield db
+    db.engine.dispose()
+
+
+@pytest.fixture
+def blob_database(database, monkeypatch):
+    """``database`` with the blob store writing through its sync engine."""
+    monkeypatch.setattr(blob_store, "engine", database.engine)
+    return database
+
+
+@pytest.fixture
+def app_client(database):
+    """Test client whose requests get ``AsyncSession``s on ``database``."""
+    async def override_get_async_db():
+        async with database.Session() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def login(app_client):
+    """Sign requests in as ``login(user_id, roles)``; returns the principal, which tests may edit."""
+    def sign_in(user_id, roles):
+        user = {"user_id": user_id, "roles": list(roles), "is_active": True}
+        app.dependency_overrides[get_current_user] = lambda: user
+        return user
+
+    return sign_in
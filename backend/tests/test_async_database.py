@@ -0,0 +1,130 @@
+import pytest
+
+import auth
+from main import app
+from auth import create_access_token, get_current_user
+from database import async_database_url
+from principal_cache import PrincipalCache
+
+ADMIN_ID = "11111111-1111-1111-1111-111111111111"
+OWNER_ID = "22222222-2222-2222-2222-222222222222"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+INTEREST_ID = "cccccccc-cccc-cccc-cccc-cccccccccccc"
+
+@pytest.fixture
+def client(database, app_client, login):
+    """Test client signed in as an administrator, whose async routers run on an aiosqlite session."""
+    database.insert("lands", {"land_id": LAND_ID, "status": "submitted"})
+    database.insert("land_reviews", {
+        "review_id": "r1", "land_id": LAND_ID, "reviewer_role": "re_analyst", "status": "approved",
+        "subtasks_completed": 3, "total_subtasks": 3, "documents_approved": 2, "total_documents": 2,
+        "published": 0
+    })
+    database.insert("user", {
+        "user_id": OWNER_ID, "email": "lena@example.com", "first_name": "Lena", "last_name": "Owner",
+        "is_verified": 1, "is_active": 1, "created_at": "2025-03-01 10:00:00", "updated_at": "2025-03-01 10:00:00"
+    })
+    database.insert("lu_roles", {"role_key": "landowner", "label": "Landowner"},
+                    {"role_key": "investor", "label": "Investor"})
+    database.insert("investor_interests", {"interest_id": INTEREST_ID, "investor_id": OWNER_ID,
+                                           "land_id": LAND_ID, "status": "pending"})
+    login(ADMIN_ID, ["administrator"])
+    return app_client
+
+
+class TestAsyncDatabaseUrl:
+    """Test the mapping from configured URLs to asyncio drivers."""
+
+    def test_known_backends_use_async_drivers(self):
+        """Test that PostgreSQL and SQLite URLs get asyncpg and aiosqlite."""
+        assert async_database_url("postgresql://u:p@db:5432/renewmart") == "postgresql+asyncpg://u:p@db:5432/renewmart"
+        assert async_database_url("postgresql+psycopg2://u:p@db/renewmart") == "postgresql+asyncpg://u:p@db/renewmart"
+        assert async_database_url("sqlite:///./renewmart.db") == "sqlite+aiosqlite:///./renewmart.db"
+
+    def test_unknown_backend_is_left_alone(self):
+        """Test that URLs without a known async driver pass through unchanged."""
+        assert async_database_url("mysql+aiomysql://u:p@db/renewmart") == "mysql+aiomysql://u:p@db/renewmart"
+
+
+class TestAsyncReviewsRouter:
+    """Test the reviews endpoints on an AsyncSession."""
+
+    def test_all_review_statuses(self, client):
+        """Test that stored and default review statuses are returned."""
+        response = client.get(f"/api/reviews/land/{LAND_ID}/all")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["re_analyst"]["status"] == "approved"
+        assert body["re_analyst"]["subtasksCompleted"] == 3
+        assert body["re_sales_advisor"]["status"] == "pending"
+
+    def test_delete_review_status(self, client):
+        """Test that a delete is committed through the async session."""
+        response = client.delete(f"/api/reviews/land/{LAND_ID}/role/re_analyst")
+        assert response.status_code == 200
+
+        response = client.get(f"/api/reviews/land/{LAND_ID}/role/re_analyst")
+        assert response.json()["status"] == "pending"
+
+        missing = client.delete(f"/api/reviews/land/{LAND_ID}/role/re_analyst")
+        assert missing.status_code == 404
+
+
+class TestAsyncUsersRouter:
+    """Test the users endpoints on an AsyncSession."""
+
+    def test_role_assignment_round_trip(self, client):
+        """Test that roles are assigned, filtered on and removed through the async session."""
+        assert client.post(f"/api/users/{OWNER_ID}/roles", json={"user_id": OWNER_ID, "role_key": "landowner"}).status_code == 200
+        assert client.post(f"/api/users/{OWNER_ID}/roles", json={"user_id": OWNER_ID, "role_key": "surveyor"}).status_code == 404
+
+        roles = client.get(f"/api/users/{OWNER_ID}/roles").json()
+        assert [role["role_key"] for role in roles] == ["landowner"]
+        landowners = client.get("/api/users/", params={"role": "landowner"}).json()
+        assert [user["email"] for user in landowners] == ["lena@example.com"]
+
+        assert client.delete(f"/api/users/{OWNER_ID}/roles/landowner").status_code == 200
+        assert client.delete(f"/api/users/{OWNER_ID}/roles/landowner").status_code == 404
+
+
+class TestAsyncInvestorsRouter:
+    """Test the investors endpoints on an AsyncSession."""
+
+    def test_withdrawn_interest_leaves_stats(self, client):
+        """Test that a withdrawal is committed and reflected in the interest statistics."""
+        assert client.get("/api/investors/stats/interests").json()["pending_interests"] == 1
+
+        assert client.delete(f"/api/investors/interest/{INTEREST_ID}").status_code == 200
+        assert client.delete(f"/api/investors/interest/{INTEREST_ID}").status_code == 404
+
+        assert client.get("/api/investors/stats/interests").json()["total_interests"] == 0
+
+
+class TestAsyncAuthRouter:
+    """Test the authentication endpoints on an AsyncSession."""
+
+    def test_verification_request_looks_up_user(self, client):
+        """Test that the verification request resolves the user by email through the async session."""
+        missing = client.post("/api/auth/verify/request", json={"email": "nobody@example.com"})
+        assert missing.status_code == 404
+
+        verified = client.post("/api/auth/verify/request", json={"email": "lena@example.com"})
+        assert verified.status_code == 400
+        assert verified.json()["detail"] == "User already verified"
+
+    def test_current_user_loaded_on_cache_miss(self, client, monkeypatch):
+        """Test that a bearer token resolves the user and their roles through the async session on SQLite."""
+        monkeypatch.setattr(auth, "DATABASE_URL", "sqlite:///./renewmart.db")
+        monkeypatch.setattr(auth, "STATELESS_AUTH", False)
+        monkeypatch.setattr(auth, "principal_cache", PrincipalCache(ttl=60, local_ttl=60, max_entries=2))
+        client.post(f"/api/users/{OWNER_ID}/roles", json={"user_id": OWNER_ID, "role_key": "landowner"})
+        app.dependency_overrides.pop(get_current_user)
+
+        token = create_access_token({"sub": OWNER_ID})
+        response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json()["email"] == "lena@example.com"
+        assert response.json()["roles"] == ["landowner"]
+        auth.principal_cache.clear()
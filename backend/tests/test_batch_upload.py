@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import text
+
+import document_storage
+import routers.documents as documents_router
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+
+
+@pytest.fixture
+def upload_env(blob_database, app_client, login, monkeypatch):
+    """Test client for a land owned by OWNER_ID, recording scheduled processing."""
+    blob_database.insert("lands", {"land_id": LAND_ID, "landowner_id": OWNER_ID, "status": "draft"})
+    scheduled = []
+    monkeypatch.setattr(documents_router, "schedule_document_processing",
+                        lambda background_tasks, content_hash: scheduled.append(content_hash))
+    login(OWNER_ID, ["landowner"])
+    return app_client, blob_database, scheduled
+
+
+def post_files(client, files, land_id=LAND_ID):
+    return client.post(
+        f"/api/documents/upload/{land_id}/batch",
+        data={"document_type": "ownership-documents"},
+        files=[("files", (name, content, "application/octet-stream")) for name, content in files]
+    )
+
+
+class TestBatchUpload:
+    """Test multi-file uploads with a single commit."""
+
+    def test_files_inserted_with_one_statement(self, upload_env):
+        """Test that all document rows go in through one executemany."""
+        client, database, scheduled = upload_env
+
+        response = post_files(client, [
+            ("deed.pdf", b"%PDF-1.4 deed"),
+            ("notes.txt", b"survey notes"),
+            ("copy.pdf", b"%PDF-1.4 deed"),
+        ])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["uploaded"], body["failed"]) == (3, 0)
+        assert [r["document"]["file_name"] for r in body["results"]] == ["deed.pdf", "notes.txt", "copy.pdf"]
+        assert body["results"][0]["document"]["mime_type"] == "application/pdf"
+
+        assert [s.split()[0].upper() for s in database.batched].count("INSERT") == 1
+        assert len(scheduled) == 2
+
+        with database.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM documents")).scalar() == 3
+            assert conn.execute(text("SELECT count(*) FROM document_blobs")).scalar() == 2
+
+    def test_bad_files_fail_individually(self, upload_env):
+        """Test that invalid and oversized files are reported without failing the batch."""
+        client, database, _ = upload_env
+
+        response = post_files(client, [
+            ("run.exe", b"MZ"),
+            ("deed.pdf", b"%PDF-1.4 deed"),
+            ("scan.pdf", b"%PDF-1.4" + b"x" * document_storage.MAX_FILE_SIZE),
+        ])
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["success"] for r in results] == [False, True, False]
+        assert results[0]["error"].startswith("File type not allowed")
+        assert results[2]["error"].startswith("File too large")
+
+        with database.engine.connect() as conn:
+            assert conn.execute(text("SELECT file_name FROM documents")).fetchall() == [("deed.pdf",)]
+
+    def test_permission_checked_once_for_batch(self, upload_env, login):
+        """Test that a non-owner is rejected before any file is stored."""
+        client, database, _ = upload_env
+        login("intruder", [])
+
+        response = post_files(client, [("deed.pdf", b"%PDF-1.4 deed")])
+
+        assert response.status_code == 403
+        with database.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM document_blobs")).scalar() == 0
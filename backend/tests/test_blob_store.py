@@ -0,0 +1,322 @@
+import asyncio
+import io
+import os
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import blob_codecs
+import blob_store
+from blob_codecs import ZlibCodec, choose_codec
+from blob_store import (
+    FilesystemBlobStore, put_blob, put_blob_async, iter_blob_range, release_blob, wait_for_blob_unlinks
+)
+from database import async_database_url
+from document_storage import ingest_stream
+
+SCHEMA = [
+    """CREATE TABLE document_blobs (
+        content_hash VARCHAR(64) PRIMARY KEY, size BIGINT NOT NULL, mime_type TEXT,
+        storage_backend VARCHAR(20) NOT NULL, chunk_size INTEGER NOT NULL,
+        codec VARCHAR(20) NOT NULL DEFAULT 'identity', stored_size BIGINT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE document_blob_chunks (
+        content_hash VARCHAR(64) NOT NULL REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+        chunk_index INTEGER NOT NULL, data BLOB NOT NULL,
+        PRIMARY KEY (content_hash, chunk_index)
+    )""",
+    """CREATE TABLE documents (
+        document_id TEXT PRIMARY KEY, file_name TEXT,
+        content_hash VARCHAR(64) REFERENCES document_blobs(content_hash)
+    )""",
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory SQLite database with the blob store schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA foreign_keys = ON"))
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+
+    monkeypatch.setattr(blob_store, "engine", engine)
+    monkeypatch.setattr(blob_store, "BLOB_CHUNK_SIZE", 1024)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def async_db(monkeypatch, tmp_path):
+    """SQLite file with the blob store schema, opened by a sync engine and an async session factory."""
+    url = f"sqlite:///{tmp_path / 'blobs.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+
+    monkeypatch.setattr(blob_store, "engine", engine)
+    monkeypatch.setattr(blob_store, "BLOB_CHUNK_SIZE", 1024)
+    yield async_sessionmaker(create_async_engine(async_database_url(url)), expire_on_commit=False), engine
+    engine.dispose()
+
+
+def ingest(payload, name="survey.pdf"):
+    return ingest_stream(io.BytesIO(payload), name)
+
+
+class TestDatabaseBlobStore:
+    """Test the chunked database blob backend."""
+
+    def test_identical_content_is_stored_once(self, db):
+        """Test that uploading the same bytes twice writes one blob."""
+        payload = b"%PDF-1.4 " + b"z" * 5000
+
+        with ingest(payload) as first, ingest(payload, "copy.pdf") as second:
+            assert put_blob(db, first) == put_blob(db, second)
+        db.commit()
+
+        assert db.execute(text("SELECT COUNT(*) FROM document_blobs")).scalar() == 1
+        assert db.execute(text("SELECT COUNT(*) FROM document_blob_chunks")).scalar() == 5
+
+    def test_range_reads_across_chunk_boundaries(self, db):
+        """Test that ranges spanning several chunks are reassembled exactly."""
+        payload = bytes(range(256)) * 20
+
+        with ingest(payload) as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        blob = db.execute(
+            text("SELECT content_hash, storage_backend, chunk_size, codec FROM document_blobs")
+        ).fetchone()
+
+        assert blob.content_hash == content_hash
+        assert b"".join(iter_blob_range(blob, 0, len(payload) - 1)) == payload
+        assert b"".join(iter_blob_range(blob, 1000, 3100)) == payload[1000:3101]
+
+    def test_release_keeps_shared_blobs(self, db):
+        """Test that a blob is only released once nothing references it."""
+        with ingest(b"shared bytes") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.execute(
+            text("INSERT INTO documents VALUES ('doc-1', 'a.pdf', :h)"),
+            {"h": content_hash}
+        )
+        db.commit()
+
+        assert release_blob(db, content_hash) is False
+
+        db.execute(text("DELETE FROM documents"))
+        assert release_blob(db, content_hash) is True
+        db.commit()
+
+        assert db.execute(text("SELECT COUNT(*) FROM document_blob_chunks")).scalar() == 0
+
+    def test_release_deletes_chunks_without_cascade(self, db):
+        """Test that chunk rows are deleted even where foreign keys are not enforced."""
+        db.execute(text("PRAGMA foreign_keys = OFF"))
+        with ingest(b"x" * 3000) as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        assert release_blob(db, content_hash) is True
+        db.commit()
+
+        assert db.execute(text("SELECT COUNT(*) FROM document_blob_chunks")).scalar() == 0
+
+
+class TestFilesystemBlobStore:
+    """Test the directory-tree blob backend."""
+
+    def test_write_and_read_range(self, db, tmp_path, monkeypatch):
+        """Test that blobs are fanned out on disk and read back by range."""
+        store = FilesystemBlobStore(str(tmp_path))
+        monkeypatch.setitem(blob_store._BLOB_STORES, "filesystem", store)
+        monkeypatch.setattr(blob_store, "DEFAULT_BLOB_BACKEND", "filesystem")
+        payload = b"GIF89a" + b"q" * 3000
+
+        with ingest(payload, "map.gif") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        path = store.path_for(content_hash, "identity")
+        assert path.parent.parent.name == content_hash[:2]
+        assert path.read_bytes() == payload
+        assert b"".join(store.iter_range(content_hash, 6, 99, 1024, blob_codecs.IdentityCodec())) == payload[6:100]
+
+        assert release_blob(db, content_hash) is True
+        assert path.exists()  # Removed only after commit
+        db.commit()
+        wait_for_blob_unlinks()
+        assert not path.exists()
+
+    def test_commit_does_not_wait_for_unlink(self, db, tmp_path, monkeypatch):
+        """Test that the file removal runs after the commit returns, not inside it."""
+        store = FilesystemBlobStore(str(tmp_path))
+        monkeypatch.setitem(blob_store._BLOB_STORES, "filesystem", store)
+        monkeypatch.setattr(blob_store, "DEFAULT_BLOB_BACKEND", "filesystem")
+        release = threading.Event()
+        unlink = store._unlink_unregistered
+        monkeypatch.setattr(store, "_unlink_unregistered", lambda h: release.wait(5) and unlink(h))
+
+        with ingest(b"GIF89a" + b"s" * 3000, "map.gif") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        assert release_blob(db, content_hash) is True
+        db.commit()  # Would block for 5s if the unlink ran in the commit hook
+        path = store.path_for(content_hash, "identity")
+        assert path.exists()
+
+        release.set()
+        wait_for_blob_unlinks()
+        assert not path.exists()
+
+    def test_file_kept_when_hash_registered_again(self, db, tmp_path, monkeypatch):
+        """Test that a release does not unlink a file another upload re-registered before commit."""
+        store = FilesystemBlobStore(str(tmp_path))
+        monkeypatch.setitem(blob_store._BLOB_STORES, "filesystem", store)
+        monkeypatch.setattr(blob_store, "DEFAULT_BLOB_BACKEND", "filesystem")
+        payload = b"GIF89a" + b"r" * 3000
+
+        with ingest(payload, "map.gif") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        assert release_blob(db, content_hash) is True
+        with ingest(payload, "map-copy.gif") as ingested:
+            put_blob(db, ingested)
+        db.commit()
+        wait_for_blob_unlinks()
+
+        assert store.path_for(content_hash, "identity").read_bytes() == payload
+        assert db.execute(text("SELECT COUNT(*) FROM document_blobs")).scalar() == 1
+
+
+class TestBlobCompression:
+    """Test per-chunk compression at rest."""
+
+    def test_compressed_blob_round_trips_by_range(self, db, monkeypatch):
+        """Test that compressible blobs shrink and ranges decode transparently."""
+        monkeypatch.setattr(blob_codecs, "DEFAULT_BLOB_CODEC", "zlib")
+        payload = b"".join(b"parcel %05d surveyed and approved\n" % i for i in range(400))
+
+        with ingest(payload, "notes.txt") as ingested:
+            put_blob(db, ingested)
+        db.commit()
+
+        blob = db.execute(text(
+            "SELECT content_hash, storage_backend, chunk_size, codec, size, stored_size FROM document_blobs"
+        )).fetchone()
+
+        assert blob.codec == "zlib"
+        assert blob.size == len(payload)
+        assert blob.stored_size < len(payload) // 4
+        assert b"".join(iter_blob_range(blob, 0, len(payload) - 1)) == payload
+        assert b"".join(iter_blob_range(blob, 1500, 4000)) == payload[1500:4001]
+
+    def test_framed_filesystem_blob_range(self, db, tmp_path, monkeypatch):
+        """Test that compressed files on disk are read frame by frame."""
+        store = FilesystemBlobStore(str(tmp_path))
+        monkeypatch.setitem(blob_store._BLOB_STORES, "filesystem", store)
+        monkeypatch.setattr(blob_store, "DEFAULT_BLOB_BACKEND", "filesystem")
+        monkeypatch.setattr(blob_codecs, "DEFAULT_BLOB_CODEC", "zlib")
+        payload = b"abcdefgh" * 1000
+
+        with ingest(payload, "notes.txt") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        assert store.path_for(content_hash, "zlib").stat().st_size < len(payload)
+        assert b"".join(store.iter_range(content_hash, 2500, 7000, 1024, ZlibCodec())) == payload[2500:7001]
+
+    def test_leftover_file_with_other_codec_is_not_reused(self, db, tmp_path, monkeypatch):
+        """Test that a file left by a rolled-back upload is ignored once the codec setting changes."""
+        store = FilesystemBlobStore(str(tmp_path))
+        monkeypatch.setitem(blob_store._BLOB_STORES, "filesystem", store)
+        monkeypatch.setattr(blob_store, "DEFAULT_BLOB_BACKEND", "filesystem")
+        payload = b"abcdefgh" * 1000
+
+        with ingest(payload, "notes.txt") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.rollback()
+
+        monkeypatch.setattr(blob_codecs, "DEFAULT_BLOB_CODEC", "zlib")
+        with ingest(payload, "notes.txt") as ingested:
+            put_blob(db, ingested)
+        db.commit()
+
+        blob = db.execute(text("SELECT content_hash, storage_backend, chunk_size, codec FROM document_blobs")).fetchone()
+        assert blob.codec == "zlib"
+        assert store.path_for(content_hash, "identity").exists()
+        assert b"".join(iter_blob_range(blob, 0, len(payload) - 1)) == payload
+
+    def test_incompressible_content_is_stored_raw(self):
+        """Test that images and random-looking data skip compression."""
+        text_sample = b"survey " * 1000
+
+        assert choose_codec("image/png", text_sample, "zlib").name == "identity"
+        assert choose_codec("application/pdf", os.urandom(4096), "zlib").name == "identity"
+        assert choose_codec("text/plain", text_sample, "zlib").name == "zlib"
+
+    def test_zlib_uses_configured_level(self):
+        """Test that DOCUMENT_BLOB_CODEC_LEVEL applies to zlib too, within its 0-9 range."""
+        assert blob_codecs.get_codec("zlib").level == min(blob_codecs.BLOB_CODEC_LEVEL, 9)
+
+
+class TestPutBlobAsync:
+    """Test blob registration through an AsyncSession."""
+
+    def test_compressed_blob_round_trips(self, async_db, monkeypatch):
+        """Test that chunks are encoded and stored through the async session and read back by range."""
+        Session, engine = async_db
+        monkeypatch.setattr(blob_codecs, "DEFAULT_BLOB_CODEC", "zlib")
+        payload = b"".join(b"parcel %05d surveyed and approved\n" % i for i in range(400))
+
+        async def scenario():
+            async with Session() as db:
+                with ingest(payload, "notes.txt") as first, ingest(payload, "copy.txt") as second:
+                    hashes = {await put_blob_async(db, first), await put_blob_async(db, second)}
+                await db.commit()
+            return hashes
+
+        assert len(asyncio.run(scenario())) == 1
+
+        with engine.connect() as conn:
+            blob = conn.execute(text(
+                "SELECT content_hash, storage_backend, chunk_size, codec, size, stored_size FROM document_blobs"
+            )).fetchone()
+            chunks = conn.execute(text("SELECT COUNT(*) FROM document_blob_chunks")).scalar()
+
+        assert blob.codec == "zlib"
+        assert blob.stored_size < len(payload) // 4
+        assert chunks == -(-len(payload) // 1024)
+        assert b"".join(iter_blob_range(blob, 1500, 4000)) == payload[1500:4001]
+
+    def test_rollback_discards_blob(self, async_db):
+        """Test that the blob row and its chunks roll back with the caller's transaction."""
+        Session, engine = async_db
+
+        async def scenario():
+            async with Session() as db:
+                with ingest(b"%PDF-1.4 " + b"z" * 3000) as ingested:
+                    await put_blob_async(db, ingested)
+                await db.rollback()
+
+        asyncio.run(scenario())
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM document_blobs")).scalar() == 0
+            assert conn.execute(text("SELECT COUNT(*) FROM document_blob_chunks")).scalar() == 0
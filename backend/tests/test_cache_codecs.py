@@ -0,0 +1,106 @@
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import cache_codecs
+from cache_codecs import CacheValueCodec
+from redis_service import RedisService
+
+
+class BytesRedis:
+    """Stand-in Redis client that stores and returns values as bytes, like a real server."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def incrby(self, key, amount):
+        self.data[key] = str(int(self.data.get(key, b"0")) + amount).encode()
+        return int(self.data[key])
+
+
+LISTING = [
+    {"land_id": str(uuid.UUID(int=index)), "title": f"Parcel {index}", "area_acres": 120.5,
+     "energy_key": "solar", "published": True, "capacity_mw": None}
+    for index in range(40)
+]
+
+SERIALIZERS = [name for name in ("json", "orjson", "msgpack") if name in cache_codecs._SERIALIZERS]
+
+
+class TestCacheValueCodec:
+    """Test the header-tagged value encoding."""
+
+    @pytest.mark.parametrize("value", [
+        True, False, 0, -12, 2.5, "42", "true", "", b"\x00\xff",
+        datetime(2025, 10, 24, 9, 30, 15), date(2025, 10, 24), uuid.UUID(int=7), Decimal("12.50"),
+    ])
+    def test_scalars_keep_their_type(self, value):
+        """Test that scalars come back as the type they were stored as."""
+        codec = CacheValueCodec("json")
+        decoded = codec.decode(codec.encode(value))
+
+        assert decoded == value
+        assert type(decoded) is type(value)
+
+    @pytest.mark.parametrize("serializer", SERIALIZERS)
+    def test_structured_values_round_trip(self, serializer):
+        """Test that every available serializer round-trips listings."""
+        codec = CacheValueCodec(serializer, compression="none")
+        assert codec.decode(codec.encode({"items": LISTING, "total": 40})) == {"items": LISTING, "total": 40}
+
+    def test_reads_values_from_other_serializers(self):
+        """Test that the header, not local configuration, decides how a value is read."""
+        written = CacheValueCodec("json").encode({"a": [1, 2]})
+        assert CacheValueCodec(SERIALIZERS[-1]).decode(written) == {"a": [1, 2]}
+
+    def test_large_values_are_compressed(self):
+        """Test that values over the threshold are stored compressed and read back."""
+        codec = CacheValueCodec("json", compression="zlib", compress_min_bytes=256)
+        encoded = codec.encode(LISTING)
+
+        assert encoded[1] & 0x0F == 1
+        assert len(encoded) < len(json.dumps(LISTING)) / 2
+        assert codec.decode(encoded) == LISTING
+        assert codec.encode({"small": 1})[1] & 0x0F == 0
+
+    def test_legacy_values_still_read(self):
+        """Test that plain JSON and str values written before the codec are decoded as before."""
+        codec = CacheValueCodec()
+        assert codec.decode(b'{"total": 3}') == {"total": 3}
+        assert codec.decode("plain text") == "plain text"
+        assert codec.decode(b"17") == 17
+
+    def test_unavailable_serializer_falls_back_to_json(self):
+        """Test that an unknown serializer name uses json instead of failing."""
+        assert CacheValueCodec("pickle").serializer.name == "json"
+
+
+class TestRedisServiceCodec:
+    """Test RedisService storing values through the codec."""
+
+    def test_round_trip_through_redis(self, monkeypatch):
+        """Test that values keep their types through Redis and integers stay incrementable."""
+        monkeypatch.setattr(RedisService, "_initialize_connection", lambda self: None)
+        service = RedisService()
+        service.redis_client, service.is_connected = BytesRedis(), True
+
+        service.set("flag", True)
+        service.set("updated", datetime(2025, 10, 24, 9, 0))
+        service.set("listing", LISTING)
+        service.set("views", 5)
+
+        assert service.get("flag") is True
+        assert service.get("updated") == datetime(2025, 10, 24, 9, 0)
+        assert service.get("listing") == LISTING
+        assert service.increment("views") == 6
+        assert service.get("views") == 6
@@ -0,0 +1,123 @@
+import pytest
+
+from redis_service import RedisService
+
+
+class SharedRedis:
+    """Stand-in Redis server shared by several workers, delivering pub/sub synchronously."""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+        self.subscribers = []
+
+    def client(self):
+        return SharedRedisClient(self)
+
+
+class SharedRedisClient:
+    def __init__(self, server):
+        self.server = server
+
+    def get(self, key):
+        self.server.gets += 1
+        return self.server.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.server.data[key] = value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.server.data.pop(key, None) is not None for key in keys)
+
+    def expire(self, key, seconds):
+        return key in self.server.data
+
+    def incrby(self, key, amount):
+        self.server.data[key] = str(int(self.server.data.get(key, 0)) + amount)
+        return int(self.server.data[key])
+
+    def publish(self, channel, message):
+        for handler in self.server.subscribers:
+            handler({"channel": channel, "data": message})
+        return len(self.server.subscribers)
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    """Two workers with an L1 for ``lookup:`` keys, talking to one Redis."""
+    monkeypatch.setattr(RedisService, "_initialize_connection", lambda self: None)
+    server = SharedRedis()
+    services = []
+    for _ in range(2):
+        service = RedisService()
+        service.redis_client, service.is_connected = server.client(), True
+        service.enable_l1({"lookup:": 30, "lookup:volatile:": 1})
+        server.subscribers.append(service._on_l1_message)
+        services.append(service)
+    return server, services
+
+
+class TestCacheL1:
+    """Test the in-process tier in front of Redis."""
+
+    def test_hot_reads_skip_redis(self, workers):
+        """Test that repeated reads of an L1 key hit Redis once and return fresh copies."""
+        server, (worker, _) = workers
+        worker.set("lookup:energy_types", ["solar", "wind"])
+        server.gets = 0
+
+        first = worker.get("lookup:energy_types")
+        first.append("hydro")
+        for _ in range(10):
+            assert worker.get("lookup:energy_types") == ["solar", "wind"]
+
+        assert server.gets == 0
+        assert worker.l1_stats()["hits"] == 11
+
+    def test_other_keys_always_read_redis(self, workers):
+        """Test that keys without an L1 prefix are not kept in process."""
+        server, (worker, _) = workers
+        worker.set("upload:abc", {"offset": 10})
+        server.gets = 0
+
+        worker.get("upload:abc")
+        worker.get("upload:abc")
+
+        assert server.gets == 2
+        assert len(worker._l1) == 0
+
+    def test_writes_evict_other_workers(self, workers):
+        """Test that set and delete on one worker evict the key from every other L1."""
+        _, (writer, reader) = workers
+        writer.set("lookup:sections", {"version": 1})
+        assert reader.get("lookup:sections") == {"version": 1}
+
+        writer.set("lookup:sections", {"version": 2})
+        assert reader.get("lookup:sections") == {"version": 2}
+        assert writer.get("lookup:sections") == {"version": 2}
+
+        writer.delete("lookup:sections")
+        assert reader.get("lookup:sections") is None
+        assert reader.l1_stats()["invalidations_received"] == 3
+        assert writer.l1_stats()["invalidations_received"] == 0
+
+    def test_eviction_listeners_follow_broadcasts(self, workers):
+        """Test that evictions of keys kept outside L1 reach listeners on other workers."""
+        _, (writer, reader) = workers
+        evicted = []
+        reader.on_eviction("principal:", evicted.append)
+
+        writer.broadcast_eviction("principal:42")
+        writer.broadcast_eviction("upload:abc")
+
+        assert evicted == ["principal:42"]
+
+    def test_longest_prefix_sets_ttl(self, workers):
+        """Test that the most specific prefix decides how long a key stays in L1."""
+        _, (worker, _) = workers
+        worker.set("lookup:volatile:rates", "42")
+
+        assert worker._l1.ttl("lookup:volatile:rates") == 1
+        assert worker._l1_ttl("lookup:roles") == 30
+        assert worker._l1_ttl("principal:1") is None
@@ -0,0 +1,213 @@
+import fnmatch
+
+import pytest
+import redis
+from sqlalchemy import text
+
+import redis_service as redis_module
+from redis_service import (
+    CacheManager, MARKETPLACE_TAG, RedisService, land_tag, session_manager, user_tag
+)
+
+OWNER_ID = "22222222-2222-2222-2222-222222222222"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-000000000001"
+
+
+class TagRedis:
+    """Stand-in Redis client with the commands tag invalidation uses; KEYS is off limits."""
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.round_trips = 0
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS blocks Redis and must not be used")
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    def sadd(self, name, *members):
+        self.sets.setdefault(name, set()).update(members)
+        return len(members)
+
+    def expire(self, name, seconds):
+        return True
+
+    def rename(self, source, target):
+        if source not in self.sets:
+            raise redis.ResponseError("no such key")
+        self.sets[target] = self.sets.pop(source)
+
+    def sscan_iter(self, name, count=None):
+        return iter(sorted(self.sets.get(name, ())))
+
+    def scan_iter(self, match=None, count=None):
+        return iter([key for key in list(self.data) if fnmatch.fnmatchcase(key, match or "*")])
+
+    def unlink(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += (self.data.pop(key, None) is not None) + (self.sets.pop(key, None) is not None)
+        return removed
+
+    def publish(self, channel, message):
+        return 0
+
+    def lock(self, name, timeout=None):
+        return FreeLock()
+
+    def pipeline(self, transaction=True):
+        return TagPipeline(self)
+
+
+class FreeLock:
+    """Recompute lock nobody else holds."""
+
+    def acquire(self, blocking=True):
+        return True
+
+    def owned(self):
+        return True
+
+    def release(self):
+        pass
+
+
+class TagPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture(params=["redis", "fallback"])
+def service(request, monkeypatch):
+    """Module-level redis_service, connected to the stand-in client or running on the fallback store."""
+    monkeypatch.setattr(RedisService, "_initialize_connection", lambda self: None)
+    service = RedisService()
+    if request.param == "redis":
+        service.redis_client, service.is_connected = TagRedis(), True
+    monkeypatch.setattr(redis_module, "redis_service", service)
+    monkeypatch.setattr(redis_module, "CACHE_INVALIDATE_BATCH", 2)
+    return service
+
+
+class TestCacheTags:
+    """Test invalidation through tag sets."""
+
+    def test_invalidate_tag_deletes_only_its_keys(self, service):
+        """Test that a land's tag removes its entries and leaves others."""
+        service.set("api:land:1:detail", {"title": "North field"}, 300, tags=[land_tag(1), MARKETPLACE_TAG])
+        service.set("api:land:1:sections", [1, 2], 300, tags=[land_tag(1)])
+        service.set("api:land:2:detail", {"title": "South field"}, 300, tags=[land_tag(2), MARKETPLACE_TAG])
+
+        assert CacheManager.invalidate_tags(land_tag(1)) == 2
+
+        assert service.get("api:land:1:detail") is None
+        assert service.get("api:land:2:detail") == {"title": "South field"}
+        assert CacheManager.invalidate_tags(land_tag(1)) == 0
+        assert CacheManager.invalidate_tags(MARKETPLACE_TAG) == 1
+
+    def test_clear_user_cache_uses_user_tag(self, service):
+        """Test that a user's cached results and sessions are cleared without pattern scans."""
+        session_manager.create_session("abc", {"user_id": "u1", "role": "landowner"})
+        service.set("reports:u1", {"total": 3}, 300, tags=[user_tag("u1")])
+        service.set("reports:u2", {"total": 4}, 300, tags=[user_tag("u2")])
+
+        assert CacheManager.clear_user_cache("u1") == 2
+
+        assert session_manager.get_session("abc") is None
+        assert service.get("reports:u2") == {"total": 4}
+
+    def test_decorator_registers_tags(self, service):
+        """Test that cache_result tags entries with tags derived from the call."""
+        calls = []
+
+        @redis_module.cache_result(expire=60, key_prefix="test", tags=lambda land_id: [land_tag(land_id)])
+        def land_summary(land_id):
+            calls.append(land_id)
+            return {"land_id": land_id}
+
+        land_summary(7)
+        land_summary(7)
+        CacheManager.invalidate_tags(land_tag(7))
+        land_summary(7)
+
+        assert calls == [7, 7]
+
+    def test_pattern_fallback_scans_in_batches(self, service):
+        """Test that ad-hoc patterns are deleted through SCAN in pipelined batches."""
+        for index in range(5):
+            service.set(f"api:lands:{index}", index, 300)
+        service.set("api:users:1", 1, 300)
+        trips = getattr(service.redis_client, "round_trips", 0)
+
+        assert CacheManager.invalidate_pattern("api:lands:*") == 5
+
+        assert service.get("api:users:1") == 1
+        if service.is_connected:
+            # Five keys in batches of two, plus the read above
+            assert service.redis_client.round_trips - trips == 4
+
+    def test_clear_land_cache(self, service):
+        """Test that a land's entries and the pages listing it go, and other pages only on request."""
+        service.set("api:land:1", {"title": "North field"}, 300, tags=[land_tag(1)])
+        service.set("api:marketplace:a", [1, 2], 300, tags=[MARKETPLACE_TAG, land_tag(1), land_tag(2)])
+        service.set("api:marketplace:b", [2], 300, tags=[MARKETPLACE_TAG, land_tag(2)])
+
+        assert CacheManager.clear_land_cache(1) == 2
+        assert service.get("api:marketplace:b") == [2]
+
+        assert CacheManager.clear_land_cache(3, marketplace=True) == 1
+        assert service.get("api:marketplace:b") is None
+
+
+@pytest.fixture
+def land_client(monkeypatch, database, app_client, login):
+    """Test client over one published land, caching in a fresh fallback store."""
+    monkeypatch.setattr(RedisService, "_initialize_connection", lambda self: None)
+    monkeypatch.setattr(redis_module, "redis_service", RedisService())
+    monkeypatch.setattr("routers.lands.redis_service", redis_module.redis_service)
+
+    database.insert("lands", {
+        "land_id": LAND_ID, "landowner_id": OWNER_ID, "title": "North field", "status": "published",
+        "published_at": "2025-03-01 10:00:00", "created_at": "2025-03-01 09:00:00",
+        "updated_at": "2025-03-01 09:00:00"
+    })
+    login(OWNER_ID, ["landowner"])
+    return app_client, database.engine
+
+
+@pytest.mark.parse_timestamps
+class TestLandCacheTags:
+    """Test that land and marketplace responses are cached under their tags."""
+
+    def test_land_update_evicts_detail_and_marketplace(self, land_client):
+        """Test that editing a land is visible at once in its detail and on the marketplace."""
+        client, engine = land_client
+        assert client.get(f"/api/lands/{LAND_ID}").json()["title"] == "North field"
+        assert client.get("/api/lands/marketplace/published").json()[0]["title"] == "North field"
+
+        # Cached: a change behind the API's back is not seen
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE lands SET title = 'Renamed outside'"))
+        assert client.get(f"/api/lands/{LAND_ID}").json()["title"] == "North field"
+        assert client.get("/api/lands/marketplace/published").json()[0]["title"] == "North field"
+
+        response = client.put(f"/api/lands/{LAND_ID}", json={"title": "South field"})
+        assert response.status_code == 200
+
+        assert client.get(f"/api/lands/{LAND_ID}").json()["title"] == "South field"
+        assert client.get("/api/lands/marketplace/published").json()[0]["title"] == "South field"
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session
+
+import redis_service as redis_module
+from redis_service import cache_async_result, cache_result, make_cache_key, redis_service
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def lookup(land_id, limit=10):
+    return None
+
+
+@pytest.fixture(autouse=True)
+def clean_store():
+    """Run against the in-memory fallback store, emptied around each test."""
+    redis_service._memory_store.clear()
+    yield
+    redis_service._memory_store.clear()
+
+
+class TestCacheKeys:
+    """Test deterministic key derivation."""
+
+    def test_keys_equal_for_equal_arguments(self):
+        """Test that keyword order and value types normalise to one key."""
+        land_id = uuid.UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+        first = make_cache_key("lands", lookup, (land_id,), {"limit": 10, "since": datetime(2025, 3, 1)})
+        second = make_cache_key("lands", lookup, (land_id,), {"since": datetime(2025, 3, 1), "limit": 10})
+
+        assert first == second
+        assert first.startswith("lands:test_cached_results.lookup:")
+        assert make_cache_key("lands", lookup, (land_id,), {"limit": 11}) != first
+
+    def test_sessions_are_left_out_of_keys(self):
+        """Test that calls differing only in their session share a key."""
+        with Session() as first_db, Session() as second_db:
+            assert (make_cache_key("lands", lookup, (first_db, 1), {})
+                    == make_cache_key("lands", lookup, (second_db, 1), {}))
+
+    def test_unknown_arguments_are_rejected(self):
+        """Test that an argument the key cannot represent raises instead of sharing an entry."""
+        class Filter:
+            def __init__(self, status):
+                self.status = status
+
+        with pytest.raises(TypeError):
+            make_cache_key("lands", lookup, (Filter("published"),), {})
+
+    def test_keys_stable_across_processes(self):
+        """Test that processes with different hash seeds derive the same key."""
+        script = (
+            "import uuid; from redis_service import make_cache_key\n"
+            "def lookup(land_id, limit=10): pass\n"
+            "lookup.__module__ = 'test_cached_results'\n"
+            "print(make_cache_key('lands', lookup, ({'b', 'a'}, uuid.UUID(int=1)), {'limit': 10}))"
+        )
+        keys = {
+            subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True,
+                           env={"PYTHONHASHSEED": seed, "PATH": ""}).stdout.strip().splitlines()[-1]
+            for seed in ("1", "2")
+        }
+        assert len(keys) == 1
+
+
+class TestSingleFlight:
+    """Test that concurrent misses compute once."""
+
+    def test_threads_share_one_computation(self):
+        """Test that threads missing the same key together call the function once."""
+        calls = []
+
+        @cache_result(expire=60, key_prefix="test")
+        def slow_lookup(value):
+            calls.append(value)
+            time.sleep(0.2)
+            return {"value": value}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow_lookup(7))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [7]
+        assert results == [{"value": 7}] * 8
+
+    def test_coroutines_share_one_computation(self):
+        """Test that concurrent awaits of the same key call the coroutine once."""
+        calls = []
+
+        @cache_async_result(expire=60, key_prefix="test")
+        async def slow_lookup(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return [value]
+
+        async def scenario():
+            return await asyncio.gather(*(slow_lookup(3) for _ in range(10)), slow_lookup(4))
+
+        results = asyncio.run(scenario())
+
+        assert sorted(calls) == [3, 4]
+        assert results == [[3]] * 10 + [[4]]
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        """Test that a failing computation fails its waiters and is retried afterwards."""
+        attempts = []
+
+        @cache_async_result(expire=60, key_prefix="test")
+        async def flaky():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise RuntimeError("database went away")
+            return "ok"
+
+        async def scenario():
+            first = await asyncio.gather(flaky(), flaky(), return_exceptions=True)
+            return first, await flaky()
+
+        first, retried = asyncio.run(scenario())
+
+        assert all(isinstance(result, RuntimeError) for result in first)
+        assert retried == "ok"
+        assert len(attempts) == 2
+
+    def test_cancelled_leader_hands_over_to_waiter(self):
+        """Test that cancelling the computing request leaves coalesced waiters with a value."""
+        calls = []
+
+        @cache_async_result(expire=60, key_prefix="test")
+        async def land_report(land_id):
+            calls.append(land_id)
+            await asyncio.sleep(0.05)
+            return {"land_id": land_id}
+
+        async def scenario():
+            leader = asyncio.ensure_future(land_report(9))
+            await asyncio.sleep(0.01)
+            waiters = [asyncio.ensure_future(land_report(9)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            return leader, results
+
+        leader, results = asyncio.run(scenario())
+
+        assert leader.cancelled()
+        assert results == [{"land_id": 9}] * 3
+        assert calls == [9, 9]
+
+    def test_waits_for_another_workers_result(self, monkeypatch):
+        """Test that a worker losing the Redis lock returns the winner's value instead of computing."""
+        calls = []
+
+        @cache_result(expire=60, key_prefix="test")
+        def report():
+            calls.append(1)
+            return "computed here"
+
+        class HeldLock:
+            def acquire(self, blocking=True):
+                return False
+
+        class OtherWorkerRedis:
+            def __init__(self):
+                self.data = {}
+
+            def get(self, key):
+                return self.data.get(key)
+
+            def set(self, key, value, ex=None):
+                self.data[key] = value
+                return True
+
+            def lock(self, name, timeout=None):
+                return HeldLock()
+
+        client = OtherWorkerRedis()
+        monkeypatch.setattr(redis_service, "redis_client", client)
+        monkeypatch.setattr(redis_service, "is_connected", True)
+        key = make_cache_key("test", report.__wrapped__, (), {})
+        threading.Timer(0.1, lambda: client.set(key, json.dumps(
+            {"value": "computed there", "fresh_until": time.time() + 60}))).start()
+
+        assert report() == "computed there"
+        assert calls == []
+
+    def test_async_wait_keeps_the_event_loop_free(self, monkeypatch):
+        """Test that reading the cache and polling for another worker's result do not block the loop on Redis."""
+        @cache_async_result(expire=60, key_prefix="test")
+        async def report():
+            return "computed here"
+
+        class SlowHeldLock:
+            def acquire(self, blocking=True):
+                time.sleep(0.05)
+                return False
+
+        class SlowRedis:
+            def __init__(self):
+                self.data = {}
+
+            def get(self, key):
+                time.sleep(0.05)
+                return self.data.get(key)
+
+            def set(self, key, value, ex=None):
+                self.data[key] = value
+                return True
+
+            def lock(self, name, timeout=None):
+                return SlowHeldLock()
+
+        client = SlowRedis()
+        monkeypatch.setattr(redis_service, "redis_client", client)
+        monkeypatch.setattr(redis_service, "is_connected", True)
+        key = make_cache_key("test", report.__wrapped__, (), {})
+
+        async def scenario():
+            gaps = []
+
+            async def ticker():
+                last = time.monotonic()
+                while True:
+                    await asyncio.sleep(0.005)
+                    now = time.monotonic()
+                    gaps.append(now - last)
+                    last = now
+
+            ticking = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            threading.Timer(0.3, lambda: client.set(key, json.dumps(
+                {"value": "computed there", "fresh_until": time.time() + 60}))).start()
+            result = await report()
+            ticking.cancel()
+            return result, gaps
+
+        result, gaps = asyncio.run(scenario())
+
+        assert result == "computed there"
+        assert max(gaps) < 0.04
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale values during a background refresh."""
+
+    def test_stale_value_served_while_refreshing(self, monkeypatch):
+        """Test that an expired value is returned at once and replaced in the background."""
+        versions = iter(["v1", "v2"])
+        clock = [1000.0]
+        monkeypatch.setattr(redis_module.time, "time", lambda: clock[0])
+
+        @cache_result(expire=10, key_prefix="test", stale_ttl=60)
+        def current_version():
+            return next(versions)
+
+        assert current_version() == "v1"
+        clock[0] += 11
+        assert current_version() == "v1"
+
+        deadline = time.monotonic() + 2
+        while current_version() != "v2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert current_version() == "v2"
+
+    def test_async_stale_value_refreshed_by_task(self, monkeypatch):
+        """Test that the async decorator refreshes stale values on the running loop."""
+        versions = iter(["v1", "v2"])
+        clock = [1000.0]
+        monkeypatch.setattr(redis_module.time, "time", lambda: clock[0])
+
+        @cache_async_result(expire=10, key_prefix="test", stale_ttl=60)
+        async def current_version():
+            return next(versions)
+
+        async def scenario():
+            first = await current_version()
+            clock[0] += 11
+            stale = await current_version()
+            await asyncio.sleep(0.05)
+            return first, stale, await current_version()
+
+        assert asyncio.run(scenario()) == ("v1", "v1", "v2")
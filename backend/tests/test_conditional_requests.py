@@ -0,0 +1,100 @@
+import io
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from blob_store import put_blob
+from document_storage import ingest_stream, is_not_modified, http_date
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+DOCUMENT_ID = "dddddddd-dddd-dddd-dddd-dddddddddddd"
+
+
+@pytest.fixture
+def client_env(blob_database, app_client, login):
+    """Test client signed in as the landowner of one blob-backed document."""
+    blob_database.insert("lands", {"land_id": LAND_ID, "landowner_id": OWNER_ID, "status": "draft",
+                                   "title": "North field"})
+    session = sessionmaker(bind=blob_database.engine)()
+    content_hash = put_blob(session, ingest_stream(io.BytesIO(b"%PDF-1.4 title deed"), "deed.pdf"))
+    session.commit()
+    session.close()
+    blob_database.insert("documents", {
+        "document_id": DOCUMENT_ID, "land_id": LAND_ID, "document_type": "ownership-documents",
+        "file_name": "deed.pdf", "file_size": 19, "uploaded_by": OWNER_ID, "mime_type": "application/pdf",
+        "is_draft": 0, "content_hash": content_hash, "created_at": "2025-03-01 10:00:00"
+    })
+    login(OWNER_ID, ["landowner"])
+    return app_client, blob_database, content_hash
+
+
+class TestConditionalDownloads:
+    """Test ETag validators on document downloads and metadata."""
+
+    def test_download_revalidates_without_reading_blob(self, client_env):
+        """Test that a matching If-None-Match returns 304 from metadata alone."""
+        client, database, content_hash = client_env
+        url = f"/api/documents/download/{DOCUMENT_ID}"
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.content == b"%PDF-1.4 title deed"
+        assert response.headers["ETag"] == f'"{content_hash}"'
+        assert response.headers["Last-Modified"] == "Sat, 01 Mar 2025 10:00:00 GMT"
+
+        database.statements.clear()
+        response = client.get(url, headers={"If-None-Match": f'"{content_hash}"'})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert not any("document_blob_chunks" in s or "file_data FROM" in s for s in database.statements)
+
+        response = client.get(url, headers={"If-Modified-Since": "Sat, 01 Mar 2025 10:00:00 GMT"})
+        assert response.status_code == 304
+
+    def test_stale_if_range_serves_whole_file(self, client_env):
+        """Test that a range is only honoured when If-Range still matches."""
+        client, _, content_hash = client_env
+        url = f"/api/documents/download/{DOCUMENT_ID}"
+
+        partial = client.get(url, headers={"Range": "bytes=0-3", "If-Range": f'"{content_hash}"'})
+        full = client.get(url, headers={"Range": "bytes=0-3", "If-Range": '"stale"'})
+
+        assert partial.status_code == 206
+        assert full.status_code == 200
+        assert len(full.content) == 19
+
+    def test_metadata_etag_changes_with_metadata(self, client_env):
+        """Test that document and listing ETags change when a document is renamed."""
+        client, database, _ = client_env
+        document_url = f"/api/documents/{DOCUMENT_ID}"
+        listing_url = f"/api/documents/land/{LAND_ID}"
+
+        document_etag = client.get(document_url).headers["ETag"]
+        listing_etag = client.get(listing_url).headers["ETag"]
+        assert client.get(document_url, headers={"If-None-Match": document_etag}).status_code == 304
+        assert client.get(listing_url, headers={"If-None-Match": listing_etag}).status_code == 304
+
+        with database.engine.begin() as conn:
+            conn.execute(text("UPDATE documents SET file_name = 'deed-signed.pdf'"))
+
+        response = client.get(document_url, headers={"If-None-Match": document_etag})
+        assert response.status_code == 200
+        assert response.json()["file_name"] == "deed-signed.pdf"
+        assert client.get(listing_url, headers={"If-None-Match": listing_etag}).status_code == 200
+
+
+class TestConditionalHelpers:
+    """Test evaluation of conditional request headers."""
+
+    def test_if_none_match_takes_precedence(self):
+        """Test that If-Modified-Since is ignored when If-None-Match is sent."""
+        last_modified = "2025-03-01 10:00:00"
+        since = http_date(last_modified)
+
+        assert is_not_modified('"a"', None, last_modified, since)
+        assert not is_not_modified('"a"', '"b"', last_modified, since)
+        assert not is_not_modified(None, '"a"')
+        assert not is_not_modified('"a"', None, last_modified, "not a date")
+        assert not is_not_modified('"a"', None, last_modified, "Fri, 28 Feb 2025 10:00:00 GMT")
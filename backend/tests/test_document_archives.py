@@ -0,0 +1,111 @@
+import io
+import zipfile
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from blob_store import put_blob
+from document_storage import ingest_stream
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+REVIEWER_ID = "22222222-2222-2222-2222-222222222222"
+OUTSIDER_ID = "33333333-3333-3333-3333-333333333333"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+TASK_ID = "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"
+
+# (document_type, file_name, uploaded_by, created_at) - text, pre-1980 and missing timestamps
+DOCUMENTS = [
+    ("land-valuation", "valuation.pdf", OWNER_ID, "2025-03-01 10:00:00"),
+    ("topographical-surveys", "survey.pdf", OWNER_ID, "1975-06-01 00:00:00"),
+    ("grid-connectivity", "grid.pdf", REVIEWER_ID, None),
+]
+
+
+@pytest.fixture
+def client(blob_database, app_client):
+    """Test client over a land with one task and three blob-backed documents."""
+    blob_database.insert("lands", {"land_id": LAND_ID, "landowner_id": OWNER_ID, "status": "under_review",
+                                   "title": "North field"})
+    blob_database.insert("tasks", {"task_id": TASK_ID, "land_id": LAND_ID, "assigned_to": REVIEWER_ID,
+                                   "assigned_role": "re_sales_advisor"})
+
+    session = sessionmaker(bind=blob_database.engine)()
+    for index, (document_type, file_name, uploaded_by, created_at) in enumerate(DOCUMENTS):
+        payload = b"%PDF-1.4 " + file_name.encode()
+        content_hash = put_blob(session, ingest_stream(io.BytesIO(payload), file_name))
+        session.commit()
+        blob_database.insert("documents", {
+            "document_id": f"dddddddd-dddd-dddd-dddd-00000000000{index}", "land_id": LAND_ID, "task_id": TASK_ID,
+            "document_type": document_type, "file_name": file_name, "uploaded_by": uploaded_by,
+            "mime_type": "application/pdf", "content_hash": content_hash, "created_at": created_at
+        })
+    session.close()
+    return app_client
+
+
+def archive_names(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    return sorted(archive.namelist())
+
+
+class TestLandArchive:
+    """Test the streamed ZIP of a land's documents."""
+
+    def test_owner_gets_every_document(self, client, login):
+        """Test that text, pre-1980 and missing timestamps all produce a complete archive."""
+        login(OWNER_ID, ["landowner"])
+
+        response = client.get(f"/api/documents/land/{LAND_ID}/archive")
+
+        assert archive_names(response) == [
+            "grid-connectivity/grid.pdf",
+            "land-valuation/valuation.pdf",
+            "topographical-surveys/survey.pdf",
+        ]
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.getinfo("land-valuation/valuation.pdf").date_time == (2025, 3, 1, 10, 0, 0)
+        assert archive.getinfo("topographical-surveys/survey.pdf").date_time == (1980, 1, 1, 0, 0, 0)
+        assert archive.read("land-valuation/valuation.pdf") == b"%PDF-1.4 valuation.pdf"
+
+    def test_reviewer_limited_to_role_document_types(self, client, login):
+        """Test that a reviewer only gets the document types mapped to their task role."""
+        login(REVIEWER_ID, ["re_sales_advisor"])
+
+        response = client.get(f"/api/documents/land/{LAND_ID}/archive")
+
+        assert archive_names(response) == ["land-valuation/valuation.pdf"]
+
+    def test_unrelated_user_forbidden(self, client, login):
+        """Test that users without a task on an unpublished land are refused."""
+        login(OUTSIDER_ID, ["investor"])
+
+        assert client.get(f"/api/documents/land/{LAND_ID}/archive").status_code == 403
+
+
+class TestTaskArchive:
+    """Test the streamed ZIP of a task's documents."""
+
+    def test_owner_gets_every_document(self, client, login):
+        """Test that the landowner gets every document of the task."""
+        login(OWNER_ID, ["landowner"])
+
+        response = client.get(f"/api/documents/task/{TASK_ID}/archive")
+
+        assert len(archive_names(response)) == 3
+
+    def test_reviewer_gets_role_types_and_own_uploads(self, client, login):
+        """Test that the assigned reviewer gets their role's types plus what they uploaded."""
+        login(REVIEWER_ID, ["re_sales_advisor"])
+
+        response = client.get(f"/api/documents/task/{TASK_ID}/archive")
+
+        assert archive_names(response) == ["grid-connectivity/grid.pdf", "land-valuation/valuation.pdf"]
+
+    def test_unassigned_user_forbidden(self, client, login):
+        """Test that users neither owning nor assigned to the task are refused."""
+        login(OUTSIDER_ID, ["re_sales_advisor"])
+
+        assert client.get(f"/api/documents/task/{TASK_ID}/archive").status_code == 403
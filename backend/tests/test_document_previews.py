@@ -0,0 +1,134 @@
+import asyncio
+import io
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+Image = pytest.importorskip("PIL.Image")
+
+import blob_store
+import document_previews
+import worker_pool
+from blob_store import put_blob
+from document_storage import ingest_stream, etag_matches
+from preview_renderer import render_preview
+
+SCHEMA = [
+    """CREATE TABLE document_blobs (
+        content_hash VARCHAR(64) PRIMARY KEY, size BIGINT NOT NULL, mime_type TEXT,
+        storage_backend VARCHAR(20) NOT NULL, chunk_size INTEGER NOT NULL,
+        codec VARCHAR(20) NOT NULL DEFAULT 'identity', stored_size BIGINT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE document_blob_chunks (
+        content_hash VARCHAR(64) NOT NULL REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+        chunk_index INTEGER NOT NULL, data BLOB NOT NULL,
+        PRIMARY KEY (content_hash, chunk_index)
+    )""",
+    """CREATE TABLE document_previews (
+        content_hash VARCHAR(64) PRIMARY KEY REFERENCES document_blobs(content_hash) ON DELETE CASCADE,
+        mime_type TEXT NOT NULL, width INTEGER NOT NULL, height INTEGER NOT NULL,
+        data BLOB NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+
+def make_png(size=(1200, 800), mode="RGBA"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (30, 120, 60, 255) if mode == "RGBA" else (30, 120, 60)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory SQLite database with the blob store and preview schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+
+    monkeypatch.setattr(blob_store, "engine", engine)
+    monkeypatch.setattr(document_previews, "engine", engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    worker_pool.shutdown_worker_pool()
+
+
+class TestPreviewRenderer:
+    """Test thumbnail rendering in isolation."""
+
+    def test_image_is_downscaled_to_jpeg(self, tmp_path):
+        """Test that large images become small JPEGs that keep their aspect ratio."""
+        path = tmp_path / "site.png"
+        path.write_bytes(make_png())
+
+        data, width, height = render_preview(str(path), "image/png", (320, 320))
+
+        assert data[:3] == b"\xff\xd8\xff"
+        assert (width, height) == (320, 213)
+
+    def test_unsupported_type_has_no_preview(self, tmp_path):
+        """Test that non-renderable types are skipped."""
+        path = tmp_path / "notes.txt"
+        path.write_text("survey notes")
+
+        assert render_preview(str(path), "text/plain", (320, 320)) is None
+
+
+class TestPreviewETags:
+    """Test If-None-Match evaluation against strong preview ETags."""
+
+    def test_etag_matching(self):
+        """Test exact, listed, weak and wildcard validators."""
+        etag = document_previews.preview_etag("ab" * 32)
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestPreviewGeneration:
+    """Test the background preview pipeline end to end."""
+
+    def test_preview_is_stored_once_per_blob(self, db):
+        """Test that a preview is rendered in the worker pool and keyed by content hash."""
+        with ingest_stream(io.BytesIO(make_png()), "site.png") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        assert asyncio.run(document_previews.generate_preview(content_hash)) is True
+        # Already rendered - nothing to do
+        assert asyncio.run(document_previews.generate_preview(content_hash)) is False
+
+        row = db.execute(text(
+            "SELECT mime_type, width, height, data FROM document_previews WHERE content_hash = :h"
+        ), {"h": content_hash}).fetchone()
+        assert row.mime_type == "image/jpeg"
+        assert max(row.width, row.height) == document_previews.PREVIEW_MAX_DIMENSION
+        assert bytes(row.data)[:3] == b"\xff\xd8\xff"
+
+    def test_failed_render_is_not_retried(self, db, monkeypatch):
+        """Test that a corrupt image is marked failed instead of being rendered on every request."""
+        with ingest_stream(io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 512), "broken.png") as ingested:
+            content_hash = put_blob(db, ingested)
+        db.commit()
+
+        assert asyncio.run(document_previews.generate_preview(content_hash)) is False
+        assert document_previews.preview_failed(content_hash)
+
+        async def must_not_render(*args):
+            raise AssertionError("failed previews must not be rendered again")
+
+        monkeypatch.setattr(document_previews, "run_in_worker", must_not_render)
+        assert asyncio.run(document_previews.generate_preview(content_hash)) is False
+        document_previews.redis_service.delete(document_previews._failure_key(content_hash))
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+ADMIN_ID = "00000000-0000-0000-0000-0000000000aa"
+
+
+@pytest.fixture
+def review_env(database, app_client, login):
+    """Test client signed in as an administrator over four pending documents."""
+    document_ids = [str(uuid.uuid4()) for _ in range(4)]
+    database.insert("documents", *[{
+        "document_id": document_id, "document_type": "land-valuation", "file_name": "valuation.pdf",
+        "mime_type": "application/pdf", "is_draft": 0
+    } for document_id in document_ids])
+    login(ADMIN_ID, ["administrator"])
+    database.statements.clear()
+    return app_client, database, document_ids
+
+
+class TestBatchReview:
+    """Test bulk approve/reject in one transaction."""
+
+    def test_one_update_per_decision(self, review_env):
+        """Test that a mixed batch issues one UPDATE per decision."""
+        client, database, ids = review_env
+
+        response = client.post("/api/documents/review/batch", json={"items": [
+            {"document_id": ids[0], "decision": "approve", "admin_comments": "ok"},
+            {"document_id": ids[1], "decision": "approve"},
+            {"document_id": ids[2], "decision": "reject", "reason": "Unsigned deed"},
+        ]})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["approved"], body["rejected"], body["failed"]) == (2, 1, 0)
+        assert [r["document"]["status"] for r in body["results"]] == ["approved", "approved", "rejected"]
+        assert [s.split()[0].upper() for s in database.statements].count("UPDATE") == 2
+
+        with database.engine.connect() as conn:
+            row = conn.execute(text("SELECT status, rejection_reason, approved_by FROM documents WHERE document_id = :id"),
+                               {"id": ids[2]}).fetchone()
+        assert (row.status, row.rejection_reason, row.approved_by) == ("rejected", "Unsigned deed", ADMIN_ID)
+
+    def test_item_errors_do_not_abort_batch(self, review_env):
+        """Test that unknown, duplicate and invalid items fail on their own."""
+        client, database, ids = review_env
+        missing = str(uuid.uuid4())
+
+        response = client.post("/api/documents/review/batch", json={"items": [
+            {"document_id": ids[0], "decision": "approve"},
+            {"document_id": missing, "decision": "approve"},
+            {"document_id": ids[1], "decision": "reject"},
+            {"document_id": ids[3], "decision": "approve"},
+            {"document_id": ids[3], "decision": "reject", "reason": "dup"},
+        ]})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["success"] for r in results] == [True, False, False, False, False]
+        assert results[1]["error"] == "Document not found"
+        assert results[2]["error"] == "A rejection reason is required"
+        assert "more than once" in results[3]["error"]
+
+        with database.engine.connect() as conn:
+            statuses = dict(conn.execute(text("SELECT document_id, status FROM documents")).fetchall())
+        assert statuses[ids[0]] == "approved"
+        assert statuses[ids[1]] == "pending"
+        assert statuses[ids[3]] == "pending"
@@ -0,0 +1,143 @@
+import zipfile
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import document_search
+from document_search import ensure_search_schema, search_documents, highlight_snippet
+from routers.documents import document_access_condition
+from text_extraction import extract_text, DOCX_MIME_TYPE
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+ANALYST_ID = "22222222-2222-2222-2222-222222222222"
+OUTSIDER_ID = "33333333-3333-3333-3333-333333333333"
+
+SCHEMA = [
+    """CREATE TABLE document_blobs (
+        content_hash VARCHAR(64) PRIMARY KEY, size BIGINT NOT NULL, mime_type TEXT,
+        storage_backend VARCHAR(20) NOT NULL, chunk_size INTEGER NOT NULL,
+        codec VARCHAR(20) NOT NULL DEFAULT 'identity', stored_size BIGINT
+    )""",
+    "CREATE TABLE lands (land_id TEXT PRIMARY KEY, landowner_id TEXT, status TEXT)",
+    "CREATE TABLE tasks (task_id TEXT PRIMARY KEY, land_id TEXT, assigned_to TEXT, assigned_role TEXT)",
+    """CREATE TABLE documents (
+        document_id TEXT PRIMARY KEY, land_id TEXT, document_type TEXT, file_name TEXT,
+        mime_type TEXT, created_at TIMESTAMP, content_hash VARCHAR(64)
+    )""",
+]
+
+DOCUMENTS = [
+    # document_id, land_id, document_type, content
+    ("d1", "land-a", "topographical-surveys", "Survey ID TS-4471 covers parcel 118/2 near the substation"),
+    ("d2", "land-a", "ownership-documents", "Title deed for parcel 118/2 registered to the landowner"),
+    ("d3", "land-b", "government-nocs", "NOC reference GOV-2291 issued for parcel 907"),
+    ("d4", "land-b", "government-nocs", '<img src=x onerror="alert(1)"> NOC reference GOV-3318'),
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory SQLite database with an FTS5 document index."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    monkeypatch.setattr(document_search, "engine", engine)
+    monkeypatch.setattr(document_search, "IS_SQLITE", True)
+
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+    ensure_search_schema(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO lands VALUES ('land-a', :owner, 'under_review'), ('land-b', :owner, 'draft')"),
+                     {"owner": OWNER_ID})
+        conn.execute(text("INSERT INTO tasks VALUES ('t1', 'land-a', :analyst, 're_analyst')"),
+                     {"analyst": ANALYST_ID})
+        for document_id, land_id, document_type, content in DOCUMENTS:
+            content_hash = document_id * 32
+            conn.execute(text("""
+                INSERT INTO document_blobs (content_hash, size, mime_type, storage_backend, chunk_size)
+                VALUES (:h, 1, 'text/plain', 'database', 1024)
+            """), {"h": content_hash})
+            conn.execute(text("""
+                INSERT INTO documents VALUES (:id, :land_id, :type, :name, 'text/plain', CURRENT_TIMESTAMP, :h)
+            """), {"id": document_id, "land_id": land_id, "type": document_type,
+                   "name": f"{document_id}.txt", "h": content_hash})
+    for document_id, _, _, content in DOCUMENTS:
+        document_search._store_text(document_id * 32, content)
+
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def search_as(db, user_id, query, roles=None):
+    params = {}
+    condition = document_access_condition({"user_id": user_id, "roles": roles or []}, params)
+    return [row.document_id for row in search_documents(db, query, condition, params)]
+
+
+class TestDocumentSearch:
+    """Test ranked full-text search and its permission filter."""
+
+    def test_matches_references_with_snippets(self, db):
+        """Test that identifiers are searchable and snippets highlight the hit."""
+        results = search_documents(db, "TS-4471")
+
+        assert [row.document_id for row in results] == ["d1"]
+        assert "<mark>" in highlight_snippet(results[0].snippet)
+
+    def test_snippet_text_is_escaped(self, db):
+        """Test that markup in uploaded text is escaped while hits are still highlighted."""
+        snippet = highlight_snippet(search_documents(db, "GOV-3318")[0].snippet)
+
+        assert "<img" not in snippet
+        assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in snippet
+        assert "<mark>" in snippet
+
+    def test_owner_and_admin_see_all_matches(self, db):
+        """Test that owners and admins are not filtered."""
+        assert sorted(search_as(db, OWNER_ID, "parcel")) == ["d1", "d2", "d3"]
+        assert sorted(search_as(db, OUTSIDER_ID, "parcel", roles=["administrator"])) == ["d1", "d2", "d3"]
+
+    def test_reviewer_limited_to_role_document_types(self, db):
+        """Test that reviewers only find their role's document types on assigned lands."""
+        assert search_as(db, ANALYST_ID, "parcel") == ["d1"]
+        assert search_as(db, OUTSIDER_ID, "parcel") == []
+
+    def test_user_input_is_not_query_syntax(self, db):
+        """Test that FTS5 operators in the query are treated as plain text."""
+        assert search_documents(db, 'parcel" OR NEAR(') == []
+
+
+class TestTextExtraction:
+    """Test worker-side text extraction."""
+
+    def test_docx_text_is_extracted(self, tmp_path):
+        """Test that paragraph text is read from word/document.xml."""
+        path = tmp_path / "noc.docx"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("word/document.xml", (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                '<w:p><w:r><w:t>NOC reference</w:t></w:r></w:p>'
+                '<w:p><w:r><w:t>GOV-2291</w:t></w:r></w:p>'
+                '</w:body></w:document>'
+            ))
+
+        content = extract_text(str(path), DOCX_MIME_TYPE, 10_000)
+
+        assert "NOC reference" in content
+        assert "GOV-2291" in content
+
+    def test_text_is_truncated(self, tmp_path):
+        """Test that extraction stops at the configured character budget."""
+        path = tmp_path / "notes.txt"
+        path.write_text("a" * 5000)
+
+        assert len(extract_text(str(path), "text/plain", 100)) == 100
+        assert extract_text(str(path), "image/png", 100) is None
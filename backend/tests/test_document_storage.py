@@ -0,0 +1,147 @@
+import hashlib
+import io
+import zipfile
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from document_storage import (
+    ingest_stream, ingest_path, sniff_mime_type, parse_range_header, iter_file_range, DOCX_MIME_TYPE,
+    ArchiveEntry, iter_zip_archive, unique_archive_name
+)
+
+
+class TestIngestPipeline:
+    """Test the single-pass upload ingest stage."""
+
+    def test_ingest_computes_size_and_hash(self):
+        """Test that size and SHA-256 are computed while spooling."""
+        payload = b"%PDF-1.7\n" + b"x" * 200_000
+        ingested = ingest_stream(io.BytesIO(payload), "survey.pdf", chunk_size=4096)
+
+        with ingested:
+            assert ingested.size == len(payload)
+            assert ingested.sha256 == hashlib.sha256(payload).hexdigest()
+            assert ingested.mime_type == "application/pdf"
+            assert b"".join(ingested.iter_chunks(1000)) == payload
+            assert ingested.read() == payload
+
+    def test_ingest_enforces_max_size(self):
+        """Test that oversized uploads are rejected with 413."""
+        with pytest.raises(HTTPException) as exc_info:
+            ingest_stream(io.BytesIO(b"a" * 5000), "big.txt", max_size=4096, chunk_size=1024)
+
+        assert exc_info.value.status_code == 413
+
+    def test_empty_upload(self):
+        """Test that an empty upload yields a zero-length file."""
+        with ingest_stream(io.BytesIO(b""), "empty.txt") as ingested:
+            assert ingested.size == 0
+            assert ingested.sha256 == hashlib.sha256(b"").hexdigest()
+
+
+class TestMimeSniffing:
+    """Test content-based MIME type detection."""
+
+    def test_signature_wins_over_declared_type(self):
+        """Test that magic bytes override a wrong client content type."""
+        assert sniff_mime_type(b"\x89PNG\r\n\x1a\n....", "photo.jpg", "image/jpeg") == "image/png"
+
+    def test_docx_detection(self):
+        """Test that ZIP containers with a .docx name are reported as DOCX."""
+        assert sniff_mime_type(b"PK\x03\x04rest", "report.docx") == DOCX_MIME_TYPE
+
+    def test_fallback_to_extension(self):
+        """Test that unknown content falls back to the file extension."""
+        assert sniff_mime_type(b"plain words", "notes.txt") == "text/plain"
+        assert sniff_mime_type(b"\x00\x01", "blob.bin", None) == "application/octet-stream"
+
+
+class TestRangeRequests:
+    """Test Range header parsing and sliced file reads."""
+
+    def test_no_header_serves_full_file(self):
+        """Test that a missing or unsupported header means a full response."""
+        assert parse_range_header(None, 100) is None
+        assert parse_range_header("items=0-5", 100) is None
+        assert parse_range_header("bytes=0-5,10-20", 100) is None
+
+    def test_explicit_and_open_ranges(self):
+        """Test bounded, open-ended and suffix ranges."""
+        assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+        assert parse_range_header("bytes=900-", 1000) == (900, 999)
+        assert parse_range_header("bytes=-100", 1000) == (900, 999)
+        assert parse_range_header("bytes=990-5000", 1000) == (990, 999)
+
+    def test_unsatisfiable_range(self):
+        """Test that a range past the end raises 416 with Content-Range."""
+        with pytest.raises(HTTPException) as exc_info:
+            parse_range_header("bytes=1000-", 1000)
+
+        assert exc_info.value.status_code == 416
+        assert exc_info.value.headers["Content-Range"] == "bytes */1000"
+
+    def test_iter_file_range(self, tmp_path):
+        """Test that file slices are yielded in bounded chunks."""
+        path = tmp_path / "doc.bin"
+        path.write_bytes(bytes(range(256)) * 10)
+
+        chunks = list(iter_file_range(str(path), 10, 1033, chunk_size=256))
+
+        assert b"".join(chunks) == path.read_bytes()[10:1034]
+        assert max(len(chunk) for chunk in chunks) <= 256
+
+
+class TestIngestPath:
+    """Test in-place ingest of files already on disk."""
+
+    def test_ingest_path_reads_without_copy(self, tmp_path):
+        """Test that an assembled file is hashed and re-read in place."""
+        path = tmp_path / "assembled.part"
+        payload = b"\xff\xd8\xff" + b"j" * 100_000
+        path.write_bytes(payload)
+
+        with ingest_path(str(path), "photo.jpg") as ingested:
+            assert ingested.size == len(payload)
+            assert ingested.sha256 == hashlib.sha256(payload).hexdigest()
+            assert ingested.mime_type == "image/jpeg"
+            assert b"".join(ingested.iter_chunks()) == payload
+
+        assert path.exists()
+
+
+class TestZipArchive:
+    """Test the streamed ZIP export."""
+
+    def test_archive_streams_readable_zip(self, tmp_path):
+        """Test that entries are read in chunks and produce a valid archive."""
+        report = tmp_path / "report.txt"
+        report.write_bytes(b"survey line\n" * 50_000)
+        scan = tmp_path / "scan.pdf"
+        scan.write_bytes(b"%PDF-1.4 " + bytes(range(256)) * 100)
+
+        entries = [
+            ArchiveEntry("reports/report.txt", report.stat().st_size, "text/plain", None,
+                         lambda start, end: iter_file_range(str(report), start, end, chunk_size=8192)),
+            ArchiveEntry("scans/scan.pdf", scan.stat().st_size, "application/pdf", datetime(2025, 1, 2),
+                         lambda start, end: iter_file_range(str(scan), start, end, chunk_size=8192)),
+        ]
+
+        parts = list(iter_zip_archive(entries))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(parts)))
+
+        assert len(parts) > 2
+        assert archive.testzip() is None
+        assert archive.read("reports/report.txt") == report.read_bytes()
+        assert archive.read("scans/scan.pdf") == scan.read_bytes()
+        assert archive.getinfo("scans/scan.pdf").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("reports/report.txt").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_archive_names_are_safe_and_unique(self):
+        """Test that traversal segments are dropped and duplicates numbered."""
+        used = set()
+
+        assert unique_archive_name("deeds/title.pdf", used) == "deeds/title.pdf"
+        assert unique_archive_name("deeds/Title.pdf", used) == "deeds/Title (2).pdf"
+        assert unique_archive_name("../../etc/passwd", used) == "etc/passwd"
@@ -120,10 +120,10 @@ class TestHealthEndpoints:
         response = client.get("/api/health/")
         assert response.status_code == 200
     
-    @patch('database.engine.connect')
-    def test_health_check_database_failure(self, mock_connect, client, setup_database):
+    @patch('routers.health.get_async_engine')
+    def test_health_check_database_failure(self, mock_get_async_engine, client, setup_database):
         """Test health check when database is unavailable."""
-        mock_connect.side_effect = Exception("Database connection failed")
+        mock_get_async_engine.return_value.connect.side_effect = Exception("Database connection failed")
         
         response = client.get("/api/health/")
         
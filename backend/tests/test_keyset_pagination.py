@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from pagination import CURSOR_HEADER, decode_cursor, encode_cursor, keyset_page
+
+ADMIN_ID = "11111111-1111-1111-1111-111111111111"
+OWNER_ID = "22222222-2222-2222-2222-222222222222"
+
+# Several rows share a timestamp so the primary key has to break ties
+TIMESTAMPS = ["2025-03-01 10:00:00"] * 3 + ["2025-03-02 09:00:00"] * 2 + ["2025-03-03 08:00:00"] * 2
+
+pytestmark = pytest.mark.parse_timestamps
+
+
+@pytest.fixture
+def client(database, app_client, login):
+    """Test client signed in as an administrator over seven documents and seven lands."""
+    for index, created_at in enumerate(TIMESTAMPS):
+        database.insert("documents", {
+            "document_id": f"dddddddd-dddd-dddd-dddd-00000000000{index}", "document_type": "survey",
+            "file_name": f"doc{index}.pdf", "file_size": 10, "uploaded_by": OWNER_ID,
+            "mime_type": "application/pdf", "is_draft": 0, "created_at": created_at
+        })
+        database.insert("lands", {
+            "land_id": f"aaaaaaaa-aaaa-aaaa-aaaa-00000000000{index}", "landowner_id": OWNER_ID,
+            "title": f"Field {index}", "status": "draft" if index % 2 else "published",
+            "created_at": created_at, "updated_at": created_at
+        })
+    login(ADMIN_ID, ["administrator"])
+    return app_client
+
+
+def walk_pages(client, path, limit, cursor=None):
+    """Follow X-Next-Cursor until a short page, returning the rows in order."""
+    rows, params = [], {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        rows.extend(response.json())
+        if CURSOR_HEADER not in response.headers:
+            return rows
+        params = {"limit": limit, "cursor": response.headers[CURSOR_HEADER]}
+
+
+class TestCursorEncoding:
+    """Test the opaque cursor format."""
+
+    def test_round_trip_keeps_datetimes(self):
+        """Test that datetime sort keys come back as datetimes."""
+        created_at = datetime(2025, 3, 1, 10, 0, 0)
+        cursor = encode_cursor(created_at, "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+        assert decode_cursor(encode_cursor("2025-03-01 10:00:00", 7)) == ("2025-03-01 10:00:00", "7")
+
+    def test_malformed_cursor_is_rejected(self):
+        """Test that tampered cursors raise 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor("not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+
+class TestKeysetPagination:
+    """Test cursor pagination on the list endpoints."""
+
+    def test_cursor_pages_match_offset_listing(self, client, database):
+        """Test that walking cursors yields the full listing once, in order, without OFFSET."""
+        full = client.get("/api/documents/admin/all", params={"limit": 100}).json()
+        database.statements.clear()
+
+        paged = walk_pages(client, "/api/documents/admin/all", limit=3)
+
+        assert [doc["document_id"] for doc in paged] == [doc["document_id"] for doc in full]
+        assert len(paged) == len(TIMESTAMPS)
+        seeks = [s for s in database.statements if "FROM documents" in s]
+        assert len(seeks) == 3
+        assert all("OFFSET" not in s for s in seeks[1:])
+
+    def test_cursor_continues_an_offset_page(self, client):
+        """Test that the cursor returned by an offset page picks up where it ended."""
+        full = client.get("/api/lands/", params={"limit": 100}).json()
+
+        first = client.get("/api/lands/", params={"skip": 2, "limit": 2})
+        rest = walk_pages(client, "/api/lands/", limit=2, cursor=first.headers[CURSOR_HEADER])
+
+        ids = [land["land_id"] for land in first.json() + rest]
+        assert ids == [land["land_id"] for land in full[2:]]
+
+    def test_short_page_has_no_cursor(self, client):
+        """Test that the last page carries no X-Next-Cursor."""
+        response = client.get("/api/lands/marketplace/published", params={"limit": 10})
+
+        assert response.status_code == 200
+        assert len(response.json()) == 4
+        assert CURSOR_HEADER not in response.headers
+
+    def test_null_sort_keys_do_not_end_the_listing(self, database):
+        """Test that rows without a sort key are paged first and the cursor carries on past them."""
+        database.insert("documents", *[{"document_id": f"d{index}", "created_at": created_at} for index, created_at in
+                                       enumerate([None, None, None, "2025-03-01 10:00:00", "2025-03-02 10:00:00"])])
+        seen, cursor = [], None
+        while True:
+            params = {}
+            where_sql, order_sql = keyset_page("created_at", "document_id", cursor, 0, 2, params)
+            with database.engine.connect() as conn:
+                page = conn.execute(text(f"SELECT document_id, created_at FROM documents WHERE 1=1{where_sql}{order_sql}"),
+                                    params).fetchall()
+            seen.extend(row.document_id for row in page)
+            if len(page) < 2:
+                break
+            cursor = encode_cursor(page[-1].created_at, page[-1].document_id)
+
+        assert seen == ["d2", "d1", "d0", "d4", "d3"]
+
+    def test_invalid_cursor_returns_400(self, client):
+        """Test that a malformed cursor is a client error."""
+        response = client.get("/api/documents/admin/all", params={"cursor": "%%%"})
+
+        assert response.status_code == 400
+
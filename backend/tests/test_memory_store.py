@@ -0,0 +1,114 @@
+import pytest
+
+import memory_store
+from memory_store import MemoryStore
+from redis_service import RedisService
+
+
+class FakeClock:
+    """Monotonic clock the tests move by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(memory_store.time, "monotonic", clock)
+    return clock
+
+
+class TestMemoryStore:
+    """Test the bounded fallback store."""
+
+    def test_least_recently_used_key_is_evicted(self):
+        """Test that the entry limit evicts the key read least recently."""
+        store = MemoryStore(max_entries=2)
+        store.set("a", 1)
+        store.set("b", 2)
+        assert store.get("a") == 1
+        store.set("c", 3)
+
+        assert store.get("b") is None
+        assert store.get("a") == 1 and store.get("c") == 3
+        assert store.stats()["evictions"] == 1
+
+    def test_byte_limit_bounds_memory(self):
+        """Test that large values push out older ones and oversized values are refused."""
+        store = MemoryStore(max_entries=100, max_bytes=4096)
+        for index in range(10):
+            assert store.set(f"blob:{index}", "x" * 1000)
+
+        assert store.stats()["bytes"] <= 4096
+        assert len(store) < 10
+        assert store.get("blob:9") == "x" * 1000
+        assert store.set("huge", "x" * 10000) is False
+
+    def test_expired_keys_freed_without_reads(self, clock):
+        """Test that writes and the reaper free expired keys nobody reads again."""
+        store = MemoryStore()
+        for index in range(5):
+            store.set(f"code:{index}", "123456", expire=60)
+        store.set("session", {"user": "a"})
+
+        clock.now += 61
+        store.set("other", 1)
+        assert len(store) == 2
+
+        store.set("late", 1, expire=10)
+        clock.now += 11
+        assert store.purge_expired() == 1
+        assert store.stats()["expirations"] == 6
+
+    def test_overwrite_drops_old_expiry(self, clock):
+        """Test that re-setting a key replaces its TTL instead of expiring it early."""
+        store = MemoryStore()
+        store.set("session", "a", expire=10)
+        store.set("session", "b", expire=100)
+        store.set("persistent", "c", expire=10)
+        store.set("persistent", "d")
+
+        clock.now += 50
+        assert store.purge_expired() == 0
+        assert store.get("session") == "b"
+        assert store.ttl("persistent") == -1
+
+    def test_redis_semantics(self, clock):
+        """Test ttl, expire and increment against the Redis command behaviour."""
+        store = MemoryStore()
+        assert store.ttl("missing") == -2
+        assert store.increment("attempts") == 1
+        store.expire("attempts", 30)
+        assert store.increment("attempts", 4) == 5
+        assert store.ttl("attempts") == 30
+
+        clock.now += 29.5
+        assert store.ttl("attempts") == 1
+        assert store.expire("attempts", 0) is True
+        assert store.exists("attempts") is False
+
+        store.set("name", "renewmart")
+        assert store.increment("name") is None
+        assert store.delete("name", "missing") == 1
+
+
+class TestRedisServiceFallback:
+    """Test that RedisService uses the bounded store while disconnected."""
+
+    def test_fallback_store_and_health_stats(self, monkeypatch):
+        """Test the fallback path end to end and its counters in the health status."""
+        monkeypatch.setattr(RedisService, "_initialize_connection", lambda self: None)
+        service = RedisService()
+
+        assert service.set("verify:a@example.com", {"code": "123456"}, 600)
+        assert service.get("verify:a@example.com") == {"code": "123456"}
+        assert service.get("verify:b@example.com", "none") == "none"
+        assert 0 < service.ttl("verify:a@example.com") <= 600
+
+        stats = service.get_health_status()["memory_store"]
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1 and stats["misses"] == 1
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from password_hashing import KdfPool, hash_password_sync, verify_password_sync
+
+
+@pytest.fixture
+def pool():
+    """A small KDF pool torn down after each test."""
+    pool = KdfPool(workers=1, max_pending=2)
+    yield pool
+    pool.shutdown()
+
+
+class TestKdfPool:
+    """Test the bounded password hashing process pool."""
+
+    def test_hash_and_verify_in_pool(self, pool):
+        """Test that hashes made in the pool verify with the shared context."""
+        async def scenario():
+            hashed = await pool.run(hash_password_sync, "s3cret-pass")
+            return hashed, await pool.run(verify_password_sync, "s3cret-pass", hashed)
+
+        hashed, verified = asyncio.run(scenario())
+
+        assert hashed.startswith("$pbkdf2-sha256$")
+        assert verified
+        assert not verify_password_sync("wrong", hashed)
+        assert pool.stats()["completed"] == 2
+
+    def test_event_loop_keeps_running(self, pool):
+        """Test that other coroutines run while the KDF work is in progress."""
+        async def scenario():
+            await pool.run(time.sleep, 0)  # start the worker process up front
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            await pool.run(time.sleep, 0.3)
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(scenario()) >= 10
+
+    def test_full_queue_returns_429(self, pool):
+        """Test that calls beyond max_pending are rejected, not queued."""
+        async def scenario():
+            running = [asyncio.create_task(pool.run(time.sleep, 0.3)) for _ in range(2)]
+            await asyncio.sleep(0)
+            depth = pool.stats()
+            with pytest.raises(HTTPException) as exc_info:
+                await pool.run(time.sleep, 0)
+            await asyncio.gather(*running)
+            return depth, exc_info.value
+
+        depth, error = asyncio.run(scenario())
+
+        assert (depth["pending"], depth["queue_depth"]) == (2, 1)
+        assert error.status_code == 429
+        assert error.headers["Retry-After"] == "1"
+        assert pool.stats()["rejected"] == 1
+        assert pool.stats()["pending"] == 0
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+import auth
+from auth import create_access_token, get_current_user
+from principal_cache import PrincipalCache
+
+
+def make_principal(**overrides):
+    principal = {
+        "user_id": uuid.uuid4(),
+        "email": "owner@example.com",
+        "first_name": "Asha",
+        "last_name": "Rao",
+        "phone": None,
+        "is_verified": True,
+        "is_active": True,
+        "created_at": datetime(2025, 1, 2, 3, 4, 5),
+        "updated_at": None,
+        "roles": ["landowner"],
+    }
+    principal.update(overrides)
+    return principal
+
+
+@pytest.fixture
+def cache():
+    """A principal cache with no entries carried over from other tests."""
+    cache = PrincipalCache(ttl=60, local_ttl=60, max_entries=2)
+    yield cache
+    cache.clear()
+
+
+class FailingSession:
+    """Stand-in session that fails the test if the database is queried."""
+
+    def execute(self, *args, **kwargs):
+        raise AssertionError("principal should have been served from the cache")
+
+
+class TestPrincipalCache:
+    """Test the in-process LRU in front of Redis."""
+
+    def test_round_trip_keeps_types(self, cache):
+        """Test that cached principals come back with UUID and datetime values."""
+        principal = make_principal()
+        cache.set(principal)
+        cache.clear()  # force the Redis (or fallback store) path
+
+        cached = cache.get(principal["user_id"])
+
+        assert cached == principal
+        assert isinstance(cached["user_id"], uuid.UUID)
+        assert cache.stats()["redis_hits"] == 1
+        cache.invalidate(principal["user_id"])
+
+    def test_async_lookup_reads_the_shared_copy(self, cache):
+        """Test that get_async falls back to Redis (or the fallback store) on a local miss."""
+        principal = make_principal()
+        cache.set(principal)
+        cache.clear()
+
+        assert asyncio.run(cache.get_async(principal["user_id"])) == principal
+        assert asyncio.run(cache.get_async(principal["user_id"])) == principal
+        stats = cache.stats()
+        assert (stats["redis_hits"], stats["local_hits"]) == (1, 1)
+        cache.invalidate(principal["user_id"])
+
+    def test_callers_get_their_own_copy(self, cache):
+        """Test that mutating a returned principal does not change the cache."""
+        principal = make_principal()
+        cache.set(principal)
+
+        cache.get(principal["user_id"])["roles"].append("administrator")
+
+        assert cache.get(principal["user_id"])["roles"] == ["landowner"]
+        cache.invalidate(principal["user_id"])
+
+    def test_invalidate_forces_miss(self, cache):
+        """Test that invalidation clears both tiers and is counted."""
+        principal = make_principal()
+        cache.set(principal)
+
+        cache.invalidate(principal["user_id"])
+
+        assert cache.get(principal["user_id"]) is None
+        stats = cache.stats()
+        assert (stats["misses"], stats["invalidations"]) == (1, 1)
+
+    def test_local_tier_is_bounded(self, cache):
+        """Test that the least recently used principal is evicted locally."""
+        principals = [make_principal() for _ in range(3)]
+        for principal in principals:
+            cache.set(principal)
+
+        assert cache.stats()["local_entries"] == 2
+        for principal in principals:
+            cache.invalidate(principal["user_id"])
+
+    def test_remote_eviction_drops_local_copy(self, cache):
+        """Test that an invalidation broadcast by another worker evicts the local entry."""
+        principal = make_principal()
+        cache.set(principal)
+
+        cache.evict_local(f"principal:{principal['user_id']}")
+
+        assert cache.stats()["local_entries"] == 0
+        cache.invalidate(principal["user_id"])
+
+
+class TestGetCurrentUser:
+    """Test that authentication only queries the database on a miss."""
+
+    def test_cached_principal_skips_database(self, monkeypatch, cache):
+        """Test that a cached principal is returned without a query."""
+        monkeypatch.setattr(auth, "principal_cache", cache)
+        principal = make_principal(roles=["administrator"])
+        cache.set(principal)
+        token = create_access_token({"sub": str(principal["user_id"])})
+
+        current_user = asyncio.run(get_current_user(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), FailingSession()
+        ))
+
+        assert current_user["roles"] == ["administrator"]
+        assert cache.stats()["hit_rate"] == 100.0
+        cache.invalidate(principal["user_id"])
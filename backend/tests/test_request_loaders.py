@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from loaders import DataLoader, RequestLoaders
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+REVIEWER_ID = "22222222-2222-2222-2222-222222222222"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+
+pytestmark = pytest.mark.parse_timestamps
+
+
+@pytest.fixture
+def seeded(database):
+    """Database with two users, a draft land and three tasks."""
+    database.insert("user", {"user_id": OWNER_ID, "first_name": "Lena", "last_name": "Owner"},
+                    {"user_id": REVIEWER_ID, "first_name": "Ravi", "last_name": "Analyst"})
+    database.insert("user_roles", {"user_id": OWNER_ID, "role_key": "landowner"},
+                    {"user_id": REVIEWER_ID, "role_key": "re_analyst"},
+                    {"user_id": REVIEWER_ID, "role_key": "re_sales_advisor"})
+    database.insert("lands", {"land_id": LAND_ID, "landowner_id": OWNER_ID, "status": "draft",
+                              "title": "North field"})
+    database.insert("tasks", *[{
+        "task_id": f"00000000-0000-0000-0000-{index:012d}", "land_id": LAND_ID, "title": "Review",
+        "assigned_to": REVIEWER_ID, "created_by": OWNER_ID, "status": "pending", "priority": "medium",
+        "created_at": "2025-03-01 10:00:00", "updated_at": "2025-03-01 10:00:00"
+    } for index in range(3)])
+    return database
+
+
+@pytest.fixture
+def client(seeded, app_client, login):
+    """Test client signed in as the landowner."""
+    login(OWNER_ID, ["landowner"])
+    return app_client
+
+
+class TestDataLoader:
+    """Test batching and memoization in the loader."""
+
+    def test_concurrent_loads_share_one_batch(self):
+        """Test that loads issued together are resolved by one call and cached afterwards."""
+        calls = []
+
+        async def batch(keys):
+            calls.append(list(keys))
+            return {key: key.upper() for key in keys if key != "missing"}
+
+        async def scenario():
+            loader = DataLoader(batch, default="none")
+            together = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"))
+            again = await loader.load_many(["b", None, "missing"])
+            return together, again
+
+        together, again = asyncio.run(scenario())
+
+        assert together == ["A", "B", "A"]
+        assert again == {"b": "B", "missing": "none"}
+        assert calls == [["a", "b"], ["missing"]]
+
+    def test_failed_batch_is_not_cached(self):
+        """Test that an error reaches every waiter and the keys are retried next time."""
+        attempts = []
+
+        async def batch(keys):
+            attempts.append(keys)
+            if len(attempts) == 1:
+                raise RuntimeError("database went away")
+            return {key: key for key in keys}
+
+        async def scenario():
+            loader = DataLoader(batch)
+            results = await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+            return results, await loader.load("a")
+
+        results, retried = asyncio.run(scenario())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert retried == "a"
+        assert len(attempts) == 2
+
+    def test_roles_grouped_per_user(self, seeded):
+        """Test that roles for several users come from one query, with [] for unknown users."""
+        async def scenario():
+            async with seeded.Session() as db:
+                loaders = RequestLoaders(db)
+                return await loaders.roles.load_many([OWNER_ID, REVIEWER_ID, "nobody"]), loaders.roles.batches
+
+        roles, batches = asyncio.run(scenario())
+
+        assert roles[OWNER_ID] == ["landowner"]
+        assert sorted(roles[REVIEWER_ID]) == ["re_analyst", "re_sales_advisor"]
+        assert roles["nobody"] == []
+        assert batches == 1
+
+    def test_users_without_roles_get_their_own_list(self, seeded):
+        """Test that the empty role lists of different users are separate objects."""
+        async def scenario():
+            async with seeded.Session() as db:
+                return await RequestLoaders(db).roles.load_many(["nobody", "no-one"])
+
+        roles = asyncio.run(scenario())
+        roles["nobody"].append("administrator")
+
+        assert roles["no-one"] == []
+
+    def test_loaders_share_the_session_one_statement_at_a_time(self, seeded):
+        """Test that user and land batches due together run one after the other on the session."""
+        async def scenario():
+            async with seeded.Session() as db:
+                loaders = RequestLoaders(db)
+                return await asyncio.gather(loaders.users.load(OWNER_ID), loaders.lands.load(LAND_ID))
+
+        user, land = asyncio.run(scenario())
+
+        assert user.first_name == "Lena"
+        assert land.title == "North field"
+
+
+class TestLoadersInRouters:
+    """Test routers that resolve users and lands through the request loaders."""
+
+    def test_task_names_resolved_in_one_user_query(self, client, seeded):
+        """Test that assignee and creator names for a page cost a single user lookup."""
+        seeded.statements.clear()
+
+        response = client.get(f"/api/tasks/project/{LAND_ID}/review")
+
+        assert response.status_code == 200
+        assert {task["assigned_to_name"] for task in response.json()} == {"Ravi Analyst"}
+        assert {task["assigned_by_name"] for task in response.json()} == {"Lena Owner"}
+        assert len([s for s in seeded.statements if 'FROM "user"' in s]) == 1
+
+    def test_land_sections_permission_check(self, client, login):
+        """Test that section listing still enforces land visibility."""
+        assert client.get(f"/api/lands/{LAND_ID}/sections").status_code == 200
+
+        login(REVIEWER_ID, ["landowner"])
+        assert client.get(f"/api/lands/{LAND_ID}/sections").status_code == 403
+        missing = client.get("/api/lands/bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb/sections")
+        assert missing.status_code == 404
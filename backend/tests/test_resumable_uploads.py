@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import resumable_uploads
+from resumable_uploads import (
+    create_upload_session, get_upload_session, append_chunk,
+    current_offset, discard_upload_session, partial_path, UploadLock,
+    claim_upload_session, restore_upload_session, purge_stale_partials
+)
+
+OWNER = {"user_id": "owner-1", "roles": ["landowner"]}
+
+
+async def body(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def append(session, offset, *chunks):
+    return asyncio.run(append_chunk(session, offset, body(*chunks)))
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """An upload session for a 10-byte file stored under a temp directory."""
+    monkeypatch.setattr(resumable_uploads, "RESUMABLE_UPLOAD_DIR", tmp_path)
+    created = create_upload_session("land-1", "owner-1", "zoning-approvals", "eia.pdf", 10)
+    yield created
+    discard_upload_session(created["upload_id"])
+
+
+class TestResumableUploads:
+    """Test the resumable upload session protocol."""
+
+    def test_chunks_are_appended_at_offsets(self, session):
+        """Test that chunks accumulate and the offset tracks the partial file."""
+        assert current_offset(session["upload_id"]) == 0
+        assert append(session, 0, b"abc", b"de") == 5
+        assert append(session, 5, b"fghij") == 10
+        assert partial_path(session["upload_id"]).read_bytes() == b"abcdefghij"
+
+    def test_offset_mismatch_returns_conflict(self, session):
+        """Test that a stale offset is rejected with the current offset."""
+        append(session, 0, b"abc")
+
+        with pytest.raises(HTTPException) as exc_info:
+            append(session, 0, b"abc")
+
+        assert exc_info.value.status_code == 409
+        assert exc_info.value.headers["Upload-Offset"] == "3"
+
+    def test_overflow_discards_chunk(self, session):
+        """Test that bytes past the declared size are rejected and rolled back."""
+        append(session, 0, b"abcd")
+
+        with pytest.raises(HTTPException) as exc_info:
+            append(session, 4, b"efg", b"hijklm")
+
+        assert exc_info.value.status_code == 413
+        assert current_offset(session["upload_id"]) == 4
+
+    def test_session_access_is_restricted(self, session):
+        """Test that only the creator or an admin can use a session."""
+        assert get_upload_session(session["upload_id"], OWNER)["file_name"] == "eia.pdf"
+        assert get_upload_session(session["upload_id"], {"user_id": "x", "roles": ["administrator"]})
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_upload_session(session["upload_id"], {"user_id": "intruder", "roles": []})
+        assert exc_info.value.status_code == 403
+
+    def test_discarded_session_is_gone(self, session):
+        """Test that cancelling removes both the session and the partial file."""
+        discard_upload_session(session["upload_id"])
+
+        assert not partial_path(session["upload_id"]).exists()
+        with pytest.raises(HTTPException) as exc_info:
+            get_upload_session(session["upload_id"], OWNER)
+        assert exc_info.value.status_code == 404
+
+    def test_concurrent_request_is_rejected(self, session):
+        """Test that a retried PATCH racing the original gets 409 instead of interleaving writes."""
+        with UploadLock(session["upload_id"]):
+            with pytest.raises(HTTPException) as exc_info:
+                append(session, 0, b"abc")
+            assert exc_info.value.status_code == 409
+            assert exc_info.value.headers["Upload-Offset"] == "0"
+
+        assert append(session, 0, b"abc") == 3
+
+    def test_lock_after_completion_is_not_found(self, session):
+        """Test that a request queued behind a finalize sees the session as gone."""
+        discard_upload_session(session["upload_id"])
+
+        with pytest.raises(HTTPException) as exc_info:
+            with UploadLock(session["upload_id"]):
+                pass
+        assert exc_info.value.status_code == 404
+        assert session["upload_id"] not in resumable_uploads._local_locks
+
+    def test_session_is_claimed_once(self, session):
+        """Test that only one complete call can claim a session, and a failed one can hand it back."""
+        claim_upload_session(session)
+
+        with pytest.raises(HTTPException) as exc_info:
+            claim_upload_session(session)
+        assert exc_info.value.status_code == 404
+        with pytest.raises(HTTPException) as exc_info:
+            append(session, 0, b"abc")
+        assert exc_info.value.status_code == 404
+
+        restore_upload_session(session)
+        assert get_upload_session(session["upload_id"], OWNER)["file_name"] == "eia.pdf"
+        claim_upload_session(session)
+
+    def test_stale_partials_without_session_are_purged(self, session, tmp_path):
+        """Test that the sweep removes old orphaned partial files and keeps live uploads."""
+        orphan = tmp_path / "abandoned.part"
+        orphan.write_bytes(b"abc")
+        day_ago = time.time() - 86400
+        for path in (orphan, partial_path(session["upload_id"])):
+            os.utime(path, (day_ago, day_ago))
+
+        assert purge_stale_partials(max_age=3600) == 1
+        assert not orphan.exists()
+        assert partial_path(session["upload_id"]).exists()
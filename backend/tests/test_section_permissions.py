@@ -0,0 +1,75 @@
+import asyncio
+import uuid
+
+import pytest
+
+from routers.sections import SectionPermissions
+
+OWNER_ID = uuid.UUID("11111111-1111-1111-1111-111111111111")
+ANALYST_ID = uuid.UUID("22222222-2222-2222-2222-222222222222")
+LAND_ID = uuid.UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+OTHER_LAND_ID = uuid.UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+SECTION_ID = uuid.UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+
+@pytest.fixture
+def seeded(database):
+    """Database with two draft lands, one with a section assigned to the analyst role."""
+    # The ORM stores UUID columns as 32-character hex on SQLite
+    database.insert("lands", *[{
+        "land_id": land_id.hex, "landowner_id": OWNER_ID.hex, "title": "North field", "status": "draft",
+        "created_at": "2025-03-01 10:00:00", "updated_at": "2025-03-01 10:00:00"
+    } for land_id in (LAND_ID, OTHER_LAND_ID)])
+    database.insert("land_sections", {"land_section_id": SECTION_ID.hex, "land_id": LAND_ID.hex,
+                                      "section_key": "grid", "status": "submitted", "assigned_role": "re_analyst"})
+    return database
+
+
+@pytest.fixture
+def client(seeded, app_client, login):
+    """Test client signed in as the analyst."""
+    login(str(ANALYST_ID), ["re_analyst"])
+    return app_client
+
+
+class TestSectionPermissions:
+    """Test the per-request permission context."""
+
+    def test_ownership_loaded_once(self, seeded):
+        """Test that owned lands are fetched by the first check only and roles never hit the database."""
+        seeded.statements.clear()
+
+        async def scenario():
+            async with seeded.Session() as db:
+                perms = SectionPermissions({"user_id": str(OWNER_ID), "roles": ["landowner"]}, db)
+                assert perms.has_role("landowner") and not perms.is_admin
+                assert seeded.statements == []
+
+                return [await perms.owns_land(LAND_ID), await perms.owns_land(str(OTHER_LAND_ID)),
+                        await perms.owns_land(SECTION_ID)]
+
+        assert asyncio.run(scenario()) == [True, True, False]
+        assert len(seeded.statements) == 1
+
+    def test_decide_section_checks_in_memory(self, client, seeded):
+        """Test that a reviewer's decision runs no role or ownership queries."""
+        seeded.statements.clear()
+
+        response = client.post(f"/api/sections/{SECTION_ID}/decide",
+                               json={"decision": "approved", "comments": "Grid study checks out"})
+
+        assert response.status_code == 200
+        assert not any("user_roles" in s or "landowner_id =" in s for s in seeded.statements)
+        section = client.get(f"/api/sections/{SECTION_ID}").json()
+        assert section["status"] == "approved"
+        assert section["reviewer_comments"] == "Grid study checks out"
+
+    def test_unassigned_user_is_forbidden(self, client, login):
+        """Test that users outside the assignment and ownership cannot view or decide."""
+        login("33333333-3333-3333-3333-333333333333", ["re_sales_advisor"])
+
+        assert client.get(f"/api/sections/{SECTION_ID}").status_code == 403
+        decision = client.post(f"/api/sections/{SECTION_ID}/decide", json={"decision": "approved"})
+        assert decision.status_code == 403
+
+        login(str(OWNER_ID), ["landowner"])
+        assert client.get(f"/api/sections/{SECTION_ID}").status_code == 200
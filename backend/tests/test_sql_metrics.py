@@ -0,0 +1,132 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import sql_metrics as sql_metrics_module
+from sql_metrics import SQLMetrics, SQLMetricsMiddleware, UNROUTED, sql_metrics, statement_shape
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+
+REVIEW_ROUTE = "GET /api/tasks/project/{land_id}/review"
+
+pytestmark = pytest.mark.parse_timestamps
+
+
+@pytest.fixture
+def seeded(database):
+    """Database with one submitted land and no tasks."""
+    database.insert("lands", {"land_id": LAND_ID, "landowner_id": OWNER_ID, "status": "submitted",
+                              "title": "North field"})
+    return database
+
+
+@pytest.fixture
+def client(seeded, app_client, login):
+    """Test client signed in as the landowner, with fresh SQL metrics."""
+    login(OWNER_ID, ["landowner"])
+    sql_metrics.reset()
+    yield app_client
+    sql_metrics.reset()
+
+
+class TestStatementShape:
+    """Test statement normalisation for N+1 detection."""
+
+    def test_literals_and_in_lists_are_normalised(self):
+        """Test that statements differing only in values or IN-list length share a shape."""
+        assert statement_shape("SELECT * FROM tasks WHERE task_id IN (?, ?, ?)") == \
+            statement_shape("SELECT  *\n FROM tasks WHERE task_id IN (?)")
+        assert statement_shape("SELECT * FROM lands WHERE status = 'draft' LIMIT 10") == \
+            statement_shape("SELECT * FROM lands WHERE status = 'published' LIMIT 20")
+        assert statement_shape("SELECT * FROM user_roles") != statement_shape("SELECT * FROM lands")
+
+
+class TestSQLMetrics:
+    """Test statement attribution and N+1 flagging."""
+
+    def test_repeated_shape_flagged_as_n_plus_one(self, seeded):
+        """Test that one shape run past the threshold is reported for the route."""
+        metrics = SQLMetrics(n_plus_one_threshold=3)
+        token = metrics.start_request()
+        with seeded.engine.connect() as conn:
+            conn.execute(text("SELECT land_id FROM lands"))
+            for index in range(4):
+                conn.execute(text("SELECT * FROM tasks WHERE land_id = :id"), {"id": str(index)})
+            queries = metrics.finish_request(token, "GET /api/things")
+
+        assert queries.count == 5
+        route = metrics.stats()["routes"]["GET /api/things"]
+        assert route["requests"] == 1 and route["statements"] == 5
+        assert route["n_plus_one_requests"] == 1
+        assert list(route["n_plus_one"].values()) == [4]
+
+    def test_statements_outside_requests_are_unrouted(self, seeded):
+        """Test that statements with no request in progress are still counted."""
+        sql_metrics.reset()
+        with seeded.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        unrouted = sql_metrics.stats()["routes"][UNROUTED]
+        assert unrouted["statements"] == 1
+        assert unrouted["requests"] == 0
+        sql_metrics.reset()
+
+
+class TestSQLMetricsMiddleware:
+    """Test per-route attribution through the HTTP middleware."""
+
+    def test_statements_attributed_to_route_template(self, client, seeded):
+        """Test that a request's statements land under its route template, not its URL."""
+        seeded.statements.clear()
+
+        response = client.get(f"/api/tasks/project/{LAND_ID}/review")
+
+        assert response.status_code == 200
+        route = sql_metrics.stats()["routes"][REVIEW_ROUTE]
+        assert route["requests"] == 1
+        assert route["statements"] == len(seeded.statements) > 0
+        assert route["n_plus_one_requests"] == 0
+        assert "Server-Timing" not in response.headers
+
+    def test_server_timing_header(self, client, seeded, monkeypatch):
+        """Test that the optional Server-Timing header reports the request's queries."""
+        monkeypatch.setattr(sql_metrics_module, "SQL_SERVER_TIMING", True)
+        seeded.statements.clear()
+
+        response = client.get(f"/api/tasks/project/{LAND_ID}/review")
+
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert f'desc="{len(seeded.statements)} queries"' in timing
+
+    def test_statements_while_streaming_are_counted(self, seeded):
+        """Test that statements run while a streamed body is sent count towards its route."""
+        api = FastAPI()
+
+        @api.get("/export/{land_id}")
+        async def export(land_id: str):
+            def chunks():
+                for _ in range(3):
+                    with seeded.engine.connect() as conn:
+                        yield str(conn.execute(text("SELECT COUNT(*) FROM lands")).scalar()).encode()
+            return StreamingResponse(chunks())
+
+        sql_metrics.reset()
+        response = TestClient(SQLMetricsMiddleware(api)).get(f"/export/{LAND_ID}")
+
+        assert response.content == b"111"
+        assert sql_metrics.stats()["routes"]["GET /export/{land_id}"]["statements"] == 3
+        sql_metrics.reset()
+
+    def test_async_session_statements_attributed(self, client, login):
+        """Test that statements run on the asyncio engine reach the request's totals."""
+        login(OWNER_ID, ["administrator"])
+
+        response = client.get(f"/api/reviews/land/{LAND_ID}/role/re_analyst")
+
+        assert response.status_code == 200
+        route = sql_metrics.stats()["routes"]["GET /api/reviews/land/{land_id}/role/{reviewer_role}"]
+        assert route["statements"] >= 1
@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import auth
+from auth import create_user_token, get_current_user, invalidate_principal
+from token_versions import TokenVersions
+
+
+class FailingSession:
+    """Stand-in session that fails the test if the database is queried."""
+
+    def execute(self, *args, **kwargs):
+        raise AssertionError("stateless tokens must not hit the database")
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    """Stateless mode with a process-local token version registry."""
+    versions = TokenVersions(channel="test_token_versions")
+    monkeypatch.setattr(auth, "STATELESS_AUTH", True)
+    monkeypatch.setattr(auth, "token_versions", versions)
+    return versions
+
+
+@pytest.fixture
+def user():
+    return {
+        "user_id": uuid.uuid4(),
+        "email": "analyst@example.com",
+        "first_name": "Ravi",
+        "last_name": "Kumar",
+        "phone": None,
+        "is_verified": True,
+        "is_active": True,
+        "created_at": datetime(2025, 1, 2, 3, 4, 5),
+        "updated_at": datetime(2025, 2, 3, 4, 5, 6),
+        "roles": ["re_analyst"],
+    }
+
+
+class TestStatelessAuth:
+    """Test authentication from signed claims with version-based revocation."""
+
+    def test_claims_authenticate_without_io(self, stateless, user):
+        """Test that a stateless token yields the full principal without queries."""
+        current_user = asyncio.run(get_current_user(bearer(create_user_token(user)), FailingSession()))
+
+        assert current_user == user
+
+    def test_revocation_rejects_older_tokens(self, stateless, user):
+        """Test that bumping the version revokes tokens issued before it."""
+        old_token = create_user_token(user)
+        invalidate_principal(user["user_id"])
+        new_token = create_user_token(user)
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(get_current_user(bearer(old_token), FailingSession()))
+        assert exc_info.value.status_code == 401
+        assert asyncio.run(get_current_user(bearer(new_token), FailingSession()))["user_id"] == user["user_id"]
+
+    def test_inactive_claims_are_rejected(self, stateless, user):
+        """Test that a token issued for an inactive user is not accepted."""
+        token = create_user_token({**user, "is_active": False})
+
+        with pytest.raises(HTTPException):
+            asyncio.run(get_current_user(bearer(token), FailingSession()))
+
+    def test_session_mode_skips_revocation(self, monkeypatch, user):
+        """Test that invalidating a user does not touch token versions when stateless auth is off."""
+        versions = TokenVersions(channel="test_token_versions")
+        monkeypatch.setattr(auth, "STATELESS_AUTH", False)
+        monkeypatch.setattr(auth, "token_versions", versions)
+
+        def revoke(user_id):
+            raise AssertionError("token versions are only used in stateless mode")
+
+        monkeypatch.setattr(versions, "revoke", revoke)
+        invalidate_principal(user["user_id"])
+
+
+class TestTokenVersions:
+    """Test the in-memory replica of token version counters."""
+
+    def test_replicated_versions_only_move_forward(self):
+        """Test that pub/sub messages apply in any order and bad ones are ignored."""
+        versions = TokenVersions(channel="test_token_versions")
+
+        versions._on_message({"data": "user-1:3"})
+        versions._on_message({"data": "user-1:2"})
+        versions._on_message({"data": "garbage"})
+
+        assert versions.current("user-1") == 3
+        assert versions.is_current("user-1", 3)
+        assert not versions.is_current("user-1", 2)
+        assert versions.current("user-2") == 0
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from routers.tasks import load_subtasks_by_task
+
+OWNER_ID = "11111111-1111-1111-1111-111111111111"
+LAND_ID = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
+
+pytestmark = pytest.mark.parse_timestamps
+
+
+@pytest.fixture
+def project(database):
+    """Database with a submitted land and no tasks yet."""
+    database.insert("user", {"user_id": OWNER_ID, "first_name": "Lena", "last_name": "Owner"})
+    database.insert("lands", {"land_id": LAND_ID, "landowner_id": OWNER_ID, "status": "submitted",
+                              "title": "North field"})
+    return database
+
+
+@pytest.fixture
+def client(project, app_client, login):
+    """Test client signed in as the landowner."""
+    login(OWNER_ID, ["landowner"])
+    return app_client
+
+
+def add_tasks(database, count, subtasks_per_task=3):
+    """Add tasks to the project, each with a few subtasks."""
+    with database.engine.begin() as conn:
+        existing = conn.execute(text("SELECT COUNT(*) FROM tasks")).scalar()
+        for index in range(existing, existing + count):
+            task_id = f"00000000-0000-0000-0000-{index:012d}"
+            conn.execute(text("""
+                INSERT INTO tasks (task_id, land_id, title, created_by, status, priority,
+                                   created_at, updated_at)
+                VALUES (:id, :land_id, 'Review', :owner, 'pending', 'medium',
+                        '2025-03-01 10:00:00', '2025-03-01 10:00:00')
+            """), {"id": task_id, "land_id": LAND_ID, "owner": OWNER_ID})
+            for position in range(subtasks_per_task):
+                conn.execute(text("""
+                    INSERT INTO subtasks VALUES (:id, :task_id, :title, NULL, 'pending', NULL, :owner,
+                                                 :position, :created_at, :created_at)
+                """), {"id": f"{task_id[:-12]}{position:04d}{index:08d}", "task_id": task_id,
+                       "title": f"Step {position}", "owner": OWNER_ID, "position": position,
+                       "created_at": f"2025-03-01 10:0{position}:00"})
+
+
+def queries_for(client, database, path, params=None):
+    """Run one request and return it with the number of SQL statements it executed."""
+    database.statements.clear()
+    response = client.get(path, params=params)
+    assert response.status_code == 200
+    return response, len(database.statements)
+
+
+class TestLoadSubtasksByTask:
+    """Test the batched subtask loader."""
+
+    def test_groups_subtasks_in_order(self, project):
+        """Test that subtasks are grouped per task in creation order, with empty lists for the rest."""
+        add_tasks(project, 2)
+        project.statements.clear()
+
+        async def scenario():
+            async with project.Session() as db:
+                return await load_subtasks_by_task(
+                    ["00000000-0000-0000-0000-000000000000", "00000000-0000-0000-0000-000000000001", "missing"], db
+                )
+
+        grouped = asyncio.run(scenario())
+
+        assert len(project.statements) == 1
+        assert [s["title"] for s in grouped["00000000-0000-0000-0000-000000000000"]] == ["Step 0", "Step 1", "Step 2"]
+        assert len(grouped["00000000-0000-0000-0000-000000000001"]) == 3
+        assert grouped["missing"] == []
+
+    def test_no_tasks_runs_no_query(self, project):
+        """Test that an empty page does not touch the database."""
+        project.statements.clear()
+
+        async def scenario():
+            async with project.Session() as db:
+                return await load_subtasks_by_task([], db)
+
+        assert asyncio.run(scenario()) == {}
+        assert project.statements == []
+
+
+class TestSubtaskQueryCount:
+    """Test that task listings with subtasks run a constant number of queries."""
+
+    @pytest.mark.parametrize("path", ["/api/tasks/", f"/api/tasks/project/{LAND_ID}/review"])
+    def test_query_count_independent_of_task_count(self, client, project, path):
+        """Test that 2 and 30 tasks cost the same number of queries."""
+        params = {"include_subtasks": True} if path == "/api/tasks/" else None
+
+        add_tasks(project, 2)
+        small, small_count = queries_for(client, project, path, params)
+        add_tasks(project, 28)
+        large, large_count = queries_for(client, project, path, params)
+
+        assert len(small.json()) == 2
+        assert len(large.json()) == 30
+        assert all(len(task["subtasks"]) == 3 for task in large.json())
+        assert large_count == small_count
@@ -0,0 +1,83 @@
+"""Text extraction executed inside the background worker processes.
+
+Kept free of application imports so spawned workers start quickly.
+Plain text and DOCX use the standard library; PDFs need PyMuPDF and are
+skipped without it.
+"""
+import zipfile
+from typing import List, Optional
+from xml.etree import ElementTree
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24
+    except ImportError:  # PyMuPDF not installed - PDFs are not indexed
+        pymupdf = None
+
+TEXT_MIME_TYPE = "text/plain"
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def can_extract(mime_type: Optional[str]) -> bool:
+    """Whether text can be extracted from this MIME type in this install"""
+    if mime_type in (TEXT_MIME_TYPE, DOCX_MIME_TYPE):
+        return True
+    return mime_type == PDF_MIME_TYPE and pymupdf is not None
+
+
+def _extract_txt(path: str, max_chars: int) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as fh:
+        return fh.read(max_chars)
+
+
+def _extract_docx(path: str, max_chars: int) -> str:
+    parts: List[str] = []
+    length = 0
+    with zipfile.ZipFile(path) as archive:
+        with archive.open("word/document.xml") as xml:
+            # Stream the XML so large documents never build a full tree
+            for _, element in ElementTree.iterparse(xml, events=("end",)):
+                if element.tag == f"{_WORD_NS}t" and element.text:
+                    parts.append(element.text)
+                    length += len(element.text)
+                elif element.tag in (f"{_WORD_NS}p", f"{_WORD_NS}tab", f"{_WORD_NS}br"):
+                    parts.append("\n" if element.tag == f"{_WORD_NS}p" else " ")
+                    element.clear()
+                if length >= max_chars:
+                    break
+    return "".join(parts)[:max_chars]
+
+
+def _extract_pdf(path: str, max_chars: int) -> str:
+    parts: List[str] = []
+    length = 0
+    with pymupdf.open(path) as pdf:
+        for page in pdf:
+            page_text = page.get_text()
+            parts.append(page_text)
+            length += len(page_text)
+            if length >= max_chars:
+                break
+    return "".join(parts)[:max_chars]
+
+
+def extract_text(path: str, mime_type: str, max_chars: int) -> Optional[str]:
+    """Extract up to ``max_chars`` characters of text from the file at ``path``.
+
+    Returns None if the type is not supported.
+    """
+    if not can_extract(mime_type):
+        return None
+    if mime_type == PDF_MIME_TYPE:
+        content = _extract_pdf(path, max_chars)
+    elif mime_type == DOCX_MIME_TYPE:
+        content = _extract_docx(path, max_chars)
+    else:
+        content = _extract_txt(path, max_chars)
+    # NUL bytes are not allowed in Postgres text columns
+    return content.replace("\x00", " ")
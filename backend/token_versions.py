@@ -0,0 +1,122 @@
+import threading
+from typing import Dict, Optional
+import logging
+
+from config import settings
+from redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+# Stateless authentication configuration
+STATELESS_AUTH = settings.get('STATELESS_AUTH', False)  # Trust signed role claims instead of the database
+TOKEN_VERSION_CHANNEL = settings.get('TOKEN_VERSION_CHANNEL', 'token_versions')
+
+_KEY_PREFIX = "token_version:"
+
+
+def _version_key(user_id) -> str:
+    return f"{_KEY_PREFIX}{user_id}"
+
+
+class TokenVersions:
+    """Per-user token version counters, mirrored in memory by every worker.
+
+    Revoking a user's tokens increments their counter in Redis and
+    publishes the new value; each worker's subscriber applies it to the
+    in-memory map, so checking a token costs a dict lookup. Only users
+    that were ever revoked have an entry. Without Redis the counters live
+    in this process only.
+    """
+
+    def __init__(self, channel: str = TOKEN_VERSION_CHANNEL):
+        self.channel = channel
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self, user_id) -> int:
+        """In-memory version for a user (0 if never revoked)."""
+        return self._versions.get(str(user_id), 0)
+
+    def is_current(self, user_id, version: int) -> bool:
+        """Whether a token carrying ``version`` has not been revoked."""
+        return version >= self.current(user_id)
+
+    def issue_version(self, user_id) -> int:
+        """Version to embed in a new token, read through to Redis when available."""
+        if redis_service.is_connected and redis_service.redis_client:
+            try:
+                value = redis_service.redis_client.get(_version_key(user_id))
+                self._apply(str(user_id), int(value or 0))
+            except Exception as e:
+                logger.warning(f"Could not read token version for {user_id}: {e}")
+        return self.current(user_id)
+
+    def revoke(self, user_id) -> int:
+        """Invalidate every token issued to a user so far; returns the new version."""
+        key = str(user_id)
+        if redis_service.is_connected and redis_service.redis_client:
+            try:
+                version = redis_service.redis_client.incr(_version_key(key))
+                redis_service.redis_client.publish(self.channel, f"{key}:{version}")
+                self._apply(key, version)
+                return version
+            except Exception as e:
+                logger.error(f"Token revocation for {key} could not be replicated: {e}")
+
+        with self._lock:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+        return version
+
+    def sync(self) -> int:
+        """Load every counter from Redis; returns the number of users loaded."""
+        if not redis_service.is_connected or not redis_service.redis_client:
+            return 0
+
+        client = redis_service.redis_client
+        keys = list(client.scan_iter(match=f"{_KEY_PREFIX}*", count=1000))
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            for key, value in zip(batch, client.mget(batch)):
+                if value is not None:
+                    self._apply(key[len(_KEY_PREFIX):], int(value))
+        return len(keys)
+
+    def start(self):
+        """Subscribe to revocations and load the current counters."""
+        if self._thread or not redis_service.is_connected or not redis_service.redis_client:
+            return
+
+        # Subscribe before syncing so no revocation falls between the two
+        self._pubsub = redis_service.redis_client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        logger.info(f"Loaded token versions for {self.sync()} users")
+
+    def stop(self):
+        """Stop the revocation subscriber."""
+        if self._thread:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _on_message(self, message):
+        try:
+            user_id, _, version = message["data"].rpartition(":")
+            self._apply(user_id, int(version))
+        except (AttributeError, ValueError):
+            logger.warning(f"Ignoring malformed token version message: {message!r}")
+
+    def _apply(self, user_id: str, version: int):
+        # Versions only move forward, whatever order updates arrive in
+        with self._lock:
+            if version > self._versions.get(user_id, 0):
+                self._versions[user_id] = version
+
+
+# Global token version registry
+token_versions = TokenVersions()
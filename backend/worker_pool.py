@@ -0,0 +1,45 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Background worker configuration
+BACKGROUND_WORKERS = settings.get('BACKGROUND_WORKERS', 2)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Create the shared background worker pool on first use.
+
+    Document processing (preview rendering, text extraction) is CPU-bound
+    and parsers can misbehave on hostile input, so it runs in separate
+    processes rather than on the event loop or threadpool. Workers are
+    spawned so they never inherit database connections from the parent.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=BACKGROUND_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def run_in_worker(func: Callable[..., Any], *args) -> Any:
+    """Run a picklable function in the worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_worker_pool(), func, *args)
+
+
+def shutdown_worker_pool():
+    """Stop the background workers (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None